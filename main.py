@@ -180,7 +180,11 @@ def initialize_config():
 def initialize_data_manager(config):
     """Initialize data manager"""
     logger.info("Initializing data manager...")
-    data_manager = DataManager(config.data_directory)
+    data_manager = DataManager(
+        config.data_directory,
+        storage_backend=config.storage_backend,
+        columnar_snapshots=config.columnar_snapshots
+    )
     logger.info("Data manager initialized successfully")
     return data_manager
 
@@ -0,0 +1,324 @@
+"""
+Aggregate Store Module
+Materialized per-day, per-month and per-category totals kept in step with module data
+"""
+
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+
+# Aggregated record sources: module -> file, columns to load, and the columns
+# giving each row's date, category bucket and value. 'value' is 'amount' for
+# summed numbers, 'flag' for booleans counted when true, or 'count' for rows.
+# Expenses skip undated and non-positive rows, as ExpenseDataModel does when
+# it loads them, so counts match the transaction count shown before.
+AGGREGATE_SOURCES: Dict[str, Dict[str, Any]] = {
+    'expenses': {
+        'filename': 'expenses.csv',
+        'columns': ['id', 'date', 'type', 'category', 'sub_category', 'transaction_mode', 'amount'],
+        'date': 'date',
+        'category': 'category',
+        'value': 'amount',
+        'kind': 'amount',
+        'require_date': True,
+        'positive_only': True,
+    },
+    'income': {
+        'filename': 'income_records.csv',
+        'columns': ['id', 'date', 'earned', 'status'],
+        'date': 'date',
+        'category': 'status',
+        'value': 'earned',
+        'kind': 'amount',
+        'require_date': True,
+        'positive_only': False,
+    },
+    'habits': {
+        'filename': 'habit_records.csv',
+        'columns': ['id', 'date', 'habit_id', 'habit_name', 'is_completed'],
+        'date': 'date',
+        'category': 'habit_name',
+        'value': 'is_completed',
+        'kind': 'flag',
+        'require_date': True,
+        'positive_only': False,
+    },
+    'todos': {
+        'filename': 'todo_items.csv',
+        'columns': ['id', 'status', 'priority', 'due_date', 'completed_at'],
+        'date': 'due_date',
+        'category': 'status',
+        'value': None,
+        'kind': 'count',
+        'require_date': False,
+        'positive_only': False,
+    },
+}
+
+_TRUE_VALUES = {'true', '1', '1.0', 'yes', 'y'}
+
+# A row's contribution: (day, month, category, value); day and month are None for undated rows
+Contribution = Tuple[Optional[str], Optional[str], str, float]
+
+
+class AggregateStore:
+    """Running totals over module records, updated from row-level changes
+
+    For every source the store keeps the total and the value sum and row
+    count per day, per month and per category, plus each row's content hash
+    and contribution. When a module's storage signature changes only rows
+    whose hash changed are re-derived, their old contribution is subtracted
+    and the new one added. refresh() reports which views actually moved so
+    callers can redraw just the widgets reading them:
+
+        'records'      any loaded row was added, removed or edited
+        'totals'       module total or row count
+        'by_day'       per-day buckets
+        'by_month'     per-month buckets
+        'by_category'  per-category buckets
+    """
+
+    views = ('records', 'totals', 'by_day', 'by_month', 'by_category')
+    bucket_views = ('by_day', 'by_month', 'by_category')
+
+    def __init__(self, data_manager):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.data_manager = data_manager
+        self._lock = threading.RLock()
+
+        self.signatures: Dict[str, Optional[tuple]] = {}                       # module -> source signature
+        self.rows: Dict[str, Dict[str, Tuple[int, Optional[Contribution]]]] = {}  # module -> row key -> hash, contribution
+        self.totals: Dict[str, List[float]] = {}                                # module -> [value, count]
+        self.buckets: Dict[str, Dict[str, Dict[str, List[float]]]] = {}        # module -> view -> key -> [value, count]
+        self.versions: Dict[str, Dict[str, int]] = {}                           # module -> view -> change counter
+
+    def refresh(self, modules: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """Bring the aggregates up to date, returning the changed views per module
+
+        Modules whose storage signature is unchanged cost one stat call, so
+        this is cheap enough to poll.
+        """
+        changes = {}
+        with self._lock:
+            for module in modules or AGGREGATE_SOURCES:
+                try:
+                    changed_views = self._refresh_module(module)
+                except Exception as e:
+                    self.logger.error(f"Error refreshing aggregates for {module}: {e}")
+                    continue
+                if changed_views:
+                    changes[module] = changed_views
+        return changes
+
+    def rebuild(self):
+        """Drop all aggregates and re-read every source"""
+        with self._lock:
+            self.signatures.clear()
+            self.rows.clear()
+            self.totals.clear()
+            self.buckets.clear()
+            self.refresh()
+
+    def get_total(self, module: str) -> Dict[str, float]:
+        """Get the value sum and row count of a module"""
+        with self._lock:
+            value, count = self.totals.get(module, [0.0, 0])
+            return {'total': value, 'count': int(count)}
+
+    def get_buckets(self, module: str, view: str) -> Dict[str, Dict[str, float]]:
+        """Get {bucket key: {'total', 'count'}} for one of the bucket views"""
+        if view not in self.bucket_views:
+            raise ValueError(f"Unknown aggregate view: {view}")
+        with self._lock:
+            buckets = self.buckets.get(module, {}).get(view, {})
+            return {key: {'total': value, 'count': int(count)}
+                    for key, (value, count) in buckets.items()}
+
+    def get_frame(self, module: str, view: str, key_column: str = 'key',
+                  value_column: str = 'total') -> pd.DataFrame:
+        """Get a bucket view as a DataFrame sorted by key, with a 'count' column
+
+        Day keys are returned as datetimes so the frame can stand in for the
+        raw records in charts that group by date.
+        """
+        buckets = self.get_buckets(module, view)
+        keys = sorted(buckets)
+        df = pd.DataFrame({
+            key_column: keys,
+            value_column: [buckets[key]['total'] for key in keys],
+            'count': [buckets[key]['count'] for key in keys],
+        })
+        if view == 'by_day':
+            df[key_column] = pd.to_datetime(df[key_column])
+        return df
+
+    def get_total_between(self, module: str, start: date, end: date) -> Dict[str, float]:
+        """Get the value sum and row count of days in [start, end]"""
+        start_key, end_key = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        with self._lock:
+            value, count = 0.0, 0
+            for key, (bucket_value, bucket_count) in self.buckets.get(module, {}).get('by_day', {}).items():
+                if start_key <= key <= end_key:
+                    value += bucket_value
+                    count += bucket_count
+            return {'total': value, 'count': int(count)}
+
+    def get_version(self, module: str, view: str) -> int:
+        """Get a counter that increases whenever the view changes"""
+        with self._lock:
+            return self.versions.get(module, {}).get(view, 0)
+
+    def _refresh_module(self, module: str) -> Set[str]:
+        """Apply the row changes of one module, returning the views that moved"""
+        source = AGGREGATE_SOURCES[module]
+        signature = self.data_manager.get_data_signature(module, source['filename'])
+        if module in self.signatures and signature == self.signatures[module]:
+            return set()
+
+        if self.data_manager.file_exists(module, source['filename']):
+            df = self.data_manager.read_csv(module, source['filename'], source['columns'],
+                                            columns=source['columns'])
+            df = df.reindex(columns=source['columns'])
+        else:
+            df = pd.DataFrame(columns=source['columns'])
+
+        keys = self._row_keys(df)
+        hashes = pd.util.hash_pandas_object(df, index=False).tolist() if len(df) else []
+
+        old_rows = self.rows.get(module, {})
+        new_keys = set(keys)
+        changed_positions = [position for position, (key, row_hash) in enumerate(zip(keys, hashes))
+                             if key not in old_rows or old_rows[key][0] != row_hash]
+        removed_keys = [key for key in old_rows if key not in new_keys]
+
+        self.signatures[module] = signature
+        if not changed_positions and not removed_keys and module in self.rows:
+            return set()
+
+        contributions = self._contributions(source, df.iloc[changed_positions])
+
+        # Net change per bucket, so edits that cancel out leave views untouched
+        deltas: Dict[str, Dict[str, List[float]]] = {view: defaultdict(lambda: [0.0, 0])
+                                                      for view in ('totals',) + self.bucket_views}
+        rows = dict(old_rows)
+        for key in removed_keys:
+            self._add_delta(deltas, rows.pop(key)[1], -1)
+        for position, contribution in zip(changed_positions, contributions):
+            key = keys[position]
+            if key in rows:
+                self._add_delta(deltas, rows[key][1], -1)
+            self._add_delta(deltas, contribution, 1)
+            rows[key] = (hashes[position], contribution)
+
+        self.rows[module] = rows
+        changed_views = {'records'}
+        changed_views |= self._apply_deltas(module, deltas)
+
+        versions = self.versions.setdefault(module, {})
+        for view in changed_views:
+            versions[view] = versions.get(view, 0) + 1
+
+        self.logger.debug(f"Aggregates {module}: {len(changed_positions)} rows changed, "
+                          f"{len(removed_keys)} removed, views {sorted(changed_views)}")
+        return changed_views
+
+    @staticmethod
+    def _row_keys(df: pd.DataFrame) -> List[str]:
+        """Key rows by id, falling back to position for missing or repeated ids"""
+        if df.empty:
+            return []
+        ids = df['id'].astype(object).where(df['id'].notna(), '').astype(str).str.strip()
+        ambiguous = ids.duplicated(keep=False) | (ids == '')
+        positions = pd.Series(range(len(df)), index=df.index).astype(str)
+        return ids.where(~ambiguous, ids + '@' + positions).tolist()
+
+    @staticmethod
+    def _contributions(source: Dict[str, Any], df: pd.DataFrame) -> List[Optional[Contribution]]:
+        """Derive the contribution of each row, None for rows that are not counted"""
+        if df.empty:
+            return []
+
+        dates = pd.to_datetime(df[source['date']], errors='coerce')
+        days = [day if isinstance(day, str) else None for day in dates.dt.strftime('%Y-%m-%d').tolist()]
+        months = [day[:7] if day else None for day in days]
+
+        category = df[source['category']]
+        categories = category.astype(object).where(category.notna(), '').astype(str).str.strip()
+
+        if source['kind'] == 'amount':
+            values = pd.to_numeric(df[source['value']], errors='coerce').fillna(0.0)
+        elif source['kind'] == 'flag':
+            values = df[source['value']].astype(str).str.strip().str.lower().isin(_TRUE_VALUES).astype(float)
+        else:
+            values = pd.Series(1.0, index=df.index)
+
+        counted = pd.Series(True, index=df.index)
+        if source['require_date']:
+            counted &= dates.notna()
+        if source['positive_only']:
+            counted &= values > 0
+
+        return [(day, month, category_key, float(value)) if keep else None
+                for day, month, category_key, value, keep
+                in zip(days, months, categories.tolist(), values.tolist(), counted.tolist())]
+
+    @staticmethod
+    def _add_delta(deltas: Dict[str, Dict[str, List[float]]], contribution: Optional[Contribution], sign: int):
+        """Accumulate a row contribution into the per-bucket deltas"""
+        if contribution is None:
+            return
+        day, month, category, value = contribution
+        for view, key in (('totals', ''), ('by_day', day), ('by_month', month), ('by_category', category)):
+            if key is None:
+                continue
+            delta = deltas[view][key]
+            delta[0] += sign * value
+            delta[1] += sign
+
+    def _apply_deltas(self, module: str, deltas: Dict[str, Dict[str, List[float]]]) -> Set[str]:
+        """Apply the deltas to the stored views, returning the views that moved"""
+        changed_views = set()
+
+        totals = self.totals.setdefault(module, [0.0, 0])
+        total_delta = deltas['totals'].get('')
+        if total_delta is not None and (total_delta[0] or total_delta[1]):
+            totals[0] += total_delta[0]
+            totals[1] += total_delta[1]
+            if totals[1] == 0:
+                totals[0] = 0.0
+            changed_views.add('totals')
+
+        module_buckets = self.buckets.setdefault(module, {view: {} for view in self.bucket_views})
+        for view in self.bucket_views:
+            buckets = module_buckets[view]
+            for key, (value, count) in deltas[view].items():
+                if not value and not count:
+                    continue
+                bucket = buckets.setdefault(key, [0.0, 0])
+                bucket[0] += value
+                bucket[1] += count
+                if bucket[1] <= 0:
+                    del buckets[key]
+                changed_views.add(view)
+
+        return changed_views
+
+
+_aggregate_stores = weakref.WeakKeyDictionary()
+_aggregate_stores_lock = threading.Lock()
+
+
+def get_aggregate_store(data_manager) -> AggregateStore:
+    """Get the shared aggregate store for a DataManager"""
+    with _aggregate_stores_lock:
+        store = _aggregate_stores.get(data_manager)
+        if store is None:
+            store = AggregateStore(data_manager)
+            _aggregate_stores[data_manager] = store
+        return store
@@ -0,0 +1,113 @@
+"""
+Columnar Snapshots Module
+Binary Arrow (Feather) sidecars that let the DataManager skip CSV parsing
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+# pyarrow is optional - without it the DataManager simply parses the CSV files
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ipc = None
+    feather = None
+    PYARROW_AVAILABLE = False
+
+
+class ColumnarSnapshotStore:
+    """Feather sidecar snapshots of parsed module files
+
+    A snapshot holds a file's frame after parsing and date conversion, so
+    dtypes are already resolved, and records the storage signature it was
+    built from. It is only used while that signature still matches. Files
+    are written uncompressed and memory-mapped on read, so asking for a
+    subset of columns only converts those columns.
+    """
+
+    snapshot_dir_name = ".snapshots"
+    snapshot_suffix = ".feather"
+    signature_key = b"traqify_source_signature"
+
+    def __init__(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def is_available(self) -> bool:
+        """Check if pyarrow is installed"""
+        return PYARROW_AVAILABLE
+
+    def get_snapshot_path(self, file_path: Path) -> Path:
+        """Get the sidecar path for a data file"""
+        return file_path.parent / self.snapshot_dir_name / (file_path.name + self.snapshot_suffix)
+
+    def read(self, file_path: Path, signature: Optional[tuple],
+             columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Load the snapshot if it was built from the given signature"""
+        if not PYARROW_AVAILABLE or signature is None:
+            return None
+
+        snapshot_path = self.get_snapshot_path(file_path)
+        if not snapshot_path.exists():
+            return None
+
+        try:
+            with pa.memory_map(str(snapshot_path), 'r') as source:
+                reader = ipc.open_file(source)
+                metadata = reader.schema.metadata or {}
+                if metadata.get(self.signature_key) != self._encode_signature(signature):
+                    return None
+
+                table = reader.read_all()
+                if columns is not None:
+                    table = table.select([col for col in table.column_names if col in columns])
+                return table.to_pandas()
+
+        except (pa.ArrowException, OSError, ValueError) as e:
+            self.logger.debug(f"Ignoring unreadable snapshot {snapshot_path}: {e}")
+            return None
+
+    def write(self, file_path: Path, signature: Optional[tuple], df: pd.DataFrame) -> bool:
+        """Write a snapshot of a parsed frame"""
+        if not PYARROW_AVAILABLE or signature is None:
+            return False
+
+        snapshot_path = self.get_snapshot_path(file_path)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[self.signature_key] = self._encode_signature(signature)
+            table = table.replace_schema_metadata(metadata)
+
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = snapshot_path.with_suffix('.tmp')
+            feather.write_feather(table, str(temp_path), compression='uncompressed')
+            os.replace(temp_path, snapshot_path)
+            return True
+
+        except (pa.ArrowException, OSError, ValueError, TypeError) as e:
+            # Mixed-type object columns cannot be stored; keep parsing the CSV
+            self.logger.debug(f"Could not write snapshot for {file_path}: {e}")
+            return False
+
+    def remove(self, file_path: Path):
+        """Delete the snapshot for a data file"""
+        try:
+            self.get_snapshot_path(file_path).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.debug(f"Could not remove snapshot for {file_path}: {e}")
+
+    @staticmethod
+    def _encode_signature(signature: tuple) -> bytes:
+        """Encode a storage signature for the schema metadata"""
+        return json.dumps(signature, default=str).encode('utf-8')
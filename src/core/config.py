@@ -24,6 +24,8 @@ class AppConfig:
     backup_directory: str = "backups"
     auto_save_interval: int = 300  # seconds
     max_backup_files: int = 10
+    storage_backend: str = "csv"  # "csv", "journal" or "sqlite"
+    columnar_snapshots: bool = True  # Binary sidecars for faster loading (needs pyarrow)
     
     # UI settings
     theme: str = "dark"  # "light" or "dark"
@@ -32,6 +34,8 @@ class AppConfig:
     window_width: int = 1400
     window_height: int = 900
     remember_window_state: bool = True
+    lazy_module_pages: bool = True  # Build module pages when first opened
+    prefetch_module_count: int = 2  # Most-used modules built while idle after startup
     
     # Module settings
     default_currency: str = "₹"
@@ -139,6 +143,8 @@ class AppConfig:
                             validated[field_name] = default_value
                         elif field_name == 'max_backup_files' and validated[field_name] < 1:
                             validated[field_name] = default_value
+                        elif field_name == 'prefetch_module_count' and validated[field_name] < 0:
+                            validated[field_name] = default_value
                     except (ValueError, TypeError):
                         validated[field_name] = default_value
                 elif isinstance(default_value, float):
@@ -154,6 +160,8 @@ class AppConfig:
                     # Validate specific string fields
                     if field_name == 'theme' and validated[field_name] not in ['light', 'dark']:
                         validated[field_name] = default_value
+                    elif field_name == 'storage_backend' and validated[field_name] not in ['csv', 'journal', 'sqlite']:
+                        validated[field_name] = default_value
                 elif isinstance(default_value, (list, dict)):
                     validated[field_name] = value if isinstance(value, type(default_value)) else default_value
                 else:
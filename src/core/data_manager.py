@@ -11,11 +11,25 @@ import logging
 import shutil
 import threading
 import pandas as pd
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, date
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Union
 from PySide6.QtCore import QObject, Signal
 
+from .storage_backends import CSVStorageBackend, SQLiteStorageBackend, create_storage_backend
+from .columnar_snapshots import ColumnarSnapshotStore
+
+
+def _copy_on_write_enabled() -> bool:
+    """Check if pandas copy-on-write makes shallow copies safe to share"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except (KeyError, pd.errors.OptionError):
+        return False
+
 
 class DataManager(QObject):
     """Manages all data operations for the application"""
@@ -24,7 +38,8 @@ class DataManager(QObject):
     data_changed = Signal(str, str)  # module, operation
     error_occurred = Signal(str)     # error message
     
-    def __init__(self, data_directory: str = "data"):
+    def __init__(self, data_directory: str = "data", storage_backend: str = "csv",
+                 columnar_snapshots: bool = True):
         super().__init__()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.logger.info(f"Initializing DataManager with directory: {data_directory}")
@@ -35,10 +50,47 @@ class DataManager(QObject):
         self.ensure_directories()
         self._auto_save_enabled = True
 
+        # Pluggable file storage engine
+        try:
+            self._storage = create_storage_backend(storage_backend, self.data_dir)
+        except (ValueError, OSError) as e:
+            self.logger.warning(f"{e}, falling back to CSV storage")
+            self._storage = CSVStorageBackend(self.data_dir)
+        self.logger.info(f"Using {self._storage.name} storage backend")
+
+        # One-shot migration of existing CSV files into the database
+        if isinstance(self._storage, SQLiteStorageBackend):
+            self._storage.import_csv_files()
+
+        # Binary sidecars with resolved dtypes (needs pyarrow; SQLite is already typed)
+        self._snapshots = None
+        if columnar_snapshots and not self._storage.supports_queries:
+            snapshot_store = ColumnarSnapshotStore()
+            if snapshot_store.is_available():
+                self._snapshots = snapshot_store
+            else:
+                self.logger.debug("pyarrow not installed, columnar snapshots disabled")
+
         # Firebase sync integration
         self.sync_engine = None
         self._sync_enabled = False
 
+        # Shared frame cache keyed by (module, filename) and validated by the
+        # storage signature (file mtime/size, journal state or table version)
+        self._frame_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._copy_on_write = _copy_on_write_enabled()
+
+        # Open transactions keyed by (module, thread id); each buffers the
+        # frames written inside it and the operations it coalesces
+        self._transactions: Dict[tuple, Dict[str, Any]] = {}
+
+        # Module callbacks that fold their own pending-write logs into the
+        # CSV files, run by compact_storage
+        self._compaction_hooks: Dict[str, List[Callable[[Path], Any]]] = {}
+
         # Sync coordination to prevent overlapping operations
         self._pending_syncs = set()  # Track modules with pending sync operations
         self._active_syncs = set()   # Track modules currently being synced
@@ -71,37 +123,66 @@ class DataManager(QObject):
     
     def file_exists(self, module: str, filename: str) -> bool:
         """Check if a data file exists"""
-        return self.get_file_path(module, filename).exists()
+        return self._storage.exists(self.get_file_path(module, filename))
     
     def read_csv(self, module: str, filename: str,
-                 default_columns: Optional[List[str]] = None) -> pd.DataFrame:
-        """Read CSV file and return DataFrame with enhanced error handling"""
+                 default_columns: Optional[List[str]] = None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read CSV file and return DataFrame with enhanced error handling
+
+        Pass ``columns`` to load only those columns; with a columnar snapshot
+        the other columns are never materialized.
+        """
+        if columns is not None and default_columns:
+            default_columns = [col for col in default_columns if col in columns]
+
         try:
             file_path = self.get_file_path(module, filename)
 
-            if file_path.exists() and file_path.stat().st_size > 0:
-                # File exists and is not empty
+            # Inside a transaction, serve the buffered frame so reads see earlier writes
+            transaction = self._get_transaction(module)
+            if transaction is not None and filename in transaction['frames']:
+                df = self._share_frame(transaction['frames'][filename])
+                return self._add_missing_columns(self._select_columns(df, columns),
+                                                 module, filename, default_columns)
+
+            # Serve from the shared cache while the stored data is unchanged
+            signature = self._storage.signature(file_path)
+            df = self._get_cached_frame(module, filename, signature)
+            if df is not None:
+                return self._add_missing_columns(self._select_columns(df, columns),
+                                                 module, filename, default_columns)
+
+            # Then from the binary snapshot, which skips CSV and date parsing
+            if self._snapshots is not None:
+                df = self._snapshots.read(file_path, signature, columns)
+                if df is not None and not df.empty:
+                    if columns is None:
+                        df = self._put_cached_frame(module, filename, signature, df)
+                    return self._add_missing_columns(df, module, filename, default_columns)
+
+            if self._storage.exists(file_path):
+                # File exists, load it through the storage backend
                 try:
-                    df = pd.read_csv(file_path, encoding='utf-8')
+                    df = self._storage.read(file_path)
 
                     # Validate DataFrame
-                    if df.empty:
+                    if df is None or df.empty:
                         print(f"Warning: {module}/{filename} is empty")
                         return self._create_empty_dataframe(default_columns)
 
                     # Convert date columns safely
                     self._convert_date_columns(df)
 
-                    # Validate required columns if specified
-                    if default_columns:
-                        missing_cols = set(default_columns) - set(df.columns)
-                        if missing_cols:
-                            print(f"Warning: Missing columns in {module}/{filename}: {missing_cols}")
-                            # Add missing columns with default values
-                            for col in missing_cols:
-                                df[col] = None
+                    # Snapshot the parsed frame so the next cold load can skip parsing
+                    if self._snapshots is not None:
+                        self._snapshots.write(file_path, signature, df)
 
-                    return df
+                    # Keep the parsed frame and hand out a copy-on-write view
+                    df = self._put_cached_frame(module, filename, signature, df)
+
+                    return self._add_missing_columns(self._select_columns(df, columns),
+                                                     module, filename, default_columns)
 
                 except pd.errors.EmptyDataError:
                     print(f"Warning: {module}/{filename} is empty or corrupted")
@@ -141,6 +222,83 @@ class DataManager(QObject):
                 return df
             return pd.DataFrame()
 
+    def _add_missing_columns(self, df: pd.DataFrame, module: str, filename: str,
+                             default_columns: Optional[List[str]]) -> pd.DataFrame:
+        """Add any missing default columns with empty values"""
+        if default_columns:
+            missing_cols = set(default_columns) - set(df.columns)
+            if missing_cols:
+                print(f"Warning: Missing columns in {module}/{filename}: {missing_cols}")
+                # Add missing columns with default values
+                for col in missing_cols:
+                    df[col] = None
+        return df
+
+    @staticmethod
+    def _select_columns(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        """Narrow a frame to the requested columns that exist"""
+        if columns is None:
+            return df
+        return df[[col for col in df.columns if col in columns]]
+
+    def _share_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Copy a cached frame for a caller (shallow when copy-on-write is on)"""
+        return df.copy(deep=not self._copy_on_write)
+
+    def _get_cached_frame(self, module: str, filename: str,
+                          signature: Optional[tuple]) -> Optional[pd.DataFrame]:
+        """Return a copy of the cached frame if it is still current"""
+        if signature is None:
+            return None
+
+        with self._cache_lock:
+            entry = self._frame_cache.get((module, filename))
+            if entry is not None and entry["signature"] == signature:
+                self._cache_hits += 1
+                return self._share_frame(entry["frame"])
+            self._cache_misses += 1
+            return None
+
+    def _put_cached_frame(self, module: str, filename: str,
+                          signature: Optional[tuple], df: pd.DataFrame) -> pd.DataFrame:
+        """Cache a freshly parsed frame and return a copy for the caller"""
+        if signature is None:
+            return df
+
+        with self._cache_lock:
+            self._frame_cache[(module, filename)] = {"signature": signature, "frame": df}
+        return self._share_frame(df)
+
+    def invalidate_cache(self, module: Optional[str] = None, filename: Optional[str] = None):
+        """Drop cached frames for one file, one module or everything"""
+        with self._cache_lock:
+            if module is None:
+                self._frame_cache.clear()
+            elif filename is None:
+                for key in [key for key in self._frame_cache if key[0] == module]:
+                    del self._frame_cache[key]
+            else:
+                self._frame_cache.pop((module, filename), None)
+
+    def get_data_signature(self, module: str, filename: str) -> Optional[tuple]:
+        """Get a token that changes whenever the stored file changes
+
+        Models can key their own derived caches on it instead of using a TTL.
+        """
+        return self._storage.signature(self.get_file_path(module, filename))
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the shared frame cache"""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+                "entries": len(self._frame_cache),
+                "copy_on_write": self._copy_on_write
+            }
+
     def load_data(self, module: str, filename: str) -> Optional[pd.DataFrame]:
         """Load data from a CSV file for the specified module and filename
 
@@ -150,14 +308,10 @@ class DataManager(QObject):
         try:
             file_path = self.get_file_path(module, filename)
 
-            if not file_path.exists():
+            if not self._storage.exists(file_path):
                 self.logger.debug(f"File does not exist: {file_path}")
                 return None
 
-            if file_path.stat().st_size == 0:
-                self.logger.debug(f"File is empty: {file_path}")
-                return None
-
             # Use the existing read_csv method to load the data
             df = self.read_csv(module, filename)
 
@@ -191,6 +345,18 @@ class DataManager(QObject):
     
     def write_csv(self, module: str, filename: str, data: pd.DataFrame):
         """Write DataFrame to CSV file with backup and recovery"""
+        transaction = self._get_transaction(module)
+        if transaction is not None:
+            # Buffer the frame; the transaction writes it once on commit
+            transaction['frames'][filename] = data.copy()
+            transaction['operations'].append("write")
+            return
+
+        if self._write_file(module, filename, data) and self._auto_save_enabled:
+            self._notify_data_changed(module, "write")
+
+    def _write_file(self, module: str, filename: str, data: pd.DataFrame) -> bool:
+        """Back up and atomically replace a stored file"""
         try:
             file_path = self.get_file_path(module, filename)
             file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -204,25 +370,12 @@ class DataManager(QObject):
             df_copy = data.copy()
             self._prepare_for_csv(df_copy)
 
-            # Write to temporary file first
-            temp_path = file_path.with_suffix('.tmp')
-            df_copy.to_csv(temp_path, index=False, encoding='utf-8')
-
-            # Verify the temporary file was written correctly
-            if temp_path.exists() and temp_path.stat().st_size > 0:
-                # Replace original file with temporary file
-                if file_path.exists():
-                    file_path.unlink()
-                temp_path.rename(file_path)
+            # Atomically replace the stored file
+            self.invalidate_cache(module, filename)
+            self._storage.write(file_path, df_copy)
 
-                self.logger.debug(f"Successfully wrote {len(data)} rows to {module}/{filename}")
-
-                if self._auto_save_enabled:
-                    self.data_changed.emit(module, "write")
-                    # Trigger sync if enabled
-                    self.trigger_sync_for_module(module)
-            else:
-                raise Exception("Temporary file was not created properly")
+            self.logger.debug(f"Successfully wrote {len(data)} rows to {module}/{filename}")
+            return True
 
         except Exception as e:
             error_msg = f"Error writing {module}/{filename}: {str(e)}"
@@ -231,8 +384,70 @@ class DataManager(QObject):
             # Try to restore from backup if write failed
             if backup_created:
                 self._restore_from_backup(file_path)
+            self.invalidate_cache(module, filename)
 
             self.error_occurred.emit(error_msg)
+            return False
+
+    @contextmanager
+    def transaction(self, module: str):
+        """Batch the writes to a module into one write per file
+
+        Inside the block, row operations and write_csv calls for the module
+        are applied to in-memory frames and reads return them. On exit each
+        touched file is backed up and written once, followed by a single
+        data_changed signal and a single sync. If the block raises, the
+        buffered changes are discarded. Nested blocks join the outer one.
+
+            with data_manager.transaction('expenses'):
+                for row in rows:
+                    data_manager.append_row('expenses', 'expenses.csv', row, columns)
+        """
+        key = (module, threading.get_ident())
+        if key in self._transactions:
+            yield
+            return
+
+        transaction = {'frames': {}, 'operations': []}
+        self._transactions[key] = transaction
+        try:
+            yield
+        except Exception:
+            self._transactions.pop(key, None)
+            self.logger.warning(f"Rolled back transaction for {module}")
+            raise
+
+        self._transactions.pop(key, None)
+        self._commit_transaction(module, transaction)
+
+    def _get_transaction(self, module: str) -> Optional[Dict[str, Any]]:
+        """Get the transaction the current thread has open for a module"""
+        return self._transactions.get((module, threading.get_ident()))
+
+    def _commit_transaction(self, module: str, transaction: Dict[str, Any]):
+        """Write the buffered frames of a transaction and notify once"""
+        written = 0
+        for filename, data in transaction['frames'].items():
+            if self._write_file(module, filename, data):
+                written += 1
+
+        self.logger.debug(f"Committed transaction for {module}: {written} file(s), "
+                          f"{len(transaction['operations'])} operation(s)")
+
+        if transaction['operations'] and self._auto_save_enabled:
+            self.data_changed.emit(module, "transaction")
+            self.trigger_sync_for_module(module)
+
+    def _notify_data_changed(self, module: str, operation: str):
+        """Emit data_changed and schedule a sync, deferring both inside a transaction"""
+        transaction = self._get_transaction(module)
+        if transaction is not None:
+            transaction['operations'].append(operation)
+            return
+
+        self.data_changed.emit(module, operation)
+        # Trigger sync if enabled
+        self.trigger_sync_for_module(module)
 
     def _create_file_backup(self, file_path: Path) -> bool:
         """Create a backup of the file"""
@@ -308,7 +523,15 @@ class DataManager(QObject):
                 self.error_occurred.emit("Invalid row data provided")
                 return False
 
-            df = self.read_csv(module, filename, default_columns)
+            file_path = self.get_file_path(module, filename)
+            use_row_operations = self._uses_row_operations(module)
+            if use_row_operations:
+                # Only the ids are needed, so avoid loading the whole file
+                df = self._storage.read(file_path, copy=False, columns=['id'])
+                if df is None:
+                    df = self._create_empty_dataframe(default_columns)
+            else:
+                df = self.read_csv(module, filename, default_columns)
 
             # Add ID if not present or invalid
             if 'id' not in row_data or pd.isna(row_data['id']) or row_data['id'] == '' or row_data['id'] is None:
@@ -330,18 +553,29 @@ class DataManager(QObject):
             # Clean data - remove None values and convert to appropriate types
             cleaned_data = self._clean_row_data(row_data, default_columns)
 
-            # Create new row DataFrame
-            new_row = pd.DataFrame([cleaned_data])
+            if use_row_operations:
+                # Keep the file's column order for rows that start a new file
+                if default_columns:
+                    cleaned_data = {
+                        **{col: cleaned_data[col] for col in default_columns if col in cleaned_data},
+                        **cleaned_data
+                    }
+
+                # Journal the new row instead of rewriting the file
+                self._storage.append_row(file_path, cleaned_data)
+                self.invalidate_cache(module, filename)
+                self._compact_if_needed(file_path)
+            else:
+                # Create new row DataFrame
+                new_row = pd.DataFrame([cleaned_data])
 
-            # Concatenate with existing data
-            df = pd.concat([df, new_row], ignore_index=True)
+                # Concatenate with existing data
+                df = pd.concat([df, new_row], ignore_index=True)
 
-            # Write back to file
-            self.write_csv(module, filename, df)
+                # Write back to file
+                self.write_csv(module, filename, df)
 
-            self.data_changed.emit(module, "append")
-            # Trigger sync if enabled
-            self.trigger_sync_for_module(module)
+            self._notify_data_changed(module, "append")
             return True
 
         except Exception as e:
@@ -349,6 +583,10 @@ class DataManager(QObject):
             self.error_occurred.emit(f"Error appending to {module}/{filename}: {str(e)}")
             return False
     
+    def _uses_row_operations(self, module: str) -> bool:
+        """Check if row changes go straight to the backend rather than a full rewrite"""
+        return self._storage.supports_row_operations and self._get_transaction(module) is None
+
     def update_row(self, module: str, filename: str, row_id: Union[int, str],
                    update_data: Dict[str, Any], id_column: str = 'id') -> bool:
         """Update a specific row in CSV file"""
@@ -358,9 +596,14 @@ class DataManager(QObject):
                 self.error_occurred.emit(f"Invalid {id_column} provided: {row_id}")
                 return False
 
-            df = self.read_csv(module, filename)
+            file_path = self.get_file_path(module, filename)
+            use_row_operations = self._uses_row_operations(module)
+            if use_row_operations:
+                df = self._storage.read(file_path, copy=False, columns=[id_column])
+            else:
+                df = self.read_csv(module, filename)
 
-            if df.empty:
+            if df is None or df.empty:
                 return False
 
             # Convert row_id to appropriate type for comparison
@@ -379,24 +622,28 @@ class DataManager(QObject):
             if not mask.any():
                 self.error_occurred.emit(f"Row with {id_column}={row_id} not found")
                 return False
+
+            if use_row_operations:
+                # Journal the changed values instead of rewriting the file
+                self._storage.update_row(file_path, id_column, row_id, update_data)
+                self.invalidate_cache(module, filename)
+                self._compact_if_needed(file_path)
+            else:
+                # Update the row with proper dtype handling
+                for column, value in update_data.items():
+                    if column in df.columns:
+                        # Handle dtype compatibility for numeric columns
+                        if df[column].dtype in ['float64', 'int64'] and value == '':
+                            # Convert empty string to NaN for numeric columns
+                            import numpy as np
+                            df.loc[mask, column] = np.nan
+                        else:
+                            df.loc[mask, column] = value
+
+                # Write back to file
+                self.write_csv(module, filename, df)
             
-            # Update the row with proper dtype handling
-            for column, value in update_data.items():
-                if column in df.columns:
-                    # Handle dtype compatibility for numeric columns
-                    if df[column].dtype in ['float64', 'int64'] and value == '':
-                        # Convert empty string to NaN for numeric columns
-                        import numpy as np
-                        df.loc[mask, column] = np.nan
-                    else:
-                        df.loc[mask, column] = value
-            
-            # Write back to file
-            self.write_csv(module, filename, df)
-            
-            self.data_changed.emit(module, "update")
-            # Trigger sync if enabled
-            self.trigger_sync_for_module(module)
+            self._notify_data_changed(module, "update")
             return True
             
         except Exception as e:
@@ -416,9 +663,14 @@ class DataManager(QObject):
                 self.error_occurred.emit(f"Invalid {id_column} provided for deletion: {row_id}")
                 return False
 
-            df = self.read_csv(module, filename)
+            file_path = self.get_file_path(module, filename)
+            use_row_operations = self._uses_row_operations(module)
+            if use_row_operations:
+                df = self._storage.read(file_path, copy=False, columns=[id_column])
+            else:
+                df = self.read_csv(module, filename)
 
-            if df.empty:
+            if df is None or df.empty:
                 return False
 
             # Convert row_id to appropriate type for comparison
@@ -436,15 +688,19 @@ class DataManager(QObject):
                 self.error_occurred.emit(f"Row with {id_column}={row_id} not found for deletion")
                 return False
 
-            # Remove the row
-            df = df[df[id_column] != row_id]
-            
-            # Write back to file
-            self.write_csv(module, filename, df)
+            if use_row_operations:
+                # Journal a tombstone instead of rewriting the file
+                self._storage.delete_row(file_path, id_column, row_id)
+                self.invalidate_cache(module, filename)
+                self._compact_if_needed(file_path)
+            else:
+                # Remove the row
+                df = df[df[id_column] != row_id]
+
+                # Write back to file
+                self.write_csv(module, filename, df)
             
-            self.data_changed.emit(module, "delete")
-            # Trigger sync if enabled
-            self.trigger_sync_for_module(module)
+            self._notify_data_changed(module, "delete")
             return True
             
         except Exception as e:
@@ -478,6 +734,56 @@ class DataManager(QObject):
             self.error_occurred.emit(f"Error searching {module}/{filename}: {str(e)}")
             return pd.DataFrame()
     
+    @property
+    def supports_indexed_queries(self) -> bool:
+        """Whether query_csv runs as an indexed query in the storage backend"""
+        return self._storage.supports_queries
+
+    def query_csv(self, module: str, filename: str,
+                  filters: Optional[Dict[str, Any]] = None,
+                  date_range: Optional[tuple] = None, date_column: str = 'date',
+                  default_columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get the rows matching equality filters and an inclusive date range
+
+        With the SQLite backend this is an indexed query; other backends read
+        the file and filter the DataFrame. Filters on missing columns are ignored.
+        """
+        try:
+            if not self._storage.supports_queries:
+                df = self.read_csv(module, filename, default_columns)
+                if df.empty:
+                    return df
+
+                mask = pd.Series(True, index=df.index)
+                for column, value in (filters or {}).items():
+                    if column in df.columns:
+                        mask &= df[column] == value
+                if date_range and date_column in df.columns:
+                    dates = pd.to_datetime(df[date_column], errors='coerce')
+                    start, end = date_range
+                    if start is not None:
+                        mask &= dates >= pd.Timestamp(start)
+                    if end is not None:
+                        mask &= dates <= pd.Timestamp(end)
+                return df[mask]
+
+            file_path = self.get_file_path(module, filename)
+            df = self._storage.query(file_path, filters=filters, date_range=date_range,
+                                     date_column=date_column)
+            if df is None or df.empty:
+                return self._create_empty_dataframe(default_columns or (list(df.columns) if df is not None else None))
+
+            self._convert_date_columns(df)
+            if default_columns:
+                for col in set(default_columns) - set(df.columns):
+                    df[col] = None
+            return df
+
+        except Exception as e:
+            self.logger.error(f"Error querying {module}/{filename}: {e}")
+            self.error_occurred.emit(f"Error querying {module}/{filename}: {str(e)}")
+            return self._create_empty_dataframe(default_columns)
+
     def backup_data(self, backup_name: Optional[str] = None) -> bool:
         """Create a backup of all data"""
         try:
@@ -486,6 +792,9 @@ class DataManager(QObject):
             
             backup_dir = self.data_dir.parent / "backups" / backup_name
             backup_dir.mkdir(parents=True, exist_ok=True)
+
+            # Fold journals into the CSV files so the backup is self-contained
+            self.compact_storage()
             
             # Copy all data files
             shutil.copytree(self.data_dir, backup_dir / "data", dirs_exist_ok=True)
@@ -506,6 +815,66 @@ class DataManager(QObject):
             self.error_occurred.emit(f"Error creating backup: {str(e)}")
             return False
 
+    def compact_storage(self, module: Optional[str] = None) -> int:
+        """Fold pending journal operations (or database changes) into the CSV files
+
+        Compacts a single module, or every module when none is given, after
+        running the compaction hooks registered for it. Returns the number
+        of journaled files compacted.
+        """
+        module_dirs = [self.data_dir / module] if module else [
+            path for path in self.data_dir.iterdir() if path.is_dir()
+        ]
+
+        compacted = 0
+        for module_dir in module_dirs:
+            if not module_dir.exists():
+                continue
+            for hook in self._compaction_hooks.get(module_dir.name, ()):
+                try:
+                    hook(module_dir)
+                except Exception as e:
+                    self.logger.error(f"Compaction hook failed for {module_dir.name}: {e}")
+            if not self._storage.supports_row_operations:
+                continue
+            for file_path in self._storage.pending_files(module_dir):
+                if self._compact_file(file_path):
+                    compacted += 1
+
+        if compacted:
+            self.logger.info(f"Compacted {compacted} journaled file(s)")
+        return compacted
+
+    def register_compaction_hook(self, module: str, hook: Callable[[Path], Any]):
+        """Have compact_storage call ``hook(module_dir)`` for a module
+
+        For modules that buffer saves outside the storage backend, so sync
+        and backups never read a CSV missing them. Registering the same hook
+        twice has no effect.
+        """
+        hooks = self._compaction_hooks.setdefault(module, [])
+        if hook not in hooks:
+            hooks.append(hook)
+
+    def _compact_if_needed(self, file_path: Path):
+        """Compact a file once its journal grows past the threshold"""
+        if self._storage.needs_compaction(file_path):
+            self._compact_file(file_path)
+
+    def _compact_file(self, file_path: Path) -> bool:
+        """Compact one journaled file, keeping a backup of the old snapshot
+
+        The folded rows are formatted like a full rewrite through _write_file,
+        so dates end up as YYYY-MM-DD whichever backend is in use.
+        """
+        try:
+            if file_path.exists():
+                self._create_file_backup(file_path)
+            return self._storage.compact(file_path, prepare=self._format_for_csv)
+        except Exception as e:
+            self.logger.error(f"Failed to compact {file_path}: {e}")
+            return False
+
     def set_sync_engine(self, sync_engine):
         """Set the Firebase sync engine"""
         self.sync_engine = sync_engine
@@ -669,8 +1038,18 @@ class DataManager(QObject):
         
         for col in date_columns:
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-    
+                converted = pd.to_datetime(df[col], errors='coerce')
+                # Rows appended through the journal can use a different format than
+                # the rest of the file, which the inferred format turns into NaT
+                if converted.isna().sum() > df[col].isna().sum() + (df[col] == '').sum():
+                    converted = pd.to_datetime(df[col], errors='coerce', format='mixed')
+                df[col] = converted
+
+    def _format_for_csv(self, df: pd.DataFrame):
+        """Parse date columns and format the frame as _write_file stores it"""
+        self._convert_date_columns(df)
+        self._prepare_for_csv(df)
+
     def _prepare_for_csv(self, df: pd.DataFrame):
         """Prepare DataFrame for CSV storage"""
         for col in df.columns:
@@ -810,7 +1189,9 @@ class DataManager(QObject):
             }
             
             for file_path in module_dir.glob("*.csv"):
-                df = pd.read_csv(file_path)
+                df = self._storage.read(file_path)
+                if df is None:
+                    df = pd.DataFrame()
                 file_info = {
                     "name": file_path.name,
                     "records": len(df),
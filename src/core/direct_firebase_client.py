@@ -9,6 +9,7 @@ import json
 import logging
 import requests
 import sys
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -30,7 +31,10 @@ except ImportError:
 
 class DirectFirebaseClient:
     """Direct Firebase client with multiple authentication methods"""
-    
+
+    # Keep-alive connections kept open per host for concurrent sync workers
+    max_pooled_connections = 8
+
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
@@ -56,6 +60,10 @@ class DirectFirebaseClient:
         self.session_file = app_root / "data" / "config" / "firebase_session.json"
         self.remember_session = True
 
+        # One pooled keep-alive session for all REST calls, so repeated
+        # requests to the database reuse their TLS connections
+        self.session = self._create_session()
+
         # Firebase clients
         self.pyrebase_app = None
         self.admin_app = None
@@ -130,6 +138,14 @@ class DirectFirebaseClient:
             self.logger.error(f"Error loading Firebase config: {e}")
             return {}
     
+    def _create_session(self) -> requests.Session:
+        """Create the pooled HTTP session used for REST calls"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_pooled_connections)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def _initialize_clients(self):
         """Initialize Firebase clients"""
         try:
@@ -220,7 +236,7 @@ class DirectFirebaseClient:
                 "returnSecureToken": True
             }
 
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -259,14 +275,9 @@ class DirectFirebaseClient:
         try:
             if not self.is_authenticated():
                 return False, "User not authenticated"
-            
-            # Clean filename (remove .csv extension)
-            clean_filename = filename.replace('.csv', '')
-            
-            # Construct path
-            user_id = self.current_user.get('localId', 'unknown')
-            path = f"users/{user_id}/data/{module}/{clean_filename}"
-            
+
+            path = self._get_data_path(module, filename)
+
             # Try different upload methods
             success, message = self._upload_with_pyrebase(path, data)
             if success:
@@ -288,14 +299,9 @@ class DirectFirebaseClient:
         try:
             if not self.is_authenticated():
                 return False, None, "User not authenticated"
-            
-            # Clean filename (remove .csv extension)
-            clean_filename = filename.replace('.csv', '')
-            
-            # Construct path
-            user_id = self.current_user.get('localId', 'unknown')
-            path = f"users/{user_id}/data/{module}/{clean_filename}"
-            
+
+            path = self._get_data_path(module, filename)
+
             # Try different download methods
             success, data, message = self._download_with_pyrebase(path)
             if success:
@@ -312,7 +318,127 @@ class DirectFirebaseClient:
             self.logger.error(error_msg)
             return False, None, error_msg
 
-    def _upload_with_pyrebase(self, path: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    def patch_data(self, module: str, filename: str, updates: Dict[str, Any],
+                   sync_version: Optional[int] = None) -> Tuple[bool, str]:
+        """Apply a multi-path update under a file's node
+
+        Keys are paths relative to the file node (e.g. ``records/12`` or
+        ``metadata/version``); a None value deletes that child. When
+        ``sync_version`` is given, the file's entry in the version index is
+        updated in the same request.
+        """
+        try:
+            if not self.is_authenticated():
+                return False, "User not authenticated"
+
+            clean_filename = filename.replace('.csv', '')
+            path = self._get_user_path()
+            updates = {f"data/{module}/{clean_filename}/{key}": value for key, value in updates.items()}
+            if sync_version is not None:
+                updates[f"sync_versions/{self.get_version_key(module, filename)}"] = sync_version
+
+            # Try different update methods
+            success, message = self._patch_with_pyrebase(path, updates)
+            if success:
+                return True, message
+
+            success, message = self._patch_with_rest_api(path, updates)
+            if success:
+                return True, message
+
+            return False, "All update methods failed"
+
+        except Exception as e:
+            error_msg = f"Update error: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg
+
+    def set_sync_version(self, module: str, filename: str, version: int) -> Tuple[bool, str]:
+        """Record a file's version in the version index"""
+        try:
+            if not self.is_authenticated():
+                return False, "User not authenticated"
+
+            path = f"{self._get_user_path()}/sync_versions/{self.get_version_key(module, filename)}"
+
+            success, message = self._upload_with_pyrebase(path, version)
+            if success:
+                return True, message
+
+            return self._upload_with_rest_api(path, version)
+
+        except Exception as e:
+            error_msg = f"Version update error: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg
+
+    def download_sync_versions(self) -> Tuple[bool, Optional[Dict], str]:
+        """Download the version of every synced file in one shallow read
+
+        The index maps ``module:file`` keys to version numbers, so a shallow
+        query returns all of them without any record data.
+        """
+        try:
+            if not self.is_authenticated():
+                return False, None, "User not authenticated"
+
+            path = f"{self._get_user_path()}/sync_versions"
+
+            success, data, message = self._download_with_pyrebase(path, shallow=True)
+            if success:
+                return True, data, message
+
+            success, data, message = self._download_with_rest_api(path, shallow=True)
+            if success:
+                return True, data, message
+
+            return False, None, message
+
+        except Exception as e:
+            error_msg = f"Version index download error: {str(e)}"
+            self.logger.error(error_msg)
+            return False, None, error_msg
+
+    @staticmethod
+    def get_version_key(module: str, filename: str) -> str:
+        """Key of a file in the version index"""
+        return f"{module}:{filename.replace('.csv', '')}"
+
+    def download_metadata(self, module: str, filename: str) -> Tuple[bool, Optional[Dict], str]:
+        """Download only the metadata node of a file"""
+        try:
+            if not self.is_authenticated():
+                return False, None, "User not authenticated"
+
+            path = f"{self._get_data_path(module, filename)}/metadata"
+
+            success, data, message = self._download_with_pyrebase(path)
+            if success:
+                return True, data, message
+
+            success, data, message = self._download_with_rest_api(path)
+            if success:
+                return True, data, message
+
+            return False, None, message
+
+        except Exception as e:
+            error_msg = f"Metadata download error: {str(e)}"
+            self.logger.error(error_msg)
+            return False, None, error_msg
+
+    def _get_user_path(self) -> str:
+        """Get the database path of the current user"""
+        user_id = self.current_user.get('localId', 'unknown')
+        return f"users/{user_id}"
+
+    def _get_data_path(self, module: str, filename: str) -> str:
+        """Get the database path of a module file for the current user"""
+        # Clean filename (remove .csv extension)
+        clean_filename = filename.replace('.csv', '')
+        return f"{self._get_user_path()}/data/{module}/{clean_filename}"
+
+    def _upload_with_pyrebase(self, path: str, data: Any) -> Tuple[bool, str]:
         """Upload data using Pyrebase"""
         try:
             if not self.database_client or not self.id_token:
@@ -327,7 +453,7 @@ class DirectFirebaseClient:
             self.logger.warning(f"Pyrebase upload failed: {e}")
             return False, str(e)
 
-    def _upload_with_rest_api(self, path: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    def _upload_with_rest_api(self, path: str, data: Any) -> Tuple[bool, str]:
         """Upload data using REST API"""
         try:
             if not self.id_token:
@@ -336,7 +462,7 @@ class DirectFirebaseClient:
             url = f"{self.database_url}/{path}.json"
             headers = {'Authorization': f'Bearer {self.id_token}'}
 
-            response = requests.put(url, json=data, headers=headers, timeout=30)
+            response = self.session.put(url, json=data, headers=headers, timeout=30)
 
             if response.status_code == 200:
                 self.logger.info(f"Successfully uploaded data via REST API to: {path}")
@@ -350,14 +476,54 @@ class DirectFirebaseClient:
             self.logger.warning(f"REST API upload failed: {e}")
             return False, str(e)
 
-    def _download_with_pyrebase(self, path: str) -> Tuple[bool, Optional[Dict], str]:
+    def _patch_with_pyrebase(self, path: str, updates: Dict[str, Any]) -> Tuple[bool, str]:
+        """Apply a multi-path update using Pyrebase"""
+        try:
+            if not self.database_client or not self.id_token:
+                return False, "Pyrebase client or token not available"
+
+            self.database_client.child(path).update(updates, self.id_token)
+            self.logger.info(f"Successfully updated {len(updates)} paths via Pyrebase under: {path}")
+            return True, "Data updated successfully via Pyrebase"
+
+        except Exception as e:
+            self.logger.warning(f"Pyrebase update failed: {e}")
+            return False, str(e)
+
+    def _patch_with_rest_api(self, path: str, updates: Dict[str, Any]) -> Tuple[bool, str]:
+        """Apply a multi-path update using REST API"""
+        try:
+            if not self.id_token:
+                return False, "Authentication token not available"
+
+            url = f"{self.database_url}/{path}.json"
+            headers = {'Authorization': f'Bearer {self.id_token}'}
+
+            response = self.session.patch(url, json=updates, headers=headers, timeout=30)
+
+            if response.status_code == 200:
+                self.logger.info(f"Successfully updated {len(updates)} paths via REST API under: {path}")
+                return True, "Data updated successfully via REST API"
+            else:
+                error_msg = f"REST API update failed: {response.status_code} - {response.text}"
+                self.logger.warning(error_msg)
+                return False, error_msg
+
+        except Exception as e:
+            self.logger.warning(f"REST API update failed: {e}")
+            return False, str(e)
+
+    def _download_with_pyrebase(self, path: str, shallow: bool = False) -> Tuple[bool, Optional[Dict], str]:
         """Download data using Pyrebase"""
         try:
             if not self.database_client or not self.id_token:
                 return False, None, "Pyrebase client or token not available"
 
             # Download data
-            data = self.database_client.child(path).get(self.id_token).val()
+            query = self.database_client.child(path)
+            if shallow:
+                query = query.shallow()
+            data = query.get(self.id_token).val()
 
             if data is None:
                 return False, None, "No data found"
@@ -369,7 +535,7 @@ class DirectFirebaseClient:
             self.logger.warning(f"Pyrebase download failed: {e}")
             return False, None, str(e)
 
-    def _download_with_rest_api(self, path: str) -> Tuple[bool, Optional[Dict], str]:
+    def _download_with_rest_api(self, path: str, shallow: bool = False) -> Tuple[bool, Optional[Dict], str]:
         """Download data using REST API"""
         try:
             if not self.id_token:
@@ -377,8 +543,9 @@ class DirectFirebaseClient:
 
             url = f"{self.database_url}/{path}.json"
             headers = {'Authorization': f'Bearer {self.id_token}'}
+            params = {'shallow': 'true'} if shallow else None
 
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
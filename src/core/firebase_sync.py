@@ -5,13 +5,15 @@ This module handles intelligent data synchronization between local storage
 and Firebase, minimizing read/write operations to stay within free tier limits.
 """
 
+import os
 import json
 import logging
 import hashlib
 from pathlib import Path
 from datetime import datetime, timezone, date
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Tuple
 from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 import pandas as pd
@@ -43,7 +45,26 @@ class SyncMetadata:
     remote_hash: str
     last_modified: str
     sync_count: int = 0
-    
+    # Stat fingerprint of the file when local_hash was computed
+    file_size: int = -1
+    file_mtime_ns: int = -1
+    file_inode: int = -1
+
+    def matches_stat(self, stat_result: os.stat_result) -> bool:
+        """Check if the file is unchanged since local_hash was computed"""
+        return (self.file_size == stat_result.st_size and
+                self.file_mtime_ns == stat_result.st_mtime_ns and
+                self.file_inode == stat_result.st_ino)
+
+    def set_stat(self, stat_result: Optional[os.stat_result]):
+        """Remember the stat fingerprint that local_hash belongs to"""
+        if stat_result is None:
+            self.file_size = self.file_mtime_ns = self.file_inode = -1
+        else:
+            self.file_size = stat_result.st_size
+            self.file_mtime_ns = stat_result.st_mtime_ns
+            self.file_inode = stat_result.st_ino
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
     
@@ -70,7 +91,13 @@ class FirebaseSyncEngine(QObject):
     sync_completed = Signal(bool, str)     # success, message
     sync_error = Signal(str)
     conflict_detected = Signal(str, str)   # module, filename
-    
+
+    # Modules synced in parallel by sync_all_data; files of one module stay sequential
+    max_sync_workers = 4
+
+    # Read size for hashing files
+    hash_chunk_size = 1024 * 1024
+
     def __init__(self, data_manager: DataManager):
         super().__init__()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -94,6 +121,13 @@ class FirebaseSyncEngine(QObject):
         self.metadata_file = Path("data/config/sync_metadata.json")
         self.sync_metadata: Dict[str, SyncMetadata] = {}
 
+        # Delta sync state per file: remote version counter, uploaded columns
+        # and a content hash per row id, so only changed rows are sent
+        self.delta_state_file = Path("data/config/sync_delta_state.json")
+        self.delta_state: Dict[str, Dict[str, Any]] = {}
+        self._metadata_lock = threading.Lock()
+        self._saved_metadata_text: Optional[str] = None
+
         # Sync coordination to prevent concurrent operations
         self._module_locks = set()  # Track modules currently being synced
         self._main_thread = threading.current_thread()  # Track main thread for safe signal emission
@@ -176,7 +210,7 @@ class FirebaseSyncEngine(QObject):
             self._emit_signal_safe(self.sync_progress, "Initializing database...", 0, len(self.syncable_modules) + 1)
 
             # Get detailed authentication status for debugging
-            auth_status = self.secure_client.get_session_status()
+            auth_status = self._get_auth_status()
             self.logger.info(f"Starting sync - Auth status: {auth_status}")
 
             # Try database initialization with retry logic
@@ -190,7 +224,10 @@ class FirebaseSyncEngine(QObject):
 
                     # Try to refresh authentication if needed
                     try:
-                        if hasattr(self.secure_client, 'refresh_token_if_needed'):
+                        if self.use_direct_firebase:
+                            self.firebase_client.refresh_auth_token()
+                            self.logger.info("Attempted token refresh")
+                        elif hasattr(self.secure_client, 'refresh_token_if_needed'):
                             self.secure_client.refresh_token_if_needed()
                             self.logger.info("Attempted token refresh")
                     except Exception as refresh_error:
@@ -210,20 +247,7 @@ class FirebaseSyncEngine(QObject):
                     self.logger.error(f"{error_msg}. Auth status: {auth_status}")
                     raise Exception(error_msg)
 
-            total_modules = len(self.syncable_modules)
-            synced_count = 0
-            errors = []
-
-            for module in self.syncable_modules:
-                self._emit_signal_safe(self.sync_progress, f"Syncing {module}...", synced_count, total_modules)
-
-                try:
-                    self.sync_module(module, force)
-                    synced_count += 1
-                except Exception as e:
-                    error_msg = f"Error syncing {module}: {str(e)}"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
+            synced_count, errors = self._sync_modules_concurrently(self.syncable_modules, force)
 
             # Update last sync time
             self.last_sync_time = datetime.now(timezone.utc)
@@ -245,8 +269,53 @@ class FirebaseSyncEngine(QObject):
         finally:
             self.status = SyncStatus.IDLE
     
-    def sync_module(self, module: str, force: bool = False):
-        """Sync a specific module with comprehensive error handling and concurrency protection"""
+    def _sync_modules_concurrently(self, modules: List[str], force: bool = False):
+        """Sync modules on a bounded worker pool
+
+        Each module is one task, so its files are still synced in order while
+        different modules overlap their network round trips. The HTTP session
+        of the Firebase client is shared, so workers reuse pooled connections.
+        Returns the number of synced modules and the error messages.
+        """
+        total_modules = len(modules)
+        synced_count = 0
+        errors = []
+        if not modules:
+            return synced_count, errors
+
+        self._emit_signal_safe(self.sync_progress, "Syncing modules...", 0, total_modules)
+
+        # One shallow read covers the remote state of every file
+        remote_versions = None if force else self.get_remote_versions()
+
+        max_workers = max(1, min(self.max_sync_workers, total_modules))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="firebase-sync") as executor:
+            futures = {
+                executor.submit(self.sync_module, module, force, remote_versions): module
+                for module in modules
+            }
+
+            for completed, future in enumerate(as_completed(futures), start=1):
+                module = futures[future]
+                try:
+                    future.result()
+                    synced_count += 1
+                except Exception as e:
+                    error_msg = f"Error syncing {module}: {str(e)}"
+                    self.logger.error(error_msg)
+                    errors.append(error_msg)
+
+                self._emit_signal_safe(self.sync_progress, f"Synced {module}", completed, total_modules)
+
+        return synced_count, errors
+
+    def sync_module(self, module: str, force: bool = False,
+                    remote_versions: Optional[Dict[str, int]] = None):
+        """Sync a specific module with comprehensive error handling and concurrency protection
+
+        ``remote_versions`` is the version index from get_remote_versions;
+        it is fetched here when not given.
+        """
         # Check if module is already being synced
         if module in self._module_locks:
             self.logger.debug(f"Module {module} is already being synced, skipping duplicate request")
@@ -261,6 +330,9 @@ class FirebaseSyncEngine(QObject):
                 self.logger.warning(f"Firebase sync not available for module: {module}")
                 return
 
+            # Fold journaled edits and module save logs into the CSV files before hashing them
+            self.data_manager.compact_storage(module)
+
             # Get all CSV files in the module directory
             module_path = self.data_manager.data_dir / module
             if not module_path.exists():
@@ -268,7 +340,7 @@ class FirebaseSyncEngine(QObject):
                 return
 
             try:
-                csv_files = list(module_path.glob("*.csv"))
+                csv_files = sorted(module_path.glob("*.csv"))
             except Exception as e:
                 self.logger.error(f"Error listing CSV files in {module_path}: {e}")
                 return
@@ -279,15 +351,21 @@ class FirebaseSyncEngine(QObject):
 
             self.logger.debug(f"Syncing {len(csv_files)} files for module: {module}")
 
+            if remote_versions is None and not force:
+                remote_versions = self.get_remote_versions()
+
             for csv_file in csv_files:
                 try:
                     filename = csv_file.name
-                    self.sync_file(module, filename, force)
+                    self.sync_file(module, filename, force, remote_versions)
                 except Exception as file_error:
                     self.logger.error(f"Error syncing file {csv_file.name} in module {module}: {file_error}")
                     # Continue with other files instead of failing completely
                     continue
 
+            # Keep the row hashes of background syncs across restarts
+            self.save_metadata()
+
         except Exception as e:
             self.logger.error(f"Critical error in sync_module for {module}: {e}")
             # Don't re-raise to prevent application crash
@@ -297,85 +375,70 @@ class FirebaseSyncEngine(QObject):
             self._module_locks.discard(module)
             self.logger.debug(f"Released sync lock for module: {module}")
     
-    def sync_file(self, module: str, filename: str, force: bool = False):
+    def sync_file(self, module: str, filename: str, force: bool = False,
+                  remote_versions: Optional[Dict[str, int]] = None):
         """Sync a specific file with comprehensive error handling"""
         file_key = f"{module}/{filename}"
 
         try:
             self.logger.debug(f"Starting sync for file: {module}/{filename}")
 
-            # Get current file state with error handling
+            # Get existing metadata
+            metadata = self.sync_metadata.get(file_key)
+            delta_state = self.delta_state.get(file_key)
+
+            # Get current file state; the content is only hashed when its stat changed
             try:
-                local_hash = self.get_file_hash(module, filename)
-                local_modified = self.get_file_modified_time(module, filename)
+                local_hash, local_modified, local_stat = self._get_local_state(module, filename, metadata)
             except Exception as hash_error:
                 self.logger.error(f"Error getting file state for {module}/{filename}: {hash_error}")
                 # Use empty values as fallback
                 local_hash = ""
                 local_modified = ""
-
-            # Get existing metadata
-            metadata = self.sync_metadata.get(file_key)
-
-            # Check if sync is needed
-            if not force and metadata:
-                try:
-                    if (metadata.local_hash == local_hash and
-                        metadata.last_modified == local_modified):
-                        # No local changes, check remote
-                        remote_hash = self.get_remote_hash(module, filename)
-                        if remote_hash == metadata.remote_hash:
-                            # No changes on either side
-                            self.logger.debug(f"No changes detected for {module}/{filename}, skipping sync")
-                            return
-                except Exception as metadata_error:
-                    self.logger.warning(f"Error checking metadata for {module}/{filename}: {metadata_error}")
-                    # Continue with sync as fallback
+                local_stat = None
 
             # Perform sync with error handling
             try:
-                if metadata is None or force:
+                if metadata is None or delta_state is None or force:
                     # First sync or forced sync - upload everything
                     self.logger.debug(f"Performing initial/forced sync for {module}/{filename}")
                     self.upload_file(module, filename)
                 else:
-                    # Intelligent sync - check for conflicts
-                    self.logger.debug(f"Performing intelligent sync for {module}/{filename}")
+                    local_changed = metadata.local_hash != local_hash
 
-                    try:
+                    # The version index tells us if another device pushed changes
+                    if remote_versions is not None:
+                        remote_version = remote_versions.get(
+                            self.firebase_client.get_version_key(module, filename), 0)
+                    else:
+                        remote_version = self.get_remote_version(module, filename)
+
+                    if remote_version is not None and remote_version != delta_state.get('version'):
+                        self.logger.info(f"Remote changes detected for {module}/{filename}, merging...")
                         remote_data = self.download_file(module, filename)
                         local_data = self.data_manager.read_csv(module, filename)
 
-                        if remote_data is not None and not local_data.empty:
-                            try:
-                                if not local_data.equals(remote_data):
-                                    # Conflict detected - use timestamp-based resolution
-                                    self.logger.info(f"Conflict detected for {module}/{filename}, resolving...")
-                                    self.resolve_conflict(module, filename, local_data, remote_data)
-                                else:
-                                    self.logger.debug(f"Data identical for {module}/{filename}, no sync needed")
-                            except Exception as compare_error:
-                                self.logger.warning(f"Error comparing data for {module}/{filename}: {compare_error}")
-                                # Upload local changes as fallback
-                                if not local_data.empty:
-                                    self.upload_file(module, filename)
-                        elif not local_data.empty:
-                            # Upload local changes
-                            self.logger.debug(f"Uploading local changes for {module}/{filename}")
+                        if remote_data is not None and not remote_data.empty and not local_data.empty:
+                            self.resolve_conflict(module, filename, local_data, remote_data)
+                        elif remote_data is not None and not remote_data.empty:
+                            self.data_manager.write_csv(module, filename, remote_data)
                             self.upload_file(module, filename)
                         else:
-                            self.logger.debug(f"No local data to sync for {module}/{filename}")
+                            # Remote node is gone or unreadable - replace it
+                            self.upload_file(module, filename)
 
-                    except Exception as sync_data_error:
-                        self.logger.error(f"Error during data sync for {module}/{filename}: {sync_data_error}")
-                        # Try a simple upload as fallback (including empty files)
-                        try:
-                            local_data = self.data_manager.read_csv(module, filename)
-                            if local_data is not None:  # Upload both empty and non-empty files
-                                self.upload_file(module, filename)
-                        except Exception as fallback_error:
-                            self.logger.error(f"Fallback upload also failed for {module}/{filename}: {fallback_error}")
-                            raise sync_data_error  # Re-raise original error
+                        # The merge rewrote the local file
+                        local_hash, local_modified, local_stat = self._get_local_state(module, filename)
+                    elif local_changed:
+                        self.logger.debug(f"Pushing local changes for {module}/{filename}")
+                        self.push_changes(module, filename)
+                    else:
+                        # No changes on either side; a touched but identical file
+                        # keeps its hash under the new stat fingerprint
+                        metadata.set_stat(local_stat)
+                        metadata.last_modified = local_modified
+                        self.logger.debug(f"No changes detected for {module}/{filename}, skipping sync")
+                        return
 
             except Exception as upload_error:
                 self.logger.error(f"Upload failed for {module}/{filename}: {upload_error}")
@@ -384,7 +447,7 @@ class FirebaseSyncEngine(QObject):
 
             # Update metadata with error handling
             try:
-                self.update_metadata(module, filename, local_hash, local_modified)
+                self.update_metadata(module, filename, local_hash, local_modified, local_stat)
                 self.logger.debug(f"Successfully synced file: {module}/{filename}")
             except Exception as metadata_update_error:
                 self.logger.error(f"Error updating metadata for {module}/{filename}: {metadata_update_error}")
@@ -416,6 +479,117 @@ class FirebaseSyncEngine(QObject):
                 self._emit_signal_safe(self.sync_error, f"Upload failed: {error_msg}")
             raise  # Re-raise so the calling code can handle it properly
 
+    def push_changes(self, module: str, filename: str):
+        """Send only the rows that changed since the last upload
+
+        Falls back to a full upload when there is no delta state yet, the
+        rows have no usable ids or the columns changed.
+        """
+        try:
+            if self._upload_delta_via_direct_firebase(module, filename):
+                return
+        except Exception as e:
+            self.logger.warning(f"Delta upload failed for {module}/{filename}, uploading full file: {e}")
+
+        self.upload_file(module, filename)
+
+    def _upload_delta_via_direct_firebase(self, module: str, filename: str) -> bool:
+        """Patch changed and deleted rows; returns False if a full upload is needed"""
+        file_key = f"{module}/{filename}"
+        state = self.delta_state.get(file_key)
+        if not state or state.get('rows') is None:
+            return False
+
+        data = self.data_manager.read_csv(module, filename)
+        if data is None or data.empty:
+            return False
+
+        data_copy = self._prepare_dataframe_for_upload(data)
+        columns = data_copy.columns.tolist()
+        keyed_records = self._build_keyed_records(data_copy)
+        if keyed_records is None or columns != state.get('columns'):
+            return False
+
+        row_hashes = {key: self._hash_record(record) for key, record in keyed_records.items()}
+        old_hashes = state.get('rows', {})
+
+        changed = [key for key, row_hash in row_hashes.items() if old_hashes.get(key) != row_hash]
+        deleted = [key for key in old_hashes if key not in row_hashes]
+
+        updates = {}
+        for key in changed:
+            updates[f"records/{key}"] = keyed_records[key]
+        for key in deleted:
+            updates[f"records/{key}"] = None
+
+        if not updates:
+            self.logger.debug(f"No row changes to push for {module}/{filename}")
+            return True
+
+        version = state.get('version', 0) + 1
+        updates['metadata/version'] = version
+        updates['metadata/row_count'] = len(row_hashes)
+        updates['metadata/uploaded_at'] = datetime.now().isoformat()
+
+        try:
+            json.dumps(updates)
+        except (TypeError, ValueError) as json_error:
+            self.logger.warning(f"Delta for {module}/{filename} is not serializable: {json_error}")
+            return False
+
+        success, message = self.firebase_client.patch_data(module, filename, updates, sync_version=version)
+        if not success:
+            raise Exception(f"Direct Firebase delta upload failed: {message}")
+
+        self.delta_state[file_key] = {'version': version, 'columns': columns, 'rows': row_hashes}
+        self.logger.info(f"Patched {len(changed)} changed and {len(deleted)} deleted "
+                         f"rows of {module}/{filename} (version {version})")
+        return True
+
+    def _build_keyed_records(self, data: pd.DataFrame) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Key prepared records by their id, or None if the ids cannot be used as keys"""
+        if 'id' not in data.columns:
+            return None
+
+        keyed_records = {}
+        for record in data.to_dict('records'):
+            key = self._record_key(record.get('id'))
+            if key is None or key in keyed_records:
+                return None
+            keyed_records[key] = record
+        return keyed_records
+
+    @staticmethod
+    def _record_key(value: Any) -> Optional[str]:
+        """Convert a row id to a database key"""
+        if value is None:
+            return None
+        if isinstance(value, float):
+            if value != value or not value.is_integer():
+                return None
+            value = int(value)
+        key = str(value).strip()
+        if not key or any(char in key for char in '.$#[]/'):
+            return None
+        return key
+
+    @staticmethod
+    def _hash_record(record: Dict[str, Any]) -> str:
+        """Content hash of a prepared record"""
+        return hashlib.md5(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _publish_version(self, module: str, filename: str, version: int):
+        """Record a full upload in the remote version index"""
+        success, message = self.firebase_client.set_sync_version(module, filename, version)
+        if not success:
+            # Other devices will see a stale version and merge once, which is harmless
+            self.logger.warning(f"Could not update version index for {module}/{filename}: {message}")
+
+    def _next_remote_version(self, file_key: str) -> int:
+        """Version number for the next upload of a file"""
+        state = self.delta_state.get(file_key)
+        return (state.get('version', 0) if state else 0) + 1
+
     def _upload_via_direct_firebase(self, module: str, filename: str):
         """Upload file using direct Firebase client"""
         try:
@@ -430,6 +604,9 @@ class FirebaseSyncEngine(QObject):
                 self.logger.warning(f"Could not read data for {module}/{filename}")
                 return
 
+            file_key = f"{module}/{filename}"
+            version = self._next_remote_version(file_key)
+
             # Handle empty data by uploading empty marker
             if data.empty:
                 self.logger.info(f"Data is empty for {module}/{filename}, uploading empty marker")
@@ -441,6 +618,7 @@ class FirebaseSyncEngine(QObject):
                         'column_count': 0,
                         'uploaded_at': datetime.now().isoformat(),
                         'empty': True,
+                        'version': version,
                         'backend': 'direct_firebase'
                     }
                 }
@@ -449,16 +627,16 @@ class FirebaseSyncEngine(QObject):
                 success, message = self.firebase_client.upload_data(module, filename, upload_data)
 
                 if success:
+                    self.delta_state[file_key] = {'version': version, 'columns': [], 'rows': {}}
+                    self._publish_version(module, filename, version)
                     self.logger.info(f"Successfully uploaded empty data marker for {module}/{filename} via direct Firebase: {message}")
                 else:
                     raise Exception(f"Direct Firebase upload of empty data failed: {message}")
                 return
 
-            # Prepare data for upload using comprehensive data preparation
-            data_copy = data.copy()
-
             # Use the comprehensive data preparation function that handles NaN, inf, -inf
-            data_copy = self._prepare_dataframe_for_upload(data_copy)
+            # (it works on its own copy, so the cached frame is left untouched)
+            data_copy = self._prepare_dataframe_for_upload(data)
 
             # Create upload data structure with JSON serialization test
             try:
@@ -468,13 +646,17 @@ class FirebaseSyncEngine(QObject):
                 # Test JSON serialization to catch any remaining issues
                 json.dumps(records_data[:1] if records_data else [])  # Test with first record
 
+                # Key rows by id so later syncs can patch single rows
+                keyed_records = self._build_keyed_records(data_copy)
+
                 upload_data = {
-                    'records': records_data,
+                    'records': keyed_records if keyed_records is not None else records_data,
                     'columns': data_copy.columns.tolist(),
                     'metadata': {
                         'row_count': len(data_copy),
                         'column_count': len(data_copy.columns),
                         'uploaded_at': datetime.now().isoformat(),
+                        'version': version,
                         'backend': 'direct_firebase'
                     }
                 }
@@ -496,6 +678,7 @@ class FirebaseSyncEngine(QObject):
                         data_copy[col] = ''
 
                 # Retry with string-converted data
+                keyed_records = None
                 upload_data = {
                     'records': data_copy.to_dict('records'),
                     'columns': data_copy.columns.tolist(),
@@ -503,6 +686,7 @@ class FirebaseSyncEngine(QObject):
                         'row_count': len(data_copy),
                         'column_count': len(data_copy.columns),
                         'uploaded_at': datetime.now().isoformat(),
+                        'version': version,
                         'backend': 'direct_firebase'
                     }
                 }
@@ -511,6 +695,19 @@ class FirebaseSyncEngine(QObject):
             success, message = self.firebase_client.upload_data(module, filename, upload_data)
 
             if success:
+                if keyed_records is not None:
+                    self.delta_state[file_key] = {
+                        'version': version,
+                        'columns': upload_data['columns'],
+                        'rows': {key: self._hash_record(record) for key, record in keyed_records.items()}
+                    }
+                else:
+                    # Rows without usable ids are uploaded in full when the file
+                    # changes; keep the version so unchanged files are skipped
+                    self.delta_state[file_key] = {
+                        'version': version, 'columns': upload_data['columns'], 'rows': None
+                    }
+                self._publish_version(module, filename, version)
                 self.logger.info(f"Successfully uploaded {module}/{filename} via direct Firebase: {message}")
             else:
                 raise Exception(f"Direct Firebase upload failed: {message}")
@@ -874,8 +1071,15 @@ class FirebaseSyncEngine(QObject):
 
             # Convert back to DataFrame - handle both old and new data structures
             if "records" in data and "columns" in data:
-                # New structure: records + columns + metadata
-                df = pd.DataFrame(data["records"], columns=data["columns"])
+                # New structure: records + columns + metadata. Records keyed by id
+                # come back as an object, or as a sparse list for numeric ids
+                records = data["records"] or []
+                if isinstance(records, dict):
+                    records = list(records.values())
+                records = [record for record in records if record]
+                df = pd.DataFrame(records, columns=data["columns"])
+                if 'id' in df.columns:
+                    df = self._sort_by_id(df)
                 self.logger.info(f"Successfully downloaded {len(df)} records for {module}/{filename} via direct Firebase")
                 return df
             elif "data" in data and "columns" in data:
@@ -891,6 +1095,54 @@ class FirebaseSyncEngine(QObject):
             self.logger.error(f"Direct Firebase download failed for {module}/{filename}: {e}")
             return None
 
+    @staticmethod
+    def _sort_by_id(df: pd.DataFrame) -> pd.DataFrame:
+        """Restore row order of records that were keyed by id"""
+        order = pd.to_numeric(df['id'], errors='coerce')
+        if order.isna().any():
+            return df
+        return df.iloc[order.argsort(kind='stable')].reset_index(drop=True)
+
+    def get_remote_versions(self) -> Optional[Dict[str, int]]:
+        """Read the remote version of every file with one shallow query
+
+        Returns a mapping of version index keys to versions (files missing
+        from it have no versioned remote copy), or None if it could not be read.
+        """
+        try:
+            success, data, message = self.firebase_client.download_sync_versions()
+            if not success:
+                return {} if "No data found" in message else None
+            if not isinstance(data, dict):
+                return {}
+            versions = {}
+            for key, value in data.items():
+                try:
+                    versions[key] = int(value)
+                except (TypeError, ValueError):
+                    continue
+            return versions
+        except Exception as e:
+            self.logger.debug(f"Could not read remote version index: {e}")
+            return None
+
+    def get_remote_version(self, module: str, filename: str) -> Optional[int]:
+        """Read the remote version counter of a file
+
+        Returns 0 when the file has no remote copy or predates versioning,
+        and None when the metadata could not be read.
+        """
+        try:
+            success, data, message = self.firebase_client.download_metadata(module, filename)
+            if not success:
+                return 0 if "No data found" in message else None
+            if not isinstance(data, dict):
+                return 0
+            return int(data.get('version', 0) or 0)
+        except Exception as e:
+            self.logger.debug(f"Could not read remote version of {module}/{filename}: {e}")
+            return None
+
     def resolve_conflict(self, module: str, filename: str,
                         local_data: pd.DataFrame, remote_data: pd.DataFrame):
         """Resolve sync conflicts using timestamp-based strategy"""
@@ -932,8 +1184,13 @@ class FirebaseSyncEngine(QObject):
                 break
         
         if timestamp_col:
-            # Sort by timestamp and drop duplicates by ID, keeping the latest
-            combined = combined.sort_values(timestamp_col)
+            # Sort by timestamp and drop duplicates by ID, keeping the latest.
+            # Downloaded rows hold strings while local rows hold datetimes
+            combined = combined.sort_values(
+                timestamp_col,
+                key=lambda col: pd.to_datetime(col.astype(str), errors='coerce', format='mixed'),
+                kind='stable'
+            )
             combined = combined.drop_duplicates(subset=['id'], keep='last')
         else:
             # No timestamp column - just drop duplicates by ID
@@ -962,21 +1219,13 @@ class FirebaseSyncEngine(QObject):
                 self.logger.error(f"Error checking file existence for {file_path}: {exists_error}")
                 return ""
 
-            # Read file content with error handling
+            # Hash the file in fixed-size chunks so large files are never fully in memory
             try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-            except Exception as read_error:
-                self.logger.error(f"Error reading file {file_path}: {read_error}")
-                return ""
-
-            # Calculate hash with error handling
-            try:
-                hash_value = hashlib.md5(content).hexdigest()
+                hash_value = self._hash_file(file_path)
                 self.logger.debug(f"Successfully calculated hash for {module}/{filename}: {hash_value[:8]}...")
                 return hash_value
-            except Exception as hash_error:
-                self.logger.error(f"Error calculating hash for {module}/{filename}: {hash_error}")
+            except Exception as read_error:
+                self.logger.error(f"Error hashing file {file_path}: {read_error}")
                 return ""
 
         except Exception as e:
@@ -985,6 +1234,34 @@ class FirebaseSyncEngine(QObject):
             self.logger.error(f"Full traceback: {traceback.format_exc()}")
             return ""
     
+    def _hash_file(self, file_path: Path) -> str:
+        """MD5 of a file, read in chunks"""
+        digest = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.hash_chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _get_local_state(self, module: str, filename: str,
+                         metadata: Optional[SyncMetadata] = None) -> Tuple[str, str, Optional[os.stat_result]]:
+        """Get (hash, modified time, stat) of a local file
+
+        The file is only read when its (size, mtime_ns, inode) differs from
+        the fingerprint stored with the metadata; otherwise the stored hash
+        is reused.
+        """
+        file_path = self.data_manager.get_file_path(module, filename)
+        try:
+            stat_result = file_path.stat()
+        except FileNotFoundError:
+            return "", "", None
+
+        modified_time = datetime.fromtimestamp(stat_result.st_mtime).isoformat()
+        if metadata is not None and metadata.local_hash and metadata.matches_stat(stat_result):
+            return metadata.local_hash, modified_time, stat_result
+
+        return self._hash_file(file_path), modified_time, stat_result
+
     def get_file_modified_time(self, module: str, filename: str) -> str:
         """Get file modification time with comprehensive error handling"""
         try:
@@ -1054,11 +1331,13 @@ class FirebaseSyncEngine(QObject):
         except Exception:
             return ""
     
-    def update_metadata(self, module: str, filename: str, 
-                       local_hash: str, local_modified: str):
+    def update_metadata(self, module: str, filename: str,
+                       local_hash: str, local_modified: str,
+                       local_stat: Optional[os.stat_result] = None):
         """Update sync metadata"""
         file_key = f"{module}/{filename}"
-        remote_hash = self.get_remote_hash(module, filename)
+        delta_state = self.delta_state.get(file_key)
+        remote_hash = str(delta_state['version']) if delta_state else ""
         
         if file_key in self.sync_metadata:
             metadata = self.sync_metadata[file_key]
@@ -1067,6 +1346,7 @@ class FirebaseSyncEngine(QObject):
             metadata.remote_hash = remote_hash
             metadata.last_modified = local_modified
             metadata.sync_count += 1
+            metadata.set_stat(local_stat)
         else:
             metadata = SyncMetadata(
                 module=module,
@@ -1077,6 +1357,7 @@ class FirebaseSyncEngine(QObject):
                 last_modified=local_modified,
                 sync_count=1
             )
+            metadata.set_stat(local_stat)
             self.sync_metadata[file_key] = metadata
     
     def load_metadata(self):
@@ -1095,27 +1376,62 @@ class FirebaseSyncEngine(QObject):
         except Exception as e:
             self.logger.error(f"Error loading sync metadata: {e}")
             self.sync_metadata = {}
+
+        try:
+            if self.delta_state_file.exists():
+                with open(self.delta_state_file, 'r', encoding='utf-8') as f:
+                    self.delta_state = json.load(f)
+        except Exception as e:
+            # Without row hashes the next sync of each file is a full upload
+            self.logger.error(f"Error loading delta sync state: {e}")
+            self.delta_state = {}
     
     def save_metadata(self):
         """Save sync metadata to file"""
         try:
             self.metadata_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            data = {
-                key: metadata.to_dict()
-                for key, metadata in self.sync_metadata.items()
-            }
-            
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
+
+            with self._metadata_lock:
+                data = {
+                    key: metadata.to_dict()
+                    for key, metadata in list(self.sync_metadata.items())
+                }
+                metadata_text = json.dumps(data, indent=2)
+                delta_text = json.dumps(dict(self.delta_state))
+
+                # Idle syncs change nothing, so skip rewriting the files
+                if metadata_text + delta_text == self._saved_metadata_text:
+                    return
+
+                with open(self.metadata_file, 'w', encoding='utf-8') as f:
+                    f.write(metadata_text)
+
+                with open(self.delta_state_file, 'w', encoding='utf-8') as f:
+                    f.write(delta_text)
+
+                self._saved_metadata_text = metadata_text + delta_text
+
             self.logger.debug("Sync metadata saved")
         except Exception as e:
             self.logger.error(f"Error saving sync metadata: {e}")
     
+    def _get_auth_status(self) -> Dict[str, Any]:
+        """Get the authentication status of the active Firebase client"""
+        if self.use_direct_firebase:
+            return {
+                'has_user': self.firebase_client.current_user is not None,
+                'has_token': self.firebase_client.id_token is not None
+            }
+        return self.secure_client.get_session_status()
+
     def _ensure_database_exists(self) -> bool:
         """Ensure the database exists and is properly initialized"""
         try:
+            # The Realtime Database creates nodes on first write, so the direct
+            # client only needs a signed-in user
+            if self.use_direct_firebase:
+                return self.firebase_client.is_authenticated()
+
             # In secure backend mode, database initialization is handled by the backend
             # We just need to verify that the secure client is authenticated
 
@@ -0,0 +1,530 @@
+"""
+Search Index Module
+Persistent inverted index over module records for the global search
+"""
+
+import re
+import json
+import heapq
+import hashlib
+import logging
+import threading
+import weakref
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+
+def _text(value: Any) -> str:
+    """Convert a cell to display text, treating missing values as empty"""
+    if isinstance(value, str):
+        return value.strip()
+    if value is None:
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    return str(value).strip()
+
+
+def _amount(value: Any) -> str:
+    """Format a cell as a rupee amount"""
+    try:
+        return f"₹{float(value):.2f}"
+    except (TypeError, ValueError):
+        return "₹0.00"
+
+
+def _expense_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    category = _text(row.get('category'))
+    sub_category = _text(row.get('sub_category'))
+    return {
+        'module': 'Expenses',
+        'type': _text(row.get('type')) or 'Expense',
+        'title': _text(row.get('notes')) or " - ".join(filter(None, [category, sub_category])),
+        'details': f"{_amount(row.get('amount'))} - {category}",
+        'date': _text(row.get('date')),
+    }
+
+
+def _income_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'module': 'Income',
+        'type': 'Income',
+        'title': _text(row.get('notes')) or f"Income {_text(row.get('date'))}",
+        'details': f"{_amount(row.get('earned'))} - {_text(row.get('status'))}",
+        'date': _text(row.get('date')),
+    }
+
+
+def _todo_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'module': 'To-Do',
+        'type': 'Task',
+        'title': _text(row.get('title')),
+        'details': f"{_text(row.get('status'))} - {_text(row.get('priority'))} Priority",
+        'date': _text(row.get('due_date')),
+    }
+
+
+def _investment_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'module': 'Investments',
+        'type': 'Investment',
+        'title': f"{_text(row.get('symbol'))} - {_text(row.get('name'))}",
+        'details': f"{_amount(row.get('current_value'))} (P&L: {_amount(row.get('profit_loss'))})",
+        'date': '',
+    }
+
+
+def _habit_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    completed = _text(row.get('is_completed')).lower() in ('true', '1', '1.0', 'yes')
+    return {
+        'module': 'Habits',
+        'type': 'Habit',
+        'title': _text(row.get('habit_name')),
+        'details': "✅ Completed" if completed else "⏳ Pending",
+        'date': _text(row.get('date')),
+    }
+
+
+def _budget_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        health = f"{float(row.get('budget_health_score')):.1f}%"
+    except (TypeError, ValueError):
+        health = "n/a"
+    return {
+        'module': 'Budget',
+        'type': 'Budget Plan',
+        'title': _text(row.get('name')),
+        'details': f"{_text(row.get('budget_type'))} - Health: {health}",
+        'date': _text(row.get('period_start')),
+    }
+
+
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+# Indexed record sources: module -> file, columns to load, searchable
+# columns with their ranking weight, and the result formatter
+SEARCH_SOURCES: Dict[str, Dict[str, Any]] = {
+    'expenses': {
+        'filename': 'expenses.csv',
+        'columns': ['id', 'date', 'type', 'category', 'sub_category', 'transaction_mode', 'amount', 'notes'],
+        'fields': {'notes': 2.0, 'category': 1.5, 'sub_category': 1.5, 'transaction_mode': 1.0},
+        'format': _expense_result,
+    },
+    'income': {
+        'filename': 'income_records.csv',
+        'columns': ['id', 'date', 'earned', 'status', 'notes'],
+        'fields': {'notes': 2.0, 'status': 1.0},
+        'format': _income_result,
+    },
+    'todos': {
+        'filename': 'todo_items.csv',
+        'columns': ['id', 'title', 'description', 'category', 'priority', 'status', 'due_date', 'tags'],
+        'fields': {'title': 2.0, 'description': 1.0, 'category': 1.0, 'tags': 1.0},
+        'format': _todo_result,
+    },
+    'investments': {
+        'filename': 'investments.csv',
+        'columns': ['id', 'symbol', 'name', 'investment_type', 'current_value', 'profit_loss'],
+        'fields': {'symbol': 2.0, 'name': 2.0, 'investment_type': 1.0},
+        'format': _investment_result,
+    },
+    'habits': {
+        'filename': 'habit_records.csv',
+        'columns': ['id', 'date', 'habit_name', 'is_completed', 'notes'],
+        'fields': {'habit_name': 2.0, 'notes': 1.0},
+        'format': _habit_result,
+    },
+    'budget': {
+        'filename': 'budget_plans.csv',
+        'columns': ['id', 'name', 'budget_type', 'period_start', 'budget_health_score', 'notes'],
+        'fields': {'name': 2.0, 'budget_type': 1.0, 'notes': 1.0},
+        'format': _budget_result,
+    },
+}
+
+
+class SearchIndex:
+    """Token and trigram inverted index over the searchable module records
+
+    Each record becomes a document holding its display result and weighted
+    tokens. Postings map tokens to documents and trigrams to tokens, so a
+    query term is expanded to the vocabulary tokens it matches exactly, as a
+    prefix, as a substring or approximately, and only documents holding
+    those tokens are scored.
+
+    Documents are persisted in one shard file per module together with the
+    storage signature of their source file. A module is re-read only when
+    DataManager.data_changed reports it or its signature no longer matches,
+    then only changed rows are re-indexed and only its shard is rewritten.
+    """
+
+    index_version = 1
+    min_fuzzy_length = 4
+    fuzzy_threshold = 0.6
+
+    # Scores for how a query term matched a token, before field weighting
+    exact_score = 3.0
+    prefix_score = 2.0
+    substring_score = 1.0
+
+    def __init__(self, data_manager, index_dir: Optional[Path] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.data_manager = data_manager
+        self.index_dir = Path(index_dir) if index_dir else data_manager.data_dir / "config" / "search_index"
+        self._lock = threading.RLock()
+
+        self.documents: Dict[str, Dict[str, Any]] = {}      # doc key -> result, tokens, hash
+        self.module_docs: Dict[str, Set[str]] = {}          # module -> doc keys
+        self.signatures: Dict[str, Optional[str]] = {}      # module -> encoded source signature
+        self.token_docs: Dict[str, Set[str]] = {}           # token -> doc keys
+        self.trigram_tokens: Dict[str, Set[str]] = {}       # trigram -> tokens
+        self._sorted_tokens: Optional[List[str]] = None
+
+        self._dirty_modules: Set[str] = set(SEARCH_SOURCES)
+        self._loaded = False
+
+        if hasattr(data_manager, 'data_changed'):
+            data_manager.data_changed.connect(self.on_data_changed)
+
+    def on_data_changed(self, module: str, operation: str):
+        """Mark a module for re-indexing before the next search"""
+        if module in SEARCH_SOURCES:
+            with self._lock:
+                self._dirty_modules.add(module)
+
+    def search(self, query: str, modules: Optional[List[str]] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Search records, best matches first
+
+        Every query word must match a word of the record exactly, as a
+        prefix, as a substring (3+ characters) or approximately (4+
+        characters). Records containing the whole query get a bonus.
+        """
+        modules = [module for module in (modules or SEARCH_SOURCES) if module in SEARCH_SOURCES]
+        terms = list(dict.fromkeys(self.tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            self.refresh(modules)
+            allowed = set(modules)
+
+            scores: Optional[Dict[str, float]] = None
+            for term in terms:
+                matches = self._expand_term(term)
+                term_scores: Dict[str, float] = {}
+                for token, match_score in matches.items():
+                    for doc_key in self.token_docs.get(token, ()):
+                        if scores is None:
+                            if doc_key[:doc_key.index(':')] not in allowed:
+                                continue
+                        elif doc_key not in scores:
+                            continue
+                        score = match_score * self.documents[doc_key]['tokens'][token]
+                        if score > term_scores.get(doc_key, 0.0):
+                            term_scores[doc_key] = score
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc_key: scores[doc_key] + score for doc_key, score in term_scores.items()}
+                if not scores:
+                    return []
+
+            phrase = " ".join(terms)
+            results = []
+            for doc_key, score in scores.items():
+                document = self.documents[doc_key]
+                if len(terms) > 1 and phrase in document['text']:
+                    score += self.exact_score
+                results.append((score, document['result'].get('date', ''), doc_key))
+
+            # Best score first, newest first among equal scores
+            best = heapq.nlargest(limit, results, key=lambda item: (item[0], item[1]))
+            return [dict(self.documents[doc_key]['result'], score=round(score, 3))
+                    for score, _, doc_key in best]
+
+    def refresh(self, modules: Optional[List[str]] = None):
+        """Bring the index up to date for the given modules"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+            for module in modules or SEARCH_SOURCES:
+                if module in self._dirty_modules:
+                    if self._refresh_module(module):
+                        self._save_module(module)
+                    self._dirty_modules.discard(module)
+
+    def rebuild(self):
+        """Drop the index and re-read every source"""
+        with self._lock:
+            self.documents.clear()
+            self.module_docs.clear()
+            self.signatures.clear()
+            self.token_docs.clear()
+            self.trigram_tokens.clear()
+            self._sorted_tokens = None
+            self._dirty_modules = set(SEARCH_SOURCES)
+            self._loaded = True
+            self.refresh()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get document and vocabulary counts"""
+        with self._lock:
+            return {
+                'documents': len(self.documents),
+                'tokens': len(self.token_docs),
+                'trigrams': len(self.trigram_tokens),
+                'modules': {module: len(keys) for module, keys in self.module_docs.items()},
+            }
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase word tokens"""
+        return _TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def trigrams(token: str) -> Set[str]:
+        """Get the trigrams of a token, padded so short tokens have some"""
+        padded = f" {token} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _expand_term(self, term: str) -> Dict[str, float]:
+        """Find the vocabulary tokens a query term matches, with match scores"""
+        matches: Dict[str, float] = {}
+
+        # Exact and prefix matches from the sorted vocabulary
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.token_docs)
+        position = bisect_left(self._sorted_tokens, term)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(term):
+            token = self._sorted_tokens[position]
+            matches[token] = self.exact_score if token == term else self.prefix_score
+            position += 1
+
+        if len(term) < 3:
+            return matches
+
+        # Substring matches: tokens holding every inner trigram of the term
+        inner = [term[i:i + 3] for i in range(len(term) - 2)]
+        candidates = None
+        for trigram in inner:
+            tokens = self.trigram_tokens.get(trigram, set())
+            candidates = set(tokens) if candidates is None else candidates & tokens
+            if not candidates:
+                break
+        for token in candidates or ():
+            if token not in matches and term in token:
+                matches[token] = self.substring_score
+
+        # Fuzzy matches: tokens sharing enough trigrams (Dice coefficient)
+        if len(term) >= self.min_fuzzy_length:
+            term_trigrams = self.trigrams(term)
+            shared: Dict[str, int] = {}
+            for trigram in term_trigrams:
+                for token in self.trigram_tokens.get(trigram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            for token, count in shared.items():
+                if token in matches:
+                    continue
+                similarity = 2.0 * count / (len(term_trigrams) + len(self.trigrams(token)))
+                if similarity >= self.fuzzy_threshold:
+                    matches[token] = self.substring_score * similarity
+
+        return matches
+
+    def _refresh_module(self, module: str) -> bool:
+        """Re-index the changed rows of one module, returning whether anything changed"""
+        source = SEARCH_SOURCES[module]
+        signature = self._encode_signature(self.data_manager.get_data_signature(module, source['filename']))
+        if signature is not None and signature == self.signatures.get(module):
+            return False
+
+        if not self.data_manager.file_exists(module, source['filename']):
+            records = []
+        else:
+            try:
+                df = self.data_manager.read_csv(module, source['filename'], source['columns'],
+                                                columns=source['columns'])
+                records = self._text_frame(df).to_dict('records')
+            except Exception as e:
+                self.logger.error(f"Error reading {module} for search index: {e}")
+                return False
+
+        if not records and not self.module_docs.get(module) and module in self.signatures:
+            return False
+
+        documents = {}
+        for position, row in enumerate(records):
+            row_id = _text(row.get('id')) or f"row{position}"
+            doc_key = f"{module}:{row_id}"
+            documents[doc_key] = self._build_document(source, row, doc_key, row_id)
+
+        old_keys = self.module_docs.get(module, set())
+        removed = [doc_key for doc_key in old_keys if doc_key not in documents]
+        updated = [doc_key for doc_key, document in documents.items()
+                   if doc_key not in self.documents or self.documents[doc_key]['hash'] != document['hash']]
+
+        for doc_key in removed + updated:
+            self._remove_document(doc_key)
+        for doc_key in updated:
+            self._add_document(doc_key, documents[doc_key])
+
+        self.module_docs[module] = set(documents)
+        self.signatures[module] = signature
+        if removed or updated:
+            self.logger.debug(f"Search index {module}: {len(updated)} updated, {len(removed)} removed")
+        return True
+
+    @staticmethod
+    def _text_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert every cell to its display text in one pass per column"""
+        text = {}
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                text[column] = series.dt.strftime('%Y-%m-%d').fillna('')
+            else:
+                text[column] = series.astype(object).where(series.notna(), '').astype(str).str.strip()
+        return pd.DataFrame(text, index=df.index)
+
+    def _build_document(self, source: Dict[str, Any], row: Dict[str, Any],
+                        doc_key: str, row_id: str) -> Dict[str, Any]:
+        """Build the stored document for a record"""
+        row_text = "\x1f".join(_text(row.get(column)) for column in source['columns'])
+        row_hash = hashlib.md5(row_text.encode('utf-8')).hexdigest()
+        existing = self.documents.get(doc_key)
+        if existing is not None and existing['hash'] == row_hash:
+            return existing
+
+        result = source['format'](row)
+        result['id'] = row_id
+
+        tokens: Dict[str, float] = {}
+        texts = []
+        for field, weight in source['fields'].items():
+            value = _text(row.get(field))
+            if not value:
+                continue
+            texts.append(value.lower())
+            for token in self.tokenize(value):
+                tokens[token] = max(tokens.get(token, 0.0), weight)
+
+        return {
+            'result': result,
+            'tokens': tokens,
+            'text': " ".join(self.tokenize(" ".join(texts))),
+            'hash': row_hash
+        }
+
+    def _add_document(self, doc_key: str, document: Dict[str, Any]):
+        """Add a document to the postings"""
+        self.documents[doc_key] = document
+        for token in document['tokens']:
+            docs = self.token_docs.get(token)
+            if docs is None:
+                docs = self.token_docs[token] = set()
+                self._sorted_tokens = None
+                for trigram in self.trigrams(token):
+                    self.trigram_tokens.setdefault(trigram, set()).add(token)
+            docs.add(doc_key)
+
+    def _remove_document(self, doc_key: str):
+        """Remove a document from the postings"""
+        document = self.documents.pop(doc_key, None)
+        if document is None:
+            return
+        for token in document['tokens']:
+            docs = self.token_docs.get(token)
+            if docs is None:
+                continue
+            docs.discard(doc_key)
+            if not docs:
+                del self.token_docs[token]
+                self._sorted_tokens = None
+                for trigram in self.trigrams(token):
+                    tokens = self.trigram_tokens.get(trigram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self.trigram_tokens[trigram]
+
+    def _shard_file(self, module: str) -> Path:
+        """Get the file holding the persisted documents of a module"""
+        return self.index_dir / f"{module}.json"
+
+    def _load(self):
+        """Load the persisted module shards and rebuild the postings from them"""
+        for module in SEARCH_SOURCES:
+            shard_file = self._shard_file(module)
+            if not shard_file.exists():
+                continue
+            try:
+                with open(shard_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') != self.index_version:
+                    continue
+                documents = data['documents']
+                signature = data.get('signature')
+                if not isinstance(documents, dict):
+                    raise TypeError("documents is not an object")
+            except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+                self.logger.warning(f"Ignoring unreadable search index shard {shard_file}: {e}")
+                continue
+
+            self.module_docs[module] = set(documents)
+            self.signatures[module] = signature
+            for doc_key, document in documents.items():
+                self._add_document(doc_key, document)
+
+        self.logger.debug(f"Loaded search index with {len(self.documents)} documents")
+
+    def _save_module(self, module: str):
+        """Persist the documents and source signature of one module"""
+        try:
+            data = {
+                'version': self.index_version,
+                'signature': self.signatures.get(module),
+                'documents': {doc_key: self.documents[doc_key]
+                              for doc_key in sorted(self.module_docs.get(module, ()))},
+            }
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            shard_file = self._shard_file(module)
+            temp_file = shard_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            temp_file.replace(shard_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.error(f"Error saving search index for {module}: {e}")
+
+    @staticmethod
+    def _encode_signature(signature: Optional[tuple]) -> Optional[str]:
+        """Encode a storage signature so it survives the JSON round trip"""
+        if signature is None:
+            return None
+        return json.dumps(signature, default=str)
+
+
+_search_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_search_indexes_lock = threading.Lock()
+
+
+def get_search_index(data_manager) -> SearchIndex:
+    """Get the shared search index for a DataManager"""
+    with _search_indexes_lock:
+        index = _search_indexes.get(data_manager)
+        if index is None:
+            index = SearchIndex(data_manager)
+            _search_indexes[data_manager] = index
+        return index
@@ -0,0 +1,717 @@
+"""
+Storage Backends Module
+Pluggable file storage engines used by the DataManager
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, date
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a timestamp the way DataFrame.to_csv writes date-only columns"""
+    if (value.hour, value.minute, value.second, value.microsecond) == (0, 0, 0, 0):
+        return value.strftime('%Y-%m-%d')
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class CSVStorageBackend:
+    """Plain CSV storage - every change rewrites the whole file"""
+
+    name = "csv"
+    supports_row_operations = False
+    supports_queries = False
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.data_dir = data_dir
+
+    def exists(self, file_path: Path) -> bool:
+        """Check if any stored data exists for the file"""
+        return file_path.exists()
+
+    def signature(self, file_path: Path) -> Optional[tuple]:
+        """Get a cheap token that changes whenever the stored data changes"""
+        return self._signature(file_path)
+
+    def read(self, file_path: Path, copy: bool = True,
+             columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Read the stored frame, or None if there is nothing stored
+
+        When ``columns`` is given only those columns (that exist) are returned.
+        """
+        if file_path.exists() and file_path.stat().st_size > 0:
+            if columns is not None:
+                return pd.read_csv(file_path, encoding='utf-8', usecols=lambda col: col in columns)
+            return pd.read_csv(file_path, encoding='utf-8')
+        return None
+
+    def write(self, file_path: Path, data: pd.DataFrame):
+        """Atomically replace the stored file with the given frame"""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temporary file first
+        temp_path = file_path.with_suffix('.tmp')
+        data.to_csv(temp_path, index=False, encoding='utf-8')
+
+        # Verify the temporary file was written correctly
+        if not (temp_path.exists() and temp_path.stat().st_size > 0):
+            raise Exception("Temporary file was not created properly")
+
+        # Replace original file with temporary file
+        if file_path.exists():
+            file_path.unlink()
+        temp_path.rename(file_path)
+
+    def has_pending_changes(self, file_path: Path) -> bool:
+        """Check if the file has changes that are not in the CSV snapshot yet"""
+        return False
+
+    def pending_files(self, module_dir: Path) -> List[Path]:
+        """List the data files in a module directory with pending changes"""
+        return []
+
+    def needs_compaction(self, file_path: Path) -> bool:
+        """Check if the file should be compacted"""
+        return False
+
+    def compact(self, file_path: Path,
+                prepare: Optional[Callable[[pd.DataFrame], None]] = None) -> bool:
+        """Fold pending changes into the CSV snapshot
+
+        ``prepare`` formats the folded frame in place before it is written.
+        """
+        return False
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[tuple]:
+        """Get a cheap change signature for a file"""
+        try:
+            stat = path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+
+class JournalStorageBackend(CSVStorageBackend):
+    """Append-only journal storage
+
+    Each CSV file keeps a snapshot (the CSV itself) plus a ``.journal`` file
+    holding one JSON operation per line. Single-row appends, updates and
+    deletes only append a line to the journal; the journal is folded back
+    into the snapshot once it grows past ``compaction_threshold`` operations
+    or when ``compact`` is called (e.g. before sync).
+    """
+
+    name = "journal"
+    supports_row_operations = True
+    journal_suffix = ".journal"
+
+    def __init__(self, data_dir: Optional[Path] = None, compaction_threshold: int = 500):
+        super().__init__(data_dir)
+        self.compaction_threshold = compaction_threshold
+        self._states: Dict[Path, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get_journal_path(self, file_path: Path) -> Path:
+        """Get the journal path for a data file"""
+        return file_path.with_name(file_path.name + self.journal_suffix)
+
+    def exists(self, file_path: Path) -> bool:
+        """Check if any stored data exists for the file"""
+        return file_path.exists() or self.get_journal_path(file_path).exists()
+
+    def signature(self, file_path: Path) -> Optional[tuple]:
+        """Get a change token covering both the snapshot and the journal"""
+        snapshot_sig = self._signature(file_path)
+        journal_sig = self._signature(self.get_journal_path(file_path))
+        if snapshot_sig is None and journal_sig is None:
+            return None
+        return (snapshot_sig, journal_sig)
+
+    def read(self, file_path: Path, copy: bool = True,
+             columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Read the snapshot with all journal operations applied"""
+        with self._lock:
+            state = self._load_state(file_path)
+            if state is None:
+                return None
+            df = self._materialize(state)
+            if columns is not None:
+                return df[[col for col in df.columns if col in columns]]
+            return df.copy() if copy else df
+
+    def write(self, file_path: Path, data: pd.DataFrame):
+        """Write a full snapshot and discard the journal it supersedes"""
+        with self._lock:
+            super().write(file_path, data)
+            journal_path = self.get_journal_path(file_path)
+            if journal_path.exists():
+                journal_path.unlink()
+            # Reload from disk on next read so dtypes match a fresh CSV parse
+            self._states.pop(file_path, None)
+
+    def append_row(self, file_path: Path, row_data: Dict[str, Any]):
+        """Append a row by journaling it"""
+        self._record(file_path, {"op": "append", "row": row_data})
+
+    def update_row(self, file_path: Path, id_column: str,
+                   row_id: Union[int, str], update_data: Dict[str, Any]):
+        """Update a row by journaling the changed values"""
+        self._record(file_path, {"op": "update", "id_column": id_column,
+                                 "id": row_id, "values": update_data})
+
+    def delete_row(self, file_path: Path, id_column: str, row_id: Union[int, str]):
+        """Delete a row by journaling a tombstone"""
+        self._record(file_path, {"op": "delete", "id_column": id_column, "id": row_id})
+
+    def has_pending_changes(self, file_path: Path) -> bool:
+        """Check if the journal holds operations not yet in the snapshot"""
+        journal_path = self.get_journal_path(file_path)
+        return journal_path.exists() and journal_path.stat().st_size > 0
+
+    def pending_files(self, module_dir: Path) -> List[Path]:
+        """List the data files in a module directory that have a journal"""
+        return [
+            journal_path.with_name(journal_path.name[:-len(self.journal_suffix)])
+            for journal_path in module_dir.glob(f"*{self.journal_suffix}")
+        ]
+
+    def needs_compaction(self, file_path: Path) -> bool:
+        """Check if the journal has grown past the compaction threshold"""
+        with self._lock:
+            state = self._states.get(file_path)
+            return state is not None and state["op_count"] >= self.compaction_threshold
+
+    def compact(self, file_path: Path,
+                prepare: Optional[Callable[[pd.DataFrame], None]] = None) -> bool:
+        """Fold the journal into a fresh CSV snapshot"""
+        with self._lock:
+            if not self.has_pending_changes(file_path):
+                return False
+
+            state = self._load_state(file_path)
+            df = self._materialize(state).copy() if state is not None else pd.DataFrame()
+            op_count = state["op_count"] if state is not None else 0
+
+            if prepare is not None:
+                prepare(df)
+            self.write(file_path, df)
+            self.logger.debug(f"Compacted {op_count} journal operations into {file_path}")
+            return True
+
+    def _record(self, file_path: Path, operation: Dict[str, Any]):
+        """Append an operation to the journal and apply it in memory"""
+        with self._lock:
+            state = self._load_state(file_path)
+            if state is None:
+                state = self._new_state(file_path)
+
+            line = json.dumps(operation, default=self._json_default)
+            journal_path = self.get_journal_path(file_path)
+            journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(journal_path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+            # Apply the JSON round-tripped operation so memory matches a replay
+            self._apply(state, json.loads(line))
+            state["op_count"] += 1
+            state["journal_sig"] = self._signature(journal_path)
+
+    def _load_state(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the in-memory state for a file, reloading it if stale"""
+        journal_path = self.get_journal_path(file_path)
+        snapshot_sig = self._signature(file_path)
+        journal_sig = self._signature(journal_path)
+
+        state = self._states.get(file_path)
+        if (state is not None and state["snapshot_sig"] == snapshot_sig
+                and state["journal_sig"] == journal_sig):
+            return state
+
+        if snapshot_sig is None and journal_sig is None:
+            self._states.pop(file_path, None)
+            return None
+
+        state = self._new_state(file_path)
+        if snapshot_sig is not None and snapshot_sig[1] > 0:
+            state["frame"] = pd.read_csv(file_path, encoding='utf-8')
+
+        if journal_sig is not None:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        operation = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-write can leave a torn last line
+                        self.logger.warning(f"Skipping corrupt journal line {line_number} in {journal_path}")
+                        continue
+                    self._apply(state, operation)
+                    state["op_count"] += 1
+
+        state["journal_sig"] = journal_sig
+        return state
+
+    def _new_state(self, file_path: Path) -> Dict[str, Any]:
+        """Create an empty in-memory state for a file"""
+        state = {
+            "frame": pd.DataFrame(),
+            "pending_rows": [],
+            "op_count": 0,
+            "snapshot_sig": self._signature(file_path),
+            "journal_sig": self._signature(self.get_journal_path(file_path)),
+        }
+        self._states[file_path] = state
+        return state
+
+    def _apply(self, state: Dict[str, Any], operation: Dict[str, Any]):
+        """Apply one journal operation to the in-memory state"""
+        op = operation.get("op")
+        if op == "append":
+            # Appends are buffered and concatenated lazily on the next read
+            state["pending_rows"].append(operation["row"])
+            return
+
+        df = self._materialize(state)
+        id_column = operation.get("id_column", "id")
+        if df.empty or id_column not in df.columns:
+            return
+
+        if op == "update":
+            mask = df[id_column] == operation["id"]
+            for column, value in operation["values"].items():
+                if column in df.columns:
+                    # Convert empty string to NaN for numeric columns
+                    if df[column].dtype in ['float64', 'int64'] and value == '':
+                        df.loc[mask, column] = np.nan
+                    else:
+                        df.loc[mask, column] = value
+        elif op == "delete":
+            state["frame"] = df[df[id_column] != operation["id"]].reset_index(drop=True)
+        else:
+            self.logger.warning(f"Unknown journal operation: {op}")
+
+    def _materialize(self, state: Dict[str, Any]) -> pd.DataFrame:
+        """Concatenate buffered appends into the state frame"""
+        if state["pending_rows"]:
+            new_rows = pd.DataFrame(state["pending_rows"])
+            if state["frame"].empty and len(state["frame"].columns) == 0:
+                state["frame"] = new_rows
+            else:
+                state["frame"] = pd.concat([state["frame"], new_rows], ignore_index=True)
+            state["pending_rows"] = []
+        return state["frame"]
+
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        """Serialize values that the json module does not handle natively"""
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (pd.Timestamp, datetime)):
+            return _format_timestamp(value)
+        if isinstance(value, date):
+            return value.strftime('%Y-%m-%d')
+        return str(value)
+
+
+class SQLiteStorageBackend(CSVStorageBackend):
+    """SQLite storage with indexed queries
+
+    Every module file is a table in one SQLite database inside the data
+    directory, indexed on ``id``, ``date``, ``category`` and ``type``. Row
+    operations and queries run against the tables; the CSV files are kept as
+    an export that is refreshed on compaction so Firebase sync and backups
+    keep working on plain CSV files. CSV files without a table (or changed
+    outside the app) are imported on first access.
+    """
+
+    name = "sqlite"
+    supports_row_operations = True
+    supports_queries = True
+    database_filename = "traqify.db"
+    indexed_columns = ['id', 'date', 'category', 'type']
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        super().__init__(Path(data_dir) if data_dir is not None else Path("data"))
+        self.database_path = self.data_dir / self.database_filename
+        self._lock = threading.RLock()
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.database_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS _csv_files ("
+            "table_name TEXT PRIMARY KEY, module TEXT, filename TEXT, "
+            "csv_mtime_ns INTEGER, csv_size INTEGER, dirty INTEGER DEFAULT 0)"
+        )
+        self._connection.commit()
+
+        # table name -> column list, export state and in-process change counter
+        self._tables: Dict[str, List[str]] = {}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._load_catalog()
+
+    def import_csv_files(self) -> int:
+        """One-shot import of every module CSV that has no table yet"""
+        imported = 0
+        with self._lock:
+            for module_dir in self.data_dir.iterdir():
+                if not module_dir.is_dir() or module_dir.name.startswith('.'):
+                    continue
+                for file_path in module_dir.glob("*.csv"):
+                    if self._ensure_imported(file_path):
+                        imported += 1
+        if imported:
+            self.logger.info(f"Imported {imported} CSV file(s) into {self.database_path}")
+        return imported
+
+    def exists(self, file_path: Path) -> bool:
+        """Check if a table exists for the file"""
+        with self._lock:
+            self._ensure_imported(file_path)
+            return self._table_name(file_path) in self._files
+
+    def signature(self, file_path: Path) -> Optional[tuple]:
+        """Get the table's change counter"""
+        with self._lock:
+            self._ensure_imported(file_path)
+            table = self._table_name(file_path)
+            if table not in self._files:
+                return None
+            return (table, self._versions.get(table, 0))
+
+    def read(self, file_path: Path, copy: bool = True,
+             columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Read the whole table, or only the requested columns"""
+        return self.query(file_path, columns=columns)
+
+    def query(self, file_path: Path, filters: Optional[Dict[str, Any]] = None,
+              date_range: Optional[Tuple[Any, Any]] = None, date_column: str = 'date',
+              columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Run an indexed query against the file's table
+
+        ``filters`` maps column names to the value they must equal and
+        ``date_range`` is an inclusive (start, end) pair where either side may
+        be None. Filters on columns the table does not have are ignored.
+        """
+        with self._lock:
+            self._ensure_imported(file_path)
+            table = self._table_name(file_path)
+            if table not in self._files:
+                return None
+
+            table_columns = self._tables.get(table, [])
+            if not table_columns:
+                return pd.DataFrame()
+
+            selected = table_columns if columns is None else [
+                col for col in table_columns if col in columns
+            ]
+            if not selected:
+                return pd.DataFrame(index=range(0))
+
+            clauses, params = [], []
+            for column, value in (filters or {}).items():
+                if column in table_columns:
+                    clauses.append(f"{self._quote(column)} = ?")
+                    params.append(self._to_sql_value(value))
+
+            if date_range and date_column in table_columns:
+                # Dates are stored as 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'. The short
+                # form of the start and the long form of the end compare as text the
+                # way the timestamps compare, whichever form a row uses
+                start, end = date_range
+                if start is not None:
+                    clauses.append(f"{self._quote(date_column)} >= ?")
+                    params.append(_format_timestamp(pd.Timestamp(start)))
+                if end is not None:
+                    clauses.append(f"{self._quote(date_column)} <= ?")
+                    params.append(pd.Timestamp(end).strftime('%Y-%m-%d %H:%M:%S'))
+
+            sql = f"SELECT {', '.join(self._quote(col) for col in selected)} FROM {self._quote(table)}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY rowid"
+
+            rows = self._connection.execute(sql, params).fetchall()
+            return self._restore_csv_dtypes(pd.DataFrame.from_records(rows, columns=selected))
+
+    def write(self, file_path: Path, data: pd.DataFrame):
+        """Replace the table and refresh the CSV export"""
+        with self._lock:
+            table = self._table_name(file_path)
+            self._replace_table(table, data)
+            super().write(file_path, data)
+            self._set_file_state(file_path, dirty=False)
+
+    def append_row(self, file_path: Path, row_data: Dict[str, Any]):
+        """Insert a single row"""
+        with self._lock:
+            self._ensure_imported(file_path)
+            table = self._table_name(file_path)
+            self._ensure_columns(table, list(row_data.keys()))
+
+            columns = list(row_data.keys())
+            self._connection.execute(
+                f"INSERT INTO {self._quote(table)} ({', '.join(self._quote(col) for col in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [self._to_sql_value(row_data[col]) for col in columns]
+            )
+            self._bump_version(file_path)
+            self._set_file_state(file_path, dirty=True)
+
+    def update_row(self, file_path: Path, id_column: str,
+                   row_id: Union[int, str], update_data: Dict[str, Any]):
+        """Update the matching rows in place"""
+        with self._lock:
+            self._ensure_imported(file_path)
+            table = self._table_name(file_path)
+            table_columns = self._tables.get(table, [])
+            columns = [col for col in update_data if col in table_columns]
+            if not columns or id_column not in table_columns:
+                return
+
+            self._connection.execute(
+                f"UPDATE {self._quote(table)} SET {', '.join(f'{self._quote(col)} = ?' for col in columns)} "
+                f"WHERE {self._quote(id_column)} = ?",
+                [self._to_sql_value(update_data[col]) for col in columns] + [self._to_sql_value(row_id)]
+            )
+            self._bump_version(file_path)
+            self._set_file_state(file_path, dirty=True)
+
+    def delete_row(self, file_path: Path, id_column: str, row_id: Union[int, str]):
+        """Delete the matching rows"""
+        with self._lock:
+            self._ensure_imported(file_path)
+            table = self._table_name(file_path)
+            if id_column not in self._tables.get(table, []):
+                return
+
+            self._connection.execute(
+                f"DELETE FROM {self._quote(table)} WHERE {self._quote(id_column)} = ?",
+                [self._to_sql_value(row_id)]
+            )
+            self._bump_version(file_path)
+            self._set_file_state(file_path, dirty=True)
+
+    def has_pending_changes(self, file_path: Path) -> bool:
+        """Check if the table has changes not yet exported to CSV"""
+        with self._lock:
+            state = self._files.get(self._table_name(file_path))
+            return bool(state and state["dirty"])
+
+    def pending_files(self, module_dir: Path) -> List[Path]:
+        """List the data files in a module directory with unexported changes"""
+        with self._lock:
+            return [
+                module_dir / state["filename"]
+                for state in self._files.values()
+                if state["dirty"] and state["module"] == module_dir.name
+            ]
+
+    def compact(self, file_path: Path,
+                prepare: Optional[Callable[[pd.DataFrame], None]] = None) -> bool:
+        """Export the table to its CSV file"""
+        with self._lock:
+            if not self.has_pending_changes(file_path):
+                return False
+
+            df = self.read(file_path)
+            if df is None:
+                df = pd.DataFrame()
+            if prepare is not None:
+                prepare(df)
+                # Reload the table from the prepared frame so it holds what the export holds
+                self.write(file_path, df)
+            else:
+                super().write(file_path, df)
+                self._set_file_state(file_path, dirty=False)
+            self.logger.debug(f"Exported {self._table_name(file_path)} to {file_path}")
+            return True
+
+    def _load_catalog(self):
+        """Load table columns and export state from the database"""
+        for table_name, module, filename, mtime_ns, size, dirty in self._connection.execute(
+                "SELECT table_name, module, filename, csv_mtime_ns, csv_size, dirty FROM _csv_files"):
+            self._files[table_name] = {
+                "module": module,
+                "filename": filename,
+                "csv_sig": (mtime_ns, size) if mtime_ns is not None else None,
+                "dirty": bool(dirty),
+            }
+            self._tables[table_name] = self._table_columns(table_name)
+
+    def _ensure_imported(self, file_path: Path) -> bool:
+        """Import the CSV file if it has no table or changed outside the app"""
+        table = self._table_name(file_path)
+        csv_sig = self._signature(file_path)
+        state = self._files.get(table)
+
+        if csv_sig is None:
+            return False
+        if state is not None and (state["csv_sig"] == csv_sig or state["dirty"]):
+            if state["dirty"] and state["csv_sig"] != csv_sig:
+                self.logger.warning(f"{file_path} changed outside the app while {table} has unexported changes, keeping the database copy")
+            return False
+
+        df = pd.read_csv(file_path, encoding='utf-8') if csv_sig[1] > 0 else pd.DataFrame()
+        self._replace_table(table, df)
+        self._set_file_state(file_path, dirty=False)
+        self.logger.debug(f"Imported {file_path} into table {table} ({len(df)} rows)")
+        return True
+
+    def _replace_table(self, table: str, data: pd.DataFrame):
+        """Drop and recreate a table with the given frame's rows"""
+        columns = [str(col) for col in data.columns]
+        self._versions[table] = self._versions.get(table, 0) + 1
+        with self._connection:
+            self._connection.execute(f"DROP TABLE IF EXISTS {self._quote(table)}")
+            self._tables[table] = []
+            if not columns:
+                return
+
+            self._create_table(table, columns)
+            records = (
+                [self._to_sql_value(value) for value in row]
+                for row in data.itertuples(index=False, name=None)
+            )
+            self._connection.executemany(
+                f"INSERT INTO {self._quote(table)} VALUES ({', '.join('?' for _ in columns)})",
+                records
+            )
+
+    def _create_table(self, table: str, columns: List[str]):
+        """Create an untyped table (CSV-like affinity) and its indexes"""
+        self._connection.execute(
+            f"CREATE TABLE {self._quote(table)} ({', '.join(self._quote(col) for col in columns)})"
+        )
+        self._tables[table] = list(columns)
+        for column in columns:
+            self._create_index(table, column)
+
+    def _ensure_columns(self, table: str, columns: List[str]):
+        """Create the table or add any missing columns"""
+        existing = self._tables.get(table, [])
+        if not existing:
+            self._create_table(table, columns)
+            return
+
+        for column in columns:
+            if column not in existing:
+                self._connection.execute(f"ALTER TABLE {self._quote(table)} ADD COLUMN {self._quote(column)}")
+                existing.append(column)
+                self._create_index(table, column)
+
+    def _create_index(self, table: str, column: str):
+        """Index the column if it is one of the commonly queried ones"""
+        if column in self.indexed_columns:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._quote(f'idx_{table}_{column}')} "
+                f"ON {self._quote(table)} ({self._quote(column)})"
+            )
+
+    def _table_columns(self, table: str) -> List[str]:
+        """Read a table's column names from the database"""
+        rows = self._connection.execute(f"PRAGMA table_info({self._quote(table)})").fetchall()
+        return [row[1] for row in rows]
+
+    def _bump_version(self, file_path: Path):
+        """Record that a table's rows changed"""
+        table = self._table_name(file_path)
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    def _set_file_state(self, file_path: Path, dirty: bool):
+        """Record the CSV export signature and dirty flag for a table"""
+        table = self._table_name(file_path)
+        state = self._files.get(table, {"module": file_path.parent.name, "filename": file_path.name})
+        if not dirty:
+            state["csv_sig"] = self._signature(file_path)
+        else:
+            state.setdefault("csv_sig", None)
+        state["dirty"] = dirty
+        self._files[table] = state
+
+        csv_sig = state["csv_sig"] or (None, None)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO _csv_files "
+            "(table_name, module, filename, csv_mtime_ns, csv_size, dirty) VALUES (?, ?, ?, ?, ?, ?)",
+            (table, state["module"], state["filename"], csv_sig[0], csv_sig[1], int(dirty))
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _table_name(file_path: Path) -> str:
+        """Get the table name for a data file"""
+        return f"{file_path.parent.name}/{file_path.name}"
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        """Quote an SQL identifier"""
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    @staticmethod
+    def _to_sql_value(value: Any) -> Any:
+        """Convert a value to what the CSV file would have held"""
+        if value is None or (isinstance(value, str) and value == ''):
+            return None
+        if isinstance(value, (bool, np.bool_)):
+            return str(bool(value))
+        if isinstance(value, (pd.Timestamp, datetime)):
+            return None if pd.isna(value) else _format_timestamp(value)
+        if isinstance(value, date):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and np.isnan(value):
+            return None
+        if isinstance(value, (int, float, str, bytes)):
+            return value
+        return None if pd.isna(value) else str(value)
+
+    @staticmethod
+    def _restore_csv_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Infer column dtypes the same way pandas.read_csv would"""
+        for col in df.columns:
+            series = df[col]
+            if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+                continue
+
+            non_null = series.dropna()
+            if non_null.empty:
+                df[col] = series.astype('float64')
+            elif non_null.isin(['True', 'False']).all():
+                mapped = series.map({'True': True, 'False': False})
+                df[col] = mapped.astype(bool) if len(non_null) == len(series) else mapped
+            else:
+                try:
+                    df[col] = pd.to_numeric(series)
+                except (ValueError, TypeError):
+                    pass
+        return df
+
+
+STORAGE_BACKENDS = {
+    CSVStorageBackend.name: CSVStorageBackend,
+    JournalStorageBackend.name: JournalStorageBackend,
+    SQLiteStorageBackend.name: SQLiteStorageBackend,
+}
+
+
+def create_storage_backend(name: str, data_dir: Optional[Path] = None) -> CSVStorageBackend:
+    """Create a storage backend by its config name"""
+    backend_class = STORAGE_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return backend_class(data_dir)
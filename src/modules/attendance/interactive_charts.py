@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QFont, QPalette
 
+from ...ui.plotly_host import acquire_chart_view
+
 try:
     import plotly.graph_objects as go
     import plotly.express as px
@@ -144,7 +146,7 @@ class InteractiveChartWidget(QWidget):
         # Chart section
         if PLOTLY_AVAILABLE and WEBENGINE_AVAILABLE:
             print(f"Setting up WebEngine view for {self.__class__.__name__}")
-            self.web_view = QWebEngineView()
+            self.web_view = acquire_chart_view(self)
 
             # APPLIED TO DO ANALYTICS APPROACH: Set reasonable size for web view with natural expansion
             self.web_view.setMinimumSize(380, 300)  # Reasonable size for chart visibility
@@ -203,49 +205,13 @@ class InteractiveChartWidget(QWidget):
         )
         return fig
 
-    def generate_theme_aware_html(self, fig):
-        """Generate theme-aware HTML for Plotly charts - CRITICAL FIX for chart backgrounds"""
+    def render_figure(self, fig):
+        """Push a Plotly figure to the pooled chart view"""
+        if not hasattr(self, 'web_view'):
+            return
         colors = self.get_theme_colors()
-        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))  # Default to white for light theme
-
-        # Generate base HTML
-        html_str = fig.to_html(include_plotlyjs='cdn')
-
-        # CRITICAL FIX: Inject STRONGER theme-aware CSS to override ALL Plotly styling
-        theme_css = f"""
-        <style>
-            /* CRITICAL: Override ALL possible background sources with maximum specificity */
-            html, body {{
-                background-color: {background} !important;
-                background: {background} !important;
-                margin: 0 !important;
-                padding: 0 !important;
-            }}
-
-            /* Target all Plotly containers */
-            .plotly-graph-div,
-            .plotly-graph-div > div,
-            .js-plotly-plot,
-            .plot-container,
-            .svg-container {{
-                background-color: {background} !important;
-                background: {background} !important;
-            }}
-
-            /* Override any remaining containers */
-            div[id*="plotly"] {{
-                background-color: {background} !important;
-                background: {background} !important;
-            }}
-        </style>
-        """
-
-        # Insert CSS right after <head> tag
-        head_end = html_str.find('</head>')
-        if head_end != -1:
-            html_str = html_str[:head_end] + theme_css + html_str[head_end:]
-
-        return html_str
+        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))
+        self.web_view.show_figure(fig, background)
 
     def setup_controls(self):
         """Setup control widgets - to be implemented by subclasses"""
@@ -273,10 +239,9 @@ class InteractiveChartWidget(QWidget):
                 margin=dict(l=60, r=40, t=80, b=60)
             )
 
-            # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+            # CRITICAL FIX: Apply theme colors and render
             fig = self.apply_theme_to_plotly_fig(fig)
-            html_str = self.generate_theme_aware_html(fig)
-            self.web_view.setHtml(html_str)
+            self.render_figure(fig)
 
     def update_chart(self, data: pd.DataFrame):
         """Update chart with new data - to be implemented by subclasses"""
@@ -396,10 +361,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def _create_period_wise_chart(self, data: pd.DataFrame):
         """Create pie chart by period-wise attendance"""
@@ -430,10 +394,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_semester_wise_chart(self, data: pd.DataFrame):
         """Create pie chart by semester-wise attendance"""
@@ -471,10 +434,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveTimeSeriesWidget(InteractiveChartWidget):
@@ -656,10 +618,9 @@ class InteractiveTimeSeriesWidget(InteractiveChartWidget):
         fig.update_xaxes(title_text="Periods", row=2, col=1)
         fig.update_yaxes(title_text="Present Days", row=2, col=1)
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveBarChartWidget(InteractiveChartWidget):
@@ -799,10 +760,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             showlegend=False
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_period_comparison_chart(self, data: pd.DataFrame):
         """Create bar chart comparing period-wise attendance"""
@@ -849,10 +809,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             showlegend=False
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_semester_comparison_chart(self, data: pd.DataFrame):
         """Create bar chart comparing semester-wise attendance"""
@@ -906,10 +865,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             showlegend=False
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveHeatmapWidget(InteractiveChartWidget):
@@ -1005,10 +963,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_weekday_month_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing attendance patterns by weekday vs month"""
@@ -1046,10 +1003,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_period_day_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing attendance patterns by period vs day"""
@@ -1107,10 +1063,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveScatterPlotWidget(InteractiveChartWidget):
@@ -1240,10 +1195,9 @@ class InteractiveScatterPlotWidget(InteractiveChartWidget):
             yaxis_title=self.y_metric.replace('_', ' ').title()
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _prepare_scatter_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Prepare data for scatter plot visualization"""
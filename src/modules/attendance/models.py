@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .simple_models import compact_module_records, compact_pending_records
+
 
 class AttendanceStatus(Enum):
     """Attendance status enumeration"""
@@ -276,6 +278,9 @@ class AttendanceDataModel:
             self.semesters_filename = "semester_config.csv"
             self.logger.debug(f"Module: {self.module_name}, Records: {self.records_filename}, Semesters: {self.semesters_filename}")
 
+            # Sync and backups compact the module through the data manager
+            self.data_manager.register_compaction_hook(self.module_name, compact_module_records)
+
             # Default columns for attendance records CSV
             self.records_columns = [
                 'id', 'date', 'day', 'semester', 'academic_year',
@@ -332,9 +337,16 @@ class AttendanceDataModel:
             self.logger.error(f"Error initializing default semester: {e}")
             # Don't raise the error to prevent initialization failure
 
+    def _compact_pending_records(self):
+        """Fold saves still in the attendance tracker's append log into the CSV"""
+        records_file = self.data_manager.get_file_path(self.module_name, self.records_filename)
+        if not compact_pending_records(str(records_file)):
+            self.logger.warning("Could not compact pending attendance saves")
+
     def get_all_records(self) -> pd.DataFrame:
         """Get all attendance records"""
         try:
+            self._compact_pending_records()
             df = self.data_manager.read_csv(
                 self.module_name,
                 self.records_filename,
@@ -376,6 +388,7 @@ class AttendanceDataModel:
             self.data_manager.error_occurred.emit(f"Validation errors: {', '.join(errors)}")
             return False
 
+        self._compact_pending_records()
         return self.data_manager.append_row(
             self.module_name,
             self.records_filename,
@@ -390,6 +403,7 @@ class AttendanceDataModel:
             self.data_manager.error_occurred.emit(f"Validation errors: {', '.join(errors)}")
             return False
 
+        self._compact_pending_records()
         return self.data_manager.update_row(
             self.module_name,
             self.records_filename,
@@ -12,6 +12,19 @@ from dataclasses import dataclass, asdict
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import numpy as np
+
+
+def parse_holiday_dates(values) -> np.ndarray:
+    """Convert holiday date strings (plain or ISO datetime) to a datetime64[D] array"""
+    dates = []
+    for value in values:
+        try:
+            dates.append(np.datetime64(str(value)[:10], 'D'))
+        except ValueError:
+            continue
+    return np.array(dates, dtype='datetime64[D]')
+
 
 @dataclass
 class SemesterInfo:
@@ -58,36 +71,29 @@ class SemesterInfo:
         except ValueError:
             return False
     
-    def get_working_days(self) -> int:
-        """Calculate total working days (excluding weekends and holidays)"""
+    def get_working_days(self, extra_holidays: Optional[np.ndarray] = None) -> int:
+        """Calculate total working days (excluding weekends and holidays)
+
+        ``extra_holidays`` adds calendar-wide holidays (see
+        SemesterManager.get_holiday_calendar) to the semester's own list.
+        """
         try:
             start = datetime.strptime(self.start_date, '%Y-%m-%d').date()
             end = datetime.strptime(self.end_date, '%Y-%m-%d').date()
-            
-            working_days = 0
-            current_date = start
-            
-            holiday_dates = set()
-            for holiday_str in self.holidays:
-                try:
-                    holiday_date = datetime.strptime(holiday_str, '%Y-%m-%d').date()
-                    holiday_dates.add(holiday_date)
-                except ValueError:
-                    continue
-            
-            while current_date <= end:
-                # Skip weekends (Saturday=5, Sunday=6)
-                if current_date.weekday() < 5:  # Monday=0 to Friday=4
-                    # Skip holidays
-                    if current_date not in holiday_dates:
-                        working_days += 1
-                current_date += timedelta(days=1)
-            
-            return working_days
-            
         except ValueError:
             return 0
-    
+
+        if end < start:
+            return 0
+
+        holidays = parse_holiday_dates(self.holidays)
+        if extra_holidays is not None and len(extra_holidays):
+            holidays = np.concatenate([holidays, extra_holidays])
+
+        # Monday-Friday business days in [start, end], skipping holidays
+        return int(np.busday_count(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1,
+                                   holidays=holidays))
+
     def get_semester_name(self) -> str:
         """Get human-readable semester name"""
         year_names = {1: "First", 2: "Second", 3: "Third", 4: "Fourth"}
@@ -102,8 +108,11 @@ class SemesterManager:
         self.data_dir = Path(data_dir)
         self.attendance_dir = self.data_dir / "attendance"
         self.semesters_file = self.attendance_dir / "semesters.json"
+        self.holidays_file = self.data_dir / "holidays.json"
         self.logger = logging.getLogger(__name__)
         self.config = config
+        self._holiday_calendar: Optional[np.ndarray] = None
+        self._holiday_signature: Optional[tuple] = None
 
         # Ensure directory exists
         os.makedirs(self.attendance_dir, exist_ok=True)
@@ -173,6 +182,31 @@ class SemesterManager:
         except Exception as e:
             self.logger.error(f"Error creating default semesters: {e}")
     
+    def get_holiday_calendar(self) -> np.ndarray:
+        """Get the saved holidays (data/holidays.json) as a datetime64[D] array"""
+        try:
+            stat = self.holidays_file.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = ()
+
+        if self._holiday_calendar is None or signature != self._holiday_signature:
+            holidays = []
+            if signature:
+                try:
+                    with open(self.holidays_file, 'r', encoding='utf-8') as f:
+                        holidays = [holiday.get('date', '') for holiday in json.load(f)]
+                except Exception as e:
+                    self.logger.warning(f"Could not load holidays: {e}")
+            self._holiday_calendar = np.unique(parse_holiday_dates(holidays))
+            self._holiday_signature = signature
+
+        return self._holiday_calendar
+
+    def get_working_days(self, semester: SemesterInfo) -> int:
+        """Get a semester's working days, excluding weekends and all saved holidays"""
+        return semester.get_working_days(self.get_holiday_calendar())
+
     def get_all_semesters(self) -> List[SemesterInfo]:
         """Get all semester information"""
         try:
@@ -280,32 +314,28 @@ class SemesterManager:
 
             # Get attendance records for this semester
             attendance_manager = SimpleAttendanceDataManager(str(self.data_dir))
-            all_records = attendance_manager.get_all_records()
+            arrays = attendance_manager.store.get_arrays()
 
             # Filter records for this semester - USE SEMESTER FIELD, NOT DATE RANGE
-            semester_records = []
-            for record in all_records:
-                # Filter by actual semester field in the record, not by date range
-                if record.semester == semester_number:
-                    semester_records.append(record)
-            
+            in_semester = arrays['semester'] == semester_number
+
             # Calculate statistics properly
             # Get theoretical working days from semester dates (excluding weekends and holidays)
-            total_working_days = semester.get_working_days()
+            total_working_days = self.get_working_days(semester)
 
             # Get actual attendance data
-            holiday_records = [r for r in semester_records if r.is_holiday]
-            non_holiday_records = [r for r in semester_records if not r.is_holiday]
+            holidays = in_semester & arrays['is_holiday']
+            non_holidays = in_semester & ~arrays['is_holiday']
 
             # Calculate attendance statistics
-            total_attendance_days = len(non_holiday_records)  # Days with attendance records
-            present_days = len([r for r in non_holiday_records if r.present_periods > 0])
-            absent_days = len([r for r in non_holiday_records if r.present_periods == 0])
-            holiday_days = len(holiday_records)
+            total_attendance_days = int(non_holidays.sum())  # Days with attendance records
+            present_days = int((non_holidays & (arrays['present_periods'] > 0)).sum())
+            absent_days = int((non_holidays & (arrays['present_periods'] == 0)).sum())
+            holiday_days = int(holidays.sum())
 
             # Calculate percentage based on period attendance (more accurate)
-            total_periods = sum(r.total_periods for r in non_holiday_records)
-            present_periods = sum(r.present_periods for r in non_holiday_records)
+            total_periods = int(arrays['total_periods'][non_holidays].sum())
+            present_periods = int(arrays['present_periods'][non_holidays].sum())
 
             # Use period-based percentage for more accuracy
             if total_periods > 0:
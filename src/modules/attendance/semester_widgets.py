@@ -319,7 +319,7 @@ class SemesterManagementWidget(QWidget):
                 self.semesters_table.setItem(row, 4, QTableWidgetItem(semester.end_date))
                 
                 # Working days
-                working_days = semester.get_working_days()
+                working_days = self.semester_manager.get_working_days(semester)
                 self.semesters_table.setItem(row, 5, QTableWidgetItem(str(working_days)))
                 
                 # Status
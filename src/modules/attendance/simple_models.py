@@ -4,13 +4,19 @@ Simplified Attendance Models - No Pandas Dependencies
 Uses basic CSV operations to avoid recursion issues
 """
 
+import atexit
+import copy
 import csv
+import json
 import os
+import threading
 from datetime import datetime, date
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, asdict
 import logging
 
+import numpy as np
+
 
 @dataclass
 class SimpleAttendanceRecord:
@@ -141,6 +147,259 @@ class SimpleAttendanceRecord:
         return record
 
 
+# Columns of attendance_records.csv
+ATTENDANCE_HEADERS = [
+    'id', 'date', 'day', 'semester', 'academic_year',
+    'period_1', 'period_2', 'period_3', 'period_4',
+    'period_5', 'period_6', 'period_7', 'period_8',
+    'total_periods', 'present_periods', 'percentage',
+    'is_holiday', 'is_unofficial_leave', 'notes',
+    'created_at', 'updated_at'
+]
+
+
+class AttendanceRecordStore:
+    """In-memory, date-indexed view of one attendance CSV with an append log
+
+    The CSV is parsed once. Records are kept in file order with a
+    date -> position index, so lookups are O(1). An upsert updates the
+    index and appends one JSON line to ``<records>.log`` instead of
+    rewriting the CSV. The log is folded back into the CSV (compaction)
+    once it holds ``compact_threshold`` entries, on delete, at exit, when
+    the store is loaded with a log left behind, and whenever another reader
+    of the CSV calls compact_pending_records(). If the CSV changes on
+    disk (e.g. a sync download), the store reloads it and replays the log.
+    """
+
+    compact_threshold = 32
+
+    def __init__(self, records_file: str, headers: List[str]):
+        self.records_file = records_file
+        self.log_file = os.path.splitext(records_file)[0] + ".log"
+        self.headers = headers
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.lock = threading.RLock()
+
+        self.records: List[SimpleAttendanceRecord] = []
+        self.index: Dict[str, int] = {}       # date -> position of its first record
+        self.log_entries = 0
+        self.version = 0                       # bumped on every change, keys derived caches
+        self._signature: Optional[tuple] = None
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._arrays_version = -1
+
+    def ensure_loaded(self):
+        """Load the CSV (and replay the log) if it is not loaded or changed on disk"""
+        with self.lock:
+            if self._signature is None or self._signature != self._file_signature():
+                self._load()
+
+    def get(self, date_str: str) -> Optional[SimpleAttendanceRecord]:
+        """Get the record for a date"""
+        with self.lock:
+            self.ensure_loaded()
+            position = self.index.get(date_str)
+            return copy.copy(self.records[position]) if position is not None else None
+
+    def get_all(self) -> List[SimpleAttendanceRecord]:
+        """Get copies of all records in file order"""
+        with self.lock:
+            self.ensure_loaded()
+            return [copy.copy(record) for record in self.records]
+
+    def upsert(self, record: SimpleAttendanceRecord) -> bool:
+        """Insert or replace the record for ``record.date``, assigning id and timestamps"""
+        with self.lock:
+            self.ensure_loaded()
+
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            position = self.index.get(record.date)
+            if position is not None:
+                record.id = self.records[position].id
+                record.updated_at = now
+            else:
+                record.id = max((r.id for r in self.records), default=0) + 1
+                record.created_at = now
+                record.updated_at = now
+
+            try:
+                with open(self.log_file, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(record.to_dict()) + "\n")
+            except Exception as e:
+                self.logger.error(f"Error appending to attendance log: {e}")
+                return False
+
+            self._apply(copy.copy(record))
+            self.log_entries += 1
+            if self.log_entries >= self.compact_threshold:
+                return self.compact()
+            return True
+
+    def delete(self, date_str: str) -> bool:
+        """Remove all records for a date and rewrite the CSV"""
+        with self.lock:
+            self.ensure_loaded()
+            self.records = [record for record in self.records if record.date != date_str]
+            self._reindex()
+            return self.compact(force=True)
+
+    def compact(self, force: bool = False) -> bool:
+        """Write the current records to the CSV and clear the log"""
+        with self.lock:
+            if self._signature is None or (not force and not self.log_entries):
+                return True
+            temp_file = self.records_file + ".tmp"
+            try:
+                with open(temp_file, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=self.headers)
+                    writer.writeheader()
+                    for record in self.records:
+                        writer.writerow(record.to_dict())
+                os.replace(temp_file, self.records_file)
+                if os.path.exists(self.log_file):
+                    os.remove(self.log_file)
+            except Exception as e:
+                self.logger.error(f"Error compacting attendance records: {e}")
+                return False
+
+            self.log_entries = 0
+            self._signature = self._file_signature()
+            return True
+
+    def get_last(self) -> Optional[SimpleAttendanceRecord]:
+        """Get the last record in file order"""
+        with self.lock:
+            self.ensure_loaded()
+            return copy.copy(self.records[-1]) if self.records else None
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Get the records as NumPy columns for vectorized summaries"""
+        with self.lock:
+            self.ensure_loaded()
+            if self._arrays is None or self._arrays_version != self.version:
+                records = self.records
+                self._arrays = {
+                    'semester': np.array([r.semester for r in records], dtype=np.int64),
+                    'total_periods': np.array([r.total_periods for r in records], dtype=np.int64),
+                    'present_periods': np.array([r.present_periods for r in records], dtype=np.int64),
+                    'is_holiday': np.array([r.is_holiday for r in records], dtype=bool),
+                    'is_unofficial_leave': np.array([r.is_unofficial_leave for r in records], dtype=bool),
+                }
+                self._arrays_version = self.version
+            return self._arrays
+
+    def _load(self):
+        """Read the CSV, replay the log, and compact if the log had entries"""
+        records = []
+        if os.path.exists(self.records_file):
+            try:
+                with open(self.records_file, 'r', newline='', encoding='utf-8') as file:
+                    for row in csv.DictReader(file):
+                        try:
+                            records.append(SimpleAttendanceRecord.from_dict(row))
+                        except Exception as e:
+                            self.logger.warning(f"Skipping invalid record: {e}")
+            except Exception as e:
+                self.logger.error(f"Error reading records: {e}")
+
+        self.records = records
+        self._reindex()
+        self._signature = self._file_signature()
+
+        replayed = 0
+        if os.path.exists(self.log_file):
+            try:
+                with open(self.log_file, 'r', encoding='utf-8') as file:
+                    for line in file:
+                        if not line.strip():
+                            continue
+                        try:
+                            self._apply(SimpleAttendanceRecord.from_dict(json.loads(line)))
+                            replayed += 1
+                        except Exception as e:
+                            self.logger.warning(f"Skipping invalid attendance log entry: {e}")
+            except Exception as e:
+                self.logger.error(f"Error reading attendance log: {e}")
+
+        self.log_entries = replayed
+        if replayed:
+            self.compact()
+
+    def _apply(self, record: SimpleAttendanceRecord):
+        """Put a record into the in-memory index"""
+        position = self.index.get(record.date)
+        if position is not None:
+            self.records[position] = record
+        else:
+            self.index[record.date] = len(self.records)
+            self.records.append(record)
+        self.version += 1
+
+    def _reindex(self):
+        """Rebuild the date index, keeping the first record of each date"""
+        self.index = {}
+        for position, record in enumerate(self.records):
+            self.index.setdefault(record.date, position)
+        self.version += 1
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Identify the CSV's current contents on disk"""
+        try:
+            stat = os.stat(self.records_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return ()
+
+
+_record_stores: Dict[str, AttendanceRecordStore] = {}
+_record_stores_lock = threading.Lock()
+
+
+def get_record_store(records_file: str, headers: List[str]) -> AttendanceRecordStore:
+    """Get the shared record store for an attendance CSV"""
+    key = os.path.abspath(records_file)
+    with _record_stores_lock:
+        store = _record_stores.get(key)
+        if store is None:
+            store = AttendanceRecordStore(records_file, headers)
+            _record_stores[key] = store
+        return store
+
+
+def compact_pending_records(records_file: str) -> bool:
+    """Fold logged upserts for an attendance CSV into the file
+
+    Readers that parse the CSV directly rather than through the store (the
+    pandas AttendanceDataModel, the dashboard, and DataManager.compact_storage
+    through compact_module_records) call this first so they never see saves
+    still waiting in the log.
+    """
+    with _record_stores_lock:
+        store = _record_stores.get(os.path.abspath(records_file))
+    if store is None:
+        if not os.path.exists(os.path.splitext(records_file)[0] + ".log"):
+            return True
+        store = get_record_store(records_file, ATTENDANCE_HEADERS)
+
+    with store.lock:
+        store.ensure_loaded()
+        return store.compact()
+
+
+def compact_module_records(module_dir) -> bool:
+    """DataManager compaction hook folding the attendance log into its CSV"""
+    return compact_pending_records(os.path.join(str(module_dir), "attendance_records.csv"))
+
+
+def _compact_record_stores():
+    """Fold pending log entries into their CSVs at exit"""
+    for store in list(_record_stores.values()):
+        store.compact()
+
+
+atexit.register(_compact_record_stores)
+
+
 class SimpleAttendanceDataManager:
     """Simplified data manager using basic CSV operations"""
     
@@ -154,17 +413,13 @@ class SimpleAttendanceDataManager:
         os.makedirs(self.attendance_dir, exist_ok=True)
         
         # CSV headers
-        self.headers = [
-            'id', 'date', 'day', 'semester', 'academic_year',
-            'period_1', 'period_2', 'period_3', 'period_4',
-            'period_5', 'period_6', 'period_7', 'period_8',
-            'total_periods', 'present_periods', 'percentage',
-            'is_holiday', 'is_unofficial_leave', 'notes',
-            'created_at', 'updated_at'
-        ]
+        self.headers = list(ATTENDANCE_HEADERS)
         
         # Initialize CSV file if it doesn't exist
         self._initialize_csv()
+
+        # Date-indexed records shared by every manager of this file
+        self.store = get_record_store(self.records_file, self.headers)
     
     def _initialize_csv(self):
         """Initialize CSV file with headers if it doesn't exist"""
@@ -179,85 +434,29 @@ class SimpleAttendanceDataManager:
     
     def get_all_records(self) -> List[SimpleAttendanceRecord]:
         """Get all attendance records"""
-        records = []
-        try:
-            if not os.path.exists(self.records_file):
-                return records
-            
-            with open(self.records_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    try:
-                        record = SimpleAttendanceRecord.from_dict(row)
-                        records.append(record)
-                    except Exception as e:
-                        self.logger.warning(f"Skipping invalid record: {e}")
-                        continue
-        
-        except Exception as e:
-            self.logger.error(f"Error reading records: {e}")
-        
-        return records
-    
+        return self.store.get_all()
+
     def get_record_by_date(self, target_date: str) -> Optional[SimpleAttendanceRecord]:
         """Get record for specific date"""
-        records = self.get_all_records()
-        for record in records:
-            if record.date == target_date:
-                return record
-        return None
-    
+        return self.store.get(target_date)
+
     def save_record(self, record: SimpleAttendanceRecord) -> bool:
         """Save or update a record"""
         try:
-            records = self.get_all_records()
-            
-            # Check if record exists
-            existing_index = None
-            for i, existing_record in enumerate(records):
-                if existing_record.date == record.date:
-                    existing_index = i
-                    break
-            
-            # Set timestamps
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            if existing_index is not None:
-                # Update existing
-                record.id = records[existing_index].id
-                record.updated_at = now
-                records[existing_index] = record
-            else:
-                # Add new
-                record.id = max([r.id for r in records], default=0) + 1
-                record.created_at = now
-                record.updated_at = now
-                records.append(record)
-            
-            # Write all records back to CSV
-            return self._write_all_records(records)
-        
+            return self.store.upsert(record)
         except Exception as e:
             self.logger.error(f"Error saving record: {e}")
             return False
-    
-    def _write_all_records(self, records: List[SimpleAttendanceRecord]) -> bool:
-        """Write all records to CSV"""
-        try:
-            with open(self.records_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=self.headers)
-                writer.writeheader()
-                for record in records:
-                    writer.writerow(record.to_dict())
-            return True
-        except Exception as e:
-            self.logger.error(f"Error writing records: {e}")
-            return False
-    
+
+    def compact(self) -> bool:
+        """Write pending saves from the append log into the CSV"""
+        return self.store.compact()
+
     def get_summary(self) -> Dict[str, Any]:
         """Get attendance summary with proper working days and period-based calculation"""
-        records = self.get_all_records()
+        arrays = self.store.get_arrays()
 
-        if not records:
+        if not len(arrays['semester']):
             return {
                 'total_days': 0,
                 'working_days': 0,
@@ -272,27 +471,27 @@ class SimpleAttendanceDataManager:
             }
 
         # Calculate day-based statistics
-        total_days = len(records)
-        holiday_days = len([r for r in records if r.is_holiday])
+        total_days = len(arrays['semester'])
+        holiday_days = int(arrays['is_holiday'].sum())
         working_days = total_days - holiday_days  # Working days = total days - holidays
 
         # Calculate period-based statistics (more accurate for attendance)
-        working_records = [r for r in records if not r.is_holiday and not r.is_unofficial_leave]
+        working = ~arrays['is_holiday'] & ~arrays['is_unofficial_leave']
 
-        total_periods = sum(r.total_periods for r in working_records)
-        present_periods = sum(r.present_periods for r in working_records)
+        total_periods = int(arrays['total_periods'][working].sum())
+        present_periods = int(arrays['present_periods'][working].sum())
 
         # Calculate attendance percentage based on periods, not days
         overall_percentage = (present_periods / total_periods * 100) if total_periods > 0 else 0.0
 
         # Calculate present/absent days for display
-        present_days = len([r for r in working_records if r.present_periods > 0])
-        absent_days = len([r for r in working_records if r.present_periods == 0])
+        present_days = int((working & (arrays['present_periods'] > 0)).sum())
+        absent_days = int((working & (arrays['present_periods'] == 0)).sum())
 
         # Get current semester info
-        current_record = records[-1] if records else None
-        current_semester = current_record.semester if current_record else 1
-        academic_year = current_record.academic_year if current_record else f"{datetime.now().year}-{datetime.now().year + 1}"
+        current_record = self.store.get_last()
+        current_semester = current_record.semester
+        academic_year = current_record.academic_year
 
         return {
             'total_days': total_days,
@@ -313,24 +512,8 @@ class SimpleAttendanceDataManager:
             if not os.path.exists(self.records_file):
                 return False
 
-            # Read all records
-            records = []
-            with open(self.records_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if row['date'] != date_str:  # Keep all records except the one to delete
-                        records.append(row)
-
-            # Write back the filtered records
-            with open(self.records_file, 'w', newline='', encoding='utf-8') as file:
-                if records:
-                    writer = csv.DictWriter(file, fieldnames=self.headers)
-                    writer.writeheader()
-                    writer.writerows(records)
-                else:
-                    # If no records left, just write headers
-                    writer = csv.writer(file)
-                    writer.writerow(self.headers)
+            if not self.store.delete(date_str):
+                return False
 
             self.logger.info(f"Deleted attendance record for date: {date_str}")
             return True
@@ -18,7 +18,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QDate, QTimer
 from PySide6.QtGui import QFont, QColor, QTextCharFormat, QPainter, QBrush
 
-from .simple_models import SimpleAttendanceDataManager, SimpleAttendanceRecord
+from .simple_models import SimpleAttendanceDataManager, SimpleAttendanceRecord, compact_module_records
 from src.ui.themes.utils import create_calendar_text_format, get_calendar_color_for_state, get_current_theme, get_calendar_color_with_alpha
 
 
@@ -107,6 +107,7 @@ class SimpleAttendanceTrackerWidget(QWidget):
 
         # Initialize simple data manager
         self.attendance_manager = SimpleAttendanceDataManager(str(data_manager.data_dir))
+        data_manager.register_compaction_hook("attendance", compact_module_records)
 
         # Current state
         self.current_date = date.today()
@@ -733,9 +733,10 @@ class BudgetDataModel:
                              planned_amount=0.0, description="Miscellaneous expenses", is_essential=False)
             ]
 
-            # Add each default category
-            for category in default_categories:
-                self.add_budget_category(category)
+            # Add each default category in a single write
+            with self.data_manager.transaction(self.module_name):
+                for category in default_categories:
+                    self.add_budget_category(category)
 
             self.logger.info(f"Initialized {len(default_categories)} default budget categories")
 
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QDateEdit, QTextEdit,
     QCheckBox, QFrame, QGroupBox, QScrollArea, QTabWidget,
-    QProgressBar, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QProgressBar, QSpinBox, QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
     QAbstractItemView, QSizePolicy, QButtonGroup, QDoubleSpinBox,
     QMessageBox, QDialog, QDialogButtonBox, QSplitter
 )
@@ -21,6 +21,7 @@ import pandas as pd
 
 from .models import BudgetPlan, BudgetCategory, BudgetDataModel, BudgetType, CategoryType
 from ..income.models import IncomeDataModel
+from ...ui.table_models import DataFrameTableModel, TableColumn
 
 
 class SimplifiedBudgetWidget(QWidget):
@@ -1200,8 +1201,8 @@ class BudgetSummaryWidget(QFrame):
         self.actual_expenses_label.setText(f"Actual Expenses: ₹{summary['total_actual_expenses']:,.2f}")
 
 
-class BudgetPlanTableWidget(QTableWidget):
-    """Table widget for displaying budget plans"""
+class BudgetPlanTableWidget(QTableView):
+    """Table view for displaying budget plans"""
     
     plan_selected = Signal(int)  # Emits plan ID
     
@@ -1211,15 +1212,29 @@ class BudgetPlanTableWidget(QTableWidget):
     
     def setup_table(self):
         """Setup the table"""
+        def rupees(value):
+            return f"₹{float(value):,.2f}"
+
+        def health_color(score):
+            return "#28a745" if score >= 80 else "#ffc107" if score >= 60 else "#dc3545"
+
         # Define columns
-        self.columns = [
-            'Name', 'Type', 'Period Start', 'Period End', 'Planned Income',
-            'Actual Income', 'Planned Expenses', 'Actual Expenses',
-            'Health Score', 'On Track'
-        ]
-        
-        self.setColumnCount(len(self.columns))
-        self.setHorizontalHeaderLabels(self.columns)
+        self.plan_model = DataFrameTableModel([
+            TableColumn('name', "Name"),
+            TableColumn('budget_type', "Type"),
+            TableColumn('period_start', "Period Start", sort_as='date'),
+            TableColumn('period_end', "Period End", sort_as='date'),
+            TableColumn('total_income_planned', "Planned Income", rupees, sort_as='number'),
+            TableColumn('total_income_actual', "Actual Income", rupees, sort_as='number'),
+            TableColumn('total_expenses_planned', "Planned Expenses", rupees, sort_as='number'),
+            TableColumn('total_expenses_actual', "Actual Expenses", rupees, sort_as='number'),
+            TableColumn('budget_health_score', "Health Score", lambda score: f"{float(score):.1f}%",
+                        sort_as='number', foreground=health_color),
+            TableColumn('is_on_track', "On Track", lambda on_track: "✅ Yes" if on_track else "❌ No",
+                        sort_as=None, foreground=lambda on_track: "#28a745" if on_track else "#dc3545"),
+        ], self)
+        self.columns = [column.header for column in self.plan_model.columns]
+        self.setModel(self.plan_model)
         
         # Table settings
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -1234,63 +1249,19 @@ class BudgetPlanTableWidget(QTableWidget):
             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
         
         # Connect selection
-        self.itemSelectionChanged.connect(self.on_selection_changed)
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
     
     def update_plans(self, df: pd.DataFrame):
         """Update table with budget plan data"""
-        self.setRowCount(len(df))
-        
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            # Name
-            self.setItem(row_idx, 0, QTableWidgetItem(str(row['name'])))
-            
-            # Type
-            self.setItem(row_idx, 1, QTableWidgetItem(str(row['budget_type'])))
-            
-            # Period Start
-            self.setItem(row_idx, 2, QTableWidgetItem(str(row['period_start'])))
-            
-            # Period End
-            self.setItem(row_idx, 3, QTableWidgetItem(str(row['period_end'])))
-            
-            # Planned Income
-            self.setItem(row_idx, 4, QTableWidgetItem(f"₹{row['total_income_planned']:,.2f}"))
-            
-            # Actual Income
-            self.setItem(row_idx, 5, QTableWidgetItem(f"₹{row['total_income_actual']:,.2f}"))
-            
-            # Planned Expenses
-            self.setItem(row_idx, 6, QTableWidgetItem(f"₹{row['total_expenses_planned']:,.2f}"))
-            
-            # Actual Expenses
-            self.setItem(row_idx, 7, QTableWidgetItem(f"₹{row['total_expenses_actual']:,.2f}"))
-            
-            # Health Score
-            health_score = row['budget_health_score']
-            health_item = QTableWidgetItem(f"{health_score:.1f}%")
-            health_color = "#28a745" if health_score >= 80 else "#ffc107" if health_score >= 60 else "#dc3545"
-            health_item.setForeground(QColor(health_color))
-            self.setItem(row_idx, 8, health_item)
-            
-            # On Track
-            on_track = "✅ Yes" if row['is_on_track'] else "❌ No"
-            on_track_item = QTableWidgetItem(on_track)
-            on_track_color = "#28a745" if row['is_on_track'] else "#dc3545"
-            on_track_item.setForeground(QColor(on_track_color))
-            self.setItem(row_idx, 9, on_track_item)
-            
-            # Store plan ID in first column
-            self.item(row_idx, 0).setData(Qt.UserRole, row['id'])
+        self.plan_model.set_dataframe(df)
     
-    def on_selection_changed(self):
+    def on_selection_changed(self, *args):
         """Handle selection change"""
-        current_row = self.currentRow()
+        current_row = self.currentIndex().row()
         if current_row >= 0:
-            item = self.item(current_row, 0)
-            if item:
-                plan_id = item.data(Qt.UserRole)
-                if plan_id:
-                    self.plan_selected.emit(plan_id)
+            plan_id = self.plan_model.row_value(current_row, 'id')
+            if plan_id:
+                self.plan_selected.emit(plan_id)
 
 
 class BudgetPlanEditDialog(QDialog):
@@ -654,19 +654,14 @@ class ExpenseAnalyticsDashboard(QWidget):
             date_range = self.date_range_combo.currentText()
             start_date, end_date = self._get_date_range(date_range)
 
-            # CRITICAL FIX: For "All Time", get all expenses directly to ensure we get all data
+            # Charts only need the chart columns, so skip loading notes/timestamps
             if date_range == "All Time":
                 print("Loading ALL expense data (no date filtering)")
-                all_data = self.expense_model.get_all_expenses()
-                # Filter for expenses only
-                if not all_data.empty and 'type' in all_data.columns:
-                    self.current_data = all_data[all_data['type'] == 'Expense']
-                    print(f"Loaded {len(self.current_data)} expense records from all data")
-                else:
-                    self.current_data = all_data
+                self.current_data = self.expense_model.get_chart_data()
+                print(f"Loaded {len(self.current_data)} expense records from all data")
             else:
                 # Get expense data with date range filtering
-                self.current_data = self.expense_model.get_expenses_by_date_range(start_date, end_date)
+                self.current_data = self.expense_model.get_chart_data(start_date, end_date)
 
             print(f"Loaded {len(self.current_data)} expense records for date range {start_date} to {end_date}")
 
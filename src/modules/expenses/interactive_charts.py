@@ -29,6 +29,7 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.offline as pyo
 
+from ...ui.plotly_host import acquire_chart_view
 from .visualization import ExpenseDataProcessor
 
 
@@ -177,7 +178,8 @@ class PlotlyWidget(QWidget):
 
         if WEB_ENGINE_AVAILABLE:
             # Create web view for Plotly
-            self.web_view = QWebEngineView()
+            self.web_view = acquire_chart_view(self)
+            self.web_view.point_clicked.connect(self.chart_clicked)
             self.web_view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             # CRITICAL FIX: Dynamic sizing - remove fixed constraints, use minimum for usability
             self.web_view.setMinimumSize(450, 400)  # Reasonable minimum for chart readability
@@ -244,73 +246,13 @@ class PlotlyWidget(QWidget):
         )
         return fig
 
-    def generate_theme_aware_html(self, fig):
-        """Generate theme-aware HTML for Plotly charts - CRITICAL FIX for chart backgrounds"""
+    def render_figure(self, fig):
+        """Push a Plotly figure to the pooled chart view"""
+        if not hasattr(self, 'web_view'):
+            return
         colors = self.get_theme_colors()
-        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))  # Default to white for light theme
-
-        print(f"DEBUG: Generating HTML with background: {background}")
-
-        # Generate base HTML
-        html_str = fig.to_html(include_plotlyjs='cdn')
-
-        # CRITICAL FIX: Use SIMPLE CSS that doesn't interfere with chart visibility
-        theme_css = f"""
-        <style>
-            /* Simple background fix without breaking chart elements */
-            html, body {{
-                background-color: {background} !important;
-                margin: 0;
-                padding: 0;
-                width: 100%;
-                height: 100%;
-            }}
-
-            /* Only target main containers, not chart elements */
-            .plotly-graph-div {{
-                background-color: {background} !important;
-                width: 100% !important;
-                height: 100% !important;
-            }}
-
-            /* Ensure chart is visible */
-            .js-plotly-plot {{
-                width: 100% !important;
-                height: 100% !important;
-            }}
-
-            /* Specifically target any black or dark backgrounds */
-            [style*="background-color: black"],
-            [style*="background-color: #000"],
-            [style*="background-color: rgb(0,0,0)"],
-            [style*="background: black"],
-            [style*="background: #000"],
-            [style*="background: rgb(0,0,0)"] {{
-                background-color: {background} !important;
-                background: {background} !important;
-            }}
-        </style>
-        """
-
-        # Insert CSS right after <head> tag
-        head_end = html_str.find('</head>')
-        if head_end != -1:
-            html_str = html_str[:head_end] + theme_css + html_str[head_end:]
-            print(f"DEBUG: Successfully inserted CSS into HTML")
-        else:
-            print(f"DEBUG: Could not find </head> tag in HTML")
-
-        # NUCLEAR OPTION: Also modify the body tag to force background
-        body_start = html_str.find('<body')
-        if body_start != -1:
-            body_end = html_str.find('>', body_start)
-            if body_end != -1:
-                # Replace body tag with styled version
-                new_body_tag = f'<body style="background-color: {background} !important; margin: 0; padding: 0;"'
-                html_str = html_str[:body_start] + new_body_tag + html_str[body_end:]
-                print(f"DEBUG: Modified body tag with background: {background}")
-
-        return html_str
+        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))
+        self.web_view.show_figure(fig, background)
 
     def update_chart(self, fig):
         """Update the chart with a new Plotly figure"""
@@ -319,9 +261,7 @@ class PlotlyWidget(QWidget):
             fig = self.apply_theme_to_plotly_fig(fig)
 
             if WEB_ENGINE_AVAILABLE and hasattr(self, 'web_view'):
-                # CRITICAL FIX: Use theme-aware HTML generation
-                html_str = self.generate_theme_aware_html(fig)
-                self.web_view.setHtml(html_str)
+                self.render_figure(fig)
                 # CRITICAL FIX: Ensure the web view is visible and updated
                 self.web_view.show()
                 self.web_view.update()
@@ -396,7 +336,7 @@ class PlotlyWidget(QWidget):
             </body>
             </html>
             """
-            self.web_view.setHtml(error_html)
+            self.web_view.show_message(error_html)
         elif hasattr(self, 'figure'):
             self.figure.clear()
             ax = self.figure.add_subplot(111)
@@ -532,9 +472,7 @@ class InteractivePieChartWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded dark colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def _create_subcategory_pie_chart(self, data: pd.DataFrame, title: str):
         """Create sub-category level pie chart"""
@@ -589,9 +527,7 @@ class InteractivePieChartWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def on_level_changed(self, level_text: str):
         """Handle level change"""
@@ -761,9 +697,7 @@ class InteractiveTimeSeriesWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def on_aggregation_changed(self, level_text: str):
         """Handle aggregation level change"""
@@ -890,9 +824,7 @@ class InteractiveBarChartWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def on_type_changed(self, type_text: str):
         """Handle chart type change"""
@@ -1035,9 +967,7 @@ class InteractiveScatterPlotWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _get_metric_values(self, data: pd.DataFrame, metric: str):
         """Get values for a specific metric"""
@@ -1173,9 +1103,7 @@ class InteractiveHeatmapWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def on_type_changed(self, type_text: str):
         """Handle heatmap type change"""
@@ -1298,9 +1226,7 @@ class InteractiveTreemapWidget(PlotlyWidget):
         # CRITICAL FIX: Apply theme colors instead of hardcoded colors
         fig = self.apply_theme_to_plotly_fig(fig)
 
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def on_subcategory_toggled(self, checked: bool):
         """Handle subcategory toggle"""
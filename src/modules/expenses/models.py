@@ -131,16 +131,20 @@ class ExpenseDataModel:
             'transaction_mode', 'amount', 'notes', 'created_at', 'updated_at'
         ]
 
+        # Columns the analytics charts need - notes and timestamps are never loaded for them
+        self.chart_columns = [
+            'id', 'date', 'type', 'category', 'sub_category', 'transaction_mode', 'amount'
+        ]
+
         # Default columns for categories CSV - updated to match actual file structure
         self.categories_columns = [
             'category', 'sub_category', 'is_active', 'created_at', 'updated_at',
             'source', 'id', 'category_type', 'color', 'icon', 'ml_parent_id', 'ml_child_id'
         ]
 
-        # Data caching for performance optimization
+        # Normalized data caches, valid while the DataManager's file signature is unchanged
         self._cached_expenses = None
-        self._cache_timestamp = None
-        self._cache_valid_duration = 30  # Cache valid for 30 seconds
+        self._cache_signature = None
         self._processed_cache = None  # Cache for processed data with datetime conversion
 
         # Initialize default categories if not exists
@@ -183,14 +187,12 @@ class ExpenseDataModel:
     
     def get_all_expenses(self) -> pd.DataFrame:
         """Get all expense records with caching for performance and proper validation"""
-        import time
-
-        current_time = time.time()
+        signature = self.data_manager.get_data_signature(self.module_name, self.filename)
 
         # Check if cache is valid
         if (self._cached_expenses is not None and
-            self._cache_timestamp is not None and
-            current_time - self._cache_timestamp < self._cache_valid_duration):
+            signature is not None and
+            signature == self._cache_signature):
             return self._cached_expenses.copy()
 
         # Load fresh data with flexible column handling
@@ -205,7 +207,7 @@ class ExpenseDataModel:
 
         # Update cache
         self._cached_expenses = df.copy()
-        self._cache_timestamp = current_time
+        self._cache_signature = signature
         self._processed_cache = None  # Clear processed cache
 
         return df
@@ -365,14 +367,12 @@ class ExpenseDataModel:
 
     def get_processed_expenses(self) -> pd.DataFrame:
         """Get expenses with datetime conversion and preprocessing for filtering"""
-        import time
-
-        current_time = time.time()
+        signature = self.data_manager.get_data_signature(self.module_name, self.filename)
 
         # Check if processed cache is valid
         if (self._processed_cache is not None and
-            self._cache_timestamp is not None and
-            current_time - self._cache_timestamp < self._cache_valid_duration):
+            signature is not None and
+            signature == self._cache_signature):
             return self._processed_cache.copy()
 
         # Get raw data
@@ -398,6 +398,34 @@ class ExpenseDataModel:
 
         return df
 
+    def get_chart_data(self, start_date: Optional[date] = None,
+                       end_date: Optional[date] = None) -> pd.DataFrame:
+        """Get expense records for charts, loading only the chart columns"""
+        df = self.data_manager.read_csv(
+            self.module_name,
+            self.filename,
+            self.chart_columns,
+            columns=self.chart_columns
+        )
+        if df.empty:
+            return pd.DataFrame(columns=self.chart_columns)
+
+        # Same row rules as _validate_and_normalize_dataframe: unknown types count
+        # as expenses, rows without a date or a positive amount are dropped
+        df.loc[~df['type'].isin(['Income', 'Credit', 'Expense', 'Debit']), 'type'] = 'Expense'
+        df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        for col in ['type', 'category', 'sub_category', 'transaction_mode']:
+            df[col] = df[col].astype(str).fillna('').replace('nan', '')
+
+        mask = df['date'].notna() & (df['amount'] > 0) & (df['type'] == 'Expense')
+        if start_date is not None:
+            mask &= df['date'] >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= df['date'] <= pd.Timestamp(end_date)
+
+        return df[mask]
+
     def get_expense_records_only(self) -> pd.DataFrame:
         """Get only expense records (excluding income) - HELPER METHOD"""
         df = self.get_all_expenses()
@@ -414,7 +442,7 @@ class ExpenseDataModel:
     def invalidate_cache(self):
         """Invalidate the data cache - call when data is modified"""
         self._cached_expenses = None
-        self._cache_timestamp = None
+        self._cache_signature = None
         self._processed_cache = None
     
     def add_expense(self, expense: ExpenseRecord) -> bool:
@@ -492,6 +520,16 @@ class ExpenseDataModel:
     
     def get_expenses_by_date_range(self, start_date: date, end_date: date) -> pd.DataFrame:
         """Get expenses within a date range - FIXED to filter only Expense records"""
+        if self.data_manager.supports_indexed_queries:
+            # Let the storage backend use its type/date indexes
+            df = self.data_manager.query_csv(
+                self.module_name,
+                self.filename,
+                filters={'type': 'Expense'},
+                date_range=(start_date, end_date)
+            )
+            return self._validate_and_normalize_dataframe(df)
+
         df = self.get_all_expenses()
         if df.empty:
             return df
@@ -517,6 +555,14 @@ class ExpenseDataModel:
     
     def get_expenses_by_category(self, category: str, subcategory: str = None) -> pd.DataFrame:
         """Get expenses by category and optionally subcategory - FIXED to filter only Expense records"""
+        if self.data_manager.supports_indexed_queries:
+            # Let the storage backend use its type/category indexes
+            filters = {'type': 'Expense', 'category': category}
+            if subcategory:
+                filters['sub_category'] = subcategory
+            df = self.data_manager.query_csv(self.module_name, self.filename, filters=filters)
+            return self._validate_and_normalize_dataframe(df)
+
         df = self.get_all_expenses()
         if df.empty:
             return df
@@ -6,14 +6,14 @@ Contains all UI components for the expense tracking module
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QDateEdit, QTextEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QAbstractItemView,
     QFrame, QGroupBox, QSplitter, QTabWidget, QSpinBox, QDoubleSpinBox,
     QMessageBox, QDialog, QDialogButtonBox, QCheckBox, QProgressBar,
     QScrollArea, QRadioButton, QListWidget, QListWidgetItem, QButtonGroup,
     QSlider, QSpacerItem, QSizePolicy, QApplication, QFileDialog, QMenu
 )
 from PySide6.QtCore import Qt, Signal, QDate, QTimer, QSortFilterProxyModel, QThread
-from PySide6.QtGui import QFont, QIcon, QPixmap, QStandardItemModel, QStandardItem, QColor, QBrush, QAction
+from PySide6.QtGui import QFont, QIcon, QPixmap, QStandardItemModel, QStandardItem, QColor, QBrush, QAction, QPalette
 from pathlib import Path
 
 from datetime import datetime, date, timedelta
@@ -22,6 +22,7 @@ import pandas as pd
 import logging
 
 from .models import ExpenseRecord, ExpenseDataModel
+from ...ui.table_models import DataFrameTableModel, TableColumn, format_amount, format_date, truncate
 from .summary_widget import ExpenseSummaryWidget
 
 
@@ -2865,18 +2866,35 @@ class ExpenseEntryDialog(QDialog):
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
 
-class ExpenseTableWidget(QTableWidget):
-    """Custom table widget for displaying expenses with multi-select and labeling"""
+class ExpenseTableWidget(QTableView):
+    """Custom table view for displaying expenses with multi-select and labeling
+
+    Backed by a DataFrameTableModel, so only the rows on screen are formatted.
+    """
 
     expense_selected = Signal(int)  # expense_id
     expense_edit_requested = Signal(int)  # expense_id
     expense_delete_requested = Signal(int)  # expense_id
     expenses_multi_selected = Signal(list)  # list of expense_ids
     label_requested = Signal(list)  # list of expense_ids for labeling
-    
+
+    required_columns = ['id', 'date', 'type', 'category', 'sub_category', 'transaction_mode', 'amount', 'notes']
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        self.expense_model = DataFrameTableModel([
+            TableColumn('id', "ID", sort_as='number'),
+            TableColumn('date', "Date", format_date, sort_as='date'),
+            TableColumn('type', "Type"),
+            TableColumn('category', "Category"),
+            TableColumn('sub_category', "Sub-category"),
+            TableColumn('transaction_mode', "Mode"),
+            TableColumn('amount', "Amount", format_amount, Qt.AlignRight | Qt.AlignVCenter, sort_as='number'),
+            TableColumn('notes', "Notes", truncate(50), tooltip=True),
+        ], self)
+        self.setModel(self.expense_model)
+
         self.setup_table()
         self.setup_connections()
 
@@ -2901,31 +2919,25 @@ class ExpenseTableWidget(QTableWidget):
         else:
             return QColor(0, 0, 0)  # Black text for light theme
 
-    def set_item_colors(self, item):
-        """Set colors for a table item to ensure visibility - theme-aware"""
-        if item:
-            # Let the global theme handle colors - don't override
-            # Just ensure the item data is properly set
-            item.setData(Qt.DisplayRole, item.text())
-
     def setup_table(self):
         """Setup table properties"""
         # Set table properties
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)  # Enable multi-selection
-        self.setSortingEnabled(True)
         self.setObjectName("expenseTable")
 
+        # Newest first until the user picks another column
+        self.setSortingEnabled(True)
+        self.sortByColumn(1, Qt.DescendingOrder)
+
+        # Uniform row heights let the view skip measuring rows it does not paint
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
         # Enable context menu for labeling
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
-        
-        # Set columns
-        columns = ["ID", "Date", "Type", "Category", "Sub-category", "Mode", "Amount", "Notes"]
-        self.setColumnCount(len(columns))
-        self.setHorizontalHeaderLabels(columns)
-        
+
         # Configure header with enhanced resize functionality
         header = self.horizontalHeader()
         header.setStretchLastSection(True)
@@ -2947,12 +2959,7 @@ class ExpenseTableWidget(QTableWidget):
 
         # Set minimum column widths for better usability
         header.setMinimumSectionSize(80)
-        self.setColumnWidth(1, 100)  # Date
-        self.setColumnWidth(2, 80)   # Type
-        self.setColumnWidth(3, 150)  # Category
-        self.setColumnWidth(4, 150)  # Sub-category
-        self.setColumnWidth(5, 100)  # Mode
-        self.setColumnWidth(6, 100)  # Amount
+        self.reset_column_widths()
 
         # Hide ID column
         self.setColumnHidden(0, True)
@@ -2969,171 +2976,71 @@ class ExpenseTableWidget(QTableWidget):
 
     def setup_connections(self):
         """Setup signal connections"""
-        self.itemDoubleClicked.connect(self.on_item_double_clicked)
-        self.itemSelectionChanged.connect(self.on_selection_changed)
-    
+        self.doubleClicked.connect(self.on_item_double_clicked)
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
+
     def populate_table(self, expenses_df):
         """Populate table with expense data with robust error handling"""
         try:
-            self.setRowCount(0)
-
-            if expenses_df.empty:
+            if expenses_df is None or expenses_df.empty:
+                self.clear_table()
                 return
 
             # Ensure required columns exist
-            required_columns = ['id', 'date', 'type', 'category', 'sub_category', 'transaction_mode', 'amount', 'notes']
-            missing_columns = [col for col in required_columns if col not in expenses_df.columns]
+            missing_columns = [col for col in self.required_columns if col not in expenses_df.columns]
             if missing_columns:
                 print(f"Warning: Missing columns in expense data: {missing_columns}")
+                self.clear_table()
                 return
 
-            # Sort by date (newest first) with error handling
-            try:
-                expenses_df = expenses_df.sort_values('date', ascending=False)
-            except Exception as e:
-                print(f"Warning: Could not sort by date: {e}")
-                # Continue without sorting
-
-            self.setRowCount(len(expenses_df))
-
-            for row, (_, expense) in enumerate(expenses_df.iterrows()):
-                try:
-                    # ID (hidden)
-                    id_item = QTableWidgetItem(str(expense.get('id', '')))
-                    self.set_item_colors(id_item)
-                    self.setItem(row, 0, id_item)
-
-                    # Date with robust handling
-                    date_str = expense.get('date', '')
-                    if pd.isna(date_str) or date_str == '' or str(date_str).lower() == 'nan':
-                        date_str = 'Invalid Date'
-                    elif isinstance(date_str, str):
-                        try:
-                            # Try standard date format first
-                            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                            date_str = date_obj.strftime('%d/%m/%Y')
-                        except ValueError:
-                            try:
-                                # Try datetime format
-                                date_obj = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S').date()
-                                date_str = date_obj.strftime('%d/%m/%Y')
-                            except ValueError:
-                                try:
-                                    # Try pandas timestamp string
-                                    date_obj = pd.to_datetime(date_str).date()
-                                    date_str = date_obj.strftime('%d/%m/%Y')
-                                except:
-                                    date_str = 'Invalid Date'  # Fallback for unparseable dates
-                    elif hasattr(date_str, 'strftime'):
-                        # Handle pandas Timestamp objects
-                        try:
-                            date_str = date_str.strftime('%d/%m/%Y')
-                        except Exception:
-                            date_str = 'Invalid Date'
-                    else:
-                        date_str = 'Invalid Date'
-
-                    date_item = QTableWidgetItem(str(date_str))
-                    self.set_item_colors(date_item)
-                    self.setItem(row, 1, date_item)
-
-                    # Type
-                    type_item = QTableWidgetItem(str(expense.get('type', '')))
-                    self.set_item_colors(type_item)
-                    self.setItem(row, 2, type_item)
-
-                    # Category
-                    category_item = QTableWidgetItem(str(expense.get('category', '')))
-                    self.set_item_colors(category_item)
-                    self.setItem(row, 3, category_item)
-
-                    # Sub-category
-                    subcategory_item = QTableWidgetItem(str(expense.get('sub_category', '')))
-                    self.set_item_colors(subcategory_item)
-                    self.setItem(row, 4, subcategory_item)
-
-                    # Transaction mode
-                    mode_item = QTableWidgetItem(str(expense.get('transaction_mode', '')))
-                    self.set_item_colors(mode_item)
-                    self.setItem(row, 5, mode_item)
-
-                    # Amount with error handling
-                    try:
-                        amount = float(expense.get('amount', 0))
-                        amount_item = QTableWidgetItem(f"₹{amount:.2f}")
-                        amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                        self.set_item_colors(amount_item)
-                        self.setItem(row, 6, amount_item)
-                    except (ValueError, TypeError):
-                        amount_item = QTableWidgetItem("₹0.00")
-                        self.set_item_colors(amount_item)
-                        self.setItem(row, 6, amount_item)
-
-                    # Notes
-                    notes = str(expense.get('notes', '')) if expense.get('notes') else ""
-                    if len(notes) > 50:
-                        notes = notes[:47] + "..."
-                    notes_item = QTableWidgetItem(notes)
-                    self.set_item_colors(notes_item)
-                    self.setItem(row, 7, notes_item)
-
-                except Exception as e:
-                    print(f"Error populating row {row}: {e}")
-                    # Continue with next row
-                    continue
-
-            # Force table refresh to ensure styling is applied
-            self.viewport().update()
-            self.repaint()
-
-            # Apply theme-aware styling - let global theme handle colors
-            # Remove any hardcoded stylesheets to allow theme inheritance
-            self.setStyleSheet("")
+            self.expense_model.set_dataframe(expenses_df)
 
         except Exception as e:
             print(f"Error populating table: {e}")
-            self.setRowCount(0)
+            self.clear_table()
 
-    def on_item_double_clicked(self, item):
+    def clear_table(self):
+        """Remove all rows from the table"""
+        self.expense_model.clear()
+
+    def setRowCount(self, rows: int):
+        """Clear the table; kept for callers written against QTableWidget"""
+        if rows == 0:
+            self.clear_table()
+
+    def rowCount(self) -> int:
+        """Number of visible expense rows"""
+        return self.expense_model.rowCount()
+
+    def _expense_id(self, row: int) -> int:
+        """Get the expense id shown in a view row"""
+        return int(self.expense_model.row_value(row, 'id'))
+
+    def on_item_double_clicked(self, index):
         """Handle item double click"""
-        row = item.row()
-        expense_id = int(self.item(row, 0).text())
-        self.expense_edit_requested.emit(expense_id)
-    
-    def on_selection_changed(self):
+        self.expense_edit_requested.emit(self._expense_id(index.row()))
+
+    def on_selection_changed(self, *args):
         """Handle selection change"""
         selected_rows = self.selectionModel().selectedRows()
 
         if len(selected_rows) == 1:
             # Single selection - emit single expense selected
-            row = selected_rows[0].row()
-            expense_id = int(self.item(row, 0).text())
-            self.expense_selected.emit(expense_id)
+            self.expense_selected.emit(self._expense_id(selected_rows[0].row()))
         elif len(selected_rows) > 1:
             # Multi-selection - emit list of expense IDs
-            expense_ids = []
-            for index in selected_rows:
-                row = index.row()
-                expense_id = int(self.item(row, 0).text())
-                expense_ids.append(expense_id)
-            self.expenses_multi_selected.emit(expense_ids)
+            self.expenses_multi_selected.emit([self._expense_id(index.row()) for index in selected_rows])
 
     def get_selected_expense_id(self) -> Optional[int]:
         """Get the ID of the currently selected expense (single selection)"""
-        current_row = self.currentRow()
+        current_row = self.currentIndex().row()
         if current_row >= 0:
-            return int(self.item(current_row, 0).text())
+            return self._expense_id(current_row)
         return None
 
     def get_selected_expense_ids(self) -> List[int]:
         """Get the IDs of all currently selected expenses"""
-        selected_rows = self.selectionModel().selectedRows()
-        expense_ids = []
-        for index in selected_rows:
-            row = index.row()
-            expense_id = int(self.item(row, 0).text())
-            expense_ids.append(expense_id)
-        return expense_ids
+        return [self._expense_id(index.row()) for index in self.selectionModel().selectedRows()]
 
     def show_context_menu(self, position):
         """Show context menu for selected expenses and table options"""
@@ -3174,7 +3081,7 @@ class ExpenseTableWidget(QTableWidget):
             delete_action.triggered.connect(lambda: self.request_delete_multiple(selected_ids))
 
         # Show menu
-        menu.exec(self.mapToGlobal(position))
+        menu.exec(self.viewport().mapToGlobal(position))
 
     def request_delete_multiple(self, expense_ids: List[int]):
         """Request deletion of multiple expenses"""
@@ -3183,7 +3090,7 @@ class ExpenseTableWidget(QTableWidget):
 
     def auto_resize_all_columns(self):
         """Auto-resize all columns to fit their content"""
-        for column in range(self.columnCount()):
+        for column in range(self.expense_model.columnCount()):
             if not self.isColumnHidden(column):
                 self.resizeColumnToContents(column)
                 # Ensure minimum width
@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QFont, QPalette
 
+from ...ui.plotly_host import acquire_chart_view
+
 try:
     import plotly.graph_objects as go
     import plotly.express as px
@@ -144,7 +146,7 @@ class InteractiveChartWidget(QWidget):
         # Chart section
         if PLOTLY_AVAILABLE and WEBENGINE_AVAILABLE:
             print(f"Setting up WebEngine view for {self.__class__.__name__}")
-            self.web_view = QWebEngineView()
+            self.web_view = acquire_chart_view(self)
 
             # APPLIED TO DO ANALYTICS APPROACH: Set reasonable size for web view with natural expansion
             self.web_view.setMinimumSize(380, 300)  # Reasonable size for chart visibility
@@ -213,49 +215,13 @@ class InteractiveChartWidget(QWidget):
         )
         return fig
 
-    def generate_theme_aware_html(self, fig):
-        """Generate theme-aware HTML for Plotly charts - CRITICAL FIX for chart backgrounds"""
+    def render_figure(self, fig):
+        """Push a Plotly figure to the pooled chart view"""
+        if not hasattr(self, 'web_view'):
+            return
         colors = self.get_theme_colors()
-        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))  # Default to white for light theme
-
-        # Generate base HTML
-        html_str = fig.to_html(include_plotlyjs='cdn')
-
-        # CRITICAL FIX: Inject STRONGER theme-aware CSS to override ALL Plotly styling
-        theme_css = f"""
-        <style>
-            /* CRITICAL: Override ALL possible background sources with maximum specificity */
-            html, body {{
-                background-color: {background} !important;
-                background: {background} !important;
-                margin: 0 !important;
-                padding: 0 !important;
-            }}
-
-            /* Target all Plotly containers */
-            .plotly-graph-div,
-            .plotly-graph-div > div,
-            .js-plotly-plot,
-            .plot-container,
-            .svg-container {{
-                background-color: {background} !important;
-                background: {background} !important;
-            }}
-
-            /* Override any remaining containers */
-            div[id*="plotly"] {{
-                background-color: {background} !important;
-                background: {background} !important;
-            }}
-        </style>
-        """
-
-        # Insert CSS right after <head> tag
-        head_end = html_str.find('</head>')
-        if head_end != -1:
-            html_str = html_str[:head_end] + theme_css + html_str[head_end:]
-
-        return html_str
+        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))
+        self.web_view.show_figure(fig, background)
 
     def setup_controls(self):
         """Setup control widgets - to be implemented by subclasses"""
@@ -280,10 +246,9 @@ class InteractiveChartWidget(QWidget):
                 yaxis=dict(showgrid=False, showticklabels=False)
             )
             
-            # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+            # CRITICAL FIX: Apply theme colors and render
             fig = self.apply_theme_to_plotly_fig(fig)
-            html_str = self.generate_theme_aware_html(fig)
-            self.web_view.setHtml(html_str)
+            self.render_figure(fig)
 
     def update_chart(self, data: pd.DataFrame):
         """Update chart with new data - to be implemented by subclasses"""
@@ -408,10 +373,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def _create_habit_chart(self, data: pd.DataFrame):
         """Create pie chart by individual habits"""
@@ -445,10 +409,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def _create_completion_status_chart(self, data: pd.DataFrame):
         """Create pie chart by completion status"""
@@ -471,10 +434,9 @@ class InteractivePieChartWidget(InteractiveChartWidget):
             showlegend=True
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveTimeSeriesWidget(InteractiveChartWidget):
@@ -653,10 +615,9 @@ class InteractiveTimeSeriesWidget(InteractiveChartWidget):
         fig.update_xaxes(title_text="Habits", row=2, col=1)
         fig.update_yaxes(title_text="Streak (days)", row=2, col=1)
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _calculate_streaks(self, data: pd.DataFrame) -> Dict[str, Dict[str, int]]:
         """Calculate current and best streaks for each habit"""
@@ -819,10 +780,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             showlegend=False
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_streak_comparison_chart(self, data: pd.DataFrame):
         """Create bar chart comparing habit streaks"""
@@ -862,10 +822,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             barmode='group'
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_category_performance_chart(self, data: pd.DataFrame):
         """Create bar chart showing category performance"""
@@ -914,10 +873,9 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
             showlegend=False
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveScatterPlotWidget(InteractiveChartWidget):
@@ -1046,10 +1004,9 @@ class InteractiveScatterPlotWidget(InteractiveChartWidget):
             yaxis_title=self.y_metric.replace('_', ' ').title()
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _prepare_scatter_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Prepare data for scatter plot visualization"""
@@ -1181,10 +1138,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_weekday_month_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing completion patterns by weekday vs month"""
@@ -1216,10 +1172,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_habit_day_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing completion patterns by habit vs day"""
@@ -1256,10 +1211,9 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveTreemapWidget(InteractiveChartWidget):
@@ -1349,10 +1303,9 @@ class InteractiveTreemapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _prepare_treemap_data(self, data: pd.DataFrame, hierarchy_cols: List[str]) -> pd.DataFrame:
         """Prepare data for treemap visualization"""
@@ -1440,10 +1393,9 @@ class InteractiveTreemapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_frequency_habit_treemap(self, data: pd.DataFrame):
         """Create treemap with frequency → habit hierarchy"""
@@ -1473,7 +1425,6 @@ class InteractiveTreemapWidget(InteractiveChartWidget):
             height=500
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .streak_engine import get_habit_streak_engine
+
 
 class HabitFrequency(Enum):
     """Habit frequency enumeration"""
@@ -185,6 +187,9 @@ class HabitDataModel:
             'created_at', 'updated_at'
         ]
         
+        # Shared per-habit completion index for streak and rate queries
+        self.streak_engine = get_habit_streak_engine(data_manager)
+
         # Initialize default habits if not exists
         self._initialize_default_habits()
 
@@ -321,23 +326,25 @@ class HabitDataModel:
 
     def delete_habit(self, habit_id: int) -> bool:
         """Delete a habit definition and all its records"""
-        # First delete all records for this habit
-        records_df = self.get_all_records()
-        if not records_df.empty:
-            habit_records = records_df[records_df['habit_id'] == habit_id]
-            for _, record in habit_records.iterrows():
-                self.data_manager.delete_row(
-                    self.module_name,
-                    self.records_filename,
-                    record['id']
-                )
-
-        # Then delete the habit definition
-        return self.data_manager.delete_row(
-            self.module_name,
-            self.habits_filename,
-            habit_id
-        )
+        # Batch the deletes into one write per file
+        with self.data_manager.transaction(self.module_name):
+            # First delete all records for this habit
+            records_df = self.get_all_records()
+            if not records_df.empty:
+                habit_records = records_df[records_df['habit_id'] == habit_id]
+                for _, record in habit_records.iterrows():
+                    self.data_manager.delete_row(
+                        self.module_name,
+                        self.records_filename,
+                        record['id']
+                    )
+
+            # Then delete the habit definition
+            return self.data_manager.delete_row(
+                self.module_name,
+                self.habits_filename,
+                habit_id
+            )
     
     def get_all_records(self) -> pd.DataFrame:
         """Get all habit records"""
@@ -472,6 +479,9 @@ class HabitDataModel:
                 self.logger.error("Cannot save habit record without date")
                 return False
 
+            # Bring the streak index up to date so the save can be applied to it
+            self.streak_engine.ensure_current()
+
             # Check if record already exists
             try:
                 existing_records = self.get_records_by_date(record.date)
@@ -502,6 +512,8 @@ class HabitDataModel:
                             )
 
                             if success:
+                                self.streak_engine.record_saved(record.habit_id, record.date,
+                                                                record.is_completed, replaced=True)
                                 self.logger.debug(f"Successfully updated habit record {record_id} for habit {record.habit_id}")
                                 return success
                             else:
@@ -524,6 +536,8 @@ class HabitDataModel:
                 )
 
                 if success:
+                    self.streak_engine.record_saved(record.habit_id, record.date,
+                                                    record.is_completed, replaced=False)
                     self.logger.debug(f"Successfully added new habit record for habit {record.habit_id}")
                 else:
                     self.logger.error(f"Failed to add new habit record for habit {record.habit_id}")
@@ -579,62 +593,39 @@ class HabitDataModel:
 
     def get_habit_streak(self, habit_id: int) -> int:
         """Calculate current streak for a specific habit"""
-        df = self.get_all_records()
-        if df.empty:
-            return 0
-
-        # Filter records for this habit
-        habit_records = df[df['habit_id'] == habit_id]
-        if habit_records.empty:
-            return 0
-
-        # Sort by date descending
-        habit_records = habit_records.sort_values('date', ascending=False)
-        habit_records['date'] = pd.to_datetime(habit_records['date'])
+        return self.get_all_streaks().get(self._habit_key(habit_id), {}).get('current', 0)
 
-        streak = 0
-        current_date = date.today()
+    def get_longest_streak(self, habit_id: int) -> int:
+        """Get the longest streak a habit has reached"""
+        return self.get_all_streaks().get(self._habit_key(habit_id), {}).get('longest', 0)
 
-        for _, record in habit_records.iterrows():
-            record_date = record['date'].date()
-
-            # Check if this is the expected date in the streak
-            if record_date == current_date and record['is_completed']:
-                streak += 1
-                current_date -= timedelta(days=1)
-            elif record_date == current_date:
-                # Found the date but not completed, streak breaks
-                break
-            elif record_date < current_date:
-                # Gap in records, streak breaks
-                break
-
-        return streak
+    def get_all_streaks(self) -> Dict[int, Dict[str, int]]:
+        """Get current and longest streaks of every habit as {habit_id: {'current', 'longest'}}"""
+        try:
+            return self.streak_engine.get_streaks()
+        except Exception as e:
+            self.logger.error(f"Error calculating habit streaks: {e}")
+            return {}
 
     def get_habit_completion_rate(self, habit_id: int, days: int = 30) -> float:
         """Get completion rate for a habit over the last N days"""
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days-1)
-
-        df = self.get_all_records()
-        if df.empty:
-            return 0.0
-
-        # Filter records for this habit and date range
-        df['date'] = pd.to_datetime(df['date'])
-        habit_records = df[
-            (df['habit_id'] == habit_id) &
-            (df['date'] >= pd.Timestamp(start_date)) &
-            (df['date'] <= pd.Timestamp(end_date))
-        ]
+        return self.get_all_completion_rates(days).get(self._habit_key(habit_id), 0.0)
 
-        if habit_records.empty:
-            return 0.0
-
-        completed_days = len(habit_records[habit_records['is_completed'] == True])
-        total_days = len(habit_records)
+    def get_all_completion_rates(self, days: int = 30) -> Dict[int, float]:
+        """Get completion rates of every habit over the last N days"""
+        try:
+            return self.streak_engine.get_completion_rates(days)
+        except Exception as e:
+            self.logger.error(f"Error calculating habit completion rates: {e}")
+            return {}
 
-        return (completed_days / total_days) * 100 if total_days > 0 else 0.0
+    @staticmethod
+    def _habit_key(habit_id) -> Optional[int]:
+        """Normalize a habit id read from CSV (int, float or string) for index lookups"""
+        try:
+            return int(float(habit_id))
+        except (TypeError, ValueError, OverflowError):
+            return None
 
     def get_weekly_summary(self, start_date: date = None) -> Dict[str, Any]:
         """Get weekly habit completion summary"""
@@ -645,25 +636,18 @@ class HabitDataModel:
 
         end_date = start_date + timedelta(days=6)
 
-        # Get all records for the week
-        df = self.get_all_records()
-        if df.empty:
-            return self._empty_weekly_summary(start_date, end_date)
-
-        df['date'] = pd.to_datetime(df['date'])
-        week_records = df[
-            (df['date'] >= pd.Timestamp(start_date)) &
-            (df['date'] <= pd.Timestamp(end_date))
-        ]
-
-        # Get active habits
         active_habits = self.get_active_habits()
+        total_habits = len(active_habits)
+
+        daily_completions = self.streak_engine.get_daily_completions(start_date, end_date)
+        window_counts = self.streak_engine.get_window_counts(start_date, end_date)
+        streaks = self.get_all_streaks()
 
         weekly_data = {
             'start_date': start_date,
             'end_date': end_date,
-            'total_habits': len(active_habits),
-            'total_possible_completions': len(active_habits) * 7,
+            'total_habits': total_habits,
+            'total_possible_completions': total_habits * 7,
             'total_completions': 0,
             'completion_rate': 0.0,
             'daily_breakdown': [],
@@ -671,83 +655,38 @@ class HabitDataModel:
         }
 
         # Calculate daily breakdown
-        for i in range(7):
-            current_date = start_date + timedelta(days=i)
-            day_records = week_records[week_records['date'] == pd.Timestamp(current_date)] if not week_records.empty else pd.DataFrame()
-
-            completed_today = len(day_records[day_records['is_completed'] == True]) if not day_records.empty else 0
-            total_today = len(active_habits)
-
-            day_info = {
+        for current_date, completed_today in daily_completions.items():
+            weekly_data['daily_breakdown'].append({
                 'date': current_date,
                 'day_name': current_date.strftime('%A'),
                 'completed': completed_today,
-                'total': total_today,
-                'completion_rate': (completed_today / total_today * 100) if total_today > 0 else 0
-            }
-
-            weekly_data['daily_breakdown'].append(day_info)
+                'total': total_habits,
+                'completion_rate': (completed_today / total_habits * 100) if total_habits > 0 else 0
+            })
             weekly_data['total_completions'] += completed_today
 
         # Calculate habit breakdown
-        for _, habit in active_habits.iterrows():
-            habit_week_records = week_records[week_records['habit_id'] == habit['id']] if not week_records.empty else pd.DataFrame()
-            completed_days = len(habit_week_records[habit_week_records['is_completed'] == True]) if not habit_week_records.empty else 0
+        for habit_id, habit_name in zip(active_habits['id'], active_habits['name']):
+            habit_key = self._habit_key(habit_id)
+            completed_days = window_counts.get(habit_key, (0, 0))[1]
 
-            habit_info = {
-                'habit_id': habit['id'],
-                'habit_name': habit['name'],
+            weekly_data['habit_breakdown'].append({
+                'habit_id': habit_id,
+                'habit_name': habit_name,
                 'completed_days': completed_days,
                 'total_days': 7,
                 'completion_rate': (completed_days / 7) * 100,
-                'streak': self.get_habit_streak(habit['id'])
-            }
-
-            weekly_data['habit_breakdown'].append(habit_info)
+                'streak': streaks.get(habit_key, {}).get('current', 0)
+            })
 
         # Calculate overall completion rate
         weekly_data['completion_rate'] = (weekly_data['total_completions'] / weekly_data['total_possible_completions'] * 100) if weekly_data['total_possible_completions'] > 0 else 0
 
         return weekly_data
 
-    def _empty_weekly_summary(self, start_date: date, end_date: date) -> Dict[str, Any]:
-        """Return empty weekly summary structure"""
-        active_habits = self.get_active_habits()
-
-        return {
-            'start_date': start_date,
-            'end_date': end_date,
-            'total_habits': len(active_habits),
-            'total_possible_completions': len(active_habits) * 7,
-            'total_completions': 0,
-            'completion_rate': 0.0,
-            'daily_breakdown': [
-                {
-                    'date': start_date + timedelta(days=i),
-                    'day_name': (start_date + timedelta(days=i)).strftime('%A'),
-                    'completed': 0,
-                    'total': len(active_habits),
-                    'completion_rate': 0.0
-                }
-                for i in range(7)
-            ],
-            'habit_breakdown': [
-                {
-                    'habit_id': habit['id'],
-                    'habit_name': habit['name'],
-                    'completed_days': 0,
-                    'total_days': 7,
-                    'completion_rate': 0.0,
-                    'streak': 0
-                }
-                for _, habit in active_habits.iterrows()
-            ]
-        }
-
     def get_habit_summary(self) -> Dict[str, Any]:
         """Get overall habit tracking summary"""
         active_habits = self.get_active_habits()
-        all_records = self.get_all_records()
 
         if active_habits.empty:
             return {
@@ -761,24 +700,19 @@ class HabitDataModel:
             }
 
         total_habits = len(active_habits)
-        total_records = len(all_records) if not all_records.empty else 0
+        total_records, completed_records = self.streak_engine.get_totals()
 
         # Calculate overall completion rate
-        if not all_records.empty:
-            completed_records = len(all_records[all_records['is_completed'] == True])
-            overall_completion_rate = (completed_records / total_records) * 100
-        else:
-            overall_completion_rate = 0.0
+        overall_completion_rate = (completed_records / total_records) * 100 if total_records > 0 else 0.0
 
         # Find best streak across all habits
-        best_streak = 0
-        for _, habit in active_habits.iterrows():
-            habit_streak = self.get_habit_streak(habit['id'])
-            best_streak = max(best_streak, habit_streak)
+        streaks = self.get_all_streaks()
+        best_streak = max((streaks.get(self._habit_key(habit_id), {}).get('current', 0)
+                           for habit_id in active_habits['id']), default=0)
 
         # Today's completion
-        today_records = self.get_records_by_date(date.today())
-        habits_completed_today = len(today_records[today_records['is_completed'] == True]) if not today_records.empty else 0
+        today = date.today()
+        habits_completed_today = self.streak_engine.get_daily_completions(today, today)[today]
         habits_total_today = total_habits
         today_completion_rate = (habits_completed_today / habits_total_today * 100) if habits_total_today > 0 else 0
 
@@ -0,0 +1,213 @@
+"""
+Habit Streak Engine
+Per-habit daily completion arrays answering streak and completion-rate queries for all habits at once
+"""
+
+import logging
+import threading
+import weakref
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+_TRUE_VALUES = {'true', '1', '1.0', 'yes', 'y'}
+
+# Entries are keyed by habit_id * _DAY_SPAN + (epoch day + _DAY_OFFSET), so
+# one sorted int64 array orders them by habit and then by date.
+_DAY_SPAN = 1 << 20
+_DAY_OFFSET = 1 << 19
+_EPOCH = date(1970, 1, 1)
+
+
+def _epoch_day(value: date) -> int:
+    """Days since 1970-01-01"""
+    return (value - _EPOCH).days
+
+
+class HabitStreakEngine:
+    """Completion bitmap over (habit, day) built once from habit_records.csv
+
+    Each entry holds the number of records and of completed records a habit
+    has on one day, in arrays sorted by habit and date. Streaks, N-day
+    completion rates and weekly counts for every habit are computed from
+    these arrays in one vectorized pass. save_habit_record() updates the
+    entry it touched; any other change to the file (detected through its
+    storage signature) triggers a rebuild on the next query.
+    """
+
+    def __init__(self, data_manager, module_name: str = "habits",
+                 records_filename: str = "habit_records.csv"):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.data_manager = data_manager
+        self.module_name = module_name
+        self.records_filename = records_filename
+        self._lock = threading.RLock()
+
+        self.keys = np.empty(0, dtype=np.int64)        # sorted habit/day keys
+        self.recorded = np.empty(0, dtype=np.int64)    # records per entry
+        self.completed = np.empty(0, dtype=np.int64)   # completed records per entry
+        self.unindexed_records = 0                     # rows without a usable habit id or date
+        self.unindexed_completed = 0
+        self.signature: Optional[tuple] = None
+        self.built = False
+
+    # Building and updating
+
+    def ensure_current(self):
+        """Rebuild if the records file changed since the arrays were built"""
+        with self._lock:
+            signature = self.data_manager.get_data_signature(self.module_name, self.records_filename)
+            if not self.built or signature != self.signature:
+                self.rebuild(signature)
+
+    def rebuild(self, signature: Optional[tuple] = None):
+        """Re-read the records file into the completion arrays"""
+        with self._lock:
+            if signature is None:
+                signature = self.data_manager.get_data_signature(self.module_name, self.records_filename)
+
+            columns = ['habit_id', 'date', 'is_completed']
+            if self.data_manager.file_exists(self.module_name, self.records_filename):
+                df = self.data_manager.read_csv(self.module_name, self.records_filename, columns,
+                                                columns=columns).reindex(columns=columns)
+            else:
+                df = pd.DataFrame(columns=columns)
+
+            habit_ids = pd.to_numeric(df['habit_id'], errors='coerce')
+            dates = pd.to_datetime(df['date'], errors='coerce')
+            flags = df['is_completed'].astype(str).str.strip().str.lower().isin(_TRUE_VALUES).to_numpy()
+            valid = (habit_ids.notna() & dates.notna()).to_numpy()
+
+            days = dates[valid].to_numpy().astype('datetime64[D]').astype(np.int64)
+            keys = habit_ids[valid].to_numpy().astype(np.int64) * _DAY_SPAN + days + _DAY_OFFSET
+
+            self.keys, inverse = np.unique(keys, return_inverse=True)
+            self.recorded = np.bincount(inverse, minlength=len(self.keys)).astype(np.int64)
+            self.completed = np.bincount(inverse, weights=flags[valid],
+                                         minlength=len(self.keys)).astype(np.int64)
+            self.unindexed_records = int((~valid).sum())
+            self.unindexed_completed = int(flags[~valid].sum())
+            self.signature = signature
+            self.built = True
+            self.logger.debug(f"Built habit streak index: {len(self.keys)} habit-days from {len(df)} records")
+
+    def record_saved(self, habit_id: int, record_date: date, is_completed: bool, replaced: bool):
+        """Apply one saved record: ``replaced`` when it overwrote the day's existing record"""
+        with self._lock:
+            if not self.built:
+                return
+            key = int(habit_id) * _DAY_SPAN + _epoch_day(record_date) + _DAY_OFFSET
+            position = int(np.searchsorted(self.keys, key))
+            exists = position < len(self.keys) and self.keys[position] == key
+            flag = int(bool(is_completed))
+
+            if replaced and exists and self.recorded[position] == 1:
+                self.completed[position] = flag
+            elif replaced:
+                # Which of several same-day records was overwritten is unknown
+                self.built = False
+                return
+            elif exists:
+                self.recorded[position] += 1
+                self.completed[position] += flag
+            else:
+                self.keys = np.insert(self.keys, position, key)
+                self.recorded = np.insert(self.recorded, position, 1)
+                self.completed = np.insert(self.completed, position, flag)
+
+            self.signature = self.data_manager.get_data_signature(self.module_name, self.records_filename)
+
+    # Queries
+
+    def get_streaks(self, today: Optional[date] = None) -> Dict[int, Dict[str, int]]:
+        """Get {habit_id: {'current', 'longest'}} for every habit with records
+
+        A day counts when the habit has a completed record on it. The
+        current streak runs back from today and is 0 unless today is done.
+        """
+        today_day = _epoch_day(today or date.today())
+        with self._lock:
+            self.ensure_current()
+            habits, days = self._split_keys()
+            done = (self.completed > 0) & (days <= today_day)
+
+        if not len(habits):
+            return {}
+
+        # A run continues while the previous entry is the same habit, the previous day and done
+        continues = np.zeros(len(habits), dtype=bool)
+        continues[1:] = (habits[1:] == habits[:-1]) & (days[1:] == days[:-1] + 1) & done[:-1]
+        run_ids = np.cumsum(~continues) - 1
+        run_lengths = np.bincount(run_ids[done], minlength=run_ids[-1] + 1)
+        run_starts = days[np.flatnonzero(~continues)]
+
+        habit_ids, habit_index = np.unique(habits, return_inverse=True)
+        longest = np.zeros(len(habit_ids), dtype=np.int64)
+        np.maximum.at(longest, habit_index[done], run_lengths[run_ids[done]])
+
+        current = np.zeros(len(habit_ids), dtype=np.int64)
+        at_today = done & (days == today_day)
+        current[habit_index[at_today]] = today_day - run_starts[run_ids[at_today]] + 1
+
+        return {int(habit_id): {'current': int(current[i]), 'longest': int(longest[i])}
+                for i, habit_id in enumerate(habit_ids)}
+
+    def get_window_counts(self, start: date, end: date) -> Dict[int, Tuple[int, int]]:
+        """Get {habit_id: (records, completed)} for days in [start, end]"""
+        with self._lock:
+            self.ensure_current()
+            habits, days = self._split_keys()
+            in_window = (days >= _epoch_day(start)) & (days <= _epoch_day(end))
+            habit_ids, habit_index = np.unique(habits[in_window], return_inverse=True)
+            recorded = np.bincount(habit_index, weights=self.recorded[in_window], minlength=len(habit_ids))
+            completed = np.bincount(habit_index, weights=self.completed[in_window], minlength=len(habit_ids))
+
+        return {int(habit_id): (int(recorded[i]), int(completed[i]))
+                for i, habit_id in enumerate(habit_ids)}
+
+    def get_completion_rates(self, days: int = 30, today: Optional[date] = None) -> Dict[int, float]:
+        """Get {habit_id: completed records / records * 100} over the last ``days`` days"""
+        end = today or date.today()
+        counts = self.get_window_counts(end - timedelta(days=days - 1), end)
+        return {habit_id: (completed / recorded) * 100 if recorded else 0.0
+                for habit_id, (recorded, completed) in counts.items()}
+
+    def get_daily_completions(self, start: date, end: date) -> Dict[date, int]:
+        """Get completed records across all habits for each day in [start, end]"""
+        start_day, end_day = _epoch_day(start), _epoch_day(end)
+        with self._lock:
+            self.ensure_current()
+            _, days = self._split_keys()
+            in_window = (days >= start_day) & (days <= end_day)
+            totals = np.bincount(days[in_window] - start_day, weights=self.completed[in_window],
+                                 minlength=end_day - start_day + 1)
+
+        return {start + timedelta(days=offset): int(total) for offset, total in enumerate(totals)}
+
+    def get_totals(self) -> Tuple[int, int]:
+        """Get (records, completed records) over the whole history"""
+        with self._lock:
+            self.ensure_current()
+            return (int(self.recorded.sum()) + self.unindexed_records,
+                    int(self.completed.sum()) + self.unindexed_completed)
+
+    def _split_keys(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Split the entry keys into habit ids and epoch days"""
+        return self.keys // _DAY_SPAN, self.keys % _DAY_SPAN - _DAY_OFFSET
+
+
+_streak_engines = weakref.WeakKeyDictionary()
+_streak_engines_lock = threading.Lock()
+
+
+def get_habit_streak_engine(data_manager) -> HabitStreakEngine:
+    """Get the shared habit streak engine for a DataManager"""
+    with _streak_engines_lock:
+        engine = _streak_engines.get(data_manager)
+        if engine is None:
+            engine = HabitStreakEngine(data_manager)
+            _streak_engines[data_manager] = engine
+        return engine
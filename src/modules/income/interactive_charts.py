@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QFont, QPalette
 
+from ...ui.plotly_host import acquire_chart_view
+
 try:
     import plotly.graph_objects as go
     import plotly.express as px
@@ -205,7 +207,7 @@ class InteractiveChartWidget(QWidget):
         # Chart section
         if PLOTLY_AVAILABLE and WEBENGINE_AVAILABLE:
             print(f"Setting up WebEngine view for {self.__class__.__name__}")
-            self.web_view = QWebEngineView()
+            self.web_view = acquire_chart_view(self)
 
             # CRITICAL FIX: Ensure minimum size for visibility
             self.setMinimumSize(300, 200)
@@ -271,9 +273,7 @@ class InteractiveChartWidget(QWidget):
                 paper_bgcolor=colors['background'],
                 font=dict(color=colors['text'])
             )
-            # CRITICAL FIX: Generate theme-aware HTML with custom body styling
-            html_str = self.generate_theme_aware_html(fig)
-            self.web_view.setHtml(html_str)
+            self.render_figure(fig)
 
     def apply_theme_to_plotly_fig(self, fig):
         """Apply current theme colors to a Plotly figure - CRITICAL FIX for text colors"""
@@ -307,57 +307,13 @@ class InteractiveChartWidget(QWidget):
         )
         return fig
 
-    def generate_theme_aware_html(self, fig):
-        """Generate theme-aware HTML for Plotly charts - CRITICAL FIX for chart backgrounds"""
+    def render_figure(self, fig):
+        """Push a Plotly figure to the pooled chart view"""
+        if not hasattr(self, 'web_view'):
+            return
         colors = self.get_theme_colors()
-        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))  # Default to white for light theme
-
-        # Generate base HTML
-        html_str = fig.to_html(include_plotlyjs='cdn')
-
-        # CRITICAL FIX: Use SIMPLE CSS that doesn't interfere with chart visibility
-        theme_css = f"""
-        <style>
-            /* Simple background fix without breaking chart elements */
-            html, body {{
-                background-color: {background} !important;
-                margin: 0;
-                padding: 0;
-                width: 100%;
-                height: 100%;
-            }}
-
-            /* Only target main containers, not chart elements */
-            .plotly-graph-div {{
-                background-color: {background} !important;
-                width: 100% !important;
-                height: 100% !important;
-            }}
-
-            /* Ensure chart is visible */
-            .js-plotly-plot {{
-                width: 100% !important;
-                height: 100% !important;
-            }}
-        </style>
-        """
-
-        # Insert the theme CSS before the closing </head> tag
-        if '</head>' in html_str:
-            html_str = html_str.replace('</head>', theme_css + '</head>')
-        else:
-            # Fallback: add at the beginning of the HTML
-            html_str = theme_css + html_str
-
-        return html_str
-
-    def set_chart_html(self, html_str):
-        """Set HTML content and ensure visibility"""
-        if hasattr(self, 'web_view'):
-            self.web_view.setHtml(html_str)
-            # CRITICAL FIX: Ensure the web view is visible and updated
-            self.web_view.show()
-            self.web_view.update()
+        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))
+        self.web_view.show_figure(fig, background)
 
     def update_chart(self, data: pd.DataFrame):
         """Update chart with new data - to be implemented by subclasses"""
@@ -526,9 +482,7 @@ class InteractivePieChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_str)
+        self.render_figure(fig)
     
     def _create_monthly_pie(self, data: pd.DataFrame):
         """Create monthly income pie chart"""
@@ -560,8 +514,7 @@ class InteractivePieChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        html_str = fig.to_html(include_plotlyjs='cdn')
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
     
     def _create_weekly_pie(self, data: pd.DataFrame):
         """Create weekly income pie chart"""
@@ -593,9 +546,7 @@ class InteractivePieChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_str)
+        self.render_figure(fig)
 
     def _create_matplotlib_pie(self, data: pd.DataFrame):
         """Create matplotlib pie chart as fallback"""
@@ -823,9 +774,7 @@ class InteractiveTimeSeriesWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveBarChartWidget(InteractiveChartWidget):
@@ -964,9 +913,7 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_monthly_bar(self, data: pd.DataFrame):
         """Create monthly income bar chart"""
@@ -995,9 +942,7 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_weekly_bar(self, data: pd.DataFrame):
         """Create weekly income bar chart"""
@@ -1026,9 +971,7 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_daily_bar(self, data: pd.DataFrame):
         """Create daily income bar chart"""
@@ -1053,9 +996,7 @@ class InteractiveBarChartWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveScatterPlotWidget(InteractiveChartWidget):
@@ -1178,9 +1119,7 @@ class InteractiveScatterPlotWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _calculate_streaks(self, data: pd.DataFrame) -> dict:
         """Calculate streaks for income data (placeholder method for compatibility)"""
@@ -1284,9 +1223,7 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_weekday_month_heatmap(self, data: pd.DataFrame):
         """Create weekday vs month heatmap"""
@@ -1328,9 +1265,7 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_source_month_heatmap(self, data: pd.DataFrame):
         """Create source vs month heatmap"""
@@ -1396,9 +1331,7 @@ class InteractiveHeatmapWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
 
 class InteractiveTreemapWidget(InteractiveChartWidget):
@@ -1529,9 +1462,7 @@ class InteractiveTreemapWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
 
     def _create_month_source_treemap(self, data: pd.DataFrame):
         """Create month → source treemap"""
@@ -1610,6 +1541,4 @@ class InteractiveTreemapWidget(InteractiveChartWidget):
         fig = self.apply_theme_to_plotly_fig(fig)
 
         self.current_fig = fig
-        # CRITICAL FIX: Use theme-aware HTML generation
-        html_str = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_str)
+        self.render_figure(fig)
@@ -492,11 +492,6 @@ class IncomeDataModel:
         self.income_filename = "income_records.csv"
         self.goals_filename = "goal_settings.csv"
 
-        # Cache for reducing redundant file reads and warnings
-        self._income_records_cache = None
-        self._cache_timestamp = None
-        self._cache_duration = 30  # Increased cache duration to 30 seconds for better performance
-
         # Cache for base income settings to avoid repeated CSV reads
         self._base_income_settings_cache = None
         self._base_settings_cache_timestamp = None
@@ -565,33 +560,15 @@ class IncomeDataModel:
             self.data_manager.write_csv(self.module_name, self.goals_filename, df)
     
     def get_all_income_records(self) -> pd.DataFrame:
-        """Get all income records with caching to reduce file I/O"""
-        from datetime import datetime
-
-        # Check if cache is valid
-        current_time = datetime.now()
-        if (self._income_records_cache is not None and
-            self._cache_timestamp is not None and
-            (current_time - self._cache_timestamp).total_seconds() < self._cache_duration):
-            return self._income_records_cache
-
-        # Cache miss or expired - read from file
-        df = self.data_manager.read_csv(
+        """Get all income records (served from the DataManager's shared cache)"""
+        return self.data_manager.read_csv(
             self.module_name,
             self.income_filename,
             self.income_columns
         )
 
-        # Update cache
-        self._income_records_cache = df
-        self._cache_timestamp = current_time
-
-        return df
-
     def _invalidate_cache(self):
         """Invalidate all caches when data changes"""
-        self._income_records_cache = None
-        self._cache_timestamp = None
         self._base_income_settings_cache = None
         self._base_settings_cache_timestamp = None
 
@@ -699,6 +676,15 @@ class IncomeDataModel:
 
     def get_income_records_by_date_range(self, start_date: date, end_date: date) -> pd.DataFrame:
         """Get income records within a date range"""
+        if self.data_manager.supports_indexed_queries:
+            # Let the storage backend use its date index
+            return self.data_manager.query_csv(
+                self.module_name,
+                self.income_filename,
+                date_range=(start_date, end_date),
+                default_columns=self.income_columns
+            )
+
         df = self.get_all_income_records()
         if df.empty:
             return df
@@ -2101,11 +2087,12 @@ class IncomeDataModel:
 
             # Deactivate current goals
             current_goals = self.get_all_goals()
-            for _, goal_row in current_goals.iterrows():
-                if goal_row['is_active'] and goal_row['period'] == 'Daily':
-                    goal = GoalSetting.from_dict(goal_row.to_dict())
-                    goal.is_active = False
-                    self.update_goal(goal_row['id'], goal)
+            with self.data_manager.transaction(self.module_name):
+                for _, goal_row in current_goals.iterrows():
+                    if goal_row['is_active'] and goal_row['period'] == 'Daily':
+                        goal = GoalSetting.from_dict(goal_row.to_dict())
+                        goal.is_active = False
+                        self.update_goal(goal_row['id'], goal)
 
             # Add new goal
             if self.add_goal(new_goal):
@@ -6,7 +6,7 @@ Contains all UI components for the income goal tracking module
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QDateEdit, QTextEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QAbstractItemView,
     QFrame, QGroupBox, QSplitter, QTabWidget, QSpinBox, QDoubleSpinBox,
     QMessageBox, QDialog, QDialogButtonBox, QCheckBox, QProgressBar,
     QCalendarWidget, QScrollArea, QSizePolicy
@@ -15,11 +15,13 @@ from PySide6.QtCore import Qt, Signal, QDate, QTimer, QPropertyAnimation, QEasin
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPalette, QPainter, QBrush, QColor
 
 from datetime import datetime, date, timedelta
+from functools import partial
 from typing import Dict, List, Any, Optional
 import calendar
 import pandas as pd
 
 from .models import IncomeRecord, GoalSetting, IncomeDataModel, WeeklyGoalTarget, MonthlyGoalSummary
+from ...ui.table_models import DataFrameTableModel, TableColumn, format_amount, format_date
 
 
 class IncomeEntryDialog(QDialog):
@@ -5017,17 +5019,33 @@ class IncomeTrackerWidget(QWidget):
         layout.addLayout(header_layout)
 
         # Records table
-        self.records_table = QTableWidget()
+        self.records_table = QTableView()
         self.records_table.setObjectName("incomeRecordsTable")
         self.records_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.records_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.records_table.setAlternatingRowColors(True)
-        self.records_table.setSortingEnabled(True)
+        self.records_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
         # Set up table columns
-        columns = ["ID", "Date", "Zomato", "Swiggy", "Shadow Fax", "Other", "Total", "Goal", "Progress", "Status", "Notes"]
-        self.records_table.setColumnCount(len(columns))
-        self.records_table.setHorizontalHeaderLabels(columns)
+        status_colors = {"Exceeded": "#e8f5e8", "Completed": "#e3f2fd", "In Progress": "#fff3e0"}
+        self.records_model = DataFrameTableModel([
+            TableColumn('id', "ID", sort_as='number'),
+            TableColumn('date', "Date", partial(format_date, fmt='%Y-%m-%d'), sort_as='date'),
+            TableColumn('zomato', "Zomato", format_amount, sort_as='number'),
+            TableColumn('swiggy', "Swiggy", format_amount, sort_as='number'),
+            TableColumn('shadow_fax', "Shadow Fax", format_amount, sort_as='number'),
+            TableColumn('other_sources', "Other", format_amount, sort_as='number'),
+            TableColumn('earned', "Total", format_amount, sort_as='number'),
+            TableColumn('goal_inc', "Goal", format_amount, sort_as='number'),
+            TableColumn('progress', "Progress", lambda value: f"{float(value):.1f}%", sort_as='number'),
+            TableColumn('status', "Status", background=status_colors.get),
+            TableColumn('notes', "Notes"),
+        ], self)
+        self.records_table.setModel(self.records_model)
+
+        # Most recent first
+        self.records_table.setSortingEnabled(True)
+        self.records_table.sortByColumn(1, Qt.DescendingOrder)
 
         # Hide ID column
         self.records_table.setColumnHidden(0, True)
@@ -5453,10 +5471,10 @@ class IncomeTrackerWidget(QWidget):
 
     def edit_selected_record(self):
         """Edit the selected income record"""
-        current_row = self.records_table.currentRow()
+        current_row = self.records_table.currentIndex().row()
         if current_row >= 0:
             # Get the record ID from the hidden column
-            record_id = int(self.records_table.item(current_row, 0).text())
+            record_id = int(self.records_model.row_value(current_row, 'id'))
             self.edit_income_record_by_id(record_id)
 
     def edit_income_record_by_id(self, record_id: int):
@@ -5483,11 +5501,10 @@ class IncomeTrackerWidget(QWidget):
 
     def delete_selected_record(self):
         """Delete the selected income record"""
-        current_row = self.records_table.currentRow()
+        current_row = self.records_table.currentIndex().row()
         if current_row >= 0:
-            record_id = int(self.records_table.item(current_row, 0).text())
-            date_item = self.records_table.item(current_row, 1)
-            date_text = date_item.text() if date_item else "Unknown"
+            record_id = int(self.records_model.row_value(current_row, 'id'))
+            date_text = self.records_model.index(current_row, 1).data() or "Unknown"
 
             reply = QMessageBox.question(
                 self, "Confirm Delete",
@@ -5505,7 +5522,7 @@ class IncomeTrackerWidget(QWidget):
 
     def on_record_selection_changed(self):
         """Handle record selection change"""
-        has_selection = self.records_table.currentRow() >= 0
+        has_selection = self.records_table.selectionModel().hasSelection()
         self.edit_record_button.setEnabled(has_selection)
         self.delete_record_button.setEnabled(has_selection)
 
@@ -5514,58 +5531,9 @@ class IncomeTrackerWidget(QWidget):
         try:
             df = self.income_model.get_all_income_records()
 
-            if df.empty:
-                self.records_table.setRowCount(0)
-                return
-
-            # Sort by date descending (most recent first)
-            df = df.sort_values('date', ascending=False)
-
-            self.records_table.setRowCount(len(df))
-
-            for row, (_, record) in enumerate(df.iterrows()):
-                # ID (hidden)
-                self.records_table.setItem(row, 0, QTableWidgetItem(str(record['id'])))
-
-                # Date
-                date_str = str(record['date'])
-                if isinstance(record['date'], str):
-                    try:
-                        date_obj = datetime.strptime(record['date'], '%Y-%m-%d').date()
-                        date_str = date_obj.strftime('%Y-%m-%d')
-                    except ValueError:
-                        pass
-                self.records_table.setItem(row, 1, QTableWidgetItem(date_str))
-
-                # Income sources
-                self.records_table.setItem(row, 2, QTableWidgetItem(f"₹{record['zomato']:.2f}"))
-                self.records_table.setItem(row, 3, QTableWidgetItem(f"₹{record['swiggy']:.2f}"))
-                self.records_table.setItem(row, 4, QTableWidgetItem(f"₹{record['shadow_fax']:.2f}"))
-                self.records_table.setItem(row, 5, QTableWidgetItem(f"₹{record['other_sources']:.2f}"))
-
-                # Total earned
-                self.records_table.setItem(row, 6, QTableWidgetItem(f"₹{record['earned']:.2f}"))
-
-                # Goal
-                self.records_table.setItem(row, 7, QTableWidgetItem(f"₹{record['goal_inc']:.2f}"))
-
-                # Progress
-                self.records_table.setItem(row, 8, QTableWidgetItem(f"{record['progress']:.1f}%"))
-
-                # Status
-                status_item = QTableWidgetItem(str(record['status']))
-                # Color code status
-                if record['status'] == "Exceeded":
-                    status_item.setBackground(QColor("#e8f5e8"))
-                elif record['status'] == "Completed":
-                    status_item.setBackground(QColor("#e3f2fd"))
-                elif record['status'] == "In Progress":
-                    status_item.setBackground(QColor("#fff3e0"))
-                self.records_table.setItem(row, 9, status_item)
-
-                # Notes
-                notes = str(record['notes']) if record['notes'] else ""
-                self.records_table.setItem(row, 10, QTableWidgetItem(notes))
+            # The model keeps the table's sort order (most recent first by default)
+            self.records_model.set_dataframe(df)
+            self.on_record_selection_changed()
 
         except Exception as e:
             print(f"Error loading records data: {e}")
@@ -7,15 +7,24 @@ import logging
 import requests
 import csv
 import io
+import threading
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set
 from pathlib import Path
 import pandas as pd
 import re
 
 
 class AMFIDataFetcher:
-    """Fetches and processes data from AMFI's official NAV API"""
+    """Fetches and processes data from AMFI's official NAV API
+
+    NAVAll.txt is downloaded and parsed at most once per cache period and
+    shared by every caller through the module-level `amfi_fetcher`. After each
+    parse or cache load an inverted index from name tokens to scheme codes is
+    built, so code lookups are dict hits and name searches only look at
+    schemes sharing a token with the query.
+    """
 
     def __init__(self, cache_dir: str = "data/investments/amfi_cache"):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -29,15 +38,40 @@ class AMFIDataFetcher:
         # Cache settings
         self.cache_file = self.cache_dir / "amfi_nav_data.csv"
         self.cache_duration = timedelta(hours=6)  # Cache for 6 hours
+        self.retry_interval = timedelta(minutes=15)  # Wait before retrying a failed download
         
         # Data processing
         self.scheme_data = {}
         self.last_update = None
+        self.last_fetch_attempt = None
+        self._lock = threading.RLock()
+
+        # Search indexes, rebuilt whenever scheme_data is replaced
+        self.token_index: Dict[str, Set[str]] = {}
+        self.sorted_tokens: List[str] = []
+        self.name_index: Dict[str, str] = {}
+        self.scheme_order: Dict[str, int] = {}
+        self.normalized_names: List[Tuple[str, str]] = []
         
         self.logger.info("✅ AMFI Data Fetcher initialized")
 
     def fetch_nav_data(self, force_refresh: bool = False) -> bool:
         """Fetch NAV data from AMFI API"""
+        with self._lock:
+            return self._fetch_nav_data(force_refresh)
+
+    def ensure_nav_data(self) -> bool:
+        """Make sure NAV data is loaded and not older than the cache period"""
+        with self._lock:
+            now = datetime.now()
+            if self.scheme_data and self.last_update and now - self.last_update < self.cache_duration:
+                return True
+            if self.last_fetch_attempt and now - self.last_fetch_attempt < self.retry_interval:
+                return bool(self.scheme_data)
+            return self._fetch_nav_data()
+
+    def _fetch_nav_data(self, force_refresh: bool = False) -> bool:
+        """Fetch NAV data from AMFI API (caller holds the lock)"""
         try:
             # Check if we need to fetch fresh data
             if not force_refresh and self._is_cache_valid():
@@ -45,6 +79,7 @@ class AMFIDataFetcher:
                 return self._load_from_cache()
             
             self.logger.info("🌐 Fetching fresh NAV data from AMFI...")
+            self.last_fetch_attempt = datetime.now()
             
             # Try primary endpoint first
             success = self._fetch_from_endpoint(self.nav_url)
@@ -92,7 +127,7 @@ class AMFIDataFetcher:
     def _parse_nav_data(self, data_text: str) -> bool:
         """Parse AMFI NAV data from semicolon-delimited format"""
         try:
-            self.scheme_data = {}
+            scheme_data = {}
             lines = data_text.strip().split('\n')
             
             current_amc = ""
@@ -134,7 +169,7 @@ class AMFIDataFetcher:
                         nav_date = datetime.strptime(date, '%d-%b-%Y').date()
                         
                         # Store scheme data
-                        self.scheme_data[scheme_code] = {
+                        scheme_data[scheme_code] = {
                             'scheme_code': scheme_code,
                             'scheme_name': scheme_name,
                             'amc_name': current_amc,
@@ -151,9 +186,13 @@ class AMFIDataFetcher:
                         self.logger.debug(f"⚠️ Skipping invalid line: {line[:50]}... Error: {e}")
                         continue
             
+            if parsed_count == 0:
+                return False
+
+            self._set_scheme_data(scheme_data)
             self.last_update = datetime.now()
             self.logger.info(f"✅ Parsed {parsed_count} mutual fund schemes from AMFI data")
-            return parsed_count > 0
+            return True
             
         except Exception as e:
             self.logger.error(f"❌ Error parsing AMFI data: {e}")
@@ -193,22 +232,22 @@ class AMFIDataFetcher:
             if not self.cache_file.exists():
                 return False
             
-            df = pd.read_csv(self.cache_file)
-            self.scheme_data = {}
-            
-            for _, row in df.iterrows():
-                scheme_code = str(row['scheme_code'])
-                self.scheme_data[scheme_code] = {
-                    'scheme_code': scheme_code,
-                    'scheme_name': row['scheme_name'],
-                    'amc_name': row['amc_name'],
-                    'nav': float(row['nav']),
-                    'nav_date': row['nav_date'],
-                    'isin_div_payout': row.get('isin_div_payout', ''),
-                    'isin_div_reinvest': row.get('isin_div_reinvest', ''),
-                    'last_updated': row['last_updated']
-                }
-            
+            scheme_data = {}
+            with open(self.cache_file, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    scheme_code = row['scheme_code']
+                    scheme_data[scheme_code] = {
+                        'scheme_code': scheme_code,
+                        'scheme_name': row['scheme_name'],
+                        'amc_name': row['amc_name'],
+                        'nav': float(row['nav']),
+                        'nav_date': row['nav_date'],
+                        'isin_div_payout': row.get('isin_div_payout') or '',
+                        'isin_div_reinvest': row.get('isin_div_reinvest') or '',
+                        'last_updated': row['last_updated']
+                    }
+            self._set_scheme_data(scheme_data)
+
             self.last_update = datetime.fromtimestamp(self.cache_file.stat().st_mtime)
             self.logger.info(f"📦 Loaded {len(self.scheme_data)} schemes from cache")
             return True
@@ -217,42 +256,123 @@ class AMFIDataFetcher:
             self.logger.error(f"❌ Error loading from cache: {e}")
             return False
 
+    def _set_scheme_data(self, scheme_data: Dict[str, Dict[str, Any]]):
+        """Replace the scheme data and rebuild the search indexes"""
+        token_index: Dict[str, Set[str]] = {}
+        name_index: Dict[str, str] = {}
+        normalized_names = []
+
+        for scheme_code, scheme_info in scheme_data.items():
+            scheme_name = scheme_info['scheme_name']
+            name_index.setdefault(scheme_name.lower(), scheme_code)
+            normalized_names.append((self._normalize_symbol(scheme_name), scheme_code))
+            for token in self._tokenize(scheme_name):
+                token_index.setdefault(token, set()).add(scheme_code)
+
+        self.scheme_data = scheme_data
+        self.token_index = token_index
+        self.sorted_tokens = sorted(token_index)
+        self.name_index = name_index
+        self.scheme_order = {scheme_code: position for position, scheme_code in enumerate(scheme_data)}
+        self.normalized_names = normalized_names
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """Split a scheme name or query into lowercase word tokens"""
+        return re.findall(r'[a-z0-9&]+', text.lower())
+
+    def _codes_for_token(self, token: str, prefix: bool = False) -> Set[str]:
+        """Get the scheme codes whose names contain a token (or a token starting with it)"""
+        if not prefix:
+            return self.token_index.get(token, set())
+
+        codes = set()
+        position = bisect_left(self.sorted_tokens, token)
+        while position < len(self.sorted_tokens) and self.sorted_tokens[position].startswith(token):
+            codes |= self.token_index[self.sorted_tokens[position]]
+            position += 1
+        return codes
+
     def search_scheme_by_name(self, name: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search for mutual fund schemes by name"""
-        if not self.scheme_data:
-            self.fetch_nav_data()
-        
-        name_lower = name.lower()
-        matches = []
-        
-        for scheme_code, scheme_info in self.scheme_data.items():
-            scheme_name_lower = scheme_info['scheme_name'].lower()
-            
-            # Exact match gets highest priority
-            if name_lower == scheme_name_lower:
-                matches.insert(0, scheme_info)
-            # Contains match
-            elif name_lower in scheme_name_lower:
-                matches.append(scheme_info)
-            # Word match
-            elif any(word in scheme_name_lower for word in name_lower.split()):
-                matches.append(scheme_info)
-        
-        return matches[:limit]
+        """Search for mutual fund schemes by name
+
+        Results are ranked: exact name first, then names containing the whole
+        query, then by how many query words appear in the name (a word may be
+        the start of a longer word, e.g. "flexi" matches "Flexicap").
+        """
+        if not self.ensure_nav_data():
+            return []
+
+        name_lower = name.lower().strip()
+        tokens = list(dict.fromkeys(self._tokenize(name_lower)))
+        if not tokens:
+            return []
+
+        scores: Dict[str, float] = {}
+        for token in tokens:
+            exact_codes = self._codes_for_token(token)
+            for scheme_code in self._codes_for_token(token, prefix=True):
+                scores[scheme_code] = scores.get(scheme_code, 0.0) + (1.0 if scheme_code in exact_codes else 0.5)
+
+        def rank(scheme_code: str):
+            scheme_name_lower = self.scheme_data[scheme_code]['scheme_name'].lower()
+            return (
+                scheme_name_lower != name_lower,
+                name_lower not in scheme_name_lower,
+                -scores[scheme_code],
+                self.scheme_order[scheme_code]
+            )
+
+        ranked = sorted(scores, key=rank)[:limit]
+        return [self.scheme_data[scheme_code] for scheme_code in ranked]
+
+    def find_scheme(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find the scheme for an exact or partial scheme name
+
+        Returns the exact name match if there is one, otherwise the first
+        scheme in AMFI file order whose name contains `name`.
+        """
+        if not self.ensure_nav_data():
+            return None
+
+        name_lower = name.lower().strip()
+        if not name_lower:
+            return None
+
+        scheme_code = self.name_index.get(name_lower)
+        if scheme_code:
+            return self.scheme_data[scheme_code]
+
+        # Narrow to names having the query words as tokens (the last word may
+        # be cut short), then confirm with a substring check. A query starting
+        # mid-word misses the index and falls back to scanning every scheme.
+        tokens = self._tokenize(name_lower)
+        candidates = None
+        for position, token in enumerate(tokens):
+            codes = self._codes_for_token(token, prefix=position == len(tokens) - 1)
+            candidates = codes if candidates is None else candidates & codes
+
+        for scheme_codes in (sorted(candidates or (), key=self.scheme_order.get), self.scheme_data):
+            for scheme_code in scheme_codes:
+                if name_lower in self.scheme_data[scheme_code]['scheme_name'].lower():
+                    return self.scheme_data[scheme_code]
+        return None
+
+    def get_nav(self, scheme_code: str) -> Optional[float]:
+        """Get the latest NAV for an AMFI scheme code"""
+        scheme_info = self.get_scheme_by_code(scheme_code)
+        return scheme_info['nav'] if scheme_info else None
 
     def get_scheme_by_code(self, scheme_code: str) -> Optional[Dict[str, Any]]:
         """Get scheme data by AMFI scheme code"""
-        if not self.scheme_data:
-            self.fetch_nav_data()
-        
+        self.ensure_nav_data()
         return self.scheme_data.get(str(scheme_code))
 
     def get_nav_data(self, symbol: str) -> Dict[str, Any]:
         """Get NAV data for a symbol (try multiple matching strategies)"""
         try:
-            if not self.scheme_data:
-                if not self.fetch_nav_data():
-                    return {'available': False, 'error': 'Failed to fetch AMFI data', 'source': 'AMFI'}
+            if not self.ensure_nav_data():
+                return {'available': False, 'error': 'Failed to fetch AMFI data', 'source': 'AMFI'}
             
             # Strategy 1: Direct scheme code match
             scheme_data = self.get_scheme_by_code(symbol)
@@ -266,10 +386,9 @@ class AMFIDataFetcher:
             
             # Strategy 3: Fuzzy matching for common patterns
             normalized_symbol = self._normalize_symbol(symbol)
-            for scheme_code, scheme_info in self.scheme_data.items():
-                normalized_scheme = self._normalize_symbol(scheme_info['scheme_name'])
+            for normalized_scheme, scheme_code in self.normalized_names:
                 if normalized_symbol in normalized_scheme or normalized_scheme in normalized_symbol:
-                    return self._format_nav_response(scheme_info)
+                    return self._format_nav_response(self.scheme_data[scheme_code])
             
             return {
                 'available': False, 
@@ -323,9 +442,7 @@ class AMFIDataFetcher:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about cached AMFI data"""
-        if not self.scheme_data:
-            self.fetch_nav_data()
-        
+        self.ensure_nav_data()
         amc_count = len(set(scheme['amc_name'] for scheme in self.scheme_data.values()))
         
         return {
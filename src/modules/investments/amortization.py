@@ -0,0 +1,304 @@
+"""
+Loan Amortization Engine
+Computes EMI schedules as NumPy arrays in integer paise, memoized per loan
+terms, for one loan, a whole portfolio at once, or prepayment scenarios
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+# Interest rates are held exactly as integers in units of 0.0001% per annum
+RATE_SCALE = 10000
+# Monthly interest in paise = balance * rate_units / MONTHLY_RATE_DIVISOR
+MONTHLY_RATE_DIVISOR = 100 * RATE_SCALE * 12
+
+ScheduleKey = Tuple[int, int, int, int, str]
+
+
+def to_paise(amount: float) -> int:
+    """Convert a rupee amount to whole paise, rounding half up"""
+    return int(np.floor(round(float(amount) * 100, 6) + 0.5))
+
+
+def to_rate_units(annual_rate: float) -> int:
+    """Convert an annual percentage rate to integer rate units"""
+    return int(round(float(annual_rate) * RATE_SCALE))
+
+
+def emi_paise(balance: np.ndarray, rate_units: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Standard EMI, P × r × (1+r)^n / ((1+r)^n - 1), rounded to paise"""
+    balance = np.asarray(balance, dtype=float)
+    months = np.maximum(np.asarray(months, dtype=float), 1)
+    r = np.asarray(rate_units, dtype=float) / MONTHLY_RATE_DIVISOR
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + r) ** months
+        emi = np.where(r > 0, balance * r * growth / (growth - 1), balance / months)
+    return np.floor(emi + 0.5).astype(np.int64)
+
+
+def monthly_payment_dates(start: date, count: int) -> np.ndarray:
+    """Dates of `count` monthly payments from start, clamping the day to short months"""
+    offsets = np.arange(count)
+    months = np.datetime64(start, 'M') + offsets
+    month_starts = months.astype('datetime64[D]')
+    days_in_month = ((months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+    return month_starts + (np.minimum(start.day, days_in_month) - 1)
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """A loan's payments as parallel arrays (amounts in paise)"""
+    payment_number: np.ndarray
+    payment_date: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    payment: np.ndarray
+    balance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.payment_number)
+
+    @property
+    def total_principal(self) -> float:
+        return int(self.principal.sum()) / 100
+
+    @property
+    def total_interest(self) -> float:
+        return int(self.interest.sum()) / 100
+
+    @property
+    def total_payment(self) -> float:
+        return int(self.payment.sum()) / 100
+
+    def slice(self, stop: int) -> 'AmortizationSchedule':
+        """Get the first `stop` payments"""
+        return AmortizationSchedule(*(values[:stop] for values in self._arrays()))
+
+    def to_records(self) -> List[Dict]:
+        """Get the payments as dicts in rupees, one per month"""
+        return [
+            {'payment_number': number, 'payment_date': payment_date, 'principal_amount': principal,
+             'interest_amount': interest, 'total_payment': payment, 'remaining_balance': balance}
+            for number, payment_date, principal, interest, payment, balance in zip(
+                self.payment_number.tolist(), self.payment_date.astype(object),
+                (self.principal / 100).tolist(), (self.interest / 100).tolist(),
+                (self.payment / 100).tolist(), (self.balance / 100).tolist())
+        ]
+
+    def _arrays(self):
+        return (self.payment_number, self.payment_date, self.principal,
+                self.interest, self.payment, self.balance)
+
+    @staticmethod
+    def concat(first: 'AmortizationSchedule', second: 'AmortizationSchedule') -> 'AmortizationSchedule':
+        return AmortizationSchedule(*(np.concatenate(pair) for pair in zip(first._arrays(), second._arrays())))
+
+
+EMPTY_SCHEDULE = AmortizationSchedule(
+    np.zeros(0, dtype=np.int64), np.zeros(0, dtype='datetime64[D]'), *(np.zeros(0, dtype=np.int64) for _ in range(4)))
+
+
+def _amortize(balance: np.ndarray, rate_units: np.ndarray, emi: np.ndarray,
+              first_number: np.ndarray, last_number: np.ndarray,
+              extra: Optional[np.ndarray] = None, recompute_emi: bool = False):
+    """Step every loan forward one month at a time, all loans per step
+
+    Each loan starts at payment `first_number` with `balance` paise owed and
+    pays `emi` paise a month. Interest is rounded half up to paise every
+    month; payment `last_number` clears whatever is left. A loan stops once
+    its balance reaches zero. `extra[loan, step]` is principal prepaid along
+    with that payment; with `recompute_emi` the EMI is recalculated over the
+    remaining months after each prepayment instead of shortening the loan.
+
+    Returns (principal, interest, balance) arrays of shape (loans, steps)
+    and the number of payments made by each loan.
+    """
+    loans = len(balance)
+    steps = int((last_number - first_number + 1).max()) if loans else 0
+    final_step = last_number - first_number
+    # Loans with nothing owed produce zero rows, so they need no masking below
+    balance = np.where(final_step >= 0, np.maximum(balance, 0), 0).astype(np.int64)
+    emi = emi.astype(np.int64).copy()
+    rate_units = rate_units.astype(np.int64)
+    doubled_rate = rate_units * 2
+
+    principal_out = np.zeros((steps, loans), dtype=np.int64)
+    interest_out = np.zeros((steps, loans), dtype=np.int64)
+    balance_out = np.zeros((steps, loans), dtype=np.int64)
+    lengths = np.zeros(loans, dtype=np.int64)
+
+    for step in range(steps):
+        if not balance.any():
+            break
+
+        interest = (balance * doubled_rate + MONTHLY_RATE_DIVISOR) // (2 * MONTHLY_RATE_DIVISOR)
+        # An EMI below the month's interest pays only interest
+        principal = np.minimum(np.maximum(emi - interest, 0), balance)
+        interest_paid = np.minimum(interest, emi)
+
+        final = final_step == step
+        if final.any():
+            principal[final] = balance[final]
+            interest_paid[final] = interest[final]
+        if extra is not None:
+            principal = np.minimum(principal + extra[:, step], balance)
+
+        lengths += balance > 0
+        balance = balance - principal
+
+        principal_out[step] = principal
+        interest_out[step] = interest_paid
+        balance_out[step] = balance
+
+        if recompute_emi and extra is not None:
+            prepaid = (extra[:, step] > 0) & (balance > 0)
+            if prepaid.any():
+                emi[prepaid] = emi_paise(balance[prepaid], rate_units[prepaid], (final_step - step)[prepaid])
+
+    return principal_out.T, interest_out.T, balance_out.T, lengths
+
+
+class AmortizationEngine:
+    """Memoized amortization schedules
+
+    Schedules are cached by (principal, rate, tenure, EMI, start date), so
+    redrawing charts or stats for unchanged terms costs a dictionary
+    lookup. Terms that were never seen are computed together, one
+    vectorized pass for any number of loans.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.max_entries = max_entries
+        self._schedules: 'OrderedDict[Tuple, AmortizationSchedule]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(principal: float, annual_rate: float, tenure_months: int, emi: float,
+                 start: Optional[date] = None) -> ScheduleKey:
+        """Normalize loan terms into a cache key (amounts in paise, rate in rate units)"""
+        start = start or date.today()
+        if isinstance(start, datetime):
+            start = start.date()
+        principal_paise = to_paise(principal)
+        rate_units = to_rate_units(annual_rate)
+        tenure_months = int(tenure_months)
+        emi = to_paise(emi) if emi and emi > 0 else int(emi_paise(principal_paise, rate_units, tenure_months))
+        return principal_paise, rate_units, tenure_months, emi, start.isoformat()
+
+    def schedule(self, principal: float, annual_rate: float, tenure_months: int, emi: float = 0.0,
+                 start: Optional[date] = None) -> AmortizationSchedule:
+        """Get the schedule for one set of loan terms (EMI is derived when not given)"""
+        return self.schedules([self.make_key(principal, annual_rate, tenure_months, emi, start)])[0]
+
+    def schedules(self, keys: List[ScheduleKey]) -> List[AmortizationSchedule]:
+        """Get schedules for many terms, computing all uncached ones in one pass"""
+        with self._lock:
+            cached = [self._get(key) for key in keys]
+        missing = list(dict.fromkeys(key for key, schedule in zip(keys, cached) if schedule is None))
+
+        if missing:
+            computed = dict(zip(missing, self._compute(missing)))
+            with self._lock:
+                for key, schedule in computed.items():
+                    self._put(key, schedule)
+            cached = [schedule if schedule is not None else computed[key] for key, schedule in zip(keys, cached)]
+
+        return cached
+
+    def prepayment_schedule(self, key: ScheduleKey, prepayments: Mapping[int, float],
+                            reduce_emi: bool = False) -> AmortizationSchedule:
+        """Get the schedule with extra principal paid along with given payment numbers
+
+        By default the EMI stays the same and the loan ends earlier; with
+        `reduce_emi` the tenure stays and the EMI is lowered after each
+        prepayment. Payments before the first prepayment are reused from
+        the memoized base schedule; only the rest is recomputed.
+        """
+        principal_paise, rate_units, tenure, emi, start = key
+        extras = {int(number): to_paise(amount) for number, amount in prepayments.items()
+                  if amount and amount > 0 and 1 <= int(number) <= tenure}
+        base = self.schedules([key])[0]
+        if not extras:
+            return base
+
+        scenario_key = (key, tuple(sorted(extras.items())), bool(reduce_emi))
+        with self._lock:
+            scenario = self._get(scenario_key)
+        if scenario is not None:
+            return scenario
+
+        first = min(extras)
+        if first > len(base):
+            return base  # The loan is already repaid before the first prepayment
+
+        prefix = base.slice(first - 1)
+        opening_balance = int(prefix.balance[-1]) if len(prefix) else principal_paise
+        extra = np.zeros((1, tenure - first + 1), dtype=np.int64)
+        for number, amount in extras.items():
+            extra[0, number - first] = amount
+
+        principal, interest, balance, lengths = _amortize(
+            np.array([opening_balance]), np.array([rate_units]), np.array([emi]),
+            np.array([first]), np.array([tenure]), extra, reduce_emi)
+        tail = self._build(date.fromisoformat(start), first, principal[0], interest[0], balance[0], int(lengths[0]))
+        scenario = AmortizationSchedule.concat(prefix, tail)
+
+        with self._lock:
+            self._put(scenario_key, scenario)
+        return scenario
+
+    def clear(self):
+        """Drop all memoized schedules"""
+        with self._lock:
+            self._schedules.clear()
+
+    def _compute(self, keys: List[ScheduleKey]) -> List[AmortizationSchedule]:
+        terms = np.array([key[:4] for key in keys], dtype=np.int64).reshape(-1, 4)
+        principal_paise, rate_units, tenure, emi = terms.T
+        valid = (principal_paise > 0) & (tenure > 0) & (emi > 0)
+
+        principal, interest, balance, lengths = _amortize(
+            np.where(valid, principal_paise, 0), rate_units, emi,
+            np.ones(len(keys), dtype=np.int64), np.where(valid, tenure, 0))
+
+        return [self._build(date.fromisoformat(key[4]), 1, principal[i], interest[i], balance[i], int(lengths[i]))
+                for i, key in enumerate(keys)]
+
+    @staticmethod
+    def _build(start: date, first_number: int, principal: np.ndarray, interest: np.ndarray,
+               balance: np.ndarray, length: int) -> AmortizationSchedule:
+        if length <= 0:
+            return EMPTY_SCHEDULE
+        principal, interest, balance = principal[:length], interest[:length], balance[:length]
+        return AmortizationSchedule(
+            payment_number=np.arange(first_number, first_number + length),
+            payment_date=monthly_payment_dates(start, first_number - 1 + length)[first_number - 1:],
+            principal=principal,
+            interest=interest,
+            payment=principal + interest,
+            balance=balance,
+        )
+
+    def _get(self, key) -> Optional[AmortizationSchedule]:
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self._schedules.move_to_end(key)
+        return schedule
+
+    def _put(self, key, schedule: AmortizationSchedule):
+        self._schedules[key] = schedule
+        self._schedules.move_to_end(key)
+        while len(self._schedules) > self.max_entries:
+            self._schedules.popitem(last=False)
+
+
+# Global instance
+amortization_engine = AmortizationEngine()
@@ -1,29 +1,54 @@
 """
 Investment Data Storage System
-Manages local CSV-based storage for investment data with organized file structure
+Manages local storage for investment data, partitioned into one file per
+category and symbol so each read or write touches only the symbol involved
 """
 
 import os
-import csv
+import json
 import logging
+import threading
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
-import json
+from urllib.parse import quote, unquote
 import shutil
 from decimal import Decimal, InvalidOperation
 
+try:
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 class InvestmentDataStorage:
-    """Manages local CSV storage for investment data"""
+    """Manages local per-symbol storage for investment data
+
+    Each (category, symbol) pair lives in its own file under
+    ``partitions/<category>/``: an uncompressed Feather file that is
+    memory-mapped on read, or a CSV file when pyarrow is not installed.
+    The format is chosen on first use and pinned in
+    ``partitions/manifest.json`` when the first partition is written, so
+    installing or removing pyarrow later does not hide stored files.
+    Files are replaced atomically, so a failed write leaves the previous
+    data in place. Category CSV files written by earlier versions are split
+    into partitions the first time a category is used.
+    """
 
     def __init__(self, base_data_dir: str = "data/investments"):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.base_dir = Path(base_data_dir)
+        self._migrated_categories = set()
+        self._migration_lock = threading.Lock()
         self.ensure_directory_structure()
+        self._partition_format: Optional[str] = None
+        self._partition_format_pinned = False
+        self._partition_format_lock = threading.Lock()
         
         # Data categories and their corresponding file structures
+        # ('filename' is the single-file layout of earlier versions, read only for migration)
         self.data_categories = {
             'real_time': {
                 'filename': 'real_time_data.csv',
@@ -36,6 +61,10 @@ class InvestmentDataStorage:
                 'columns': ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 
                           'change', 'change_percent', 'period', 'timestamp']
             },
+            'ohlc': {
+                'filename': 'ohlc_data.csv',
+                'columns': ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 'timestamp']
+            },
             'performance': {
                 'filename': 'performance_data.csv',
                 'columns': ['symbol', 'beta', 'trailing_pe', 'forward_pe', 'price_to_book',
@@ -90,8 +119,66 @@ class InvestmentDataStorage:
             self.logger.error(f"❌ Failed to create directory structure: {e}")
             raise
 
+    @property
+    def partition_format(self) -> str:
+        """Get the partition file format, choosing it on first use"""
+        with self._partition_format_lock:
+            if self._partition_format is None:
+                self._partition_format = self._load_partition_format()
+            return self._partition_format
+
+    @property
+    def partition_suffix(self) -> str:
+        """Get the file suffix of partition files"""
+        return f".{self.partition_format}"
+
+    def _load_partition_format(self) -> str:
+        """Read the pinned partition format, or pick one without pinning it yet"""
+        partitions_dir = self.base_dir / 'partitions'
+        manifest_path = partitions_dir / 'manifest.json'
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                partition_format = json.load(f).get('format')
+            if partition_format in ('feather', 'csv'):
+                if partition_format == 'feather' and not PYARROW_AVAILABLE:
+                    self.logger.error("❌ Investment data is stored as Feather but pyarrow is not installed")
+                self._partition_format_pinned = True
+                return partition_format
+            self.logger.warning(f"⚠️ Unknown partition format in {manifest_path}: {partition_format}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not read {manifest_path}: {e}")
+
+        # Keep the format of files written before the manifest existed
+        if any(partitions_dir.glob('*/*.feather')):
+            return 'feather'
+        if any(partitions_dir.glob('*/*.csv')):
+            return 'csv'
+        return 'feather' if PYARROW_AVAILABLE else 'csv'
+
+    def _pin_partition_format(self):
+        """Record the partition format in the manifest before the first write"""
+        partition_format = self.partition_format
+        with self._partition_format_lock:
+            if self._partition_format_pinned:
+                return
+            manifest_path = self.base_dir / 'partitions' / 'manifest.json'
+            try:
+                manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    json.dump({'format': partition_format}, f)
+                self._partition_format_pinned = True
+            except Exception as e:
+                self.logger.error(f"❌ Failed to write {manifest_path}: {e}")
+
+    def _require_pyarrow(self):
+        """Fail clearly when the pinned Feather format cannot be read or written"""
+        if self.partition_format == 'feather' and not PYARROW_AVAILABLE:
+            raise RuntimeError("Investment data is stored as Feather files; install pyarrow to access it")
+
     def get_file_path(self, category: str) -> Path:
-        """Get file path for a data category"""
+        """Get the single-file path earlier versions used for a data category"""
         if category not in self.data_categories:
             raise ValueError(f"Unknown data category: {category}")
         return self.base_dir / self.data_categories[category]['filename']
@@ -102,22 +189,141 @@ class InvestmentDataStorage:
             raise ValueError(f"Unknown data category: {category}")
         return self.data_categories[category]['columns']
 
-    def initialize_csv_file(self, category: str) -> bool:
-        """Initialize CSV file with headers if it doesn't exist"""
+    def get_partition_dir(self, category: str) -> Path:
+        """Get the directory holding a category's per-symbol files"""
+        if category not in self.data_categories:
+            raise ValueError(f"Unknown data category: {category}")
+        self.migrate_legacy_file(category)
+        return self.base_dir / 'partitions' / category
+
+    def get_partition_path(self, category: str, symbol: str) -> Path:
+        """Get the file path for one symbol of a data category"""
+        return self._partition_file(self.get_partition_dir(category), symbol)
+
+    def _partition_file(self, partition_dir: Path, symbol: str) -> Path:
+        """Name a symbol's file inside a partition directory"""
+        # Percent-encode so symbols like ^NSEI or M&M.NS make safe, reversible file names
+        return partition_dir / f"{quote(symbol, safe='.-_')}{self.partition_suffix}"
+
+    def get_partition_symbols(self, category: str) -> List[str]:
+        """Get the symbols that have a file in a data category"""
+        partition_dir = self.get_partition_dir(category)
+        if not partition_dir.exists():
+            return []
+        return [unquote(path.name[:-len(self.partition_suffix)])
+                for path in partition_dir.glob(f"*{self.partition_suffix}")]
+
+    def read_partition(self, category: str, symbol: str,
+                       columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Read one symbol's rows of a data category (None when nothing is stored)"""
+        file_path = self.get_partition_path(category, symbol)
+        if not file_path.exists():
+            return None
+
+        self._require_pyarrow()
+        if self.partition_format == 'feather':
+            return feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+        return pd.read_csv(file_path, usecols=columns)
+
+    def write_partition(self, category: str, symbol: str, df: pd.DataFrame) -> None:
+        """Replace one symbol's rows of a data category"""
+        self._write_partition_file(self.get_partition_path(category, symbol), category, df)
+
+    def _write_partition_file(self, file_path: Path, category: str, df: pd.DataFrame) -> None:
+        """Atomically replace a partition file"""
+        self._require_pyarrow()
+        self._pin_partition_format()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        df = df.reindex(columns=self.get_columns(category)).reset_index(drop=True)
+        temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
         try:
-            file_path = self.get_file_path(category)
-            if not file_path.exists():
-                columns = self.get_columns(category)
-                df = pd.DataFrame(columns=columns)
-                df.to_csv(file_path, index=False)
-                self.logger.info(f"✅ Initialized CSV file: {file_path}")
-            return True
-        except Exception as e:
-            self.logger.error(f"❌ Failed to initialize CSV file for {category}: {e}")
-            return False
+            if self.partition_format == 'feather':
+                feather.write_feather(self._to_arrow_safe(df), temp_path, compression='uncompressed')
+            else:
+                df.to_csv(temp_path, index=False)
+            os.replace(temp_path, file_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def delete_partition(self, category: str, symbol: str) -> None:
+        """Remove one symbol's rows of a data category"""
+        file_path = self.get_partition_path(category, symbol)
+        if file_path.exists():
+            file_path.unlink()
+
+    def read_category(self, category: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read every symbol's rows of a data category into one frame"""
+        frames = []
+        for symbol in self.get_partition_symbols(category):
+            try:
+                df = self.read_partition(category, symbol, columns)
+                if df is not None and not df.empty:
+                    frames.append(df)
+            except Exception as e:
+                self.logger.error(f"❌ Error reading {category} data for {symbol}: {e}")
+
+        if not frames:
+            return pd.DataFrame(columns=columns or self.get_columns(category))
+        return pd.concat(frames, ignore_index=True)
+
+    def migrate_legacy_file(self, category: str) -> None:
+        """Split a category file from earlier versions into per-symbol files, once
+
+        The category counts as migrated only after every partition is written
+        and the old file is moved aside; a failed migration is retried on the
+        next access.
+        """
+        if category in self._migrated_categories:
+            return
+
+        with self._migration_lock:
+            if category in self._migrated_categories:
+                return
+
+            legacy_path = self.get_file_path(category)
+            if not legacy_path.exists():
+                self._migrated_categories.add(category)
+                return
+
+            try:
+                df = pd.read_csv(legacy_path)
+                partition_dir = self.base_dir / 'partitions' / category
+                migrated = 0
+                if 'symbol' in df.columns:
+                    for symbol, symbol_data in df.groupby('symbol', sort=False):
+                        file_path = self._partition_file(partition_dir, str(symbol))
+                        if not file_path.exists():
+                            self._write_partition_file(file_path, category, symbol_data)
+                            migrated += 1
+
+                # Keep the old file out of the way rather than deleting it
+                backup_dir = self.base_dir / 'backups'
+                backup_dir.mkdir(exist_ok=True)
+                shutil.move(str(legacy_path), str(backup_dir / f"{legacy_path.stem}_pre_partition.csv"))
+            except Exception as e:
+                self.logger.error(f"❌ Failed to migrate {category} data to per-symbol files: {e}")
+                return
+
+            self._migrated_categories.add(category)
+            self.logger.info(f"✅ Migrated {migrated} symbols of {category} data to per-symbol files")
+
+    @staticmethod
+    def _to_arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+        """Turn object columns holding mixed types into strings, as the CSV files stored them"""
+        mixed_columns = [column for column, values in df.items() if values.dtype == object and
+                         pd.api.types.infer_dtype(values, skipna=True) in ('mixed', 'mixed-integer')]
+        if not mixed_columns:
+            return df
+
+        df = df.copy()
+        for column in mixed_columns:
+            df[column] = df[column].map(lambda value: value if value is None or value != value else str(value))
+        return df
 
     def store_real_time_data(self, symbol: str, data: Dict[str, Any]) -> bool:
-        """Store real-time data for a symbol with validation and backup"""
+        """Store real-time data for a symbol with validation"""
         try:
             # Validate symbol
             if not self.validate_symbol(symbol):
@@ -130,19 +336,6 @@ class InvestmentDataStorage:
                 self.logger.error(f"❌ Data validation failed for {symbol}: {errors}")
                 return False
 
-            self.initialize_csv_file('real_time')
-            file_path = self.get_file_path('real_time')
-
-            # Create backup
-            self.backup_file('real_time')
-
-            # Read existing data
-            df = pd.read_csv(file_path)
-
-            # Remove existing data for this symbol
-            df = df[df['symbol'] != symbol]
-
-            # Add new data
             new_row = {
                 'symbol': symbol,
                 'current_price': data.get('current_price'),
@@ -158,14 +351,7 @@ class InvestmentDataStorage:
                 'source_timestamp': data.get('source_timestamp', datetime.now().isoformat()),
                 'timestamp': datetime.now().isoformat()
             }
-
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            df.to_csv(file_path, index=False)
-
-            # Verify integrity after write
-            is_valid, issues = self.verify_data_integrity('real_time')
-            if not is_valid:
-                self.logger.warning(f"⚠️ Data integrity issues after storing {symbol}: {issues}")
+            self.write_partition('real_time', symbol, pd.DataFrame([new_row]))
 
             self.logger.debug(f"✅ Stored real-time data for {symbol}")
             return True
@@ -177,14 +363,8 @@ class InvestmentDataStorage:
     def load_real_time_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load real-time data for a symbol"""
         try:
-            file_path = self.get_file_path('real_time')
-            if not file_path.exists():
-                return None
-                
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-            
-            if symbol_data.empty:
+            symbol_data = self.read_partition('real_time', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
                 
             # Get the most recent record
@@ -213,42 +393,27 @@ class InvestmentDataStorage:
     def store_historical_data(self, symbol: str, data: List[Dict[str, Any]], period: str = "1y") -> bool:
         """Store historical data for a symbol"""
         try:
-            self.initialize_csv_file('historical')
-            file_path = self.get_file_path('historical')
-            
-            # Read existing data
-            df = pd.read_csv(file_path)
-            
-            # Remove existing data for this symbol and period
-            df = df[~((df['symbol'] == symbol) & (df['period'] == period))]
-            
-            # Add new data
-            new_rows = []
+            if not data:
+                return False
+
             timestamp = datetime.now().isoformat()
-            
-            for record in data:
-                new_row = {
-                    'symbol': symbol,
-                    'date': record.get('date'),
-                    'open': record.get('open'),
-                    'high': record.get('high'),
-                    'low': record.get('low'),
-                    'close': record.get('close'),
-                    'volume': record.get('volume'),
-                    'change': record.get('change'),
-                    'change_percent': record.get('change_percent'),
-                    'period': period,
-                    'timestamp': timestamp
-                }
-                new_rows.append(new_row)
-            
-            if new_rows:
-                new_df = pd.DataFrame(new_rows)
-                df = pd.concat([df, new_df], ignore_index=True)
-                df.to_csv(file_path, index=False)
-                
-                self.logger.debug(f"✅ Stored {len(new_rows)} historical records for {symbol} ({period})")
-                return True
+            new_df = pd.DataFrame.from_records(
+                data, columns=['date', 'open', 'high', 'low', 'close', 'volume', 'change', 'change_percent'])
+            new_df.insert(0, 'symbol', symbol)
+            new_df['period'] = period
+            new_df['timestamp'] = timestamp
+
+            # Keep the symbol's other periods, replace this one
+            existing = self.read_partition('historical', symbol)
+            if existing is not None and not existing.empty:
+                existing = existing[existing['period'] != period]
+                if not existing.empty:
+                    new_df = pd.concat([existing, new_df], ignore_index=True)
+
+            self.write_partition('historical', symbol, new_df)
+
+            self.logger.debug(f"✅ Stored {len(data)} historical records for {symbol} ({period})")
+            return True
             
         except Exception as e:
             self.logger.error(f"❌ Failed to store historical data for {symbol}: {e}")
@@ -257,36 +422,24 @@ class InvestmentDataStorage:
     def load_historical_data(self, symbol: str, period: str = "1y") -> Optional[Dict[str, Any]]:
         """Load historical data for a symbol"""
         try:
-            file_path = self.get_file_path('historical')
-            if not file_path.exists():
+            df = self.read_partition('historical', symbol)
+            if df is None:
                 return None
-                
-            df = pd.read_csv(file_path)
-            symbol_data = df[(df['symbol'] == symbol) & (df['period'] == period)]
-            
+
+            symbol_data = df[df['period'] == period]
             if symbol_data.empty:
                 return None
             
             # Convert to list of dictionaries
-            historical_data = []
-            for _, row in symbol_data.iterrows():
-                historical_data.append({
-                    'date': row.get('date'),
-                    'open': row.get('open'),
-                    'high': row.get('high'),
-                    'low': row.get('low'),
-                    'close': row.get('close'),
-                    'volume': row.get('volume'),
-                    'change': row.get('change'),
-                    'change_percent': row.get('change_percent')
-                })
+            historical_data = symbol_data[['date', 'open', 'high', 'low', 'close', 'volume',
+                                           'change', 'change_percent']].to_dict('records')
             
             return {
                 'available': True,
                 'data': historical_data,
                 'period': period,
                 'total_records': len(historical_data),
-                'last_updated': symbol_data.iloc[-1].get('timestamp') if not symbol_data.empty else None
+                'last_updated': symbol_data.iloc[-1].get('timestamp')
             }
             
         except Exception as e:
@@ -296,14 +449,8 @@ class InvestmentDataStorage:
     def get_data_freshness(self, symbol: str, category: str) -> Optional[datetime]:
         """Get the timestamp when data was last updated for a symbol and category"""
         try:
-            file_path = self.get_file_path(category)
-            if not file_path.exists():
-                return None
-                
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-            
-            if symbol_data.empty:
+            symbol_data = self.read_partition(category, symbol, columns=['timestamp'])
+            if symbol_data is None or symbol_data.empty:
                 return None
                 
             latest_timestamp = symbol_data['timestamp'].iloc[-1]
@@ -371,86 +518,56 @@ class InvestmentDataStorage:
 
         return len(errors) == 0, errors
 
-    def backup_file(self, category: str) -> bool:
-        """Create backup of data file before modification"""
-        try:
-            file_path = self.get_file_path(category)
-            if file_path.exists():
-                backup_dir = self.base_dir / 'backups'
-                backup_dir.mkdir(exist_ok=True)
-
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                backup_path = backup_dir / f"{category}_backup_{timestamp}.csv"
-
-                shutil.copy2(file_path, backup_path)
-
-                # Keep only last 10 backups
-                backups = sorted(backup_dir.glob(f"{category}_backup_*.csv"))
-                if len(backups) > 10:
-                    for old_backup in backups[:-10]:
-                        old_backup.unlink()
-
-                self.logger.debug(f"✅ Created backup: {backup_path}")
-                return True
-        except Exception as e:
-            self.logger.error(f"❌ Failed to create backup for {category}: {e}")
-            return False
-
-    def verify_data_integrity(self, category: str) -> Tuple[bool, List[str]]:
-        """Verify data integrity for a category"""
+    def find_integrity_issues(self, df: pd.DataFrame, category: str) -> List[str]:
+        """Check a frame of a data category for structural problems"""
         issues = []
-
+        expected_columns = self.get_columns(category)
+
+        # Check column structure
+        if list(df.columns) != expected_columns:
+            issues.append(f"Column mismatch. Expected: {expected_columns}, Found: {list(df.columns)}")
+
+        # Check for duplicate symbols with same timestamp
+        if 'symbol' in df.columns and 'timestamp' in df.columns and category != 'historical':
+            duplicates = df.groupby(['symbol', 'timestamp']).size()
+            duplicate_count = (duplicates > 1).sum()
+            if duplicate_count > 0:
+                issues.append(f"Found {duplicate_count} duplicate symbol-timestamp combinations")
+
+        # Check for invalid timestamps
+        if 'timestamp' in df.columns:
+            timestamps = df['timestamp'].dropna().astype(str)
+            parsed = pd.to_datetime(timestamps, format='ISO8601', errors='coerce')
+            invalid_timestamps = int(parsed.isna().sum())
+            if invalid_timestamps > 0:
+                issues.append(f"Found {invalid_timestamps} invalid timestamps")
+
+        # Check for completely empty rows
+        empty_rows = df.isnull().all(axis=1).sum()
+        if empty_rows > 0:
+            issues.append(f"Found {empty_rows} completely empty rows")
+
+        return issues
+
+    def verify_data_integrity(self, category: str, symbol: Optional[str] = None) -> Tuple[bool, List[str]]:
+        """Verify data integrity for a category (or one symbol of it)"""
         try:
-            file_path = self.get_file_path(category)
-            if not file_path.exists():
-                return True, []  # No file means no issues
-
-            df = pd.read_csv(file_path)
-            expected_columns = self.get_columns(category)
-
-            # Check column structure
-            if list(df.columns) != expected_columns:
-                issues.append(f"Column mismatch. Expected: {expected_columns}, Found: {list(df.columns)}")
-
-            # Check for duplicate symbols with same timestamp
-            if 'symbol' in df.columns and 'timestamp' in df.columns:
-                duplicates = df.groupby(['symbol', 'timestamp']).size()
-                duplicate_count = (duplicates > 1).sum()
-                if duplicate_count > 0:
-                    issues.append(f"Found {duplicate_count} duplicate symbol-timestamp combinations")
-
-            # Check for invalid timestamps
-            if 'timestamp' in df.columns:
-                invalid_timestamps = 0
-                for timestamp in df['timestamp'].dropna():
-                    try:
-                        datetime.fromisoformat(str(timestamp))
-                    except (ValueError, TypeError):
-                        invalid_timestamps += 1
-
-                if invalid_timestamps > 0:
-                    issues.append(f"Found {invalid_timestamps} invalid timestamps")
-
-            # Check for completely empty rows
-            empty_rows = df.isnull().all(axis=1).sum()
-            if empty_rows > 0:
-                issues.append(f"Found {empty_rows} completely empty rows")
-
+            if symbol is not None:
+                df = self.read_partition(category, symbol)
+                if df is None:
+                    return True, []  # No file means no issues
+            else:
+                df = self.read_category(category)
+
+            issues = self.find_integrity_issues(df, category)
             return len(issues) == 0, issues
 
         except Exception as e:
-            issues.append(f"Error reading file: {e}")
-            return False, issues
+            return False, [f"Error reading data: {e}"]
 
     def store_performance_data(self, symbol: str, data: Dict[str, Any]) -> bool:
         """Store performance data for a symbol"""
         try:
-            self.initialize_csv_file('performance')
-            file_path = self.get_file_path('performance')
-
-            df = pd.read_csv(file_path)
-            df = df[df['symbol'] != symbol]  # Remove existing data
-
             new_row = {
                 'symbol': symbol,
                 'beta': data.get('beta'),
@@ -472,8 +589,7 @@ class InvestmentDataStorage:
                 'timestamp': datetime.now().isoformat()
             }
 
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            df.to_csv(file_path, index=False)
+            self.write_partition('performance', symbol, pd.DataFrame([new_row]))
 
             self.logger.debug(f"✅ Stored performance data for {symbol}")
             return True
@@ -485,14 +601,8 @@ class InvestmentDataStorage:
     def load_performance_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load performance data for a symbol"""
         try:
-            file_path = self.get_file_path('performance')
-            if not file_path.exists():
-                return None
-
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
-            if symbol_data.empty:
+            symbol_data = self.read_partition('performance', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
 
             latest = symbol_data.iloc[-1]
@@ -523,12 +633,6 @@ class InvestmentDataStorage:
     def store_financial_data(self, symbol: str, data: Dict[str, Any]) -> bool:
         """Store financial data for a symbol"""
         try:
-            self.initialize_csv_file('financial')
-            file_path = self.get_file_path('financial')
-
-            df = pd.read_csv(file_path)
-            df = df[df['symbol'] != symbol]  # Remove existing data
-
             new_row = {
                 'symbol': symbol,
                 'total_revenue': data.get('total_revenue'),
@@ -549,8 +653,7 @@ class InvestmentDataStorage:
                 'timestamp': datetime.now().isoformat()
             }
 
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            df.to_csv(file_path, index=False)
+            self.write_partition('financial', symbol, pd.DataFrame([new_row]))
 
             self.logger.debug(f"✅ Stored financial data for {symbol}")
             return True
@@ -562,14 +665,8 @@ class InvestmentDataStorage:
     def load_financial_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load financial data for a symbol"""
         try:
-            file_path = self.get_file_path('financial')
-            if not file_path.exists():
-                return None
-
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
-            if symbol_data.empty:
+            symbol_data = self.read_partition('financial', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
 
             latest = symbol_data.iloc[-1]
@@ -601,12 +698,6 @@ class InvestmentDataStorage:
     def store_portfolio_data(self, symbol: str, data: Dict[str, Any]) -> bool:
         """Store portfolio data for a symbol"""
         try:
-            self.initialize_csv_file('portfolio')
-            file_path = self.get_file_path('portfolio')
-
-            df = pd.read_csv(file_path)
-            df = df[df['symbol'] != symbol]  # Remove existing data
-
             headquarters = data.get('headquarters', {})
             new_row = {
                 'symbol': symbol,
@@ -621,8 +712,7 @@ class InvestmentDataStorage:
                 'timestamp': datetime.now().isoformat()
             }
 
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            df.to_csv(file_path, index=False)
+            self.write_partition('portfolio', symbol, pd.DataFrame([new_row]))
 
             self.logger.debug(f"✅ Stored portfolio data for {symbol}")
             return True
@@ -634,14 +724,8 @@ class InvestmentDataStorage:
     def load_portfolio_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load portfolio data for a symbol"""
         try:
-            file_path = self.get_file_path('portfolio')
-            if not file_path.exists():
-                return None
-
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
-            if symbol_data.empty:
+            symbol_data = self.read_partition('portfolio', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
 
             latest = symbol_data.iloc[-1]
@@ -668,12 +752,6 @@ class InvestmentDataStorage:
     def store_dividend_data(self, symbol: str, data: Dict[str, Any]) -> bool:
         """Store dividend data for a symbol"""
         try:
-            self.initialize_csv_file('dividend')
-            file_path = self.get_file_path('dividend')
-
-            df = pd.read_csv(file_path)
-            df = df[df['symbol'] != symbol]  # Remove existing data
-
             # Store dividend history
             dividends = data.get('dividends', [])
             new_rows = []
@@ -693,9 +771,7 @@ class InvestmentDataStorage:
                 new_rows.append(new_row)
 
             if new_rows:
-                new_df = pd.DataFrame(new_rows)
-                df = pd.concat([df, new_df], ignore_index=True)
-                df.to_csv(file_path, index=False)
+                self.write_partition('dividend', symbol, pd.DataFrame(new_rows))
 
                 self.logger.debug(f"✅ Stored {len(new_rows)} dividend records for {symbol}")
                 return True
@@ -707,23 +783,14 @@ class InvestmentDataStorage:
     def load_dividend_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load dividend data for a symbol"""
         try:
-            file_path = self.get_file_path('dividend')
-            if not file_path.exists():
-                return None
-
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
-            if symbol_data.empty:
+            symbol_data = self.read_partition('dividend', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
 
             # Convert to list of dictionaries
-            dividends = []
-            for _, row in symbol_data.iterrows():
-                dividends.append({
-                    'date': row.get('dividend_date'),
-                    'amount': row.get('dividend_amount')
-                })
+            dividends = (symbol_data[['dividend_date', 'dividend_amount']]
+                         .rename(columns={'dividend_date': 'date', 'dividend_amount': 'amount'})
+                         .to_dict('records'))
 
             # Get summary data from the latest record
             latest = symbol_data.iloc[-1]
@@ -746,12 +813,6 @@ class InvestmentDataStorage:
     def store_fees_data(self, symbol: str, data: Dict[str, Any]) -> bool:
         """Store fees data for a symbol"""
         try:
-            self.initialize_csv_file('fees')
-            file_path = self.get_file_path('fees')
-
-            df = pd.read_csv(file_path)
-            df = df[df['symbol'] != symbol]  # Remove existing data
-
             new_row = {
                 'symbol': symbol,
                 'expense_ratio': data.get('expense_ratio'),
@@ -764,8 +825,7 @@ class InvestmentDataStorage:
                 'timestamp': datetime.now().isoformat()
             }
 
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            df.to_csv(file_path, index=False)
+            self.write_partition('fees', symbol, pd.DataFrame([new_row]))
 
             self.logger.debug(f"✅ Stored fees data for {symbol}")
             return True
@@ -777,14 +837,8 @@ class InvestmentDataStorage:
     def load_fees_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Load fees data for a symbol"""
         try:
-            file_path = self.get_file_path('fees')
-            if not file_path.exists():
-                return None
-
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
-            if symbol_data.empty:
+            symbol_data = self.read_partition('fees', symbol)
+            if symbol_data is None or symbol_data.empty:
                 return None
 
             latest = symbol_data.iloc[-1]
@@ -811,11 +865,7 @@ class InvestmentDataStorage:
 
         for category in self.data_categories.keys():
             try:
-                file_path = self.get_file_path(category)
-                if file_path.exists():
-                    df = pd.read_csv(file_path)
-                    if 'symbol' in df.columns:
-                        symbols.update(df['symbol'].unique())
+                symbols.update(self.get_partition_symbols(category))
             except Exception as e:
                 self.logger.error(f"❌ Error reading symbols from {category}: {e}")
 
@@ -827,11 +877,7 @@ class InvestmentDataStorage:
             categories = [category] if category else self.data_categories.keys()
 
             for cat in categories:
-                file_path = self.get_file_path(cat)
-                if file_path.exists():
-                    df = pd.read_csv(file_path)
-                    df = df[df['symbol'] != symbol]
-                    df.to_csv(file_path, index=False)
+                self.delete_partition(cat, symbol)
 
             self.logger.info(f"✅ Cleared data for {symbol} ({category or 'all categories'})")
             return True
@@ -852,17 +898,13 @@ class InvestmentDataStorage:
 
             for category in self.data_categories.keys():
                 try:
-                    file_path = self.get_file_path(category)
-                    if not file_path.exists():
-                        continue
-
-                    df = pd.read_csv(file_path)
-
-                    # Filter by symbol if specified
+                    # Read only the symbol's file if one is specified
                     if symbol:
-                        df = df[df['symbol'] == symbol]
+                        df = self.read_partition(category, symbol)
+                    else:
+                        df = self.read_category(category)
 
-                    if df.empty:
+                    if df is None or df.empty:
                         continue
 
                     # Count by data source
@@ -893,13 +935,10 @@ class InvestmentDataStorage:
     def cross_validate_data(self, symbol: str, category: str) -> Dict[str, Any]:
         """Cross-validate data from multiple sources for the same symbol"""
         try:
-            file_path = self.get_file_path(category)
-            if not file_path.exists():
+            symbol_data = self.read_partition(category, symbol)
+            if symbol_data is None:
                 return {'available': False, 'error': 'No data file found'}
 
-            df = pd.read_csv(file_path)
-            symbol_data = df[df['symbol'] == symbol]
-
             if symbol_data.empty:
                 return {'available': False, 'error': 'No data found for symbol'}
 
@@ -965,13 +1004,10 @@ class InvestmentDataStorage:
 
             for category in self.data_categories.keys():
                 try:
-                    file_path = self.get_file_path(category)
-                    if not file_path.exists():
+                    if 'data_source' not in self.get_columns(category):
                         continue
 
-                    df = pd.read_csv(file_path)
-                    if 'data_source' not in df.columns:
-                        continue
+                    df = self.read_category(category)
 
                     source_data = df[df['data_source'] == source]
                     if source_data.empty:
@@ -0,0 +1,304 @@
+"""
+Historical Price Cache
+Keeps daily OHLCV bars per symbol in local storage, downloads only the dates
+it is missing and serves any period by slicing the stored series
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_storage import InvestmentDataStorage
+
+
+# Storage category holding the daily bars
+OHLC_CATEGORY = 'ohlc'
+
+# Start date used for the 'max' period
+EARLIEST_DATE = date(1900, 1, 1)
+
+# Periods understood by get_history, as offsets back from today
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1), '1m': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3), '3m': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6), '6m': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1), '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5), '10y': pd.DateOffset(years=10),
+}
+
+# The last bar is re-downloaded at most this often, which also bounds retries on holidays
+TAIL_REFRESH_INTERVAL = timedelta(minutes=15)
+
+# A re-downloaded bar whose close moved more than this was re-adjusted (split or dividend)
+ADJUSTMENT_TOLERANCE = 0.005
+
+BAR_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+def period_start(period: str, today: Optional[date] = None) -> date:
+    """Get the first date covered by a period such as '6mo', '1y', 'ytd' or 'max'"""
+    today = today or date.today()
+    if period == 'max':
+        return EARLIEST_DATE
+    if period == 'ytd':
+        return date(today.year, 1, 1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unknown history period: {period}")
+    return (pd.Timestamp(today) - PERIOD_OFFSETS[period]).date()
+
+
+def latest_session_date(today: Optional[date] = None) -> date:
+    """Get the most recent weekday on or before today"""
+    today = today or date.today()
+    return np.busday_offset(np.datetime64(today, 'D'), 0, roll='backward').astype(date)
+
+
+def normalize_history(history: pd.DataFrame) -> pd.DataFrame:
+    """Turn a Yahoo Finance history frame (dated index, Open/High/Low/Close/Volume) into bars"""
+    if history is None or history.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    index = pd.DatetimeIndex(history.index)
+    return pd.DataFrame({
+        'date': index.strftime('%Y-%m-%d'),
+        'open': history['Open'].to_numpy(dtype=float),
+        'high': history['High'].to_numpy(dtype=float),
+        'low': history['Low'].to_numpy(dtype=float),
+        'close': history['Close'].to_numpy(dtype=float),
+        'volume': history['Volume'].fillna(0).to_numpy(dtype='int64'),
+    })
+
+
+class HistoricalPriceCache:
+    """Incrementally maintained daily price history
+
+    Bars are stored per symbol through InvestmentDataStorage. For every
+    symbol the cache remembers the earliest date it has asked the source
+    for, when it last downloaded, and the day its latest bars were
+    downloaded on (``settled_before``), in ``metadata/ohlc_coverage.json``.
+    Bars dated before that day were final when downloaded (settled); later
+    ones were still forming (provisional). A request then downloads at most:
+
+    * the head, when a longer period than ever before is asked for;
+    * the tail, from the last settled bar to today, when the latest session
+      is missing or the last bar is provisional, and the last download is
+      older than the refresh interval.
+
+    Provisional bars are overwritten by the tail without comparison. The
+    last settled bar is downloaded again with the tail; if its close
+    changed, the source re-adjusted history for a split or dividend and
+    the whole covered range is downloaded once more.
+
+    ``downloader(symbol, start, end)`` returns Yahoo Finance style history
+    for dates in [start, end).
+    """
+
+    def __init__(self, storage: InvestmentDataStorage,
+                 downloader: Callable[[str, date, date], pd.DataFrame]):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.storage = storage
+        self.downloader = downloader
+        self.coverage_path = Path(storage.base_dir) / 'metadata' / 'ohlc_coverage.json'
+
+        self._coverage: Optional[Dict[str, Dict[str, str]]] = None
+        self._coverage_lock = threading.Lock()
+        self._symbol_locks = defaultdict(threading.Lock)
+
+    def get_history(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
+        """Get daily bars with day-over-day changes for a period, as PriceFetcher returns them"""
+        try:
+            bars, error = self.get_bars(symbol, period)
+        except Exception as e:
+            self.logger.error(f"Error loading historical data for {symbol}: {e}")
+            return {'available': False, 'error': str(e)}
+
+        if bars.empty:
+            return {'available': False, 'error': error or 'No historical data found'}
+
+        close = bars['close']
+        previous_close = close.shift()
+        change = (close - previous_close).fillna(0.0)
+        change_percent = (change / previous_close.where(previous_close != 0) * 100).fillna(0.0)
+
+        records = bars.assign(change=change, change_percent=change_percent).to_dict('records')
+        return {
+            'available': True,
+            'data': records,
+            'period': period,
+            'total_records': len(records),
+            'last_updated': self._get_coverage(symbol).get('fetched_at')
+        }
+
+    def get_bars(self, symbol: str, period: str = "1y") -> Tuple[pd.DataFrame, Optional[str]]:
+        """Get the stored bars of a period, downloading missing dates first
+
+        Returns the bars and the download error, if one occurred (stored
+        bars are still returned when the source is unreachable).
+        """
+        start = period_start(period)
+        bars, error = self.update(symbol, start)
+        if start > EARLIEST_DATE:
+            bars = bars[bars['date'] >= start.isoformat()]
+        return bars.reset_index(drop=True), error
+
+    def last_stored_date(self, symbol: str) -> Optional[date]:
+        """Get the date of the last stored bar for a symbol"""
+        bars = self.storage.read_partition(OHLC_CATEGORY, symbol, columns=['date'])
+        if bars is None or bars.empty:
+            return None
+        return date.fromisoformat(str(bars['date'].iloc[-1]))
+
+    def update(self, symbol: str, start: date) -> Tuple[pd.DataFrame, Optional[str]]:
+        """Make sure bars from start to the latest session are stored and return all stored bars"""
+        with self._symbol_locks[symbol]:
+            bars = self._read_bars(symbol)
+            coverage = self._get_coverage(symbol)
+            covered_from = date.fromisoformat(coverage['covered_from']) if coverage.get('covered_from') else None
+            fetched_at = datetime.fromisoformat(coverage['fetched_at']) if coverage.get('fetched_at') else None
+
+            now = datetime.now()
+            today = now.date()
+            end = today + timedelta(days=1)
+
+            # Coverage written before settled_before was tracked: the last download also fetched the tail
+            if coverage.get('settled_before'):
+                settled_before = date.fromisoformat(coverage['settled_before'])
+            else:
+                settled_before = fetched_at.date() if fetched_at is not None else today
+
+            try:
+                changed = False
+                if bars.empty or covered_from is None:
+                    recently_empty = (covered_from is not None and covered_from <= start and
+                                      fetched_at is not None and now - fetched_at < TAIL_REFRESH_INTERVAL)
+                    if not recently_empty:
+                        bars = self._download(symbol, start, end)
+                        covered_from = start
+                        settled_before = today
+                        changed = True
+                else:
+                    if start < covered_from:
+                        # Longer period than ever asked for: download only the missing head
+                        head = self._download(symbol, start, date.fromisoformat(bars['date'].iloc[0]))
+                        bars = self._merge(head, bars)
+                        covered_from = start
+                        changed = True
+
+                    if self._tail_due(bars, fetched_at, settled_before, now):
+                        # Download from the last settled bar so its close can be compared
+                        settled = bars[bars['date'] < settled_before.isoformat()]
+                        tail_start = settled['date'].iloc[-1] if not settled.empty else bars['date'].iloc[0]
+                        tail = self._download(symbol, date.fromisoformat(tail_start), end)
+                        if self._was_readjusted(settled, tail):
+                            self.logger.info(f"History of {symbol} was re-adjusted, downloading it again")
+                            bars = self._download(symbol, covered_from, end)
+                        else:
+                            # Provisional bars are replaced by their newer copies
+                            bars = self._merge(bars, tail)
+                        settled_before = today
+                        changed = True
+
+                if not changed:
+                    return bars, None
+
+            except Exception as e:
+                self.logger.warning(f"Could not download history for {symbol}, using stored bars: {e}")
+                return bars, str(e)
+
+            self._write_bars(symbol, bars)
+            self._set_coverage(symbol, covered_from, now, settled_before)
+            return bars, None
+
+    def clear(self, symbol: str):
+        """Forget the stored bars of a symbol"""
+        with self._symbol_locks[symbol]:
+            self.storage.delete_partition(OHLC_CATEGORY, symbol)
+            with self._coverage_lock:
+                coverage = self._load_coverage()
+                if coverage.pop(symbol, None) is not None:
+                    self._save_coverage(coverage)
+
+    def _download(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        self.logger.debug(f"Downloading {symbol} history from {start} to {end}")
+        bars = normalize_history(self.downloader(symbol, start, end))
+        return bars[bars['date'] < end.isoformat()]
+
+    @staticmethod
+    def _tail_due(bars: pd.DataFrame, fetched_at: Optional[datetime], settled_before: date,
+                  now: datetime) -> bool:
+        """Check whether the latest session is missing (or provisional) and may be downloaded again"""
+        if fetched_at is not None and now - fetched_at < TAIL_REFRESH_INTERVAL:
+            return False
+        last_date = date.fromisoformat(bars['date'].iloc[-1])
+        return last_date < latest_session_date(now.date()) or last_date >= settled_before
+
+    @staticmethod
+    def _merge(older: pd.DataFrame, newer: pd.DataFrame) -> pd.DataFrame:
+        """Combine bars, preferring newer bars for dates in both"""
+        if newer.empty:
+            return older
+        if older.empty:
+            return newer
+        bars = pd.concat([older, newer], ignore_index=True)
+        return bars.drop_duplicates('date', keep='last').sort_values('date', kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _was_readjusted(settled: pd.DataFrame, tail: pd.DataFrame) -> bool:
+        """Check whether the re-downloaded copy of the last settled bar has a different close"""
+        if settled.empty or tail.empty:
+            return False
+        overlap = tail[tail['date'] == settled['date'].iloc[-1]]
+        if overlap.empty:
+            return False
+        stored_close = float(settled['close'].iloc[-1])
+        new_close = float(overlap['close'].iloc[0])
+        return stored_close > 0 and abs(new_close - stored_close) / stored_close > ADJUSTMENT_TOLERANCE
+
+    def _read_bars(self, symbol: str) -> pd.DataFrame:
+        stored = self.storage.read_partition(OHLC_CATEGORY, symbol, columns=BAR_COLUMNS)
+        if stored is None:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        stored['date'] = stored['date'].astype(str)
+        return stored
+
+    def _write_bars(self, symbol: str, bars: pd.DataFrame):
+        self.storage.write_partition(OHLC_CATEGORY, symbol,
+                                     bars.assign(symbol=symbol, timestamp=datetime.now().isoformat()))
+
+    def _get_coverage(self, symbol: str) -> Dict[str, str]:
+        with self._coverage_lock:
+            return dict(self._load_coverage().get(symbol, {}))
+
+    def _set_coverage(self, symbol: str, covered_from: date, fetched_at: datetime, settled_before: date):
+        with self._coverage_lock:
+            coverage = self._load_coverage()
+            coverage[symbol] = {'covered_from': covered_from.isoformat(), 'fetched_at': fetched_at.isoformat(),
+                                'settled_before': settled_before.isoformat()}
+            self._save_coverage(coverage)
+
+    def _load_coverage(self) -> Dict[str, Dict[str, str]]:
+        if self._coverage is None:
+            try:
+                with open(self.coverage_path, 'r', encoding='utf-8') as f:
+                    self._coverage = json.load(f)
+            except FileNotFoundError:
+                self._coverage = {}
+            except Exception as e:
+                self.logger.warning(f"Could not read history coverage, starting fresh: {e}")
+                self._coverage = {}
+        return self._coverage
+
+    def _save_coverage(self, coverage: Dict[str, Dict[str, str]]):
+        self.coverage_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.coverage_path.with_name(f"{self.coverage_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(coverage, f, indent=1)
+        os.replace(temp_path, self.coverage_path)
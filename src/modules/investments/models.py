@@ -4,6 +4,7 @@ Handles investment tracking data structure and calculations
 """
 
 import logging
+import numpy as np
 import pandas as pd
 import csv
 import os
@@ -13,6 +14,8 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict, fields
 from enum import Enum
 
+from .amortization import EMPTY_SCHEDULE, amortization_engine
+
 
 class InvestmentType(Enum):
     """Investment types"""
@@ -189,6 +192,10 @@ class InvestmentDataModel:
                 'last_updated', 'notes', 'total_investment', 'current_value',
                 'profit_loss', 'profit_loss_percentage', 'days_held', 'annualized_return'
             ]
+
+            # Last frame this model wrote, reused while the stored file is unchanged
+            self._frame: Optional[pd.DataFrame] = None
+            self._frame_signature: Optional[tuple] = None
             
             self.logger.info("✅ InvestmentDataModel initialization SUCCESSFUL")
             
@@ -199,6 +206,12 @@ class InvestmentDataModel:
     def get_all_investments(self) -> pd.DataFrame:
         """Get all investments"""
         try:
+            if self._frame is not None:
+                signature = self.data_manager.get_data_signature(self.module_name, self.filename)
+                if signature is not None and signature == self._frame_signature:
+                    return self._frame.copy()
+                self._frame = None
+
             df = self.data_manager.read_csv(self.module_name, self.filename, self.columns)
             return df
         except Exception as e:
@@ -244,9 +257,14 @@ class InvestmentDataModel:
             return df
         return df[df['investment_type'] == investment_type]
     
-    def get_portfolio_summary(self) -> Dict[str, Any]:
-        """Get portfolio summary statistics"""
-        df = self.get_all_investments()
+    def get_portfolio_summary(self, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Get portfolio summary statistics
+
+        Pass ``df`` (e.g. the frame update_current_prices just wrote) to
+        summarise it without reading the investments again.
+        """
+        if df is None:
+            df = self.get_all_investments()
         
         if df.empty:
             return {
@@ -260,49 +278,50 @@ class InvestmentDataModel:
                 'by_type': {},
                 'average_return': 0.0
             }
-        
-        total_investment_amount = df['total_investment'].sum()
-        total_current_value = df['current_value'].sum()
-        total_profit_loss = df['profit_loss'].sum()
+
+        amounts = df[['total_investment', 'current_value', 'profit_loss', 'profit_loss_percentage']].apply(
+            pd.to_numeric, errors='coerce').fillna(0.0)
+        total_investment_amount = amounts['total_investment'].sum()
+        total_current_value = amounts['current_value'].sum()
+        total_profit_loss = amounts['profit_loss'].sum()
         
         total_profit_loss_percentage = 0.0
         if total_investment_amount > 0:
             total_profit_loss_percentage = (total_profit_loss / total_investment_amount) * 100
         
         # Best and worst performers
-        best_performer = None
-        worst_performer = None
-        
-        if not df.empty:
-            best_idx = df['profit_loss_percentage'].idxmax()
-            worst_idx = df['profit_loss_percentage'].idxmin()
-            
-            best_performer = {
-                'symbol': df.loc[best_idx, 'symbol'],
-                'name': df.loc[best_idx, 'name'],
-                'return': df.loc[best_idx, 'profit_loss_percentage']
-            }
-            
-            worst_performer = {
-                'symbol': df.loc[worst_idx, 'symbol'],
-                'name': df.loc[worst_idx, 'name'],
-                'return': df.loc[worst_idx, 'profit_loss_percentage']
-            }
+        best_idx = amounts['profit_loss_percentage'].idxmax()
+        worst_idx = amounts['profit_loss_percentage'].idxmin()
+
+        best_performer = {
+            'symbol': df.loc[best_idx, 'symbol'],
+            'name': df.loc[best_idx, 'name'],
+            'return': amounts.loc[best_idx, 'profit_loss_percentage']
+        }
+
+        worst_performer = {
+            'symbol': df.loc[worst_idx, 'symbol'],
+            'name': df.loc[worst_idx, 'name'],
+            'return': amounts.loc[worst_idx, 'profit_loss_percentage']
+        }
         
         # Group by investment type
-        by_type = {}
-        for inv_type in df['investment_type'].unique():
-            type_df = df[df['investment_type'] == inv_type]
-            by_type[inv_type] = {
-                'count': len(type_df),
-                'total_investment': type_df['total_investment'].sum(),
-                'current_value': type_df['current_value'].sum(),
-                'profit_loss': type_df['profit_loss'].sum()
+        grouped = amounts.groupby(df['investment_type'], sort=False)
+        totals = grouped[['total_investment', 'current_value', 'profit_loss']].sum()
+        counts = grouped.size()
+        by_type = {
+            inv_type: {
+                'count': int(counts[inv_type]),
+                'total_investment': totals.at[inv_type, 'total_investment'],
+                'current_value': totals.at[inv_type, 'current_value'],
+                'profit_loss': totals.at[inv_type, 'profit_loss']
             }
+            for inv_type in totals.index
+        }
         
         # Average return (weighted by investment amount)
         if total_investment_amount > 0:
-            weighted_returns = (df['profit_loss_percentage'] * df['total_investment']).sum()
+            weighted_returns = (amounts['profit_loss_percentage'] * amounts['total_investment']).sum()
             average_return = weighted_returns / total_investment_amount
         else:
             average_return = 0.0
@@ -320,24 +339,75 @@ class InvestmentDataModel:
         }
     
     def update_current_prices(self, price_updates: Dict[str, float]) -> int:
-        """Update current prices for multiple investments"""
+        """Update current prices for multiple investments
+
+        The prices are joined to the portfolio by symbol in one step, the
+        derived columns of the matched rows are recomputed together and the
+        file is written once, with a single change notification and sync.
+        Negative or non-numeric prices are ignored. Returns the number of
+        investments updated.
+        """
         df = self.get_all_investments()
-        if df.empty:
+        if df.empty or not price_updates:
             return 0
-        
-        updated_count = 0
-        for symbol, new_price in price_updates.items():
-            matching_rows = df[df['symbol'] == symbol]
-            for idx, row in matching_rows.iterrows():
-                investment = Investment.from_dict(row.to_dict())
-                investment.current_price = new_price
-                investment.last_updated = datetime.now()
-                
-                if self.update_investment(row['id'], investment):
-                    updated_count += 1
-        
+
+        prices = pd.to_numeric(pd.Series(price_updates, dtype=object), errors='coerce')
+        prices = prices[prices >= 0]
+        new_prices = df['symbol'].map(prices)
+        mask = new_prices.notna()
+        if not mask.any():
+            return 0
+
+        df['current_price'] = pd.to_numeric(df['current_price'], errors='coerce').astype(float)
+        df.loc[mask, 'current_price'] = new_prices[mask].astype(float)
+        df['last_updated'] = df['last_updated'].astype(object)
+        df.loc[mask, 'last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.compute_derived_columns(df, mask)
+
+        self.data_manager.write_csv(self.module_name, self.filename, df)
+        self._frame = df
+        self._frame_signature = self.data_manager.get_data_signature(self.module_name, self.filename)
+
+        updated_count = int(mask.sum())
+        self.logger.info(f"Updated prices of {updated_count} investments")
         return updated_count
 
+    @staticmethod
+    def compute_derived_columns(df: pd.DataFrame, mask: Optional[pd.Series] = None):
+        """Recompute the calculated columns in place, for the rows in ``mask`` or all rows
+
+        Column-wise equivalent of the calculated fields of Investment.to_dict().
+        """
+        if mask is None:
+            mask = pd.Series(True, index=df.index)
+
+        quantity = pd.to_numeric(df.loc[mask, 'quantity'], errors='coerce').fillna(0.0)
+        purchase_price = pd.to_numeric(df.loc[mask, 'purchase_price'], errors='coerce').fillna(0.0)
+        current_price = pd.to_numeric(df.loc[mask, 'current_price'], errors='coerce').fillna(0.0)
+
+        total_investment = quantity * purchase_price
+        current_value = quantity * current_price
+        profit_loss = current_value - total_investment
+        percentage = (profit_loss / total_investment.where(total_investment != 0) * 100).fillna(0.0)
+
+        # Unparseable purchase dates count as bought today, as Investment does
+        purchase_dates = pd.to_datetime(df.loc[mask, 'purchase_date'], errors='coerce').dt.normalize()
+        days_held = (pd.Timestamp(date.today()) - purchase_dates).dt.days.fillna(0).astype(int)
+        years_held = days_held / 365.25
+        growth = np.clip(1 + percentage / 100, 0, None)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annualized = (np.power(growth, 1 / years_held.where(days_held != 0)) - 1) * 100
+        annualized = annualized.where(days_held != 0, 0.0).fillna(0.0)
+
+        for column, values in (('total_investment', total_investment), ('current_value', current_value),
+                               ('profit_loss', profit_loss), ('profit_loss_percentage', percentage),
+                               ('days_held', days_held), ('annualized_return', annualized)):
+            existing = pd.to_numeric(df[column], errors='coerce') if column in df.columns else np.nan
+            df[column] = pd.Series(existing, index=df.index, dtype=float)
+            df.loc[mask, column] = values.astype(float)
+        if df['days_held'].notna().all():
+            df['days_held'] = df['days_held'].astype(int)
+
 
 # New data models for additional investment tabs
 
@@ -689,105 +759,49 @@ class LoanDetails:
         emi = P * r * (1 + r) ** n / ((1 + r) ** n - 1)
         return round(emi, 2)
 
+    def amortization_key(self):
+        """Get the memoization key of this loan's schedule: (principal, rate, tenure, EMI, start)"""
+        return amortization_engine.make_key(self.outstanding_amount, self.interest_rate, self.net_tenure,
+                                            self.emi_amount, self.emi_start_date)
+
+    def get_amortization(self):
+        """Get the complete amortization schedule as arrays (amounts in paise)
+
+        Schedules are computed in whole paise by the amortization engine and
+        memoized on the loan terms, so repeated calls are cheap.
+        """
+        if self.outstanding_amount <= 0 or self.net_tenure <= 0:
+            return EMPTY_SCHEDULE
+        return amortization_engine.schedules([self.amortization_key()])[0]
+
     def generate_amortization_schedule(self):
         """Generate complete amortization schedule for the loan lifecycle using net_tenure
 
         This generates the full amortization schedule from loan start to finish,
         showing the complete loan repayment journey based on net_tenure.
         """
-        if self.outstanding_amount <= 0 or self.net_tenure <= 0:
-            return []
+        return self.get_amortization().to_records()
 
-        # Calculate EMI if not provided
-        emi = self.emi_amount if self.emi_amount > 0 else self.calculate_emi()
+    def get_prepayment_scenario(self, prepayments, reduce_emi=False):
+        """Compare the schedule with extra principal paid along with some payments
 
-        if emi <= 0:
-            return []
+        `prepayments` maps payment numbers to extra amounts. The loan keeps its
+        EMI and finishes early, or keeps its tenure with a lower EMI when
+        `reduce_emi` is set.
+        """
+        base = self.get_amortization()
+        if not len(base):
+            return {'schedule': [], 'total_payments': 0, 'total_interest': 0.0,
+                    'interest_saved': 0.0, 'payments_saved': 0}
 
-        schedule = []
-        # Use Decimal for high precision calculations to avoid floating-point errors
-        from decimal import Decimal, ROUND_HALF_UP
-
-        # Convert to Decimal for precise calculations
-        remaining_balance = Decimal(str(self.outstanding_amount))
-        emi_decimal = Decimal(str(emi))
-        monthly_rate_decimal = Decimal(str(self.interest_rate)) / Decimal('100') / Decimal('12') if self.interest_rate > 0 else Decimal('0')
-
-        # Track cumulative principal for final validation
-        cumulative_principal = Decimal('0')
-        original_loan_amount = Decimal(str(self.outstanding_amount))
-
-        # Start date for payments
-        start_date = self.emi_start_date if self.emi_start_date else datetime.now().date()
-        if isinstance(start_date, datetime):
-            start_date = start_date.date()
-
-        # Generate ALL payment periods for the complete loan duration using net_tenure
-        for payment_num in range(1, self.net_tenure + 1):
-            # Calculate payment date
-            payment_date = self.add_months_to_date(start_date, payment_num - 1)
-
-            # Calculate interest for this month
-            interest_amount = remaining_balance * monthly_rate_decimal
-
-            # For the final payment, ensure we pay exactly the remaining balance
-            if payment_num == self.net_tenure:
-                # Final payment: pay all remaining balance plus interest
-                principal_amount = remaining_balance
-                total_payment = principal_amount + interest_amount
-                remaining_balance = Decimal('0')
-            else:
-                # Regular payment
-                principal_amount = emi_decimal - interest_amount
-
-                # Ensure principal is not negative (can happen with very high interest rates)
-                if principal_amount < 0:
-                    principal_amount = Decimal('0')
-                    interest_amount = emi_decimal
-
-                # Ensure we don't pay more principal than remaining balance
-                if principal_amount > remaining_balance:
-                    principal_amount = remaining_balance
-                    total_payment = principal_amount + interest_amount
-                    remaining_balance = Decimal('0')
-                else:
-                    total_payment = emi_decimal
-                    remaining_balance -= principal_amount
-
-            # Track cumulative principal
-            cumulative_principal += principal_amount
-
-            # Convert back to float and round for display
-            schedule.append({
-                'payment_number': payment_num,
-                'payment_date': payment_date,
-                'principal_amount': float(principal_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                'interest_amount': float(interest_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                'total_payment': float(total_payment.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                'remaining_balance': float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-            })
-
-            # Stop if balance is fully paid
-            if remaining_balance <= 0:
-                break
-
-        # Final validation and adjustment if needed
-        if schedule:
-            # Ensure final balance is exactly zero
-            schedule[-1]['remaining_balance'] = 0.00
-
-            # Check if cumulative principal matches original loan amount
-            total_principal_paid = sum(Decimal(str(payment['principal_amount'])) for payment in schedule)
-            principal_difference = original_loan_amount - total_principal_paid
-
-            # If there's a small difference due to rounding, adjust the final payment
-            if abs(principal_difference) > Decimal('0'):
-                final_payment = schedule[-1]
-                adjustment = float(principal_difference.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-                final_payment['principal_amount'] = round(final_payment['principal_amount'] + adjustment, 2)
-                final_payment['total_payment'] = round(final_payment['total_payment'] + adjustment, 2)
-
-        return schedule
+        scenario = amortization_engine.prepayment_schedule(self.amortization_key(), prepayments, reduce_emi)
+        return {
+            'schedule': scenario.to_records(),
+            'total_payments': len(scenario),
+            'total_interest': scenario.total_interest,
+            'interest_saved': round(base.total_interest - scenario.total_interest, 2),
+            'payments_saved': len(base) - len(scenario)
+        }
 
     def validate_amortization_schedule(self, schedule):
         """Validate the accuracy of the amortization schedule"""
@@ -834,38 +848,11 @@ class LoanDetails:
             'total_payments': len(schedule)
         }
 
-    def add_months_to_date(self, start_date, months):
-        """Add months to a date, handling month overflow"""
-        try:
-            from dateutil.relativedelta import relativedelta
-            return start_date + relativedelta(months=months)
-        except ImportError:
-            # Fallback method if dateutil is not available
-            year = start_date.year
-            month = start_date.month + months
-            day = start_date.day
-
-            # Handle month overflow
-            while month > 12:
-                year += 1
-                month -= 12
-            while month < 1:
-                year -= 1
-                month += 12
-
-            # Handle day overflow (e.g., Jan 31 + 1 month = Feb 28/29)
-            import calendar
-            max_day = calendar.monthrange(year, month)[1]
-            if day > max_day:
-                day = max_day
-
-            return date(year, month, day)
-
     def get_loan_summary_stats(self):
         """Get summary statistics for the loan"""
-        schedule = self.generate_amortization_schedule()
+        schedule = self.get_amortization()
 
-        if not schedule:
+        if not len(schedule):
             return {
                 'total_payments': 0,
                 'total_interest': 0.0,
@@ -875,25 +862,24 @@ class LoanDetails:
                 'interest_percentage': 0.0
             }
 
-        total_interest = sum(payment['interest_amount'] for payment in schedule)
-        total_principal = sum(payment['principal_amount'] for payment in schedule)
-        total_amount_payable = total_interest + total_principal
+        total_interest = schedule.total_interest
+        total_principal = schedule.total_principal
+        total_amount_payable = schedule.total_payment
 
         return {
             'total_payments': len(schedule),
-            'total_interest': round(total_interest, 2),
-            'total_principal': round(total_principal, 2),
-            'total_amount_payable': round(total_amount_payable, 2),
-            'average_monthly_interest': round(total_interest / len(schedule), 2) if schedule else 0.0,
+            'total_interest': total_interest,
+            'total_principal': total_principal,
+            'total_amount_payable': total_amount_payable,
+            'average_monthly_interest': round(total_interest / len(schedule), 2),
             'interest_percentage': round((total_interest / total_amount_payable * 100), 2) if total_amount_payable > 0 else 0.0
         }
 
     def get_chart_data(self):
         """Generate data for various chart visualizations"""
-        schedule = self.generate_amortization_schedule()
-        stats = self.get_loan_summary_stats()
+        schedule = self.get_amortization()
 
-        if not schedule:
+        if not len(schedule):
             return {
                 'pie_chart_data': [],
                 'line_chart_data': [],
@@ -901,26 +887,27 @@ class LoanDetails:
                 'bar_chart_data': []
             }
 
+        dates = schedule.payment_date.astype(object)
+
         # Pie chart data (Principal vs Interest)
         pie_data = [
-            ('Principal', stats['total_principal']),
-            ('Interest', stats['total_interest'])
+            ('Principal', schedule.total_principal),
+            ('Interest', schedule.total_interest)
         ]
 
         # Line chart data (Payment amounts over time)
-        line_data = [(payment['payment_date'], payment['total_payment']) for payment in schedule]
+        line_data = list(zip(dates, (schedule.payment / 100).tolist()))
 
         # Balance reduction chart data
-        balance_data = [(payment['payment_date'], payment['remaining_balance']) for payment in schedule]
-
-        # Bar chart data (Monthly Principal vs Interest)
-        bar_data = []
-        for payment in schedule[:min(24, len(schedule))]:  # Show first 24 months
-            bar_data.append({
-                'month': payment['payment_date'].strftime('%b %Y'),
-                'principal': payment['principal_amount'],
-                'interest': payment['interest_amount']
-            })
+        balance_data = list(zip(dates, (schedule.balance / 100).tolist()))
+
+        # Bar chart data (Monthly Principal vs Interest), first 24 months
+        first = schedule.slice(24)
+        bar_data = [
+            {'month': payment_date.strftime('%b %Y'), 'principal': principal, 'interest': interest}
+            for payment_date, principal, interest in zip(
+                dates[:len(first)], (first.principal / 100).tolist(), (first.interest / 100).tolist())
+        ]
 
         return {
             'pie_chart_data': pie_data,
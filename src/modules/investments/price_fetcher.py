@@ -5,9 +5,10 @@ Handles fetching current prices from Yahoo Finance API with proper error handlin
 
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from datetime import date, datetime, timedelta
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 try:
     import yfinance as yf
@@ -26,10 +27,45 @@ except ImportError:
     Mftool = None
     pd = None
 
+from .data_storage import investment_data_storage
+from .historical_cache import EARLIEST_DATE, HistoricalPriceCache
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how fast requests are started
+
+    Tokens refill at `rate` per second up to `capacity`, so short bursts of
+    parallel requests go out at once while the sustained rate stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
 
 class PriceFetcher:
     """Service for fetching current investment prices from Yahoo Finance and alternative sources"""
 
+    # Batched refresh settings for get_multiple_prices
+    batch_size = 50  # Tickers per Yahoo Finance download
+    max_fetch_workers = 4  # Concurrent downloads and fallback lookups
+
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.cache = {}
@@ -37,6 +73,7 @@ class PriceFetcher:
         self.cache_duration = timedelta(minutes=5)  # Cache prices for 5 minutes
         self.request_delay = 0.1  # Delay between requests to avoid rate limiting
         self.last_request_time = 0
+        self.rate_limiter = TokenBucket(rate=1 / self.request_delay, capacity=self.max_fetch_workers)
         self.YFINANCE_AVAILABLE = YFINANCE_AVAILABLE  # Expose the module-level variable
         self.MFTOOL_AVAILABLE = MFTOOL_AVAILABLE
 
@@ -45,6 +82,9 @@ class PriceFetcher:
         self.detailed_cache_expiry = {}
         self.detailed_cache_duration = timedelta(hours=1)  # Cache detailed data for 1 hour
 
+        # Daily price history kept locally; only missing dates are downloaded
+        self.history_cache = HistoricalPriceCache(investment_data_storage, self._download_daily_history)
+
         # Initialize mftool for Indian mutual fund data with error handling
         self.mf = None
         if MFTOOL_AVAILABLE:
@@ -219,12 +259,14 @@ class PriceFetcher:
             return False
         return datetime.now() < self.cache_expiry[symbol]
     
+    def _cache_price(self, symbol: str, price: float):
+        """Store a fetched price in the cache"""
+        self.cache[symbol] = price
+        self.cache_expiry[symbol] = datetime.now() + self.cache_duration
+
     def _rate_limit(self):
         """Implement rate limiting to avoid overwhelming the API"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            time.sleep(self.request_delay - time_since_last)
+        self.rate_limiter.acquire()
         self.last_request_time = time.time()
     
     def get_current_price(self, symbol: str) -> Optional[float]:
@@ -244,30 +286,30 @@ class PriceFetcher:
                 self.logger.debug(f"Successfully fetched price from Yahoo Finance for {symbol}: ₹{price:.2f}")
                 return price
 
+        return self._fetch_alternative_price(symbol)
+
+    def _fetch_alternative_price(self, symbol: str) -> Optional[float]:
+        """Fetch a price from the sources tried after Yahoo Finance"""
         # Phase 2: Try alternative data sources for mutual funds
         if symbol in self.mutual_fund_mappings:
             scheme_name = self.mutual_fund_mappings[symbol]
             self.logger.info(f"Yahoo Finance failed for {symbol}, trying alternative sources...")
 
-            # Try mftool first
+            # Try the shared AMFI NAV index first - no download once it is loaded
+            price = self.get_mf_nav_from_direct_api(scheme_name)
+            if price is not None:
+                self._cache_price(symbol, price)
+                self.logger.info(f"✅ Successfully fetched NAV from direct AMFI API for {symbol}: ₹{price:.2f}")
+                return price
+
+            # Try mftool as fallback
             if self.MFTOOL_AVAILABLE:
                 price = self.get_mf_nav_from_mftool(scheme_name)
                 if price is not None:
-                    # Cache the result
-                    self.cache[symbol] = price
-                    self.cache_expiry[symbol] = datetime.now() + self.cache_duration
+                    self._cache_price(symbol, price)
                     self.logger.info(f"✅ Successfully fetched NAV from mftool for {symbol}: ₹{price:.2f}")
                     return price
 
-            # Try direct AMFI API as fallback
-            price = self.get_mf_nav_from_direct_api(scheme_name)
-            if price is not None:
-                # Cache the result
-                self.cache[symbol] = price
-                self.cache_expiry[symbol] = datetime.now() + self.cache_duration
-                self.logger.info(f"✅ Successfully fetched NAV from direct AMFI API for {symbol}: ₹{price:.2f}")
-                return price
-
         # Phase 2.5: Try intelligent mutual fund name matching for unmapped symbols
         price = self._try_intelligent_mf_matching(symbol)
         if price is not None:
@@ -379,9 +421,7 @@ class PriceFetcher:
                     price = float(hist['Close'].iloc[-1])
 
             if price is not None:
-                # Cache the result
-                self.cache[symbol] = price
-                self.cache_expiry[symbol] = datetime.now() + self.cache_duration
+                self._cache_price(symbol, price)
                 self.logger.debug(f"Successfully fetched price for {normalized_symbol}: ₹{price:.2f}")
                 return price
             else:
@@ -392,39 +432,145 @@ class PriceFetcher:
             self.logger.error(f"Error fetching price for {symbol}: {e}")
             return None
     
-    def get_multiple_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
-        """Get current prices for multiple symbols"""
-        if not YFINANCE_AVAILABLE:
-            self.logger.warning("yfinance library not available")
-            return {symbol: None for symbol in symbols}
-        
+    def get_multiple_prices(self, symbols: List[str],
+                            callback: Optional[Callable[[str, Optional[float]], None]] = None,
+                            cancel_event: Optional[threading.Event] = None
+                            ) -> Dict[str, Optional[float]]:
+        """Get current prices for multiple symbols
+
+        Uncached symbols are fetched in multi-ticker Yahoo Finance downloads of
+        up to `batch_size` tickers. Symbols a batch does not price go on to the
+        mftool/AMFI sources as soon as that batch returns, so they overlap with
+        the remaining downloads. All requests share the token-bucket rate limit.
+
+        If given, `callback(symbol, price)` is called once per symbol as its
+        result arrives (price is None when every source failed). Callbacks run
+        in the calling thread, so they may touch the UI.
+
+        Setting `cancel_event` stops the fetch: queued requests are dropped,
+        requests already in flight are waited for but not reported, and the
+        prices reported so far are returned.
+        """
         results = {}
-        
-        # Separate cached and non-cached symbols
+
+        def report(symbol: str, price: Optional[float]):
+            results[symbol] = price
+            if callback:
+                try:
+                    callback(symbol, price)
+                except Exception as e:
+                    self.logger.error(f"Error in price callback for {symbol}: {e}")
+
+        # Serve cached symbols straight away
         cached_symbols = []
         fetch_symbols = []
-        
-        for symbol in symbols:
-            if self._is_cache_valid(symbol):
-                results[symbol] = self.cache[symbol]
+        for symbol in dict.fromkeys(symbols):
+            if not symbol:
+                report(symbol, None)
+            elif self._is_cache_valid(symbol):
                 cached_symbols.append(symbol)
+                report(symbol, self.cache[symbol])
             else:
                 fetch_symbols.append(symbol)
-        
+
         if cached_symbols:
             self.logger.debug(f"Using cached prices for {len(cached_symbols)} symbols")
-        
-        # Fetch non-cached symbols
-        for symbol in fetch_symbols:
-            price = self.get_current_price(symbol)
-            results[symbol] = price
-            
-            # Small delay between requests to be respectful to the API
-            if len(fetch_symbols) > 1:
-                time.sleep(0.1)
-        
+
+        if not fetch_symbols:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=self.max_fetch_workers, thread_name_prefix="price-fetch")
+        try:
+            pending = {}
+
+            if YFINANCE_AVAILABLE:
+                for start in range(0, len(fetch_symbols), self.batch_size):
+                    batch = fetch_symbols[start:start + self.batch_size]
+                    pending[executor.submit(self._fetch_yahoo_batch, batch)] = ('batch', batch)
+            else:
+                self.logger.warning("yfinance library not available, using alternative sources only")
+                for symbol in fetch_symbols:
+                    pending[executor.submit(self._fetch_alternative_price, symbol)] = ('symbol', symbol)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                if cancel_event is not None and cancel_event.is_set():
+                    self.logger.info(f"Price fetch cancelled with {len(results)} of {len(symbols)} symbols done")
+                    break
+                for future in done:
+                    kind, target = pending.pop(future)
+
+                    if kind == 'symbol':
+                        try:
+                            price = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Error fetching price for {target}: {e}")
+                            price = None
+                        report(target, price)
+                        continue
+
+                    try:
+                        batch_prices = future.result()
+                        fallback_task = self._fetch_alternative_price
+                    except Exception as e:
+                        # Whole download failed - retry each symbol through the full chain
+                        self.logger.warning(f"Batch download failed for {len(target)} symbols: {e}")
+                        batch_prices = {}
+                        fallback_task = self.get_current_price
+
+                    for symbol in target:
+                        if symbol in batch_prices:
+                            report(symbol, batch_prices[symbol])
+                        else:
+                            pending[executor.submit(fallback_task, symbol)] = ('symbol', symbol)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
         return results
-    
+
+    def _fetch_yahoo_batch(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch the latest close for several symbols in one Yahoo Finance download"""
+        tickers = {}
+        for symbol in symbols:
+            normalized_symbol = self._normalize_symbol(symbol)
+            if normalized_symbol:
+                tickers.setdefault(normalized_symbol, []).append(symbol)
+
+        if not tickers:
+            return {}
+
+        self._rate_limit()
+        data = yf.download(
+            tickers=list(tickers), period="5d", interval="1d", group_by='ticker',
+            auto_adjust=False, threads=min(len(tickers), self.max_fetch_workers), progress=False
+        )
+
+        prices = {}
+        if data is None or data.empty:
+            return prices
+
+        for ticker, ticker_symbols in tickers.items():
+            try:
+                if data.columns.nlevels > 1:
+                    if ticker not in data.columns.get_level_values(0):
+                        continue
+                    closes = data[ticker]['Close']
+                else:
+                    closes = data['Close']
+                closes = closes.dropna()
+                if closes.empty:
+                    continue
+
+                price = float(closes.iloc[-1])
+                for symbol in ticker_symbols:
+                    self._cache_price(symbol, price)
+                    prices[symbol] = price
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.debug(f"No batch price for {ticker}: {e}")
+
+        self.logger.debug(f"Batch download priced {len(prices)} of {len(symbols)} symbols")
+        return prices
+
     def clear_cache(self):
         """Clear the price cache"""
         self.cache.clear()
@@ -501,43 +647,21 @@ class PriceFetcher:
             return None
 
     def get_mf_nav_from_direct_api(self, scheme_name: str) -> Optional[float]:
-        """Get mutual fund NAV using direct AMFI API"""
+        """Get mutual fund NAV from the shared AMFI NAV index"""
         try:
-            self.logger.debug(f"Fetching NAV from direct AMFI API for scheme: {scheme_name}")
-
-            # Rate limiting for AMFI API
-            self._rate_limit()
+            from .amfi_fetcher import amfi_fetcher
 
-            # AMFI NAV data URL
-            amfi_url = "https://www.amfiindia.com/spages/NAVAll.txt"
+            self.logger.debug(f"Looking up NAV in AMFI index for scheme: {scheme_name}")
 
-            # Fetch data with timeout
-            response = requests.get(amfi_url, timeout=10)
-            response.raise_for_status()
+            # The index downloads NAVAll.txt at most once per cache period
+            scheme_info = amfi_fetcher.find_scheme(scheme_name)
+            if scheme_info is None:
+                self.logger.warning(f"No matching scheme found in AMFI data for: {scheme_name}")
+                return None
 
-            # Parse the data
-            lines = response.text.strip().split('\n')
-            scheme_name_lower = scheme_name.lower()
-
-            for line in lines:
-                if ';' in line:
-                    parts = line.split(';')
-                    if len(parts) >= 5:
-                        scheme_code = parts[0].strip()
-                        scheme_full_name = parts[3].strip()
-                        nav_str = parts[4].strip()
-
-                        # Check if this is the scheme we're looking for
-                        if scheme_name_lower in scheme_full_name.lower():
-                            try:
-                                nav_value = float(nav_str)
-                                self.logger.info(f"Successfully fetched NAV from direct AMFI API for {scheme_name}: ₹{nav_value:.2f}")
-                                return nav_value
-                            except ValueError:
-                                continue
-
-            self.logger.warning(f"No matching scheme found in AMFI data for: {scheme_name}")
-            return None
+            nav_value = float(scheme_info['nav'])
+            self.logger.info(f"Successfully fetched NAV from direct AMFI API for {scheme_name}: ₹{nav_value:.2f}")
+            return nav_value
 
         except Exception as e:
             self.logger.error(f"Error fetching NAV from direct AMFI API for {scheme_name}: {e}")
@@ -594,19 +718,17 @@ class PriceFetcher:
 
     def _try_intelligent_mf_matching(self, symbol: str) -> Optional[float]:
         """Try to intelligently match mutual fund symbols to AMFI scheme names"""
-        if not self.MFTOOL_AVAILABLE:
-            return None
-
         # Generate possible scheme name variations based on symbol
         possible_names = self._generate_scheme_name_variations(symbol)
 
         for scheme_name in possible_names:
             self.logger.debug(f"Trying scheme name variation: {scheme_name}")
-            price = self.get_mf_nav_from_mftool(scheme_name)
+            price = self.get_mf_nav_from_direct_api(scheme_name)
+            if price is None and self.MFTOOL_AVAILABLE:
+                price = self.get_mf_nav_from_mftool(scheme_name)
             if price is not None:
                 # Cache the result and add to mappings for future use
-                self.cache[symbol] = price
-                self.cache_expiry[symbol] = datetime.now() + self.cache_duration
+                self._cache_price(symbol, price)
                 self.mutual_fund_mappings[symbol] = scheme_name  # Add successful mapping
                 self.logger.info(f"✅ Found matching scheme for {symbol}: {scheme_name} (₹{price:.2f})")
                 return price
@@ -761,57 +883,31 @@ class PriceFetcher:
             return {'available': False, 'error': str(e)}
 
     def _get_historical_data(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
-        """Get historical price data"""
+        """Get historical price data from the local history, downloading only missing dates"""
         try:
             if not symbol:
                 return {'available': False, 'error': 'Empty or None symbol provided'}
 
-            if not YFINANCE_AVAILABLE:
-                return {'available': False, 'error': 'Yahoo Finance not available'}
-
             # ✅ FIX: Use analysis symbol for consistent data fetching
             analysis_symbol = self._get_analysis_symbol(symbol)
-            self.logger.debug(f"🔍 Fetching historical data for {symbol} (analysis symbol: {analysis_symbol})")
-
-            ticker = yf.Ticker(analysis_symbol)
-            hist = ticker.history(period=period)
+            self.logger.debug(f"🔍 Loading historical data for {symbol} (analysis symbol: {analysis_symbol})")
 
-            if hist.empty:
-                return {'available': False, 'error': 'No historical data found'}
-
-            # Convert to list of dictionaries for easier handling
-            historical_data = []
-            for date, row in hist.iterrows():
-                historical_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']) if not pd.isna(row['Volume']) else 0,
-                    'change': 0.0,  # Will be calculated
-                    'change_percent': 0.0  # Will be calculated
-                })
-
-            # Calculate changes
-            for i in range(1, len(historical_data)):
-                prev_close = historical_data[i-1]['close']
-                curr_close = historical_data[i]['close']
-                change = curr_close - prev_close
-                change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
-                historical_data[i]['change'] = change
-                historical_data[i]['change_percent'] = change_percent
-
-            return {
-                'available': True,
-                'data': historical_data,
-                'period': period,
-                'total_records': len(historical_data)
-            }
+            return self.history_cache.get_history(analysis_symbol, period)
         except Exception as e:
             self.logger.error(f"Error fetching historical data for {symbol}: {e}")
             return {'available': False, 'error': str(e)}
 
+    def _download_daily_history(self, symbol: str, start: date, end: date):
+        """Download daily Yahoo Finance history for dates in [start, end)"""
+        if not YFINANCE_AVAILABLE:
+            raise RuntimeError('Yahoo Finance not available')
+
+        self._rate_limit()
+        ticker = yf.Ticker(symbol)
+        if start <= EARLIEST_DATE:
+            return ticker.history(period="max")
+        return ticker.history(start=start.isoformat(), end=end.isoformat())
+
     def _get_performance_data(self, symbol: str) -> Dict[str, Any]:
         """Get performance metrics and charts data"""
         try:
@@ -0,0 +1,152 @@
+"""
+Background Price Update Service
+Fetches current prices off the UI thread and reports each price as it lands,
+with cancellation and a fixed-interval refresh during market hours
+"""
+
+import logging
+import threading
+from datetime import datetime, time
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal, QTimer
+
+from .price_fetcher import price_fetcher
+
+
+# NSE cash market session
+MARKET_OPEN_TIME = time(9, 15)
+MARKET_CLOSE_TIME = time(15, 30)
+
+DEFAULT_REFRESH_INTERVAL_SECONDS = 300
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Check whether the exchange session is running (weekdays 09:15-15:30)"""
+    now = now or datetime.now()
+    return now.weekday() < 5 and MARKET_OPEN_TIME <= now.time() <= MARKET_CLOSE_TIME
+
+
+class PriceUpdateService(QObject):
+    """Runs price fetches on a worker thread and posts results back as signals
+
+    The service is created on the UI thread, so signals emitted from the
+    worker are delivered through queued connections and slots may update
+    widgets directly. Only one fetch runs at a time; cancelling a fetch
+    stops it reporting further prices and still emits `update_finished`.
+    """
+
+    update_started = Signal(int, bool)  # total_symbols, scheduled
+    price_received = Signal(str, object)  # symbol, price (None when every source failed)
+    progress_updated = Signal(int, int)  # completed, total
+    update_finished = Signal(object, bool, bool)  # {symbol: price}, cancelled, scheduled
+
+    def __init__(self, fetcher=None, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.fetcher = fetcher or price_fetcher
+
+        self._thread: Optional[threading.Thread] = None
+        self._cancel_event: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+        self.symbols_provider: Optional[Callable[[], List[str]]] = None
+        self.market_hours_only = True
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._on_refresh_timer)
+
+    def is_running(self) -> bool:
+        """Check whether a fetch is in progress"""
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def start(self, symbols: List[str], scheduled: bool = False) -> bool:
+        """Start fetching prices for symbols; returns False if a fetch is already running"""
+        symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+        if not symbols:
+            return False
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self.logger.debug("Price update already running, not starting another")
+                return False
+
+            cancel_event = threading.Event()
+            self._cancel_event = cancel_event
+            self._thread = threading.Thread(
+                target=self._run, args=(symbols, cancel_event, scheduled),
+                name="price-update", daemon=True
+            )
+
+        self.update_started.emit(len(symbols), scheduled)
+        self._thread.start()
+        self.logger.info(f"Started {'scheduled' if scheduled else 'manual'} price update for {len(symbols)} symbols")
+        return True
+
+    def cancel(self):
+        """Ask the running fetch to stop"""
+        with self._lock:
+            if self._cancel_event is not None:
+                self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the running fetch to end; returns False on timeout"""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def shutdown(self, timeout: float = 2.0):
+        """Stop the refresh timer and any running fetch"""
+        self.stop_auto_refresh()
+        self.cancel()
+        self.wait(timeout)
+
+    def start_auto_refresh(self, symbols_provider: Callable[[], List[str]],
+                           interval_seconds: int = DEFAULT_REFRESH_INTERVAL_SECONDS,
+                           market_hours_only: bool = True):
+        """Refresh the provider's symbols every interval (only while the market is open by default)"""
+        self.symbols_provider = symbols_provider
+        self.market_hours_only = market_hours_only
+        self.refresh_timer.start(max(1, int(interval_seconds)) * 1000)
+        self.logger.info(f"Automatic price refresh every {interval_seconds}s")
+
+    def stop_auto_refresh(self):
+        """Stop the fixed-interval refresh"""
+        self.refresh_timer.stop()
+
+    def _on_refresh_timer(self):
+        if self.symbols_provider is None or self.is_running():
+            return
+        if self.market_hours_only and not is_market_open():
+            return
+
+        try:
+            symbols = self.symbols_provider()
+        except Exception as e:
+            self.logger.error(f"Error collecting symbols for scheduled price update: {e}")
+            return
+        self.start(symbols, scheduled=True)
+
+    def _run(self, symbols: List[str], cancel_event: threading.Event, scheduled: bool):
+        """Worker thread body; always ends with update_finished"""
+        results: Dict[str, Optional[float]] = {}
+        total = len(symbols)
+
+        def on_price(symbol: str, price: Optional[float]):
+            if cancel_event.is_set():
+                return
+            results[symbol] = price
+            self.price_received.emit(symbol, price)
+            self.progress_updated.emit(len(results), total)
+
+        try:
+            self.fetcher.get_multiple_prices(symbols, callback=on_price, cancel_event=cancel_event)
+        except Exception as e:
+            self.logger.error(f"Price update failed: {e}")
+        finally:
+            cancelled = cancel_event.is_set()
+            self.logger.info(f"Price update {'cancelled' if cancelled else 'finished'}: "
+                             f"{sum(1 for p in results.values() if p)} of {total} prices")
+            self.update_finished.emit(dict(results), cancelled, scheduled)
@@ -30,6 +30,8 @@ from .models import (
     MonthlySavingsTarget
 )
 from .price_fetcher import price_fetcher
+from .price_update_service import PriceUpdateService, DEFAULT_REFRESH_INTERVAL_SECONDS
+from .amortization import amortization_engine
 from .progressive_fetcher import progressive_fetcher
 from .loading_widget import InvestmentLoadingWidget
 from .data_storage import investment_data_storage
@@ -1659,6 +1661,7 @@ class LoanDetailsDialog(QDialog):
         self.loan = loan if loan else LoanDetails()
         self.setup_ui()
         self.load_data()
+        self.update_schedule_preview()
 
     def setup_ui(self):
         """Setup the dialog UI"""
@@ -1730,6 +1733,17 @@ class LoanDetailsDialog(QDialog):
 
         layout.addLayout(form_layout)
 
+        # Repayment preview, recomputed as the loan terms are edited
+        self.schedule_preview_label = QLabel()
+        self.schedule_preview_label.setWordWrap(True)
+        self.schedule_preview_label.setStyleSheet("color: #555; padding: 4px;")
+        layout.addWidget(self.schedule_preview_label)
+
+        for spin in (self.outstanding_amount_spin, self.interest_rate_spin,
+                     self.emi_amount_spin, self.net_tenure_spin):
+            spin.valueChanged.connect(self.update_schedule_preview)
+        self.emi_start_date_edit.dateChanged.connect(self.update_schedule_preview)
+
         # Buttons
         button_layout = QHBoxLayout()
         self.save_btn = QPushButton("Save")
@@ -1773,6 +1787,32 @@ class LoanDetailsDialog(QDialog):
             self.net_tenure_spin.setValue(self.loan.net_tenure)
             self.loan_holder_edit.setText(self.loan.loan_holder)
 
+    def update_schedule_preview(self):
+        """Show the EMI and total interest of the terms currently entered"""
+        try:
+            preview = LoanDetails(
+                id=0,
+                outstanding_amount=self.outstanding_amount_spin.value(),
+                interest_rate=self.interest_rate_spin.value(),
+                emi_amount=self.emi_amount_spin.value(),
+                emi_start_date=self.emi_start_date_edit.date().toPython(),
+                net_tenure=self.net_tenure_spin.value()
+            )
+            schedule = preview.get_amortization()
+            if not len(schedule):
+                self.schedule_preview_label.setText("Enter the amount and net tenure to preview repayments")
+                return
+
+            stats = preview.get_loan_summary_stats()
+            emi = preview.emi_amount if preview.emi_amount > 0 else schedule.payment[0] / 100
+            self.schedule_preview_label.setText(
+                f"EMI ₹{emi:,.2f} · {stats['total_payments']} payments ending "
+                f"{schedule.payment_date[-1].astype(date).strftime('%b %Y')} · "
+                f"Total interest ₹{stats['total_interest']:,.2f} ({stats['interest_percentage']:.1f}% of payable)"
+            )
+        except Exception as e:
+            self.schedule_preview_label.setText(f"Preview unavailable: {e}")
+
     def get_loan(self):
         """Get the loan from form data"""
         self.loan.loan_name = self.loan_name_edit.text().strip()
@@ -5207,117 +5247,6 @@ class LoanChartWidget(QWidget):
                     self.layout().addWidget(self.text_label)
 
 
-class PriceUpdateWorker(QObject):
-    """Worker class for updating prices in a separate thread"""
-
-    # Signals
-    progress_updated = Signal(int)
-    price_update_complete = Signal(int, list)  # updated_count, failed_updates
-
-    def __init__(self, mutual_funds_stocks, logger):
-        super().__init__()
-        self.mutual_funds_stocks = mutual_funds_stocks
-        self.logger = logger
-
-    def update_prices(self):
-        """Update prices for all mutual funds and stocks"""
-        updated_count = 0
-        failed_updates = []
-
-        try:
-            self.logger.info("🔄 Price update worker thread started")
-
-            # Extract symbols for batch processing
-            symbols = [fund.symbol.strip() for fund in self.mutual_funds_stocks if fund.symbol and fund.symbol.strip()]
-
-            if not symbols:
-                self.logger.error("❌ No valid symbols found in worker")
-                self.price_update_complete.emit(0, ["No valid symbols found"])
-                return
-
-            self.logger.info(f"🔍 Starting price fetch for {len(symbols)} symbols: {symbols}")
-
-            # Fetch prices one by one to show progress
-            price_results = {}
-            total_symbols = len(symbols)
-
-            try:
-                for i, symbol in enumerate(symbols):
-                    # Update progress bar for each symbol being fetched
-                    progress_value = i + 1
-                    self.logger.debug(f"📊 Updating progress to {progress_value}/{total_symbols}")
-
-                    # Emit signal to update progress bar in main thread
-                    self.progress_updated.emit(progress_value)
-
-                    self.logger.debug(f"🔍 Fetching price for symbol {i+1}/{total_symbols}: {symbol}")
-
-                    # Fetch individual price
-                    try:
-                        price = price_fetcher.get_current_price(symbol)
-                        if price is not None:
-                            price_results[symbol] = price
-                            self.logger.debug(f"✅ Got price for {symbol}: ₹{price:.2f}")
-                        else:
-                            self.logger.debug(f"❌ No price data for {symbol}")
-                    except Exception as symbol_error:
-                        self.logger.warning(f"❌ Failed to fetch price for {symbol}: {symbol_error}")
-
-                    # Small delay to make progress visible and avoid rate limiting
-                    import time
-                    time.sleep(0.5)  # Increased delay for better visibility
-
-                self.logger.info(f"✅ Price fetch completed, got {len(price_results)} results out of {total_symbols} symbols")
-
-            except Exception as e:
-                self.logger.error(f"❌ Price fetch process failed: {e}")
-                import traceback
-                self.logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-                self.price_update_complete.emit(0, [f"Network error: Unable to fetch prices - {str(e)}"])
-                return
-
-            # Update each fund with the fetched price
-            for i, fund in enumerate(self.mutual_funds_stocks):
-                try:
-                    if not fund.symbol or not fund.symbol.strip():
-                        failed_updates.append(f"{fund.name}: No symbol defined")
-                        continue
-
-                    symbol = fund.symbol.strip()
-
-                    if symbol in price_results:
-                        new_price = price_results[symbol]
-                        if new_price is not None and new_price > 0:
-                            old_price = fund.current_price
-                            fund.update_current_price(new_price)
-                            updated_count += 1
-
-                            # Log significant price changes
-                            if old_price > 0:
-                                change_pct = ((new_price - old_price) / old_price) * 100
-                                if abs(change_pct) > 10:  # Log changes > 10%
-                                    self.logger.warning(f"Large price change for {symbol}: {old_price:.2f} → {new_price:.2f} ({change_pct:+.1f}%)")
-
-                            self.logger.debug(f"✅ Updated {fund.name} ({symbol}): ₹{old_price:.2f} → ₹{new_price:.2f}")
-                        else:
-                            failed_updates.append(f"{fund.name}: Invalid price data")
-                    else:
-                        failed_updates.append(f"{fund.name}: No price data available")
-
-                except Exception as fund_error:
-                    self.logger.error(f"❌ Error updating fund {fund.name}: {fund_error}")
-                    failed_updates.append(f"{fund.name}: Update error - {str(fund_error)}")
-
-            self.logger.info(f"✅ Price update completed: {updated_count} updated, {len(failed_updates)} failed")
-
-            # Emit completion signal
-            self.price_update_complete.emit(updated_count, failed_updates)
-
-        except Exception as e:
-            self.logger.error(f"Critical error in price update worker: {e}")
-            self.price_update_complete.emit(0, [f"Critical system error: {str(e)}"])
-
-
 class InvestmentTrackerWidget(QWidget):
     """Main investment tracker widget with multiple tabs"""
 
@@ -5365,7 +5294,18 @@ class InvestmentTrackerWidget(QWidget):
                 self.logger.error(f"❌ Failed to setup connections: {e}")
                 raise
 
-
+            # Background price updates, refreshed at a fixed interval during market hours
+            self.price_update_service = PriceUpdateService(parent=self)
+            self.price_update_service.update_started.connect(self._on_price_update_started)
+            self.price_update_service.price_received.connect(self._on_price_received)
+            self.price_update_service.progress_updated.connect(self._on_price_update_progress)
+            self.price_update_service.update_finished.connect(self._on_price_update_finished)
+            self.price_update_service.start_auto_refresh(self._get_price_update_symbols,
+                                                         DEFAULT_REFRESH_INTERVAL_SECONDS)
+            # Page widgets are not closed individually, so also stop the worker on quit
+            app = QApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.price_update_service.shutdown)
 
             # Refresh data with error handling
             try:
@@ -8344,9 +8284,20 @@ class InvestmentTrackerWidget(QWidget):
                 # Column 11: Remarks
                 self.lic_policy_table.setItem(row, 11, QTableWidgetItem(policy.remarks))
 
+    def precompute_loan_schedules(self):
+        """Compute the amortization schedules of all loans in one batch, so loan dialogs and charts open instantly"""
+        try:
+            keys = [loan.amortization_key() for loan in self.loan_details
+                    if loan.outstanding_amount > 0 and loan.net_tenure > 0]
+            if keys:
+                amortization_engine.schedules(keys)
+        except Exception as e:
+            self.logger.warning(f"Could not precompute loan schedules: {e}")
+
     def refresh_loan_table(self):
         """Refresh the loan table with data from CSV and current balance from payment history"""
         if hasattr(self, 'loan_details') and hasattr(self, 'loan_table'):
+            self.precompute_loan_schedules()
             self.loan_table.setRowCount(len(self.loan_details))
             for row, loan in enumerate(self.loan_details):
                 # Original columns
@@ -8410,11 +8361,15 @@ class InvestmentTrackerWidget(QWidget):
         # Calculate portfolio allocations before displaying
         self.calculate_portfolio_allocations()
 
+        # Fill with sorting off, otherwise rows move between the cells of one fund
+        sorting_enabled = self.mutual_funds_table.isSortingEnabled()
+        self.mutual_funds_table.setSortingEnabled(False)
         self.mutual_funds_table.setRowCount(len(self.mutual_funds_stocks))
 
         for row, fund in enumerate(self.mutual_funds_stocks):
-            # Column 0: Name
+            # Column 0: Name (keeps the fund's index so rows can be found after sorting)
             name_item = QTableWidgetItem(fund.name)
+            name_item.setData(Qt.UserRole, row)
             self.mutual_funds_table.setItem(row, 0, name_item)
 
             # Column 1: Symbol
@@ -8433,49 +8388,8 @@ class InvestmentTrackerWidget(QWidget):
             # Column 5: Units (Unit Price column removed)
             self.mutual_funds_table.setItem(row, 5, QTableWidgetItem(f"{fund.units:.3f}"))
 
-            # Column 6: Current Price (moved from Column 6)
-            current_price_item = QTableWidgetItem()
-            if fund.current_price > 0:
-                current_price_text = f"₹{fund.current_price:.2f}"
-                self.logger.debug(f"📊 Table refresh - {fund.symbol}: current_price = ₹{fund.current_price:.2f}")
-
-                # Add visual indicator for stale prices
-                if fund.is_price_stale():
-                    current_price_text += " ⚠️"
-                    current_price_item.setBackground(QColor(255, 255, 224))  # Light yellow
-
-                current_price_item.setText(current_price_text)
-            else:
-                current_price_item.setText("N/A")
-                current_price_item.setBackground(QColor(245, 245, 245))  # Light gray
-                self.logger.debug(f"📊 Table refresh - {fund.symbol}: current_price = 0.0 (showing N/A)")
-
-            self.mutual_funds_table.setItem(row, 6, current_price_item)
-
-            # Column 7: Current Amount (Market Value) - moved from Column 7
-            current_amount_item = QTableWidgetItem()
-
-            # Calculate current market value: current_price × units
-            if fund.current_price > 0 and fund.units > 0:
-                calculated_current_amount = fund.current_price * fund.units
-                current_amount_item.setText(f"₹{calculated_current_amount:,.2f}")
-
-                self.logger.debug(f"📊 Table refresh - {fund.symbol}: current_amount = ₹{calculated_current_amount:.2f} (price: ₹{fund.current_price:.2f} × units: {fund.units:.3f})")
-
-                # Color coding for profit/loss
-                if fund.amount > 0:  # Only calculate P&L if we have original investment amount
-                    profit_loss = calculated_current_amount - fund.amount
-                    if profit_loss > 0:
-                        current_amount_item.setBackground(QColor(200, 255, 200))  # Light green
-                    elif profit_loss < 0:
-                        current_amount_item.setBackground(QColor(255, 200, 200))  # Light red
-            else:
-                # Use original amount if no current price available
-                current_amount_item.setText(f"₹{fund.amount:,.2f}")
-                current_amount_item.setBackground(QColor(245, 245, 245))  # Light gray
-                self.logger.debug(f"📊 Table refresh - {fund.symbol}: using original amount ₹{fund.amount:.2f} (no current price)")
-
-            self.mutual_funds_table.setItem(row, 7, current_amount_item)
+            # Columns 6-7: Current Price and Current Amount
+            self._set_fund_price_cells(row, fund)
 
             # Column 8: Current Allocation - calculate dynamically based on current portfolio value
             total_portfolio_value = self.calculate_total_portfolio_value()
@@ -8501,6 +8415,8 @@ class InvestmentTrackerWidget(QWidget):
             remarks_item = QTableWidgetItem(remarks_text)
             self.mutual_funds_table.setItem(row, 9, remarks_item)
 
+        self.mutual_funds_table.setSortingEnabled(sorting_enabled)
+
         # Force comprehensive table display update
         self.mutual_funds_table.resizeColumnsToContents()  # Resize columns to fit content
         self.mutual_funds_table.viewport().update()  # Update table viewport
@@ -8513,6 +8429,44 @@ class InvestmentTrackerWidget(QWidget):
         # Update Net Worth display after mutual funds data changes
         self.update_net_worth_display()
 
+    def _set_fund_price_cells(self, row, fund):
+        """Show a fund's current price (column 6) and market value (column 7) in its table row"""
+        current_price_item = QTableWidgetItem()
+        if fund.current_price > 0:
+            current_price_text = f"₹{fund.current_price:.2f}"
+
+            # Add visual indicator for stale prices
+            if fund.is_price_stale():
+                current_price_text += " ⚠️"
+                current_price_item.setBackground(QColor(255, 255, 224))  # Light yellow
+
+            current_price_item.setText(current_price_text)
+        else:
+            current_price_item.setText("N/A")
+            current_price_item.setBackground(QColor(245, 245, 245))  # Light gray
+
+        self.mutual_funds_table.setItem(row, 6, current_price_item)
+
+        # Calculate current market value: current_price × units
+        current_amount_item = QTableWidgetItem()
+        if fund.current_price > 0 and fund.units > 0:
+            calculated_current_amount = fund.current_price * fund.units
+            current_amount_item.setText(f"₹{calculated_current_amount:,.2f}")
+
+            # Color coding for profit/loss
+            if fund.amount > 0:  # Only calculate P&L if we have original investment amount
+                profit_loss = calculated_current_amount - fund.amount
+                if profit_loss > 0:
+                    current_amount_item.setBackground(QColor(200, 255, 200))  # Light green
+                elif profit_loss < 0:
+                    current_amount_item.setBackground(QColor(255, 200, 200))  # Light red
+        else:
+            # Use original amount if no current price available
+            current_amount_item.setText(f"₹{fund.amount:,.2f}")
+            current_amount_item.setBackground(QColor(245, 245, 245))  # Light gray
+
+        self.mutual_funds_table.setItem(row, 7, current_amount_item)
+
     def refresh_purchase_history_table(self):
         """Refresh the purchase history table"""
         if not hasattr(self, 'mutual_fund_purchase_history') or not hasattr(self, 'purchase_history_table'):
@@ -9511,23 +9465,17 @@ class InvestmentTrackerWidget(QWidget):
 
 
     def update_all_prices(self):
-        """Update prices for all mutual funds and stocks with crash-free synchronous approach"""
+        """Start a background price update for all mutual funds and stocks, or cancel the running one"""
         try:
-            # Add detailed logging for debugging
-            self.logger.info("🔄 Price update button clicked - starting crash-free synchronous update...")
-
-            # Check if a price update is already in progress
-            if getattr(self, '_price_update_in_progress', False):
-                self.logger.warning("❌ Price update already in progress")
-                self._safe_show_message(
-                    "Update In Progress",
-                    "A price update is already in progress. Please wait for it to complete.",
-                    "information"
-                )
+            # A second click while an update is running cancels it
+            if self.price_update_service.is_running():
+                self.logger.info("⏹ Price update cancel requested")
+                self.price_update_service.cancel()
+                self.update_prices_btn.setEnabled(False)
+                self.update_prices_btn.setText("⏹ Cancelling...")
                 return
 
-            # Set the flag to prevent concurrent updates
-            self._price_update_in_progress = True
+            self.logger.info("🔄 Price update button clicked - starting background update...")
 
             # Check if yfinance is available
             if not hasattr(price_fetcher, 'YFINANCE_AVAILABLE') or not price_fetcher.YFINANCE_AVAILABLE:
@@ -9539,106 +9487,25 @@ class InvestmentTrackerWidget(QWidget):
                     "This library is required for fetching current stock and mutual fund prices.",
                     "error"
                 )
-                self._price_update_in_progress = False  # Clear flag before returning
                 return
-            else:
-                self.logger.info("✅ yfinance is available")
 
             if not hasattr(self, 'mutual_funds_stocks') or not self.mutual_funds_stocks:
                 self.logger.error("❌ No mutual funds/stocks data loaded")
                 self._safe_show_message("No Data", "No mutual funds or stocks to update.", "information")
-                self._price_update_in_progress = False  # Clear flag before returning
                 return
-            else:
-                self.logger.info(f"✅ Found {len(self.mutual_funds_stocks)} investments")
 
-            # Check for symbols
-            symbols_count = sum(1 for fund in self.mutual_funds_stocks if fund.symbol and fund.symbol.strip())
-            if symbols_count == 0:
+            symbols = self._get_price_update_symbols()
+            if not symbols:
                 self.logger.error("❌ No valid symbols found")
                 self._safe_show_message(
                     "No Symbols",
                     "No valid symbols found in your investments. Please add symbols to enable price updates.",
                     "warning"
                 )
-                self._price_update_in_progress = False  # Clear flag before returning
                 return
-            else:
-                self.logger.info(f"✅ Found {symbols_count} valid symbols")
-
-            # Check internet connectivity by trying a simple request
-            try:
-                import urllib.request
-                import ssl
-
-                # Create SSL context that doesn't verify certificates (for testing)
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-
-                # Try with SSL verification disabled first
-                try:
-                    urllib.request.urlopen('https://finance.yahoo.com', timeout=5, context=ssl_context)
-                    self.logger.info("✅ Internet connectivity confirmed (SSL verification bypassed)")
-                except Exception:
-                    # If that fails, try with normal SSL
-                    urllib.request.urlopen('https://finance.yahoo.com', timeout=5)
-                    self.logger.info("✅ Internet connectivity confirmed")
-
-            except Exception as e:
-                self.logger.warning(f"⚠️ Network connectivity issue: {e}")
-
-                # Check if it's an SSL certificate issue
-                if "CERTIFICATE_VERIFY_FAILED" in str(e) or "SSL" in str(e).upper():
-                    # For SSL issues, automatically continue with disabled verification
-                    # to avoid blocking the user with a dialog that could cause crashes
-                    self.logger.warning("🔧 SSL certificate issue detected, automatically disabling SSL verification")
-                    import os
-                    os.environ['PYTHONHTTPSVERIFY'] = '0'
-                    self.logger.info("🔧 SSL verification disabled for this session")
-
-                    # Show informational message about the SSL workaround
-                    self._safe_show_message(
-                        "SSL Certificate Issue",
-                        "SSL certificate verification failed when connecting to Yahoo Finance.\n\n"
-                        "SSL verification has been automatically disabled for this session.\n"
-                        "Your data remains secure - this only affects the Yahoo Finance connection.",
-                        "information"
-                    )
-                else:
-                    # For other network issues, show warning but continue
-                    self.logger.warning("🌐 Network connectivity issue, continuing with price update attempt")
-                    self._safe_show_message(
-                        "Network Issue",
-                        "Unable to connect to Yahoo Finance initially. This could be due to:\n\n"
-                        "• Temporary network issues\n"
-                        "• Firewall blocking the connection\n"
-                        "• Yahoo Finance temporarily unavailable\n\n"
-                        "The price update will continue and may still succeed.",
-                        "warning"
-                    )
-
-            # Disable the update button during processing
-            self.update_prices_btn.setEnabled(False)
-            self.update_prices_btn.setText("🔄 Updating...")
-            self.logger.info("🔄 Starting crash-free synchronous price update...")
 
-            # Show both progress bars with better formatting
-            total_investments = len(self.mutual_funds_stocks)
-            self.logger.info(f"📊 Initializing progress bars for {total_investments} investments")
-
-            # Initialize both progress bars
-            for progress_bar in [self.price_update_progress, self.main_progress_bar]:
-                progress_bar.setVisible(True)
-                progress_bar.setRange(0, total_investments)
-                progress_bar.setValue(0)
-                progress_bar.setFormat(f"Starting update for {total_investments} investments... 0%")
-                progress_bar.repaint()
-
-            self.logger.info(f"✅ Progress bars initialized - Small: {self.price_update_progress.isVisible()}, Main: {self.main_progress_bar.isVisible()}")
-
-            # Use synchronous approach instead of threading to eliminate crashes
-            self._update_prices_synchronously()
+            self.logger.info(f"✅ Found {len(symbols)} valid symbols")
+            self.price_update_service.start(symbols)
 
         except Exception as e:
             self.logger.error(f"❌ Error starting price update: {e}")
@@ -9648,114 +9515,115 @@ class InvestmentTrackerWidget(QWidget):
             # Use safe message display instead of direct QMessageBox
             self._show_error_safely(f"Failed to start price update: {str(e)}")
 
-            # Restore button state and hide progress bars
-            self.reset_price_update_button()
-            if hasattr(self, 'price_update_progress'):
-                self.price_update_progress.setVisible(False)
-            if hasattr(self, 'main_progress_bar'):
-                self.main_progress_bar.setVisible(False)
+    def _get_price_update_symbols(self):
+        """Get the distinct symbols of the loaded mutual funds and stocks"""
+        funds = getattr(self, 'mutual_funds_stocks', None) or []
+        return list(dict.fromkeys(fund.symbol.strip() for fund in funds if fund.symbol and fund.symbol.strip()))
 
-            # Clear the progress flag to allow future updates
-            self._price_update_in_progress = False
+    def _on_price_update_started(self, total_symbols, scheduled):
+        """Prepare the table and progress bars when a background price update starts"""
+        try:
+            self._price_update_in_progress = True
 
-    def _update_prices_synchronously(self):
-        """Update prices synchronously without threading to eliminate crashes"""
-        updated_count = 0
-        failed_updates = []
+            # Map each symbol to its funds and their current table rows; sorting stays off
+            # during the update so rows don't move while prices land
+            self.mutual_funds_table.setSortingEnabled(False)
+            fund_rows = {}
+            for row in range(self.mutual_funds_table.rowCount()):
+                item = self.mutual_funds_table.item(row, 0)
+                index = item.data(Qt.UserRole) if item is not None else None
+                if index is not None:
+                    fund_rows[index] = row
+
+            self._price_update_targets = {}
+            for index, fund in enumerate(self.mutual_funds_stocks):
+                if fund.symbol and fund.symbol.strip():
+                    self._price_update_targets.setdefault(fund.symbol.strip(), []).append(
+                        (fund, fund_rows.get(index)))
 
-        try:
-            self.logger.info("🔄 Starting synchronous price update...")
+            self.update_prices_btn.setEnabled(True)
+            self.update_prices_btn.setText("⏹ Cancel Update")
 
-            # Extract symbols for processing
-            symbols = [fund.symbol.strip() for fund in self.mutual_funds_stocks if fund.symbol and fund.symbol.strip()]
+            for progress_bar in [self.price_update_progress, self.main_progress_bar]:
+                progress_bar.setVisible(True)
+                progress_bar.setRange(0, total_symbols)
+                progress_bar.setValue(0)
+                progress_bar.setFormat(f"Starting update for {total_symbols} symbols... 0%")
 
-            if not symbols:
-                self.logger.error("❌ No valid symbols found")
-                self._finalize_price_update(0, ["No valid symbols found"])
-                return
+            self.logger.info(f"🔄 {'Scheduled' if scheduled else 'Manual'} price update started for {total_symbols} symbols")
 
-            self.logger.info(f"🔍 Processing {len(symbols)} symbols: {symbols}")
+        except Exception as e:
+            self.logger.error(f"Error preparing price update display: {e}")
 
-            # Process each symbol with UI updates
-            total_symbols = len(symbols)
-            price_results = {}
+    def _on_price_received(self, symbol, price):
+        """Apply one fetched price to its funds and their table rows"""
+        try:
+            if price is None or price <= 0:
+                self.logger.debug(f"❌ No price data for {symbol}")
+                return
 
-            for i, symbol in enumerate(symbols):
-                try:
-                    # Update progress bars
-                    progress_value = i + 1
-                    progress_percent = int((progress_value / total_symbols) * 100)
-
-                    # Update both progress bars
-                    for progress_bar in [self.price_update_progress, self.main_progress_bar]:
-                        progress_bar.setValue(progress_value)
-                        progress_bar.setFormat(f"Fetching {symbol}... {progress_percent}%")
-                        progress_bar.repaint()
-
-                    # Process events to keep UI responsive
-                    QApplication.processEvents()
-
-                    self.logger.debug(f"🔍 Fetching price for symbol {i+1}/{total_symbols}: {symbol}")
-
-                    # Fetch individual price
-                    price = price_fetcher.get_current_price(symbol)
-                    if price is not None:
-                        price_results[symbol] = price
-                        self.logger.debug(f"✅ Got price for {symbol}: ₹{price:.2f}")
-                    else:
-                        self.logger.debug(f"❌ No price data for {symbol}")
+            for fund, row in getattr(self, '_price_update_targets', {}).get(symbol, []):
+                old_price = fund.current_price
+                fund.update_current_price(price)
 
-                    # Small delay to make progress visible
-                    import time
-                    time.sleep(0.1)
+                # Log significant price changes
+                if old_price > 0:
+                    change_pct = ((price - old_price) / old_price) * 100
+                    if abs(change_pct) > 10:  # Log changes > 10%
+                        self.logger.warning(f"Large price change for {symbol}: {old_price:.2f} → {price:.2f} ({change_pct:+.1f}%)")
 
-                except Exception as symbol_error:
-                    self.logger.warning(f"❌ Failed to fetch price for {symbol}: {symbol_error}")
+                if row is not None:
+                    self._set_fund_price_cells(row, fund)
 
-            self.logger.info(f"✅ Price fetch completed, got {len(price_results)} results out of {total_symbols} symbols")
+        except Exception as e:
+            self.logger.error(f"Error applying price for {symbol}: {e}")
 
-            # Update each fund with the fetched price
-            for fund in self.mutual_funds_stocks:
-                try:
-                    if not fund.symbol or not fund.symbol.strip():
-                        failed_updates.append(f"{fund.name}: No symbol defined")
-                        continue
+    def _on_price_update_progress(self, completed, total):
+        """Advance both progress bars as prices arrive"""
+        try:
+            progress_percent = int((completed / total) * 100) if total else 100
+            for progress_bar in [self.price_update_progress, self.main_progress_bar]:
+                progress_bar.setValue(completed)
+                progress_bar.setFormat(f"Fetched {completed}/{total} symbols... {progress_percent}%")
+        except Exception as e:
+            self.logger.error(f"Error updating progress bars: {e}")
 
-                    symbol = fund.symbol.strip()
+    def _on_price_update_finished(self, price_results, cancelled, scheduled):
+        """Save and summarize a finished background price update"""
+        updated_count = 0
+        failed_updates = []
 
-                    if symbol in price_results:
-                        new_price = price_results[symbol]
-                        if new_price is not None and new_price > 0:
-                            old_price = fund.current_price
-                            fund.update_current_price(new_price)
-                            updated_count += 1
+        try:
+            self._price_update_in_progress = False
+            self._price_update_targets = {}
+            self.mutual_funds_table.setSortingEnabled(True)
 
-                            # Log significant price changes
-                            if old_price > 0:
-                                change_pct = ((new_price - old_price) / old_price) * 100
-                                if abs(change_pct) > 10:  # Log changes > 10%
-                                    self.logger.warning(f"Large price change for {symbol}: {old_price:.2f} → {new_price:.2f} ({change_pct:+.1f}%)")
+            for fund in self.mutual_funds_stocks:
+                if not fund.symbol or not fund.symbol.strip():
+                    failed_updates.append(f"{fund.name}: No symbol defined")
+                    continue
 
-                            self.logger.debug(f"✅ Updated {fund.name} ({symbol}): ₹{old_price:.2f} → ₹{new_price:.2f}")
-                        else:
-                            failed_updates.append(f"{fund.name}: Invalid price data")
-                    else:
+                symbol = fund.symbol.strip()
+                if symbol not in price_results:
+                    if not cancelled:
                         failed_updates.append(f"{fund.name}: No price data available")
+                elif price_results[symbol] is not None and price_results[symbol] > 0:
+                    updated_count += 1
+                else:
+                    failed_updates.append(f"{fund.name}: Invalid price data")
 
-                except Exception as fund_error:
-                    self.logger.error(f"❌ Error updating fund {fund.name}: {fund_error}")
-                    failed_updates.append(f"{fund.name}: Update error - {str(fund_error)}")
-
-            self.logger.info(f"✅ Price update completed: {updated_count} updated, {len(failed_updates)} failed")
+            self.logger.info(f"✅ Price update {'cancelled' if cancelled else 'completed'}: "
+                             f"{updated_count} updated, {len(failed_updates)} failed")
 
-            # Finalize the update
-            self._finalize_price_update(updated_count, failed_updates)
+            # Scheduled and cancelled updates refresh the display without a summary dialog
+            self._finalize_price_update(updated_count, failed_updates,
+                                        show_summary=not (scheduled or cancelled))
 
         except Exception as e:
-            self.logger.error(f"Critical error in synchronous price update: {e}")
+            self.logger.error(f"Critical error finishing price update: {e}")
             import traceback
             self.logger.error(f"Full traceback: {traceback.format_exc()}")
-            self._finalize_price_update(0, [f"Critical system error: {str(e)}"])
+            self._finalize_price_update(updated_count, [f"Critical system error: {str(e)}"])
 
     def reset_price_update_button(self):
         """Reset the price update button to its default state"""
@@ -9766,134 +9634,14 @@ class InvestmentTrackerWidget(QWidget):
         except Exception as e:
             self.logger.error(f"Error resetting price update button: {e}")
 
-    def _update_progress_bar(self, value):
-        """Update progress bar value in main thread"""
-        try:
-            if hasattr(self, 'mutual_funds_stocks'):
-                total = len(self.mutual_funds_stocks)
-                format_text = f"Updating {value}/{total} investments... %p%"
-                percentage = (value / total) * 100
-
-                self.logger.info(f"🔄 _update_progress_bar called with value={value}, total={total}")
-
-                # Update both progress bars
-                progress_bars = []
-                if hasattr(self, 'price_update_progress'):
-                    progress_bars.append(('small', self.price_update_progress))
-                if hasattr(self, 'main_progress_bar'):
-                    progress_bars.append(('main', self.main_progress_bar))
-
-                for name, progress_bar in progress_bars:
-                    old_value = progress_bar.value()
-                    progress_bar.setValue(value)
-                    progress_bar.setFormat(format_text)
-
-                    # Ensure progress bar is visible and force a repaint
-                    if not progress_bar.isVisible():
-                        progress_bar.setVisible(True)
-                        self.logger.debug(f"🔍 {name} progress bar was hidden, making it visible")
-
-                    progress_bar.repaint()
-                    new_value = progress_bar.value()
-
-                    self.logger.info(f"📊 {name} progress bar: {old_value} → {new_value} ({percentage:.1f}%)")
-
-                self.logger.info(f"✅ Progress bars updated successfully: {value}/{total}")
-
-        except Exception as e:
-            self.logger.error(f"Error updating progress bars: {e}")
-            import traceback
-            self.logger.error(f"Full traceback: {traceback.format_exc()}")
-
-
-
-    def _on_price_update_complete(self, updated_count, failed_updates):
-        """Handle completion of price update process"""
-        try:
-            # Clean up the thread and worker properly to prevent crashes
-            self._cleanup_price_update_thread()
-
-            # Save updated data to CSV if any updates were made
-            if updated_count > 0:
-                try:
-                    self.logger.info(f"🔄 Attempting to save {updated_count} updated prices to CSV...")
-                    save_success = self.csv_manager.save_data('mutual_funds_stocks', self.mutual_funds_stocks)
-                    if save_success:
-                        self.logger.info(f"✅ Successfully saved {updated_count} updated prices to CSV")
-                    else:
-                        self.logger.warning(f"⚠️ CSV save returned False - data may not have been saved properly")
-                except Exception as csv_error:
-                    import traceback
-                    self.logger.error(f"❌ Critical error saving to CSV: {csv_error}")
-                    self.logger.error(f"❌ CSV save traceback: {traceback.format_exc()}")
-                    # Don't let CSV save errors crash the application
-                    # The price updates were successful, so continue with UI updates
-                    self.logger.warning("⚠️ Continuing with UI updates despite CSV save failure")
-
-                    # Store the CSV error to show in the final message
-                    if not hasattr(self, '_csv_save_error'):
-                        self._csv_save_error = str(csv_error)
-
-            # Finalize the UI update
-            self._finalize_price_update(updated_count, failed_updates)
-
-        except Exception as e:
-            self.logger.error(f"Error in _on_price_update_complete: {e}")
-            # Still try to cleanup and finalize the UI
-            self._cleanup_price_update_thread()
-            self._finalize_price_update(updated_count, failed_updates)
-
-    def _cleanup_price_update_thread(self):
-        """Properly clean up the price update thread and worker to prevent crashes"""
-        try:
-            self.logger.debug("🔄 Starting safe price update thread cleanup...")
-
-            # Block signals first to prevent any callbacks during cleanup
-            if hasattr(self, 'price_update_worker') and self.price_update_worker:
-                try:
-                    # Block signals to prevent emission during cleanup
-                    self.price_update_worker.blockSignals(True)
-                    self.logger.debug("✅ Blocked price update worker signals")
-                except Exception as e:
-                    self.logger.warning(f"Error blocking worker signals: {e}")
-
-            # Clean up the thread
-            if hasattr(self, 'price_update_thread') and self.price_update_thread:
-                if self.price_update_thread.isRunning():
-                    self.logger.debug("🔄 Stopping price update thread...")
-                    self.price_update_thread.quit()
-
-                    # Wait for thread to finish gracefully - avoid terminate() to prevent crashes
-                    if not self.price_update_thread.wait(3000):  # Wait up to 3 seconds
-                        self.logger.warning("Price update thread did not stop gracefully within 3 seconds")
-                        # Don't use terminate() as it can cause application crashes
-                        # Instead, just log the warning and continue with cleanup
-                        self.logger.warning("Continuing with cleanup without terminating thread")
-                    else:
-                        self.logger.debug("✅ Price update thread stopped gracefully")
-
-                # Clear reference without calling deleteLater to avoid crashes
-                self.price_update_thread = None
-
-            # Clean up the worker
-            if hasattr(self, 'price_update_worker') and self.price_update_worker:
-                self.price_update_worker = None
-
-            self.logger.debug("✅ Price update thread and worker cleanup completed safely")
-
-        except Exception as e:
-            self.logger.error(f"Error during price update thread cleanup: {e}")
-            # Ensure objects are cleared even if cleanup fails
-            if hasattr(self, 'price_update_thread'):
-                self.price_update_thread = None
-            if hasattr(self, 'price_update_worker'):
-                self.price_update_worker = None
-
-        finally:
-            # Always clear the progress flag to allow future updates
-            self._price_update_in_progress = False
+    def closeEvent(self, event):
+        """Stop background price updates before the widget goes away"""
+        self._closing = True
+        if hasattr(self, 'price_update_service'):
+            self.price_update_service.shutdown()
+        super().closeEvent(event)
 
-    def _finalize_price_update(self, updated_count, failed_updates):
+    def _finalize_price_update(self, updated_count, failed_updates, show_summary=True):
         """Finalize the price update process in the main thread with simplified safety checks"""
         try:
             # Simple safety check to ensure widget is in stable state
@@ -9957,7 +9705,11 @@ class InvestmentTrackerWidget(QWidget):
             total_investments = len(self.mutual_funds_stocks) if hasattr(self, 'mutual_funds_stocks') else 0
 
             # Use safer approach to show completion message - avoid QMessageBox that might cause crashes
-            self._show_price_update_completion_safely(updated_count, failed_updates, total_investments)
+            if show_summary:
+                self._show_price_update_completion_safely(updated_count, failed_updates, total_investments)
+            elif hasattr(self, '_csv_save_error'):
+                self._show_error_safely(f"Prices were updated but could not be saved: {self._csv_save_error}")
+                delattr(self, '_csv_save_error')
 
             self.logger.info(f"Price update completed: {updated_count} updated, {len(failed_updates)} failed")
 
@@ -10360,13 +10112,6 @@ class InvestmentDetailsDialog(QDialog):
 
         self._closing = True
 
-        # Clean up price update thread if running
-        try:
-            self._cleanup_price_update_thread()
-            self.logger.info("Price update thread cleanup completed during close")
-        except Exception as e:
-            self.logger.warning(f"Error during price update thread cleanup: {e}")
-
         # Disconnect signals to prevent callbacks after dialog destruction
         if hasattr(self, 'fetcher') and self.fetcher:
             try:
@@ -11246,18 +10991,13 @@ class InvestmentDetailsDialog(QDialog):
             self.advance_historical_progress()
 
             # Step 2: Fetching data
-            import time
-            time.sleep(0.1)  # Brief delay for UI responsiveness
             self.advance_historical_progress()
 
-            # Actual data fetching - use the progressive fetcher's price fetcher
+            # Served from the local price history; only dates missing from it are downloaded
             if hasattr(self, 'fetcher') and hasattr(self.fetcher, 'fetcher'):
                 historical_data = self.fetcher.fetcher._get_historical_data(self.fund.symbol, period)
             else:
-                # Fallback: create a temporary price fetcher
-                from src.modules.investments.price_fetcher import PriceFetcher
-                temp_fetcher = PriceFetcher()
-                historical_data = temp_fetcher._get_historical_data(self.fund.symbol, period)
+                historical_data = price_fetcher._get_historical_data(self.fund.symbol, period)
 
             # Step 3: Processing data
             self.advance_historical_progress()
@@ -12,6 +12,8 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QPalette
 
+from ...ui.plotly_host import acquire_chart_view
+
 # Check for optional dependencies
 try:
     import plotly.graph_objects as go
@@ -101,7 +103,7 @@ class BaseInteractiveChart(QWidget):
         if not PLOTLY_AVAILABLE or not WEBENGINE_AVAILABLE:
             self.show_dependency_message()
         else:
-            self.web_view = QWebEngineView()
+            self.web_view = acquire_chart_view(self)
 
             # SIMPLE FIX: Keep basic minimum width, remove height constraints
             self.setMinimumWidth(300)
@@ -155,71 +157,13 @@ class BaseInteractiveChart(QWidget):
         )
         return fig
 
-    def generate_theme_aware_html(self, fig):
-        """Generate theme-aware HTML for Plotly charts - CRITICAL FIX for chart backgrounds"""
+    def render_figure(self, fig):
+        """Push a Plotly figure to the pooled chart view"""
+        if not hasattr(self, 'web_view'):
+            return
         colors = self.get_theme_colors()
-        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))  # Default to white for light theme
-
-        # Generate base HTML
-        html_str = fig.to_html(include_plotlyjs='cdn')
-
-        # EMPTY SPACE FIX: Inject CSS to eliminate ALL extra spacing and ensure tight layout
-        theme_css = f"""
-        <style>
-            /* EMPTY SPACE FIX: Remove ALL margins and padding to eliminate white space */
-            html, body {{
-                background-color: {background} !important;
-                background: {background} !important;
-                margin: 0 !important;
-                padding: 0 !important;
-                height: auto !important;
-                overflow: hidden !important;
-            }}
-
-            /* EMPTY SPACE FIX: Target all Plotly containers and remove extra spacing */
-            .plotly-graph-div,
-            .plotly-graph-div > div,
-            .js-plotly-plot,
-            .plot-container,
-            .svg-container {{
-                background-color: {background} !important;
-                background: {background} !important;
-                margin: 0 !important;
-                padding: 0 !important;
-                height: auto !important;
-            }}
-
-            /* EMPTY SPACE FIX: Override any remaining containers and remove spacing */
-            div[id*="plotly"] {{
-                background-color: {background} !important;
-                background: {background} !important;
-                margin: 0 !important;
-                padding: 0 !important;
-                height: auto !important;
-            }}
-
-            /* EMPTY SPACE FIX: Ensure the main plot div takes only necessary space */
-            .main-svg {{
-                margin: 0 !important;
-                padding: 0 !important;
-            }}
-        </style>
-        """
-
-        # Insert CSS right after <head> tag
-        head_end = html_str.find('</head>')
-        if head_end != -1:
-            html_str = html_str[:head_end] + theme_css + html_str[head_end:]
-
-        return html_str
-
-    def set_chart_html(self, html_str):
-        """Set HTML content and ensure visibility"""
-        if hasattr(self, 'web_view'):
-            self.web_view.setHtml(html_str)
-            # CRITICAL FIX: Ensure the web view is visible and updated
-            self.web_view.show()
-            self.web_view.update()
+        background = colors.get('background', colors.get('figure_facecolor', '#ffffff'))
+        self.web_view.show_figure(fig, background)
 
     def create_filter_controls(self):
         """Create filter controls - to be overridden by subclasses"""
@@ -256,7 +200,7 @@ class BaseInteractiveChart(QWidget):
             </body>
             </html>
             """
-            self.web_view.setHtml(html_content)
+            self.web_view.show_message(html_content)
     
     def show_error_message(self, error: str):
         """Show error message"""
@@ -273,7 +217,7 @@ class BaseInteractiveChart(QWidget):
             </body>
             </html>
             """
-            self.web_view.setHtml(html_content)
+            self.web_view.show_message(html_content)
     
     def update_chart(self, data: pd.DataFrame):
         """Update chart with new data - to be implemented by subclasses"""
@@ -416,10 +360,9 @@ class InteractivePieChartWidget(BaseInteractiveChart):
             height=300  # Reasonable height
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
     
     def create_priority_pie_chart(self, data: pd.DataFrame):
         """Create pie chart showing task priority distribution"""
@@ -469,11 +412,9 @@ class InteractivePieChartWidget(BaseInteractiveChart):
             height=300  # Reasonable height
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        # STYLING CONSISTENCY: Use consistent method for setting chart HTML like other charts
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
     
     def create_category_pie_chart(self, data: pd.DataFrame):
         """Create pie chart showing task category distribution"""
@@ -514,11 +455,9 @@ class InteractivePieChartWidget(BaseInteractiveChart):
             height=300  # Reasonable height
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        # STYLING CONSISTENCY: Use consistent method for setting chart HTML like other charts
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
 
 class InteractiveTimeSeriesWidget(BaseInteractiveChart):
@@ -707,10 +646,9 @@ class InteractiveTimeSeriesWidget(BaseInteractiveChart):
             hovermode='x unified'
         )
         
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_creation_trends_chart(self, data: pd.DataFrame):
         """Create time series chart showing only task creation trends"""
@@ -746,10 +684,9 @@ class InteractiveTimeSeriesWidget(BaseInteractiveChart):
             height=400
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_content)
+        self.render_figure(fig)
 
     def create_completion_only_chart(self, data: pd.DataFrame):
         """Create time series chart showing only task completion trends"""
@@ -789,10 +726,9 @@ class InteractiveTimeSeriesWidget(BaseInteractiveChart):
             height=400
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_content)
+        self.render_figure(fig)
 
     def create_cumulative_chart(self, data: pd.DataFrame):
         """Create cumulative task count chart"""
@@ -833,10 +769,9 @@ class InteractiveTimeSeriesWidget(BaseInteractiveChart):
             height=400
         )
 
-        # CRITICAL FIX: Apply theme colors and generate theme-aware HTML
+        # CRITICAL FIX: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.web_view.setHtml(html_content)
+        self.render_figure(fig)
 
 
 class InteractiveBarChartWidget(BaseInteractiveChart):
@@ -987,10 +922,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_category_performance_chart(self, data: pd.DataFrame):
         """Create bar chart showing category performance"""
@@ -1051,10 +985,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_time_based_chart(self, data: pd.DataFrame):
         """Create time-based analysis chart"""
@@ -1088,10 +1021,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_status_distribution_chart(self, data: pd.DataFrame):
         """Create status distribution bar chart"""
@@ -1120,10 +1052,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_priority_distribution_chart(self, data: pd.DataFrame):
         """Create priority distribution bar chart"""
@@ -1152,10 +1083,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_completion_rate_chart(self, data: pd.DataFrame):
         """Create completion rate by category chart"""
@@ -1182,10 +1112,9 @@ class InteractiveBarChartWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
 
 class InteractiveScatterPlotWidget(BaseInteractiveChart):
@@ -1371,10 +1300,9 @@ class InteractiveScatterPlotWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_priority_timeline_chart(self, data: pd.DataFrame):
         """Create scatter plot showing priority vs timeline"""
@@ -1440,10 +1368,9 @@ class InteractiveScatterPlotWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_category_priority_chart(self, data: pd.DataFrame):
         """Create scatter plot showing category vs priority correlation"""
@@ -1494,10 +1421,9 @@ class InteractiveScatterPlotWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_status_time_chart(self, data: pd.DataFrame):
         """Create scatter plot showing status vs creation time"""
@@ -1538,10 +1464,9 @@ class InteractiveScatterPlotWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_completion_time_chart(self, data: pd.DataFrame):
         """Create scatter plot showing completion time analysis"""
@@ -1579,10 +1504,9 @@ class InteractiveScatterPlotWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
 
 class InteractiveHeatmapWidget(BaseInteractiveChart):
@@ -1745,10 +1669,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_category_priority_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing category vs priority distribution"""
@@ -1781,10 +1704,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_status_priority_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing status vs priority distribution"""
@@ -1806,10 +1728,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_monthly_patterns_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing monthly task creation patterns"""
@@ -1842,10 +1763,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_weekly_patterns_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing weekly task patterns"""
@@ -1877,10 +1797,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
     def create_completion_status_heatmap(self, data: pd.DataFrame):
         """Create heatmap showing completion patterns by category and status"""
@@ -1902,10 +1821,9 @@ class InteractiveHeatmapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
 
 
 class InteractiveTreemapWidget(BaseInteractiveChart):
@@ -2036,7 +1954,6 @@ class InteractiveTreemapWidget(BaseInteractiveChart):
             height=400
         )
 
-        # STYLING CONSISTENCY: Apply theme colors and use consistent HTML generation
+        # STYLING CONSISTENCY: Apply theme colors and render
         fig = self.apply_theme_to_plotly_fig(fig)
-        html_content = self.generate_theme_aware_html(fig)
-        self.set_chart_html(html_content)
+        self.render_figure(fig)
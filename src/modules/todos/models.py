@@ -601,10 +601,11 @@ class TodoDataModel:
             # Sync to Google Tasks
             results = self.google_tasks.sync_to_google(todo_items)
 
-            # Update local records with Google Task IDs
-            for todo_item in todo_items:
-                if hasattr(todo_item, 'google_task_id') and todo_item.google_task_id:
-                    self.update_todo(todo_item.id, todo_item)
+            # Update local records with Google Task IDs in a single write
+            with self.data_manager.transaction(self.module_name):
+                for todo_item in todo_items:
+                    if hasattr(todo_item, 'google_task_id') and todo_item.google_task_id:
+                        self.update_todo(todo_item.id, todo_item)
 
             self.logger.info(f"Synced {len(results)} todos to Google Tasks")
             return results
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QDateEdit, QTextEdit,
     QCheckBox, QFrame, QGroupBox, QScrollArea, QTabWidget,
-    QProgressBar, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QProgressBar, QSpinBox, QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
     QAbstractItemView, QSizePolicy, QButtonGroup, QDoubleSpinBox,
     QMessageBox, QDialog, QDialogButtonBox, QSplitter, QProgressDialog,
     QCalendarWidget, QListWidget, QListWidgetItem, QStackedWidget,
@@ -18,11 +18,13 @@ from PySide6.QtCore import Qt, Signal, QDate, QTimer, QSize
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPalette, QColor, QBrush, QPainter, QTextCharFormat
 
 from datetime import datetime, date, timedelta
+from functools import partial
 from typing import Dict, List, Any, Optional
 import pandas as pd
 
 from .models import TodoItem, TodoDataModel, Priority, Status, Category
 from .sync_worker import SyncProgressDialog
+from ...ui.table_models import DataFrameTableModel, TableColumn, format_date
 from src.ui.themes.utils import get_calendar_color_for_state, get_calendar_color_with_alpha, get_current_theme
 
 
@@ -732,16 +734,28 @@ class TodoHistoryWidget(QWidget):
         layout.addWidget(self.stats_label)
 
         # History table
-        self.history_table = QTableWidget()
+        self.history_table = QTableView()
         self.history_table.setAlternatingRowColors(True)
         self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.history_table.setSortingEnabled(True)
-        self.history_table.itemDoubleClicked.connect(self.on_task_double_clicked)
+        self.history_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.history_table.doubleClicked.connect(self.on_task_double_clicked)
 
         # Set up table columns
-        columns = ["Title", "Category", "Priority", "Status", "Due Date", "Created", "Completed", "Duration"]
-        self.history_table.setColumnCount(len(columns))
-        self.history_table.setHorizontalHeaderLabels(columns)
+        status_colors = {'Completed': '#90ee90', 'In Progress': '#ffffe0', 'Cancelled': '#ffb6c1'}
+        history_date = partial(format_date, fmt='%Y-%m-%d', invalid='')
+        self.history_model = DataFrameTableModel([
+            TableColumn('title', "Title"),
+            TableColumn('category', "Category"),
+            TableColumn('priority', "Priority"),
+            TableColumn('status', "Status", background=status_colors.get),
+            TableColumn('due_date', "Due Date", history_date, sort_as='date'),
+            TableColumn('created_at', "Created", history_date, sort_as='date'),
+            TableColumn('completed_at', "Completed", history_date, sort_as='date'),
+            TableColumn('duration_days', "Duration",
+                        lambda days: f"{int(days)} days" if pd.notna(days) else "", sort_as='number'),
+        ], self)
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSortingEnabled(True)
 
         # Configure column widths
         header = self.history_table.horizontalHeader()
@@ -808,14 +822,11 @@ class TodoHistoryWidget(QWidget):
     def apply_filters(self):
         """Apply current filters to the history table"""
         try:
-            # Show loading indicator
-            self.history_table.setRowCount(0)
-            self.history_table.setSortingEnabled(False)
-
             # Get all todos
             df = self.todo_model.get_all_todos()
 
             if df.empty:
+                self.history_model.clear()
                 self.update_statistics(df)
                 return
 
@@ -843,9 +854,6 @@ class TodoHistoryWidget(QWidget):
             # Update statistics
             self.update_statistics(df)
 
-            # Re-enable sorting
-            self.history_table.setSortingEnabled(True)
-
         except Exception as e:
             self.logger.error(f"Error applying filters: {e}")
 
@@ -930,87 +938,10 @@ class TodoHistoryWidget(QWidget):
 
     def populate_table(self, df):
         """Populate the history table with filtered data"""
-        self.history_table.setRowCount(len(df))
-
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            # Title
-            self.history_table.setItem(row_idx, 0, QTableWidgetItem(str(row['title'])))
-
-            # Category
-            category = str(row['category']) if pd.notna(row['category']) else ""
-            self.history_table.setItem(row_idx, 1, QTableWidgetItem(category))
-
-            # Priority
-            self.history_table.setItem(row_idx, 2, QTableWidgetItem(str(row['priority'])))
-
-            # Status
-            status_item = QTableWidgetItem(str(row['status']))
-            if row['status'] == 'Completed':
-                status_item.setBackground(QBrush(QColor(144, 238, 144)))
-            elif row['status'] == 'In Progress':
-                status_item.setBackground(QBrush(QColor(255, 255, 224)))
-            elif row['status'] == 'Cancelled':
-                status_item.setBackground(QBrush(QColor(255, 182, 193)))
-            self.history_table.setItem(row_idx, 3, status_item)
-
-            # Due Date
-            due_date = ""
-            if pd.notna(row['due_date']):
-                try:
-                    if isinstance(row['due_date'], str):
-                        due_date = datetime.strptime(row['due_date'], '%Y-%m-%d').strftime('%Y-%m-%d')
-                    else:
-                        due_date = row['due_date'].strftime('%Y-%m-%d')
-                except:
-                    due_date = str(row['due_date'])
-            self.history_table.setItem(row_idx, 4, QTableWidgetItem(due_date))
-
-            # Created Date
-            created_date = ""
-            if pd.notna(row['created_at']):
-                try:
-                    if isinstance(row['created_at'], str):
-                        created_date = datetime.strptime(row['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                    else:
-                        created_date = row['created_at'].strftime('%Y-%m-%d')
-                except:
-                    created_date = str(row['created_at'])
-            self.history_table.setItem(row_idx, 5, QTableWidgetItem(created_date))
-
-            # Completed Date
-            completed_date = ""
-            if pd.notna(row['completed_at']):
-                try:
-                    if isinstance(row['completed_at'], str):
-                        completed_date = datetime.strptime(row['completed_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                    else:
-                        completed_date = row['completed_at'].strftime('%Y-%m-%d')
-                except:
-                    completed_date = str(row['completed_at'])
-            self.history_table.setItem(row_idx, 6, QTableWidgetItem(completed_date))
-
-            # Duration (if completed)
-            duration = ""
-            if pd.notna(row['completed_at']) and pd.notna(row['created_at']):
-                try:
-                    if isinstance(row['completed_at'], str):
-                        completed = datetime.strptime(row['completed_at'], '%Y-%m-%d %H:%M:%S')
-                    else:
-                        completed = row['completed_at']
-
-                    if isinstance(row['created_at'], str):
-                        created = datetime.strptime(row['created_at'], '%Y-%m-%d %H:%M:%S')
-                    else:
-                        created = row['created_at']
-
-                    duration_delta = completed - created
-                    duration = f"{duration_delta.days} days"
-                except:
-                    duration = ""
-            self.history_table.setItem(row_idx, 7, QTableWidgetItem(duration))
-
-            # Store task ID in first column for reference
-            self.history_table.item(row_idx, 0).setData(Qt.UserRole, row['id'])
+        # Duration (if completed), for every row at once
+        created = pd.to_datetime(df['created_at'], errors='coerce')
+        completed = pd.to_datetime(df['completed_at'], errors='coerce')
+        self.history_model.set_dataframe(df.assign(duration_days=(completed - created).dt.days))
 
     def update_statistics(self, df):
         """Update statistics summary"""
@@ -1036,10 +967,10 @@ class TodoHistoryWidget(QWidget):
 
         self.stats_label.setText(stats_text)
 
-    def on_task_double_clicked(self, item):
+    def on_task_double_clicked(self, index):
         """Handle task double-click"""
-        if item.column() == 0:  # Title column
-            task_id = item.data(Qt.UserRole)
+        if index.column() == 0:  # Title column
+            task_id = self.history_model.row_value(index.row(), 'id')
             if task_id:
                 self.task_selected.emit(task_id)
 
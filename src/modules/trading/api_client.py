@@ -21,6 +21,7 @@ except ImportError:
     KiteException = Exception
 
 from .models import Position, Order, Holding, MarketData, Portfolio, Instrument, TradingConfig, MutualFundHolding, Trade
+from .instrument_master import InstrumentMaster
 
 
 class ZerodhaAPIClient:
@@ -71,6 +72,9 @@ class ZerodhaAPIClient:
         
         # Token storage file
         self.token_file = self.trading_data_dir / "tokens.json"
+
+        # Instrument dump, downloaded once per trading day
+        self.instrument_master = InstrumentMaster(self.trading_data_dir / "instruments", self._download_instruments)
         
         if not KITE_AVAILABLE:
             self.logger.error("KiteConnect library not available. Please install kiteconnect package.")
@@ -522,34 +526,28 @@ class ZerodhaAPIClient:
             self.logger.error(f"Failed to get historical data: {e}")
             return []
 
+    def _download_instruments(self) -> List[Dict[str, Any]]:
+        """Fetch the full instrument dump (all exchanges) for the instrument master"""
+        if not self.is_authenticated():
+            return []
+        return self.kite.instruments()
+
     def get_instruments(self, exchange: Optional[str] = None) -> List[Instrument]:
         """Get list of instruments"""
         try:
-            if not self.is_authenticated():
-                return []
-
-            instruments_data = self.kite.instruments(exchange)
-            instruments = []
-
-            for inst_data in instruments_data:
-                # Convert expiry string to datetime if present
-                if 'expiry' in inst_data and inst_data['expiry']:
-                    try:
-                        inst_data['expiry'] = datetime.strptime(inst_data['expiry'], '%Y-%m-%d')
-                    except:
-                        inst_data['expiry'] = None
-                else:
-                    inst_data['expiry'] = None
-
-                instrument = Instrument(**inst_data)
-                instruments.append(instrument)
-
-            return instruments
-
+            return self.instrument_master.get_instruments(exchange)
         except Exception as e:
             self.logger.error(f"Failed to get instruments: {e}")
             return []
 
+    def get_instrument_tokens(self, instruments: List[str]) -> Dict[str, int]:
+        """Resolve "EXCHANGE:SYMBOL" strings to instrument tokens from the instrument master"""
+        try:
+            return self.instrument_master.resolve_tokens(instruments)
+        except Exception as e:
+            self.logger.error(f"Failed to resolve instrument tokens: {e}")
+            return {}
+
     def get_trades(self) -> List[Dict[str, Any]]:
         """Get all trades for the day"""
         try:
@@ -590,30 +588,10 @@ class ZerodhaAPIClient:
             self.logger.error(f"Failed to get margin requirements: {e}")
             return {}
 
-    def search_instruments(self, exchange: str, query: str) -> List[Instrument]:
-        """Search for instruments by symbol"""
+    def search_instruments(self, exchange: Optional[str], query: str, limit: int = 50) -> List[Instrument]:
+        """Search for instruments by symbol or name prefix"""
         try:
-            if not self.is_authenticated():
-                return []
-
-            # Get all instruments for the exchange
-            all_instruments = self.get_instruments(exchange)
-
-            # Filter by query
-            query_upper = query.upper()
-            matching_instruments = []
-
-            for instrument in all_instruments:
-                if (query_upper in instrument.tradingsymbol.upper() or
-                    query_upper in instrument.name.upper()):
-                    matching_instruments.append(instrument)
-
-                # Limit results to avoid overwhelming the UI
-                if len(matching_instruments) >= 50:
-                    break
-
-            return matching_instruments
-
+            return self.instrument_master.search(query, exchange, limit)
         except Exception as e:
             self.logger.error(f"Failed to search instruments: {e}")
             return []
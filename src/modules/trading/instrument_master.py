@@ -0,0 +1,313 @@
+"""
+Instrument Master
+Daily cached instrument dump with a sorted prefix index for symbol search and token lookup
+"""
+
+import logging
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import Instrument
+
+# pyarrow is optional - without it the master is kept in memory only
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    feather = None
+    PYARROW_AVAILABLE = False
+
+
+# The broker regenerates the instrument dump every morning before the session
+DUMP_REFRESH_TIME = time(8, 30)
+
+INSTRUMENT_COLUMNS = ['instrument_token', 'exchange_token', 'tradingsymbol', 'name', 'last_price',
+                      'expiry', 'strike', 'tick_size', 'lot_size', 'instrument_type', 'segment', 'exchange']
+
+# Sorts after every character of a symbol, closing a prefix range
+_PREFIX_END = "\uffff"
+
+
+def dump_date(now: Optional[datetime] = None) -> date:
+    """Date of the instrument dump in effect at ``now``"""
+    now = now or datetime.now()
+    if now.time() < DUMP_REFRESH_TIME:
+        return now.date() - timedelta(days=1)
+    return now.date()
+
+
+class InstrumentMaster:
+    """All instruments of the broker, downloaded once per trading day
+
+    The dump is normalised into one DataFrame (categorical exchange and
+    segment columns, parsed expiries) and persisted as a Feather file
+    tagged with its dump date, so later sessions of the same day load it
+    from disk. Rows are kept in symbol order, so a symbol prefix or an
+    exact symbol is a binary search away, and the distinct words of the
+    instrument names get a sorted index of their own. Instrument objects
+    are only created for results.
+
+    ``loader`` returns the raw dump (a list of dicts, as
+    KiteConnect.instruments() does) and is only called when no current
+    file exists.
+    """
+
+    cache_filename = "instruments.feather"
+    dump_date_key = b"traqify_dump_date"
+
+    def __init__(self, cache_dir: Path, loader: Callable[[], Optional[List[Dict[str, Any]]]]):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.cache_dir = Path(cache_dir)
+        self.loader = loader
+        self._lock = threading.RLock()
+        self._loading: Optional[threading.Thread] = None
+
+        self.frame: Optional[pd.DataFrame] = None
+        self.loaded_date: Optional[date] = None
+        self.symbol_keys = np.empty(0, dtype=object)     # upper-cased symbol of each row, sorted
+        self.word_keys = np.empty(0, dtype=object)       # distinct name words, sorted
+        self.word_offsets = np.zeros(1, dtype=np.int64)  # word i owns word_rows[offsets[i]:offsets[i + 1]]
+        self.word_rows = np.empty(0, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {}
+        self.exchange_codes = np.empty(0, dtype=np.int8)
+        self.exchanges: List[str] = []
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / self.cache_filename
+
+    # Loading
+
+    def is_ready(self) -> bool:
+        """Check whether today's instruments are indexed"""
+        return self.frame is not None and self.loaded_date == dump_date()
+
+    def ensure_loaded(self) -> bool:
+        """Load today's instruments from the cache file or the broker; False if unavailable"""
+        with self._lock:
+            today = dump_date()
+            if self.frame is not None and self.loaded_date == today:
+                return True
+
+            frame = self._read_cache(today)
+            if frame is None:
+                frame = self._download()
+                if frame is None:
+                    # Yesterday's instruments are better than none
+                    return self.frame is not None
+                self._write_cache(frame, today)
+
+            self._build_index(frame)
+            self.loaded_date = today
+            return True
+
+    def load_in_background(self):
+        """Start ensure_loaded() on a worker thread unless already loaded or loading"""
+        with self._lock:
+            if self.is_ready() or (self._loading is not None and self._loading.is_alive()):
+                return
+            self._loading = threading.Thread(target=self._load_quietly, name="instrument-master", daemon=True)
+            self._loading.start()
+
+    def _load_quietly(self):
+        try:
+            self.ensure_loaded()
+        except Exception as e:
+            self.logger.error(f"Failed to load instrument master: {e}")
+
+    def _download(self) -> Optional[pd.DataFrame]:
+        """Fetch and normalise the instrument dump"""
+        try:
+            records = self.loader()
+        except Exception as e:
+            self.logger.error(f"Failed to download instruments: {e}")
+            return None
+        if not records:
+            return None
+
+        self.logger.info(f"Downloaded {len(records)} instruments")
+        return self.normalize(pd.DataFrame.from_records(records))
+
+    @staticmethod
+    def normalize(df: pd.DataFrame) -> pd.DataFrame:
+        """Give a raw dump compact, consistent dtypes"""
+        df = df.reindex(columns=INSTRUMENT_COLUMNS)
+        for column in ('instrument_token', 'exchange_token', 'lot_size'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(np.int64)
+        for column in ('last_price', 'strike', 'tick_size'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0.0).astype(np.float64)
+        for column in ('tradingsymbol', 'name'):
+            df[column] = df[column].fillna('').astype(str)
+        for column in ('instrument_type', 'segment', 'exchange'):
+            df[column] = df[column].fillna('').astype(str).astype('category')
+        # Expiries arrive as dates or 'YYYY-MM-DD' strings; blanks mean none
+        df['expiry'] = pd.to_datetime(df['expiry'].replace('', None), errors='coerce')
+        # Symbol order makes every symbol prefix a contiguous run of rows
+        df = df.sort_values('tradingsymbol', key=lambda symbols: symbols.str.upper(), kind='stable')
+        return df.reset_index(drop=True)
+
+    def _read_cache(self, expected_date: date) -> Optional[pd.DataFrame]:
+        """Load the cache file if it holds the expected day's dump"""
+        if not PYARROW_AVAILABLE or not self.cache_path.exists():
+            return None
+        try:
+            table = feather.read_table(str(self.cache_path), memory_map=True)
+            metadata = table.schema.metadata or {}
+            if metadata.get(self.dump_date_key) != expected_date.isoformat().encode('ascii'):
+                return None
+            return table.to_pandas()
+        except (pa.ArrowException, OSError, ValueError) as e:
+            self.logger.debug(f"Ignoring unreadable instrument cache: {e}")
+            return None
+
+    def _write_cache(self, df: pd.DataFrame, day: date):
+        """Persist a normalised dump tagged with its date"""
+        if not PYARROW_AVAILABLE:
+            return
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[self.dump_date_key] = day.isoformat().encode('ascii')
+            table = table.replace_schema_metadata(metadata)
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix('.tmp')
+            feather.write_feather(table, str(temp_path), compression='zstd')
+            os.replace(temp_path, self.cache_path)
+        except (pa.ArrowException, OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Could not write instrument cache: {e}")
+
+    def _build_index(self, df: pd.DataFrame):
+        """Index a normalised (symbol-sorted) frame for prefix search and lookup"""
+        # Names repeat across an underlying's contracts, so split each distinct name once
+        name_codes, names = pd.factorize(df['name'].str.upper())
+        pair_names, pair_words = [], []
+        for code, name in enumerate(names):
+            for word in set(name.split()):
+                if len(word) > 1:
+                    pair_names.append(code)
+                    pair_words.append(word)
+        words, pair_word_ids = np.unique(np.array(pair_words, dtype=str), return_inverse=True)
+
+        # Rows grouped by name, then fanned out to every (word, name) pair
+        pair_names = np.array(pair_names, dtype=np.int64)
+        rows_by_name = np.argsort(name_codes, kind='stable')
+        name_counts = np.bincount(name_codes[name_codes >= 0], minlength=len(names))
+        name_starts = np.concatenate([[0], np.cumsum(name_counts)[:-1]])
+        pair_order = np.argsort(pair_word_ids, kind='stable')
+        pair_counts = name_counts[pair_names[pair_order]]
+        offsets_in_pair = np.arange(pair_counts.sum()) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        word_rows = rows_by_name[np.repeat(name_starts[pair_names[pair_order]], pair_counts) + offsets_in_pair]
+        rows_per_word = np.bincount(pair_word_ids, weights=name_counts[pair_names], minlength=len(words))
+
+        self.frame = df
+        self.symbol_keys = df['tradingsymbol'].str.upper().to_numpy(dtype=object)
+        self.word_keys = words.astype(object)
+        self.word_offsets = np.concatenate([[0], np.cumsum(rows_per_word)]).astype(np.int64)
+        self.word_rows = word_rows.astype(np.int64)
+        self.columns = {column: df[column].to_numpy(dtype=object) for column in INSTRUMENT_COLUMNS}
+        self.exchange_codes = df['exchange'].cat.codes.to_numpy()
+        self.exchanges = list(df['exchange'].cat.categories)
+        self.logger.debug(f"Indexed {len(df)} instruments and {len(words)} name words")
+
+    # Queries
+
+    def search(self, query: str, exchange: Optional[str] = None, limit: int = 50) -> List[Instrument]:
+        """Find instruments whose symbol or a word of whose name starts with the query
+
+        Exact symbol matches come first, then symbol prefix matches in
+        symbol order, then name matches.
+        """
+        query = query.strip().upper()
+        if not query or limit <= 0 or not self.ensure_loaded():
+            return []
+
+        with self._lock:
+            if exchange and exchange not in self.exchanges:
+                return []
+            end = query + _PREFIX_END
+
+            # Rows are sorted by symbol, so a prefix is one contiguous run that starts with the exact match
+            lo, hi = np.searchsorted(self.symbol_keys, [query, end])
+            symbol_rows = self._in_exchange(np.arange(lo, hi), exchange, limit)
+
+            word_lo, word_hi = np.searchsorted(self.word_keys, [query, end])
+            name_rows = self._in_exchange(self.word_rows[self.word_offsets[word_lo]:self.word_offsets[word_hi]],
+                                          exchange, limit)
+
+            ranked = np.concatenate([symbol_rows, name_rows])
+            _, first = np.unique(ranked, return_index=True)
+            selected = ranked[np.sort(first)][:limit]
+            return [self._instrument(int(row)) for row in selected]
+
+    def _in_exchange(self, rows: np.ndarray, exchange: Optional[str], limit: int) -> np.ndarray:
+        """Keep the first ``limit`` rows, of one exchange if given"""
+        if exchange:
+            rows = rows[self.exchange_codes[rows] == self.exchanges.index(exchange)]
+        return rows[:limit]
+
+    def get_instrument(self, exchange: str, tradingsymbol: str) -> Optional[Instrument]:
+        """Look up one instrument by exchange and trading symbol"""
+        row = self._lookup_row(exchange, tradingsymbol)
+        return self._instrument(row) if row is not None else None
+
+    def get_token(self, instrument: str) -> Optional[int]:
+        """Get the instrument token of an "EXCHANGE:SYMBOL" string"""
+        exchange, _, tradingsymbol = instrument.partition(':')
+        row = self._lookup_row(exchange, tradingsymbol)
+        return int(self.columns['instrument_token'][row]) if row is not None else None
+
+    def resolve_tokens(self, instruments: Iterable[str]) -> Dict[str, int]:
+        """Get instrument tokens for "EXCHANGE:SYMBOL" strings, skipping unknown ones"""
+        tokens = {}
+        for instrument in instruments:
+            token = self.get_token(instrument)
+            if token is not None:
+                tokens[instrument] = token
+        return tokens
+
+    def get_instruments(self, exchange: Optional[str] = None) -> List[Instrument]:
+        """Materialise every instrument, or those of one exchange"""
+        if not self.ensure_loaded():
+            return []
+        with self._lock:
+            df = self.frame if not exchange else self.frame[self.frame['exchange'] == exchange]
+            return [self._instrument(int(row)) for row in df.index]
+
+    def _lookup_row(self, exchange: str, tradingsymbol: str) -> Optional[int]:
+        """Find the row of a symbol on an exchange"""
+        if not self.is_ready() and not self.ensure_loaded():
+            return None
+        with self._lock:
+            key = tradingsymbol.upper()
+            lo, hi = np.searchsorted(self.symbol_keys, [key, key + "\x00"])
+            for row in range(lo, hi):
+                if self.columns['exchange'][row] == exchange:
+                    return row
+            return None
+
+    def _instrument(self, row: int) -> Instrument:
+        """Build the Instrument for a frame row"""
+        values = {column: self.columns[column][row] for column in INSTRUMENT_COLUMNS}
+        expiry = values['expiry']
+        values.update(
+            instrument_token=int(values['instrument_token']),
+            exchange_token=int(values['exchange_token']),
+            last_price=float(values['last_price']),
+            expiry=None if pd.isna(expiry) else pd.Timestamp(expiry).to_pydatetime(),
+            strike=float(values['strike']),
+            tick_size=float(values['tick_size']),
+            lot_size=int(values['lot_size']),
+            instrument_type=str(values['instrument_type']),
+            segment=str(values['segment']),
+            exchange=str(values['exchange']),
+        )
+        return Instrument(**values)
@@ -0,0 +1,314 @@
+"""
+Trading Refresh Service
+Concurrent, off-UI-thread refresh of broker data that reports only what changed
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, Signal
+
+
+# Index quotes shown in the market overview
+MARKET_INDICES = ["NSE:NIFTY 50", "NSE:NIFTY BANK", "NSE:NIFTY IT", "BSE:SENSEX"]
+
+# Sections a refresh can cover. 'quotes' (watchlist) and 'indices' share one quote request.
+REFRESH_SECTIONS = ('profile', 'margins', 'positions', 'holdings', 'orders', 'trades', 'quotes', 'indices')
+
+
+def position_key(position) -> str:
+    """Key a position by exchange, symbol and product"""
+    return f"{position.exchange}:{position.tradingsymbol}:{position.product}"
+
+
+def holding_key(holding) -> str:
+    """Key a holding by exchange, symbol and product, or a mutual fund by folio and symbol"""
+    if hasattr(holding, 'fund'):
+        return f"MF:{holding.folio}:{holding.tradingsymbol}"
+    return f"{holding.exchange}:{holding.tradingsymbol}:{holding.product}"
+
+
+def order_key(order) -> str:
+    """Key an order by its order id"""
+    return str(order.order_id)
+
+
+@dataclass
+class ListChanges:
+    """Difference between two snapshots of a keyed list
+
+    ``items`` and ``keys`` describe the current list in broker order;
+    ``changed`` holds items that are new or differ from the previous
+    snapshot and ``removed`` the keys that disappeared. When
+    ``layout_changed`` is false the keys are identical and in the same
+    order, so a table can update just the rows in ``changed``.
+    """
+    items: List[Any] = field(default_factory=list)
+    keys: List[str] = field(default_factory=list)
+    changed: Dict[str, Any] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    layout_changed: bool = True
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed or self.removed or self.layout_changed)
+
+    def changed_rows(self) -> List[tuple]:
+        """Get (row, item) for every changed item"""
+        return [(row, self.changed[key]) for row, key in enumerate(self.keys) if key in self.changed]
+
+
+def unique_keys(items: Iterable[Any], key_func: Callable[[Any], str]) -> List[str]:
+    """Key items, suffixing repeats (e.g. a symbol in both day and net positions)"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for item in items:
+        base = key_func(item)
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        keys.append(base if count == 0 else f"{base}#{count}")
+    return keys
+
+
+def diff_lists(previous: Optional[ListChanges], items: List[Any], keys: List[str]) -> ListChanges:
+    """Compare a fetched list with the previous snapshot"""
+    if previous is None:
+        return ListChanges(items=items, keys=keys, changed=dict(zip(keys, items)), layout_changed=True)
+
+    old_items = dict(zip(previous.keys, previous.items))
+    current = set(keys)
+    changed = {key: item for key, item in zip(keys, items)
+               if key not in old_items or old_items[key] != item}
+    removed = [key for key in previous.keys if key not in current]
+    return ListChanges(items=items, keys=keys, changed=changed, removed=removed,
+                       layout_changed=keys != previous.keys)
+
+
+class TradingRefreshService(QObject):
+    """Fetches broker data on a worker pool and emits only the changes
+
+    request_refresh() returns immediately. A background thread fans the
+    requested sections out to a ThreadPoolExecutor, so their network round
+    trips overlap instead of adding up, then compares each result with the
+    previous snapshot. A section's signal is emitted only when its data
+    changed; receivers living on the UI thread get them queued. Requests
+    made while a refresh is running are merged into one follow-up refresh.
+
+    ``client_provider`` returns the current ZerodhaAPIClient (or None). If
+    it returns a different client by the time a refresh completes, the
+    results are dropped, and a new client starts from an empty snapshot.
+    """
+
+    profile_changed = Signal(object)            # profile dict
+    margins_changed = Signal(object)            # margins dict
+    positions_changed = Signal(object)          # ListChanges of Position
+    holdings_changed = Signal(object, object)   # get_all_holdings() dict, ListChanges of holdings
+    orders_changed = Signal(object)             # ListChanges of Order
+    trades_changed = Signal(object)             # list of trade dicts
+    quotes_changed = Signal(object)             # ListChanges of watchlist quotes keyed by instrument
+    indices_changed = Signal(object)            # ListChanges of index quotes keyed by instrument
+    refresh_finished = Signal(object)           # set of sections that changed
+
+    def __init__(self, client_provider: Callable[[], Any], max_workers: int = 6, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.client_provider = client_provider
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._pending_sections: Set[str] = set()
+        self._pending_watchlist: Optional[List[str]] = None
+        self._snapshot_client = None
+
+        # Previous results per section: ListChanges for lists, raw values otherwise
+        self.snapshot: Dict[str, Any] = {}
+
+    def is_refreshing(self) -> bool:
+        """Check whether a background refresh is running"""
+        with self._lock:
+            return self._worker is not None
+
+    def request_refresh(self, sections: Optional[Iterable[str]] = None,
+                        watchlist: Optional[List[str]] = None) -> bool:
+        """Refresh sections in the background; False if merged into a running refresh
+
+        ``watchlist`` lists the symbols (NSE) whose quotes make up the
+        'quotes' section.
+        """
+        requested = set(sections or REFRESH_SECTIONS) & set(REFRESH_SECTIONS)
+        with self._lock:
+            self._pending_sections |= requested
+            if watchlist is not None:
+                self._pending_watchlist = list(watchlist)
+            if self._worker is not None:
+                return False
+            self._worker = threading.Thread(target=self._run_pending, name="trading-refresh", daemon=True)
+            self._worker.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the background refresh finishes; False on timeout"""
+        with self._lock:
+            worker = self._worker
+        if worker is None:
+            return True
+        worker.join(timeout)
+        return not worker.is_alive()
+
+    def reset(self):
+        """Forget the previous snapshot, so the next refresh reports everything"""
+        with self._lock:
+            self.snapshot = {}
+            self._snapshot_client = None
+
+    def _run_pending(self):
+        """Worker thread: run refreshes until no requests are pending"""
+        while True:
+            with self._lock:
+                sections, self._pending_sections = self._pending_sections, set()
+                watchlist = self._pending_watchlist
+                if not sections:
+                    self._worker = None
+                    return
+            try:
+                self.refresh_now(sections, watchlist)
+            except Exception as e:
+                self.logger.error(f"Trading refresh failed: {e}")
+
+    def refresh_now(self, sections: Optional[Iterable[str]] = None,
+                    watchlist: Optional[List[str]] = None) -> Set[str]:
+        """Fetch sections concurrently in the calling thread, emit changes and return the changed sections"""
+        sections = set(sections or REFRESH_SECTIONS) & set(REFRESH_SECTIONS)
+        client = self.client_provider()
+        if client is None or not client.is_authenticated():
+            return set()
+
+        results = self._fetch(client, sections, watchlist or [])
+
+        with self._lock:
+            if self.client_provider() is not client:
+                self.logger.debug("Client changed during refresh, dropping results")
+                return set()
+            if self._snapshot_client is not client:
+                self.snapshot = {}
+                self._snapshot_client = client
+            changes = self._apply_results(results)
+
+        for section, payload in changes.items():
+            self._emit_change(section, payload)
+        self.refresh_finished.emit(set(changes))
+        return set(changes)
+
+    def _fetch(self, client, sections: Set[str], watchlist: List[str]) -> Dict[str, Any]:
+        """Run the API calls for the sections on a worker pool"""
+        watch_instruments = [f"NSE:{symbol}" for symbol in watchlist]
+        calls: Dict[str, Callable[[], Any]] = {
+            'profile': client.get_profile,
+            'margins': client.get_margins,
+            'positions': client.get_positions,
+            'holdings': client.get_all_holdings,
+            'orders': client.get_orders,
+            'trades': client.get_trades,
+        }
+        tasks = {section: calls[section] for section in sections if section in calls}
+
+        # Watchlist and index quotes go out as one batched quote request
+        instruments = []
+        if 'quotes' in sections:
+            instruments += watch_instruments
+        if 'indices' in sections:
+            instruments += [i for i in MARKET_INDICES if i not in instruments]
+        if instruments:
+            tasks['market'] = lambda: client.get_quote(instruments)
+
+        results: Dict[str, Any] = {}
+        if not tasks:
+            return results
+
+        max_workers = max(1, min(self.max_workers, len(tasks)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trading-fetch") as executor:
+            futures = {executor.submit(task): section for section, task in tasks.items()}
+            for future in as_completed(futures):
+                section = futures[future]
+                try:
+                    results[section] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch {section}: {e}")
+
+        market = results.pop('market', None)
+        if market is not None:
+            if 'quotes' in sections:
+                results['quotes'] = (watch_instruments, market)
+            if 'indices' in sections:
+                results['indices'] = (MARKET_INDICES, market)
+        return results
+
+    def _apply_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Diff fetched results against the snapshot, returning the payload of each changed section"""
+        changes: Dict[str, Any] = {}
+
+        for section in ('profile', 'margins'):
+            value = results.get(section)
+            # None means the call failed; keep what is shown
+            if value is not None and value != self.snapshot.get(section):
+                self.snapshot[section] = value
+                changes[section] = value
+
+        if 'trades' in results:
+            trades = results['trades'] or []
+            if 'trades' not in self.snapshot or trades != self.snapshot['trades']:
+                self.snapshot['trades'] = trades
+                changes['trades'] = trades
+
+        if 'positions' in results:
+            positions = results['positions'] or []
+            diff = diff_lists(self.snapshot.get('positions'), positions, unique_keys(positions, position_key))
+            self.snapshot['positions'] = diff
+            if diff.has_changes:
+                changes['positions'] = diff
+
+        if 'orders' in results:
+            orders = results['orders'] or []
+            diff = diff_lists(self.snapshot.get('orders'), orders, unique_keys(orders, order_key))
+            self.snapshot['orders'] = diff
+            if diff.has_changes:
+                changes['orders'] = diff
+
+        if 'holdings' in results and results['holdings'] is not None:
+            all_holdings = results['holdings']
+            holdings = list(all_holdings.get('regular_holdings', [])) + list(all_holdings.get('mutual_fund_holdings', []))
+            diff = diff_lists(self.snapshot.get('holdings'), holdings, unique_keys(holdings, holding_key))
+            self.snapshot['holdings'] = diff
+            self.snapshot['all_holdings'] = all_holdings
+            if diff.has_changes:
+                changes['holdings'] = (all_holdings, diff)
+
+        for section in ('quotes', 'indices'):
+            if section in results:
+                instruments, quotes = results[section]
+                diff = diff_lists(self.snapshot.get(section), [quotes.get(i) for i in instruments], list(instruments))
+                self.snapshot[section] = diff
+                if diff.has_changes:
+                    changes[section] = diff
+
+        return changes
+
+    def _emit_change(self, section: str, payload: Any):
+        """Emit the signal of a changed section"""
+        if section == 'holdings':
+            self.holdings_changed.emit(*payload)
+            return
+        signal = {
+            'profile': self.profile_changed,
+            'margins': self.margins_changed,
+            'positions': self.positions_changed,
+            'orders': self.orders_changed,
+            'trades': self.trades_changed,
+            'quotes': self.quotes_changed,
+            'indices': self.indices_changed,
+        }[section]
+        signal.emit(payload)
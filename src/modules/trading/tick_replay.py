@@ -0,0 +1,286 @@
+"""
+Tick Replay Server
+Local stand-in for the broker's ticker endpoint, for exercising and benchmarking streaming offline
+"""
+
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QObject, QTimer, Signal
+from PySide6.QtNetwork import QHostAddress
+
+from .ticker import (
+    MODE_QUOTE, SEGMENT_INDICES, MarketTicker, WEBSOCKETS_AVAILABLE,
+    pack_binary_message, pack_packet, parse_binary_message,
+)
+
+if WEBSOCKETS_AVAILABLE:
+    from PySide6.QtWebSockets import QWebSocketServer
+
+
+# A binary message counts its packets in an unsigned short
+_MAX_PACKETS_PER_MESSAGE = 65535
+
+
+def load_tick_recording(path: Path) -> List[Dict[str, Any]]:
+    """Read recorded ticks, one JSON tick dict per line"""
+    ticks = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                ticks.append(json.loads(line))
+    return ticks
+
+
+class ReplayTickServer(QObject):
+    """WebSocket server speaking the ticker protocol on localhost
+
+    Clients connect as they would to the broker and send the same JSON
+    subscribe / unsubscribe / mode messages. Every ``interval_ms`` the
+    server sends each client one binary message holding the packets of
+    the instruments it subscribed to, encoded in the client's mode, plus a
+    one-byte heartbeat every ``heartbeat_ms``.
+
+    Ticks come from ``recording`` (tick dicts, replayed in order and
+    looped) or, without one, from a random walk over ``instruments``
+    (instrument token -> starting price). ``updates_per_second`` bounds
+    how many instrument updates are generated per second in total.
+    """
+
+    client_connected = Signal()
+    subscriptions_changed = Signal()
+
+    def __init__(self, instruments: Optional[Dict[int, float]] = None,
+                 recording: Optional[List[Dict[str, Any]]] = None,
+                 updates_per_second: int = 1000, interval_ms: int = 10,
+                 heartbeat_ms: int = 1000, seed: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.instruments = dict(instruments or {})
+        self.recording = list(recording or [])
+        self.updates_per_second = updates_per_second
+        self.interval_ms = interval_ms
+        self.random = random.Random(seed)
+
+        self.clients: Dict[Any, Dict[int, str]] = {}   # socket -> instrument token -> mode
+        self.state: Dict[int, Dict[str, Any]] = {}     # instrument token -> current synthetic tick
+        self.messages_sent = 0
+        self.packets_sent = 0
+        self._recording_position = 0
+        self._update_budget = 0.0
+
+        self.server = None
+        if WEBSOCKETS_AVAILABLE:
+            self.server = QWebSocketServer("TickReplay", QWebSocketServer.NonSecureMode, self)
+            self.server.newConnection.connect(self._on_new_connection)
+
+        self.send_timer = QTimer(self)
+        self.send_timer.setInterval(interval_ms)
+        self.send_timer.timeout.connect(self._send_ticks)
+
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(heartbeat_ms)
+        self.heartbeat_timer.timeout.connect(self._send_heartbeat)
+
+    @property
+    def url(self) -> str:
+        if self.server is None or not self.server.isListening():
+            return ""
+        return f"ws://127.0.0.1:{self.server.serverPort()}"
+
+    def start(self, port: int = 0) -> str:
+        """Listen on localhost (any free port by default) and return the ws:// URL"""
+        if self.server is None:
+            raise RuntimeError("QtWebSockets is not available")
+        if not self.server.listen(QHostAddress.LocalHost, port):
+            raise RuntimeError(f"Tick replay server could not listen: {self.server.errorString()}")
+        self.send_timer.start()
+        self.heartbeat_timer.start()
+        self.logger.info(f"Tick replay server listening on {self.url}")
+        return self.url
+
+    def stop(self):
+        """Disconnect all clients and stop listening"""
+        self.send_timer.stop()
+        self.heartbeat_timer.stop()
+        self.disconnect_clients()
+        if self.server is not None:
+            self.server.close()
+
+    def disconnect_clients(self):
+        """Drop every client connection, as a broker-side disconnect would"""
+        for socket in list(self.clients):
+            socket.close()
+        self.clients.clear()
+
+    def subscribed_tokens(self) -> Dict[int, str]:
+        """Get the union of client subscriptions (token -> mode of the last client)"""
+        tokens: Dict[int, str] = {}
+        for subscriptions in self.clients.values():
+            tokens.update(subscriptions)
+        return tokens
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.clients[socket] = {}
+            socket.textMessageReceived.connect(lambda text, socket=socket: self._on_client_message(socket, text))
+            socket.disconnected.connect(lambda socket=socket: self._on_client_disconnected(socket))
+            self.client_connected.emit()
+
+    def _on_client_disconnected(self, socket):
+        self.clients.pop(socket, None)
+        socket.deleteLater()
+
+    def _on_client_message(self, socket, text: str):
+        """Apply a subscribe, unsubscribe or mode request"""
+        subscriptions = self.clients.get(socket)
+        if subscriptions is None:
+            return
+        try:
+            message = json.loads(text)
+            action, value = message['a'], message['v']
+            if action == 'subscribe':
+                for token in value:
+                    subscriptions.setdefault(int(token), MODE_QUOTE)
+            elif action == 'unsubscribe':
+                for token in value:
+                    subscriptions.pop(int(token), None)
+            elif action == 'mode':
+                mode, tokens = value
+                for token in tokens:
+                    if int(token) in subscriptions:
+                        subscriptions[int(token)] = mode
+            self.subscriptions_changed.emit()
+        except (KeyError, TypeError, ValueError) as e:
+            socket.sendTextMessage(json.dumps({'type': 'error', 'data': f"Invalid message: {e}"}))
+
+    def _send_ticks(self):
+        """Send each client the updates of its instruments generated in this interval"""
+        subscribed = self.subscribed_tokens()
+        if not subscribed:
+            return
+
+        self._update_budget += self.updates_per_second * self.interval_ms / 1000.0
+        count = int(self._update_budget)
+        self._update_budget -= count
+        if count <= 0:
+            return
+
+        ticks = self._next_recorded(count, subscribed) if self.recording else self._next_synthetic(count, subscribed)
+        if not ticks:
+            return
+
+        for socket, subscriptions in list(self.clients.items()):
+            packets = [pack_packet(tick, subscriptions[tick['instrument_token']])
+                       for tick in ticks if tick['instrument_token'] in subscriptions]
+            for start in range(0, len(packets), _MAX_PACKETS_PER_MESSAGE):
+                chunk = packets[start:start + _MAX_PACKETS_PER_MESSAGE]
+                socket.sendBinaryMessage(pack_binary_message(chunk))
+                self.messages_sent += 1
+                self.packets_sent += len(chunk)
+
+    def _send_heartbeat(self):
+        for socket in list(self.clients):
+            socket.sendBinaryMessage(b"\x00")
+
+    def _next_recorded(self, count: int, subscribed: Dict[int, str]) -> List[Dict[str, Any]]:
+        """Take the next recorded ticks for subscribed instruments, looping at the end"""
+        ticks = []
+        scanned = 0
+        while len(ticks) < count and scanned < len(self.recording):
+            tick = self.recording[self._recording_position]
+            self._recording_position = (self._recording_position + 1) % len(self.recording)
+            scanned += 1
+            if int(tick['instrument_token']) in subscribed:
+                ticks.append(tick)
+        return ticks
+
+    def _next_synthetic(self, count: int, subscribed: Dict[int, str]) -> List[Dict[str, Any]]:
+        """Move a random walk forward for randomly picked subscribed instruments"""
+        tokens = list(subscribed)
+        ticks = []
+        for _ in range(count):
+            token = self.random.choice(tokens)
+            tick = self.state.get(token)
+            if tick is None:
+                price = float(self.instruments.get(token, 100 + token % 900))
+                tick = {'instrument_token': token, 'last_price': price, 'volume_traded': 0,
+                        'last_traded_quantity': 0, 'average_traded_price': price,
+                        'total_buy_quantity': 0, 'total_sell_quantity': 0,
+                        'ohlc': {'open': price, 'high': price, 'low': price, 'close': price}}
+                self.state[token] = tick
+
+            # Move in 5 paise steps, like an exchange tick size
+            step = self.random.choice((-2, -1, 1, 2)) * 0.05
+            price = round(max(0.05, tick['last_price'] + step), 2)
+            quantity = 0 if (token & 0xff) == SEGMENT_INDICES else self.random.randint(1, 100)
+            ohlc = tick['ohlc']
+            tick = dict(tick, last_price=price, last_traded_quantity=quantity,
+                        volume_traded=tick['volume_traded'] + quantity,
+                        ohlc=dict(ohlc, high=max(ohlc['high'], price), low=min(ohlc['low'], price)))
+            self.state[token] = tick
+            ticks.append(tick)
+        return ticks
+
+
+def run_ticker_benchmark(instrument_count: int = 500, updates_per_second: int = 20000,
+                         seconds: float = 3.0, frame_rate: int = 30) -> Dict[str, float]:
+    """Stream synthetic ticks through a MarketTicker and measure conflation and decoding
+
+    Returns counts of ticks received and UI updates delivered, their
+    rates, how many ticks were folded into one update on average, and
+    the decode cost per tick.
+    """
+    app = QCoreApplication.instance() or QCoreApplication([])
+
+    instruments = {(1000 + i) << 8 | 1: 100.0 + i for i in range(instrument_count)}
+    server = ReplayTickServer(instruments, updates_per_second=updates_per_second, seed=1)
+    url = server.start()
+
+    ticker = MarketTicker(url=url, frame_rate=frame_rate)
+    ticker.auto_reconnect = False
+    ticker.subscribe(instruments)
+    ticker.start()
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    started = time.perf_counter()
+    loop.exec()
+    elapsed = time.perf_counter() - started
+
+    ticker.stop()
+    server.stop()
+    app.processEvents()
+
+    # Decode cost on a message of the size the server sends
+    sample = pack_binary_message([pack_packet(tick) for tick in list(server.state.values())[:1000]])
+    decode_rounds = 200
+    decode_started = time.perf_counter()
+    for _ in range(decode_rounds):
+        parse_binary_message(sample)
+    decode_seconds = time.perf_counter() - decode_started
+    sample_ticks = max(1, min(1000, len(server.state)))
+
+    stats = ticker.stats
+    return {
+        'seconds': elapsed,
+        'ticks_received': stats.ticks,
+        'ticks_per_second': stats.ticks / elapsed if elapsed else 0.0,
+        'frames': stats.frames,
+        'updates_delivered': stats.delivered,
+        'updates_per_second': stats.delivered / elapsed if elapsed else 0.0,
+        'ticks_per_update': stats.ticks / stats.delivered if stats.delivered else 0.0,
+        'decode_us_per_tick': decode_seconds / (decode_rounds * sample_ticks) * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    results = run_ticker_benchmark()
+    for name, value in results.items():
+        print(f"{name:>20}: {value:,.2f}")
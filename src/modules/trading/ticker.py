@@ -0,0 +1,442 @@
+"""
+Market Ticker
+Streaming market data over the Kite Connect WebSocket ticker protocol, conflated per UI frame
+"""
+
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, QUrl, QUrlQuery, Signal
+
+try:
+    from PySide6.QtWebSockets import QWebSocket
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+
+KITE_TICKER_URL = "wss://ws.kite.trade"
+
+# Streaming modes, from least to most data per packet
+MODE_LTP = "ltp"
+MODE_QUOTE = "quote"
+MODE_FULL = "full"
+
+# Exchange segments, the low byte of an instrument token
+SEGMENT_CDS = 3
+SEGMENT_BCD = 6
+SEGMENT_INDICES = 9
+
+# Instrument tokens of the indices in the market overview, used when a quote
+# response did not carry them
+INDEX_TOKENS = {
+    "NSE:NIFTY 50": 256265,
+    "NSE:NIFTY BANK": 260105,
+    "NSE:NIFTY IT": 259849,
+    "BSE:SENSEX": 265,
+}
+
+# Packet sizes per mode
+_LTP_PACKET = 8
+_INDEX_QUOTE_PACKET = 28
+_INDEX_FULL_PACKET = 32
+_QUOTE_PACKET = 44
+_FULL_PACKET = 184
+
+# Big-endian packet layouts
+_SHORT = struct.Struct(">H")
+_LTP = struct.Struct(">Ii")
+_INDEX = struct.Struct(">I6i")
+_QUOTE = struct.Struct(">I10i")
+_FULL_EXTRA = struct.Struct(">5I")
+_DEPTH_ENTRY = struct.Struct(">iiHxx")
+_UINT = struct.Struct(">I")
+
+
+def _price_divisor(instrument_token: int) -> float:
+    """Prices are sent as integers; currency segments use more decimal places"""
+    segment = instrument_token & 0xff
+    if segment == SEGMENT_CDS:
+        return 10000000.0
+    if segment == SEGMENT_BCD:
+        return 10000.0
+    return 100.0
+
+
+def _timestamp(value: int) -> Optional[datetime]:
+    """Convert epoch seconds, 0 meaning absent"""
+    return datetime.fromtimestamp(value) if value else None
+
+
+def parse_packet(packet: bytes) -> Optional[Dict[str, Any]]:
+    """Decode one tick packet into a tick dict (the layout KiteTicker produces)"""
+    if len(packet) < _LTP_PACKET:
+        return None
+
+    instrument_token = _UINT.unpack_from(packet, 0)[0]
+    divisor = _price_divisor(instrument_token)
+    tradable = (instrument_token & 0xff) != SEGMENT_INDICES
+    size = len(packet)
+
+    if size == _LTP_PACKET:
+        return {
+            'tradable': tradable,
+            'mode': MODE_LTP,
+            'instrument_token': instrument_token,
+            'last_price': _LTP.unpack_from(packet, 0)[1] / divisor,
+        }
+
+    if size in (_INDEX_QUOTE_PACKET, _INDEX_FULL_PACKET):
+        _, last_price, high, low, open_, close, net_change = _INDEX.unpack_from(packet, 0)
+        tick = {
+            'tradable': tradable,
+            'mode': MODE_FULL if size == _INDEX_FULL_PACKET else MODE_QUOTE,
+            'instrument_token': instrument_token,
+            'last_price': last_price / divisor,
+            'ohlc': {'high': high / divisor, 'low': low / divisor,
+                     'open': open_ / divisor, 'close': close / divisor},
+            'net_change': net_change / divisor,
+        }
+        tick['change'] = _percent_change(tick)
+        if size == _INDEX_FULL_PACKET:
+            tick['exchange_timestamp'] = _timestamp(_UINT.unpack_from(packet, 28)[0])
+        return tick
+
+    if size in (_QUOTE_PACKET, _FULL_PACKET):
+        (_, last_price, last_quantity, average_price, volume, buy_quantity, sell_quantity,
+         open_, high, low, close) = _QUOTE.unpack_from(packet, 0)
+        tick = {
+            'tradable': tradable,
+            'mode': MODE_FULL if size == _FULL_PACKET else MODE_QUOTE,
+            'instrument_token': instrument_token,
+            'last_price': last_price / divisor,
+            'last_traded_quantity': last_quantity,
+            'average_traded_price': average_price / divisor,
+            'volume_traded': volume,
+            'total_buy_quantity': buy_quantity,
+            'total_sell_quantity': sell_quantity,
+            'ohlc': {'open': open_ / divisor, 'high': high / divisor,
+                     'low': low / divisor, 'close': close / divisor},
+        }
+        tick['change'] = _percent_change(tick)
+
+        if size == _FULL_PACKET:
+            last_trade_time, oi, oi_high, oi_low, exchange_time = _FULL_EXTRA.unpack_from(packet, 44)
+            tick.update({
+                'last_trade_time': _timestamp(last_trade_time),
+                'oi': oi,
+                'oi_day_high': oi_high,
+                'oi_day_low': oi_low,
+                'exchange_timestamp': _timestamp(exchange_time),
+            })
+            depth = {'buy': [], 'sell': []}
+            for entry in range(10):
+                quantity, price, orders = _DEPTH_ENTRY.unpack_from(packet, 64 + entry * _DEPTH_ENTRY.size)
+                side = 'buy' if entry < 5 else 'sell'
+                depth[side].append({'quantity': quantity, 'price': price / divisor, 'orders': orders})
+            tick['depth'] = depth
+        return tick
+
+    return None
+
+
+def _percent_change(tick: Dict[str, Any]) -> float:
+    """Change against the previous close in percent"""
+    close = tick['ohlc']['close']
+    return (tick['last_price'] - close) * 100 / close if close else 0.0
+
+
+def parse_binary_message(data: bytes) -> List[Dict[str, Any]]:
+    """Decode a binary ticker message: a packet count, then length-prefixed packets
+
+    One-byte messages are heartbeats and carry no ticks.
+    """
+    if len(data) < 2:
+        return []
+
+    ticks = []
+    count = _SHORT.unpack_from(data, 0)[0]
+    offset = 2
+    for _ in range(count):
+        if offset + 2 > len(data):
+            break
+        length = _SHORT.unpack_from(data, offset)[0]
+        packet = data[offset + 2:offset + 2 + length]
+        offset += 2 + length
+        tick = parse_packet(packet)
+        if tick is not None:
+            ticks.append(tick)
+    return ticks
+
+
+def pack_packet(tick: Dict[str, Any], mode: str = MODE_QUOTE) -> bytes:
+    """Encode a tick dict as a packet of the given mode (used by the replay server)"""
+    token = int(tick['instrument_token'])
+    divisor = _price_divisor(token)
+
+    def price(value: float) -> int:
+        return int(round((value or 0) * divisor))
+
+    last_price = price(tick.get('last_price', 0))
+    if mode == MODE_LTP:
+        return _LTP.pack(token, last_price)
+
+    ohlc = tick.get('ohlc', {})
+    if (token & 0xff) == SEGMENT_INDICES:
+        packet = _INDEX.pack(token, last_price, price(ohlc.get('high')), price(ohlc.get('low')),
+                             price(ohlc.get('open')), price(ohlc.get('close')),
+                             last_price - price(ohlc.get('close')))
+        if mode == MODE_FULL:
+            packet += _UINT.pack(_epoch(tick.get('exchange_timestamp')))
+        return packet
+
+    packet = _QUOTE.pack(token, last_price, int(tick.get('last_traded_quantity', 0)),
+                         price(tick.get('average_traded_price')), int(tick.get('volume_traded', 0)),
+                         int(tick.get('total_buy_quantity', 0)), int(tick.get('total_sell_quantity', 0)),
+                         price(ohlc.get('open')), price(ohlc.get('high')),
+                         price(ohlc.get('low')), price(ohlc.get('close')))
+    if mode == MODE_FULL:
+        packet += _FULL_EXTRA.pack(_epoch(tick.get('last_trade_time')), int(tick.get('oi', 0)),
+                                   int(tick.get('oi_day_high', 0)), int(tick.get('oi_day_low', 0)),
+                                   _epoch(tick.get('exchange_timestamp')))
+        depth = tick.get('depth', {})
+        entries = (list(depth.get('buy', [])) + [{}] * 5)[:5] + (list(depth.get('sell', [])) + [{}] * 5)[:5]
+        for entry in entries:
+            packet += _DEPTH_ENTRY.pack(int(entry.get('quantity', 0)), price(entry.get('price')),
+                                        int(entry.get('orders', 0)))
+    return packet
+
+
+def _epoch(value: Optional[datetime]) -> int:
+    """Convert a datetime to epoch seconds, None meaning 0"""
+    return int(value.timestamp()) if value else 0
+
+
+def pack_binary_message(packets: List[bytes]) -> bytes:
+    """Frame packets into one binary ticker message"""
+    parts = [_SHORT.pack(len(packets))]
+    for packet in packets:
+        parts.append(_SHORT.pack(len(packet)))
+        parts.append(packet)
+    return b"".join(parts)
+
+
+class TickConflator:
+    """Latest state per instrument between two UI frames
+
+    Ticks for an instrument that arrive within one frame are merged into a
+    single dict, so the UI applies at most one update per instrument per
+    frame however fast the feed is. Merging (rather than replacing) keeps
+    fields such as 'ohlc' when a lighter LTP tick follows a quote tick.
+    """
+
+    def __init__(self):
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        self.received = 0
+        self.conflated = 0
+
+    def add(self, ticks: Iterable[Dict[str, Any]]):
+        """Merge ticks into the pending state"""
+        for tick in ticks:
+            self.received += 1
+            token = tick['instrument_token']
+            current = self.pending.get(token)
+            if current is None:
+                self.pending[token] = dict(tick)
+            else:
+                current.update(tick)
+                self.conflated += 1
+
+    def drain(self) -> Dict[int, Dict[str, Any]]:
+        """Take the pending ticks, one per instrument"""
+        pending, self.pending = self.pending, {}
+        return pending
+
+
+@dataclass
+class TickerStats:
+    """Counters of a MarketTicker connection"""
+    messages: int = 0          # binary messages received (including heartbeats)
+    ticks: int = 0             # tick packets decoded
+    frames: int = 0            # ticks_ready emissions
+    delivered: int = 0         # instrument updates delivered across all frames
+    reconnects: int = 0
+
+
+class MarketTicker(QObject):
+    """WebSocket client for the broker's streaming ticker
+
+    Connects to the ticker endpoint with the API key and access token,
+    keeps the subscribed instrument tokens and their modes (re-sent after
+    every reconnect), and decodes the binary tick packets. Ticks are not
+    forwarded as they arrive: they are conflated per instrument and
+    ticks_ready carries one merged tick per changed instrument once per
+    frame (``frame_rate`` per second). Drops are retried with exponential
+    backoff.
+    """
+
+    ticks_ready = Signal(object)       # {instrument_token: tick} since the previous frame
+    order_updated = Signal(object)     # order postback dict
+    connected = Signal()
+    disconnected = Signal()
+    error_occurred = Signal(str)
+
+    def __init__(self, api_key: str = "", access_token: str = "", url: str = KITE_TICKER_URL,
+                 frame_rate: int = 30, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.api_key = api_key
+        self.access_token = access_token
+        self.url = url
+
+        self.subscriptions: Dict[int, str] = {}   # instrument token -> mode
+        self.conflator = TickConflator()
+        self.stats = TickerStats()
+        self.auto_reconnect = True
+        self.max_reconnect_delay = 60
+        self._reconnect_delay = 1
+        self._is_connected = False
+        self._stopping = False
+
+        self.socket = QWebSocket() if WEBSOCKETS_AVAILABLE else None
+        if self.socket is not None:
+            self.socket.setParent(self)
+            self.socket.connected.connect(self._on_connected)
+            self.socket.disconnected.connect(self._on_disconnected)
+            self.socket.binaryMessageReceived.connect(self._on_binary_message)
+            self.socket.textMessageReceived.connect(self._on_text_message)
+            self.socket.errorOccurred.connect(self._on_error)
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(max(1, int(1000 / max(1, frame_rate))))
+        self.frame_timer.timeout.connect(self.flush)
+
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self.start)
+
+    def is_connected(self) -> bool:
+        return self._is_connected
+
+    def start(self):
+        """Open the ticker connection"""
+        if self.socket is None:
+            self.error_occurred.emit("QtWebSockets is not available")
+            return
+        self._stopping = False
+        url = QUrl(self.url)
+        query = QUrlQuery(url)
+        if self.api_key:
+            query.addQueryItem("api_key", self.api_key)
+        if self.access_token:
+            query.addQueryItem("access_token", self.access_token)
+        url.setQuery(query)
+        self.logger.info(f"Connecting ticker to {url.host() or self.url}")
+        self.socket.open(url)
+
+    def stop(self):
+        """Close the connection without reconnecting"""
+        self._stopping = True
+        self.reconnect_timer.stop()
+        self.frame_timer.stop()
+        self.conflator.drain()
+        if self.socket is not None:
+            self.socket.close()
+
+    def subscribe(self, tokens: Iterable[int], mode: str = MODE_QUOTE):
+        """Stream ticks for instrument tokens in the given mode"""
+        tokens = [int(token) for token in tokens]
+        new_tokens = [token for token in tokens if token not in self.subscriptions]
+        changed_mode = [token for token in tokens if self.subscriptions.get(token, mode) != mode]
+        for token in tokens:
+            self.subscriptions[token] = mode
+        if self._is_connected:
+            if new_tokens:
+                self._send({"a": "subscribe", "v": new_tokens})
+            if new_tokens or changed_mode:
+                self._send({"a": "mode", "v": [mode, new_tokens + changed_mode]})
+
+    def unsubscribe(self, tokens: Iterable[int]):
+        """Stop streaming instrument tokens"""
+        tokens = [int(token) for token in tokens if int(token) in self.subscriptions]
+        for token in tokens:
+            del self.subscriptions[token]
+        if tokens and self._is_connected:
+            self._send({"a": "unsubscribe", "v": tokens})
+
+    def set_subscriptions(self, tokens: Iterable[int], mode: str = MODE_QUOTE):
+        """Subscribe exactly these tokens, dropping the others"""
+        tokens = {int(token) for token in tokens}
+        self.unsubscribe([token for token in self.subscriptions if token not in tokens])
+        self.subscribe(sorted(tokens), mode)
+
+    def flush(self):
+        """Emit the ticks conflated since the previous frame"""
+        batch = self.conflator.drain()
+        if batch:
+            self.stats.frames += 1
+            self.stats.delivered += len(batch)
+            self.ticks_ready.emit(batch)
+
+    def _send(self, message: Dict[str, Any]):
+        self.socket.sendTextMessage(json.dumps(message))
+
+    def _resubscribe(self):
+        """Send all subscriptions, grouped by mode"""
+        if not self.subscriptions:
+            return
+        self._send({"a": "subscribe", "v": list(self.subscriptions)})
+        by_mode: Dict[str, List[int]] = {}
+        for token, mode in self.subscriptions.items():
+            by_mode.setdefault(mode, []).append(token)
+        for mode, tokens in by_mode.items():
+            self._send({"a": "mode", "v": [mode, tokens]})
+
+    def _on_connected(self):
+        self.logger.info("Ticker connected")
+        self._is_connected = True
+        self._reconnect_delay = 1
+        self._resubscribe()
+        self.frame_timer.start()
+        self.connected.emit()
+
+    def _on_disconnected(self):
+        was_connected = self._is_connected
+        self._is_connected = False
+        self.frame_timer.stop()
+        self.flush()
+        if was_connected:
+            self.logger.info("Ticker disconnected")
+            self.disconnected.emit()
+        if self.auto_reconnect and not self._stopping:
+            self.stats.reconnects += 1
+            self.logger.info(f"Reconnecting ticker in {self._reconnect_delay}s")
+            self.reconnect_timer.start(self._reconnect_delay * 1000)
+            self._reconnect_delay = min(self._reconnect_delay * 2, self.max_reconnect_delay)
+
+    def _on_binary_message(self, data):
+        self.stats.messages += 1
+        ticks = parse_binary_message(bytes(data))
+        if ticks:
+            self.stats.ticks += len(ticks)
+            self.conflator.add(ticks)
+
+    def _on_text_message(self, text: str):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if message.get('type') == 'order':
+            self.order_updated.emit(message.get('data'))
+        elif message.get('type') == 'error':
+            self.logger.error(f"Ticker error: {message.get('data')}")
+            self.error_occurred.emit(str(message.get('data')))
+
+    def _on_error(self, error):
+        message = self.socket.errorString()
+        self.logger.warning(f"Ticker socket error: {message}")
+        self.error_occurred.emit(message)
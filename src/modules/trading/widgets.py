@@ -5,13 +5,16 @@ UI components for trading functionality
 
 import logging
 import json
+import pandas as pd
 from datetime import datetime, timedelta
+from dataclasses import replace
+from functools import partial
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QGridLayout,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QFrame, QGridLayout,
     QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QTextEdit, QGroupBox,
     QProgressBar, QMessageBox, QDialog, QDialogButtonBox, QFormLayout,
     QCheckBox, QSplitter, QScrollArea
@@ -21,8 +24,11 @@ from PySide6.QtGui import QFont, QColor, QPalette
 
 from ...core.config import AppConfig
 from ...core.data_manager import DataManager
+from ...ui.table_models import DataFrameTableModel, TableColumn, format_amount, format_date, format_text
 from .api_client import ZerodhaAPIClient
 from .models import TradingConfig, Position, Order, Holding
+from .refresh_service import TradingRefreshService, ListChanges, MARKET_INDICES, REFRESH_SECTIONS
+from .ticker import MarketTicker, MODE_QUOTE, INDEX_TOKENS, WEBSOCKETS_AVAILABLE
 from .startup_auth_dialog import ZerodhaStartupDialog
 from .auth_education import ZerodhaEducationDialog, TokenStatusWidget
 from .token_manager import TokenManager
@@ -211,7 +217,23 @@ class TradingWidget(QWidget):
         
         # Initialize API client
         self.api_client = None
-        
+
+        # Background refresh: API calls run on worker threads, only changes reach the UI
+        self.refresh_service = TradingRefreshService(lambda: self.api_client, parent=self)
+        self.refresh_service.profile_changed.connect(self.on_profile_refreshed)
+        self.refresh_service.margins_changed.connect(self.update_account_summary)
+        self.refresh_service.positions_changed.connect(self.on_positions_refreshed)
+        self.refresh_service.holdings_changed.connect(self.on_holdings_refreshed)
+        self.refresh_service.orders_changed.connect(self.on_orders_refreshed)
+        self.refresh_service.quotes_changed.connect(self.on_watchlist_quotes_refreshed)
+        self.refresh_service.indices_changed.connect(self.on_indices_refreshed)
+        self.refresh_service.refresh_finished.connect(self.on_refresh_finished)
+        self.analytics_refresh_pending = False
+
+        # Streaming prices (TradingConfig.websocket_enabled): instrument token -> (table, row, context) targets
+        self.market_ticker: Optional[MarketTicker] = None
+        self.stream_targets: Dict[int, List[tuple]] = {}
+
         # Enhanced refresh system
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.intelligent_refresh_data)
@@ -244,7 +266,6 @@ class TradingWidget(QWidget):
             'orders': 10,     # seconds
             'analytics': 60   # seconds
         }
-        self.is_refreshing = False
         self.refresh_queue = []
 
         self.setup_ui()
@@ -1339,15 +1360,47 @@ class TradingWidget(QWidget):
         history_layout.addWidget(history_filters_group)
 
         # Order history table
-        self.order_history_table = QTableWidget()
-        self.order_history_table.setColumnCount(18)
-        self.order_history_table.setHorizontalHeaderLabels([
-            "Order ID", "Parent ID", "Exchange Order ID", "Symbol", "Type", "Transaction",
-            "Quantity", "Filled Qty", "Pending Qty", "Cancelled Qty", "Price", "Trigger Price",
-            "Average Price", "Status", "Status Message", "Product", "Variety", "Order Time"
-        ])
+        def or_dashes(value):
+            return format_text(value) or "--"
+
+        def status_message(value):
+            text = format_text(value)
+            return text[:50] + "..." if len(text) > 50 else text
+
+        def optional_price(value):
+            return f"₹{value:.2f}" if value and value > 0 else "--"
+
+        def quantity(value):
+            return str(value or 0)
+
+        status_colors = {"COMPLETE": "green", "CANCELLED": "orange", "REJECTED": "red"}
+        self.order_history_model = DataFrameTableModel([
+            TableColumn('order_id', "Order ID"),
+            TableColumn('parent_order_id', "Parent ID", or_dashes),
+            TableColumn('exchange_order_id', "Exchange Order ID", or_dashes),
+            TableColumn('tradingsymbol', "Symbol"),
+            TableColumn('order_type', "Type"),
+            TableColumn('transaction_type', "Transaction"),
+            TableColumn('quantity', "Quantity", sort_as='number'),
+            TableColumn('filled_quantity', "Filled Qty", quantity, sort_as='number'),
+            TableColumn('pending_quantity', "Pending Qty", quantity, sort_as='number'),
+            TableColumn('cancelled_quantity', "Cancelled Qty", quantity, sort_as='number'),
+            TableColumn('price', "Price", format_amount, sort_as='number'),
+            TableColumn('trigger_price', "Trigger Price", optional_price, sort_as='number'),
+            TableColumn('average_price', "Average Price", optional_price, sort_as='number'),
+            TableColumn('status', "Status", foreground=status_colors.get),
+            TableColumn('status_message', "Status Message", status_message, tooltip=True),
+            TableColumn('product', "Product"),
+            TableColumn('variety', "Variety"),
+            TableColumn('order_timestamp', "Order Time", partial(format_date, fmt="%d-%m-%Y %H:%M:%S"),
+                        sort_as='date'),
+        ], self)
+        self.order_history_table = QTableView()
+        self.order_history_table.setModel(self.order_history_model)
         self.order_history_table.horizontalHeader().setStretchLastSection(True)
-        self.order_history_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.order_history_table.setSelectionBehavior(QTableView.SelectRows)
+        self.order_history_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.order_history_table.setSortingEnabled(True)
         history_layout.addWidget(self.order_history_table)
 
         orders_tabs.addTab(history_widget, "Order History")
@@ -2395,6 +2448,10 @@ class TradingWidget(QWidget):
     def clear_all_data_displays(self):
         """Clear all data displays when disconnected"""
         try:
+            # The next refresh has to redraw everything
+            self.refresh_service.reset()
+            self.stream_targets = {}
+
             # Clear tables
             self.positions_table.setRowCount(0)
             self.holdings_table.setRowCount(0)
@@ -2413,8 +2470,8 @@ class TradingWidget(QWidget):
         except Exception as e:
             self.logger.error(f"Error clearing data displays: {e}")
 
-    def update_connection_status(self, connected: bool):
-        """Update connection status UI"""
+    def update_connection_status(self, connected: bool, profile: Optional[Dict[str, Any]] = None):
+        """Update connection status UI, fetching the profile unless one is given"""
         if connected:
             self.status_label.setText("Connected to Zerodha")
             self.status_label.setStyleSheet("color: green; font-weight: bold;")
@@ -2422,7 +2479,8 @@ class TradingWidget(QWidget):
             # Update user profile display
             if self.api_client and self.api_client.is_authenticated():
                 # Try to get fresh profile data
-                profile = self.api_client.get_profile()
+                if profile is None:
+                    profile = self.api_client.get_profile()
                 if profile:
                     user_name = profile.get('user_name', 'Unknown User')
                     user_id = profile.get('user_id', 'Unknown ID')
@@ -2451,12 +2509,13 @@ class TradingWidget(QWidget):
             self.connect_button.clicked.connect(self.connect_to_zerodha)
             self.force_reconnect_button.setVisible(True)  # Show when disconnected
 
-    def update_user_profile_display(self):
-        """Update user profile display in dashboard"""
+    def update_user_profile_display(self, profile: Optional[Dict[str, Any]] = None):
+        """Update user profile display in dashboard, fetching the profile unless one is given"""
         try:
             if self.api_client and self.api_client.is_authenticated():
                 # Fetch fresh profile data
-                profile = self.api_client.get_profile()
+                if profile is None:
+                    profile = self.api_client.get_profile()
                 if profile:
                     # Format user profile information based on API documentation structure
                     profile_text = f"""
@@ -2513,7 +2572,7 @@ class TradingWidget(QWidget):
             self.stop_refresh_system()
 
     def refresh_data(self):
-        """Refresh all trading data with graceful degradation"""
+        """Refresh all trading data in the background with graceful degradation"""
         if not self.api_client or not self.api_client.is_authenticated():
             if not self.authentication_skipped:
                 self.logger.warning("Cannot refresh data - API client not authenticated")
@@ -2525,80 +2584,122 @@ class TradingWidget(QWidget):
         try:
             self.logger.info("🔄 Starting data refresh...")
 
-            # Update user profile display
-            self.update_user_profile_display()
+            # Everything except the analytics-only trades list; results arrive through the on_*_refreshed handlers
+            sections = [section for section in REFRESH_SECTIONS if section != 'trades']
+            self.refresh_service.request_refresh(sections, watchlist=self.load_watchlist())
 
-            # Get margins for account summary
-            self.logger.debug("📊 Fetching margins...")
-            margins = self.api_client.get_margins()
-            self.logger.info(f"📊 Margins data: {margins is not None}")
-            if margins:
-                self.logger.debug(f"📊 Equity available: {margins.get('equity', {}).get('available', {}).get('cash', 0)}")
-                self.update_account_summary(margins)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to refresh data: {e}")
 
-            # Get positions
-            self.logger.debug("📈 Fetching positions...")
-            positions = self.api_client.get_positions()
-            self.logger.info(f"📈 Retrieved {len(positions)} positions")
-            if positions:
-                for i, pos in enumerate(positions[:3]):  # Log first 3 positions
-                    self.logger.debug(f"📈 Position {i+1}: {pos.tradingsymbol} - Qty: {pos.quantity}, P&L: ₹{pos.pnl}")
-            self.update_positions_table(positions)
+    def on_profile_refreshed(self, profile: Dict[str, Any]):
+        """Show a changed user profile from the refresh service"""
+        self.update_connection_status(True, profile)
+        self.update_user_profile_display(profile)
 
-            # Get all holdings (regular + mutual funds)
-            self.logger.debug("💼 Fetching all holdings...")
-            all_holdings_data = self.api_client.get_all_holdings()
+    def on_positions_refreshed(self, changes: ListChanges):
+        """Apply changed positions, rewriting only their rows when the set of positions is unchanged"""
+        try:
+            positions = changes.items
+            self.logger.info(f"📈 Positions: {len(changes.changed)} changed, {len(changes.removed)} closed of {len(positions)}")
+            if changes.layout_changed or self.positions_table.rowCount() != len(positions):
+                self.update_positions_table(positions)
+            else:
+                for row, position in changes.changed_rows():
+                    self.set_position_row(row, position)
+                self.update_positions_summary(positions)
+            self.positions_count_label.setText(str(len(positions)))
+        except Exception as e:
+            self.logger.error(f"Failed to apply refreshed positions: {e}")
 
-            regular_holdings = all_holdings_data['regular_holdings']
-            mf_holdings = all_holdings_data['mutual_fund_holdings']
+    def on_holdings_refreshed(self, all_holdings_data: Dict[str, Any], changes: ListChanges):
+        """Apply changed holdings (regular and mutual fund)"""
+        try:
             summary = all_holdings_data['summary']
+            self.logger.info(f"💼 Holdings: {len(changes.changed)} changed of {summary['total_count']}, "
+                             f"total P&L ₹{summary['total_pnl']:.2f}")
+            self.update_comprehensive_holdings_display(all_holdings_data)
+            self.holdings_count_label.setText(str(summary['total_count']))
+        except Exception as e:
+            self.logger.error(f"Failed to apply refreshed holdings: {e}")
 
-            self.logger.info(f"💼 Retrieved {summary['regular_count']} regular holdings, {summary['mutual_fund_count']} mutual fund holdings")
-            self.logger.info(f"💰 Total P&L: Regular ₹{summary['regular_pnl']:.2f}, MF ₹{summary['mutual_fund_pnl']:.2f}, Combined ₹{summary['total_pnl']:.2f}")
+    def on_orders_refreshed(self, changes: ListChanges):
+        """Apply changed orders to the order tables and counters"""
+        try:
+            orders = changes.items
+            self.logger.info(f"📋 Orders: {len(changes.changed)} changed of {len(orders)}")
+            self.update_orders_table(orders)
+            today = datetime.now().date()
+            today_orders = [o for o in orders if o.order_timestamp.date() == today]
+            self.orders_count_label.setText(str(len(today_orders)))
+        except Exception as e:
+            self.logger.error(f"Failed to apply refreshed orders: {e}")
 
-            # Log sample holdings
-            if regular_holdings:
-                for i, holding in enumerate(regular_holdings[:3]):
-                    self.logger.debug(f"📈 Regular Holding {i+1}: {holding.tradingsymbol} - Qty: {holding.quantity}, P&L: ₹{holding.pnl}")
-            if mf_holdings:
-                for i, holding in enumerate(mf_holdings[:3]):
-                    self.logger.debug(f"🏦 MF Holding {i+1}: {holding.fund[:30]}... - Qty: {holding.quantity}, P&L: ₹{holding.pnl}")
+    def on_watchlist_quotes_refreshed(self, changes: ListChanges):
+        """Apply changed watchlist quotes, rewriting only their rows when the watchlist is unchanged"""
+        try:
+            if changes.layout_changed or self.watchlist_table.rowCount() != len(changes.keys):
+                self.watchlist_table.setRowCount(len(changes.keys))
+                rows = list(enumerate(changes.items))
+            else:
+                rows = changes.changed_rows()
+            for row, quote in rows:
+                self.set_watchlist_row(row, changes.keys[row].split(':', 1)[1], quote)
+        except Exception as e:
+            self.logger.error(f"Failed to apply refreshed watchlist quotes: {e}")
 
-            # Update holdings display with all data
-            self.update_comprehensive_holdings_display(all_holdings_data)
+    def on_indices_refreshed(self, changes: ListChanges):
+        """Apply changed index quotes to the market overview"""
+        try:
+            if changes.layout_changed or self.indices_table.rowCount() != len(changes.keys):
+                self.indices_table.setRowCount(len(changes.keys))
+                rows = list(enumerate(changes.items))
+            else:
+                rows = changes.changed_rows()
+            for row, quote in rows:
+                if quote is not None:
+                    self.set_index_row(row, changes.keys[row].split(':', 1)[1], quote)
+        except Exception as e:
+            self.logger.error(f"Failed to apply refreshed indices: {e}")
 
-            # Calculate and update portfolio analytics
-            self.calculate_portfolio_analytics(positions, regular_holdings)
+    def on_refresh_finished(self, changed_sections: set):
+        """Update views derived from several sections once a refresh completes"""
+        try:
+            snapshot = self.refresh_service.snapshot
+            positions = snapshot['positions'].items if 'positions' in snapshot else []
+            all_holdings = snapshot.get('all_holdings', {})
+            regular_holdings = all_holdings.get('regular_holdings', [])
 
-            # Get orders
-            self.logger.debug("📋 Fetching orders...")
-            orders = self.api_client.get_orders()
-            self.logger.info(f"📋 Retrieved {len(orders)} orders")
-            if orders:
-                for i, order in enumerate(orders[:3]):  # Log first 3 orders
-                    self.logger.debug(f"📋 Order {i+1}: {order.tradingsymbol} - {order.transaction_type} {order.quantity} @ ₹{order.price}")
-            self.update_orders_table(orders)
+            if changed_sections & {'positions', 'holdings'}:
+                self.calculate_portfolio_analytics(positions, regular_holdings)
 
-            # Update quick stats
-            self.positions_count_label.setText(str(len(positions)))
-            self.holdings_count_label.setText(str(summary['total_count']))
-            today_orders = [o for o in orders if o.order_timestamp.date() == datetime.now().date()]
-            self.orders_count_label.setText(str(len(today_orders)))
-            self.logger.debug(f"📋 Today's orders: {len(today_orders)}")
+            if self.analytics_refresh_pending and 'trades' in snapshot:
+                self.analytics_refresh_pending = False
+                if changed_sections & {'orders', 'trades', 'positions', 'holdings'}:
+                    orders = snapshot['orders'].items if 'orders' in snapshot else []
+                    self.update_analytics_views(orders, snapshot['trades'], positions, regular_holdings)
 
-            # Update trading analytics (apply current filters)
-            self.apply_history_filters()
+            # Stream the instruments now on screen
+            if self.is_streaming() and changed_sections & {'quotes', 'indices', 'positions', 'holdings'}:
+                self.update_stream_subscriptions()
 
-            # Refresh watchlist and market overview
-            self.refresh_watchlist()
-            self.update_market_overview()
+            # Refreshes only run while connected; keep the status current without another API call
+            if snapshot.get('profile') and 'profile' not in changed_sections:
+                self.update_connection_status(True, snapshot['profile'])
 
-            self.logger.info("✅ Data refresh completed successfully")
+            if changed_sections:
+                self.logger.debug(f"✅ Refresh applied: {sorted(changed_sections)}")
 
         except Exception as e:
-            self.logger.error(f"❌ Failed to refresh data: {e}")
-            import traceback
-            self.logger.error(f"❌ Traceback: {traceback.format_exc()}")
+            self.logger.error(f"Failed to finish refresh: {e}")
+
+    def update_analytics_views(self, orders: List[Order], trades: List[Dict[str, Any]],
+                               positions: List[Position], holdings: List[Holding]):
+        """Redraw the analytics tab from already fetched data"""
+        self.update_analytics_dashboard(orders, trades)
+        self.update_pnl_analysis(orders, trades)
+        self.update_trade_history_analytics(orders, trades)
+        self.update_performance_analysis(orders)
+        self.update_risk_analysis(positions, holdings)
 
     def update_account_summary(self, margins: Dict[str, Any]):
         """Update account summary display with enhanced metrics"""
@@ -2960,58 +3061,55 @@ class TradingWidget(QWidget):
         try:
             self.positions_table.setRowCount(len(positions))
 
-            total_pnl = 0
-            total_day_pnl = 0
-            open_positions = 0
-
             for row, position in enumerate(positions):
-                # Calculate position value and P&L percentage
-                position_value = position.quantity * position.last_price
-                pnl_percentage = 0
-                if position.average_price > 0 and position.quantity != 0:
-                    invested_value = abs(position.quantity) * position.average_price
-                    pnl_percentage = (position.pnl / invested_value) * 100 if invested_value > 0 else 0
-
-                # Update table columns with comprehensive position data
-                self.positions_table.setItem(row, 0, QTableWidgetItem(position.tradingsymbol))
-                self.positions_table.setItem(row, 1, QTableWidgetItem(str(position.quantity)))
-                self.positions_table.setItem(row, 2, QTableWidgetItem(str(position.overnight_quantity)))
-                self.positions_table.setItem(row, 3, QTableWidgetItem(str(position.multiplier)))
-                self.positions_table.setItem(row, 4, QTableWidgetItem(f"₹{position.average_price:.2f}"))
-                self.positions_table.setItem(row, 5, QTableWidgetItem(f"₹{position.last_price:.2f}"))
-                self.positions_table.setItem(row, 6, QTableWidgetItem(f"₹{position.close_price:.2f}"))
-                self.positions_table.setItem(row, 7, QTableWidgetItem(f"₹{position.pnl:.2f}"))
-                self.positions_table.setItem(row, 8, QTableWidgetItem(f"{pnl_percentage:+.2f}%"))
-                self.positions_table.setItem(row, 9, QTableWidgetItem(f"₹{position.m2m:.2f}"))
-                self.positions_table.setItem(row, 10, QTableWidgetItem(str(position.buy_quantity)))
-                self.positions_table.setItem(row, 11, QTableWidgetItem(f"₹{position.buy_price:.2f}"))
-                self.positions_table.setItem(row, 12, QTableWidgetItem(str(position.sell_quantity)))
-                self.positions_table.setItem(row, 13, QTableWidgetItem(f"₹{position.sell_price:.2f}"))
-                self.positions_table.setItem(row, 14, QTableWidgetItem(position.product))
-                self.positions_table.setItem(row, 15, QTableWidgetItem(position.exchange))
+                self.set_position_row(row, position)
 
-                # Color code P&L columns (updated column indices)
-                pnl_item = self.positions_table.item(row, 7)  # P&L column
-                pnl_pct_item = self.positions_table.item(row, 8)  # P&L % column
-                m2m_item = self.positions_table.item(row, 9)  # M2M column
+            self.update_positions_summary(positions)
 
-                if position.pnl > 0:
-                    pnl_item.setForeground(QColor("green"))
-                    pnl_pct_item.setForeground(QColor("green"))
-                elif position.pnl < 0:
-                    pnl_item.setForeground(QColor("red"))
-                    pnl_pct_item.setForeground(QColor("red"))
+        except Exception as e:
+            self.logger.error(f"Failed to update positions table: {e}")
 
-                if position.m2m > 0:
-                    m2m_item.setForeground(QColor("green"))
-                elif position.m2m < 0:
-                    m2m_item.setForeground(QColor("red"))
+    def set_position_row(self, row: int, position: Position):
+        """Write one position into the positions table"""
+        try:
+            # Calculate P&L percentage
+            pnl_percentage = 0
+            if position.average_price > 0 and position.quantity != 0:
+                invested_value = abs(position.quantity) * position.average_price
+                pnl_percentage = (position.pnl / invested_value) * 100 if invested_value > 0 else 0
+
+            # Color code P&L columns
+            pnl_color = "green" if position.pnl > 0 else "red" if position.pnl < 0 else None
+            m2m_color = "green" if position.m2m > 0 else "red" if position.m2m < 0 else None
+
+            # Update table columns with comprehensive position data, touching only changed cells
+            table = self.positions_table
+            self.set_cell_text(table, row, 0, position.tradingsymbol)
+            self.set_cell_text(table, row, 1, str(position.quantity))
+            self.set_cell_text(table, row, 2, str(position.overnight_quantity))
+            self.set_cell_text(table, row, 3, str(position.multiplier))
+            self.set_cell_text(table, row, 4, f"₹{position.average_price:.2f}")
+            self.set_cell_text(table, row, 5, f"₹{position.last_price:.2f}")
+            self.set_cell_text(table, row, 6, f"₹{position.close_price:.2f}")
+            self.set_cell_text(table, row, 7, f"₹{position.pnl:.2f}", pnl_color)
+            self.set_cell_text(table, row, 8, f"{pnl_percentage:+.2f}%", pnl_color)
+            self.set_cell_text(table, row, 9, f"₹{position.m2m:.2f}", m2m_color)
+            self.set_cell_text(table, row, 10, str(position.buy_quantity))
+            self.set_cell_text(table, row, 11, f"₹{position.buy_price:.2f}")
+            self.set_cell_text(table, row, 12, str(position.sell_quantity))
+            self.set_cell_text(table, row, 13, f"₹{position.sell_price:.2f}")
+            self.set_cell_text(table, row, 14, position.product)
+            self.set_cell_text(table, row, 15, position.exchange)
 
-                # Accumulate totals
-                total_pnl += position.pnl
-                total_day_pnl += position.m2m
-                if position.quantity != 0:
-                    open_positions += 1
+        except Exception as e:
+            self.logger.error(f"Failed to update position row {row}: {e}")
+
+    def update_positions_summary(self, positions: List[Position]):
+        """Update the P&L and open position totals under the positions table"""
+        try:
+            total_pnl = sum(position.pnl for position in positions)
+            total_day_pnl = sum(position.m2m for position in positions)
+            open_positions = sum(1 for position in positions if position.quantity != 0)
 
             # Update positions summary
             pnl_color = "green" if total_pnl >= 0 else "red"
@@ -3026,7 +3124,7 @@ class TradingWidget(QWidget):
             self.positions_count_summary_label.setText(f"Open Positions: {open_positions}")
 
         except Exception as e:
-            self.logger.error(f"Failed to update positions table: {e}")
+            self.logger.error(f"Failed to update positions summary: {e}")
 
     def update_holdings_table(self, holdings: List[Holding]):
         """Update holdings table with enhanced analytics"""
@@ -3328,52 +3426,7 @@ class TradingWidget(QWidget):
             # Apply current filters
             filtered_orders = self.apply_order_filters(orders)
 
-            self.order_history_table.setRowCount(len(filtered_orders))
-
-            for row, order in enumerate(filtered_orders):
-                # Comprehensive order data display
-                self.order_history_table.setItem(row, 0, QTableWidgetItem(order.order_id))
-                self.order_history_table.setItem(row, 1, QTableWidgetItem(order.parent_order_id or "--"))
-                self.order_history_table.setItem(row, 2, QTableWidgetItem(order.exchange_order_id or "--"))
-                self.order_history_table.setItem(row, 3, QTableWidgetItem(order.tradingsymbol))
-                self.order_history_table.setItem(row, 4, QTableWidgetItem(order.order_type))
-                self.order_history_table.setItem(row, 5, QTableWidgetItem(order.transaction_type))
-                self.order_history_table.setItem(row, 6, QTableWidgetItem(str(order.quantity)))
-
-                filled_qty = getattr(order, 'filled_quantity', 0) or 0
-                self.order_history_table.setItem(row, 7, QTableWidgetItem(str(filled_qty)))
-
-                pending_qty = getattr(order, 'pending_quantity', 0) or 0
-                self.order_history_table.setItem(row, 8, QTableWidgetItem(str(pending_qty)))
-
-                cancelled_qty = getattr(order, 'cancelled_quantity', 0) or 0
-                self.order_history_table.setItem(row, 9, QTableWidgetItem(str(cancelled_qty)))
-
-                self.order_history_table.setItem(row, 10, QTableWidgetItem(f"₹{order.price:.2f}"))
-
-                trigger_price = getattr(order, 'trigger_price', 0) or 0
-                self.order_history_table.setItem(row, 11, QTableWidgetItem(f"₹{trigger_price:.2f}" if trigger_price > 0 else "--"))
-
-                avg_price = getattr(order, 'average_price', 0) or 0
-                self.order_history_table.setItem(row, 12, QTableWidgetItem(f"₹{avg_price:.2f}" if avg_price > 0 else "--"))
-
-                # Color code status
-                status_item = QTableWidgetItem(order.status)
-                if order.status == "COMPLETE":
-                    status_item.setForeground(QColor("green"))
-                elif order.status == "CANCELLED":
-                    status_item.setForeground(QColor("orange"))
-                elif order.status == "REJECTED":
-                    status_item.setForeground(QColor("red"))
-                self.order_history_table.setItem(row, 13, status_item)
-
-                # Status message
-                status_message = getattr(order, 'status_message', '') or ''
-                self.order_history_table.setItem(row, 14, QTableWidgetItem(status_message[:50] + "..." if len(status_message) > 50 else status_message))
-
-                self.order_history_table.setItem(row, 15, QTableWidgetItem(order.product))
-                self.order_history_table.setItem(row, 16, QTableWidgetItem(order.variety))
-                self.order_history_table.setItem(row, 17, QTableWidgetItem(order.order_timestamp.strftime("%d-%m-%Y %H:%M:%S")))
+            self.order_history_model.set_dataframe(pd.DataFrame([vars(order) for order in filtered_orders]))
 
         except Exception as e:
             self.logger.error(f"Failed to update order history table: {e}")
@@ -4225,47 +4278,57 @@ Validity: {validity}
             self.watchlist_table.setRowCount(len(watchlist))
 
             for row, symbol in enumerate(watchlist):
-                instrument = f"NSE:{symbol}"
-
-                if instrument in quotes_data:
-                    quote = quotes_data[instrument]
-
-                    # Extract quote data
-                    ltp = quote.get('last_price', 0)
-                    ohlc = quote.get('ohlc', {})
-                    prev_close = ohlc.get('close', ltp)
-                    change = ltp - prev_close
-                    change_pct = (change / prev_close * 100) if prev_close > 0 else 0
-                    volume = quote.get('volume', 0)
-                    high = ohlc.get('high', 0)
-                    low = ohlc.get('low', 0)
-
-                    # Update table
-                    self.watchlist_table.setItem(row, 0, QTableWidgetItem(symbol))
-                    self.watchlist_table.setItem(row, 1, QTableWidgetItem(f"₹{ltp:.2f}"))
-
-                    change_item = QTableWidgetItem(f"₹{change:+.2f}")
-                    change_item.setForeground(QColor("green" if change >= 0 else "red"))
-                    self.watchlist_table.setItem(row, 2, change_item)
-
-                    change_pct_item = QTableWidgetItem(f"{change_pct:+.2f}%")
-                    change_pct_item.setForeground(QColor("green" if change_pct >= 0 else "red"))
-                    self.watchlist_table.setItem(row, 3, change_pct_item)
-
-                    self.watchlist_table.setItem(row, 4, QTableWidgetItem(f"{volume:,}"))
-                    self.watchlist_table.setItem(row, 5, QTableWidgetItem(f"₹{high:.2f}"))
-                    self.watchlist_table.setItem(row, 6, QTableWidgetItem(f"₹{low:.2f}"))
-                    self.watchlist_table.setItem(row, 7, QTableWidgetItem(datetime.now().strftime("%H:%M:%S")))
-                else:
-                    # No data available
-                    self.watchlist_table.setItem(row, 0, QTableWidgetItem(symbol))
-                    for col in range(1, 8):
-                        self.watchlist_table.setItem(row, col, QTableWidgetItem("--"))
+                self.set_watchlist_row(row, symbol, quotes_data.get(f"NSE:{symbol}"))
 
         except Exception as e:
             self.logger.error(f"Failed to refresh watchlist: {e}")
             QMessageBox.critical(self, "Error", f"Failed to refresh watchlist: {e}")
 
+    def set_watchlist_row(self, row: int, symbol: str, quote: Optional[Dict[str, Any]]):
+        """Write one symbol's quote into the watchlist table"""
+        table = self.watchlist_table
+        if quote is None:
+            # No data available
+            self.set_cell_text(table, row, 0, symbol)
+            for col in range(1, 8):
+                self.set_cell_text(table, row, col, "--")
+            return
+
+        # Extract quote data
+        ltp = quote.get('last_price', 0)
+        ohlc = quote.get('ohlc', {})
+        prev_close = ohlc.get('close', ltp)
+        change = ltp - prev_close
+        change_pct = (change / prev_close * 100) if prev_close > 0 else 0
+        volume = quote.get('volume', 0)
+        high = ohlc.get('high', 0)
+        low = ohlc.get('low', 0)
+
+        # Update table, touching only cells whose text changed
+        self.set_cell_text(table, row, 0, symbol)
+        self.set_cell_text(table, row, 1, f"₹{ltp:.2f}")
+        self.set_cell_text(table, row, 2, f"₹{change:+.2f}", "green" if change >= 0 else "red")
+        self.set_cell_text(table, row, 3, f"{change_pct:+.2f}%", "green" if change_pct >= 0 else "red")
+        self.set_cell_text(table, row, 4, f"{volume:,}")
+        self.set_cell_text(table, row, 5, f"₹{high:.2f}")
+        self.set_cell_text(table, row, 6, f"₹{low:.2f}")
+        self.set_cell_text(table, row, 7, datetime.now().strftime("%H:%M:%S"))
+
+    def set_cell_text(self, table: QTableWidget, row: int, column: int, text: str,
+                      color: Optional[str] = None):
+        """Set a cell's text and colour, leaving cells that already show them untouched"""
+        item = table.item(row, column)
+        if item is None:
+            item = QTableWidgetItem(text)
+            if color is not None:
+                item.setForeground(QColor(color))
+            table.setItem(row, column, item)
+            return
+        if item.text() != text:
+            item.setText(text)
+        if color is not None and item.foreground().color() != QColor(color):
+            item.setForeground(QColor(color))
+
     def load_watchlist(self) -> List[str]:
         """Load watchlist from file"""
         try:
@@ -4296,32 +4359,14 @@ Validity: {validity}
                 return
 
             # Update market indices (major indices)
-            indices = ["NSE:NIFTY 50", "NSE:NIFTY BANK", "NSE:NIFTY IT", "BSE:SENSEX"]
+            indices = MARKET_INDICES
             indices_data = self.api_client.get_quote(indices)
 
             self.indices_table.setRowCount(len(indices))
 
             for row, instrument in enumerate(indices):
-                index_name = instrument.split(':')[1]
-
                 if instrument in indices_data:
-                    quote = indices_data[instrument]
-                    ltp = quote.get('last_price', 0)
-                    ohlc = quote.get('ohlc', {})
-                    prev_close = ohlc.get('close', ltp)
-                    change = ltp - prev_close
-                    change_pct = (change / prev_close * 100) if prev_close > 0 else 0
-
-                    self.indices_table.setItem(row, 0, QTableWidgetItem(index_name))
-                    self.indices_table.setItem(row, 1, QTableWidgetItem(f"{ltp:.2f}"))
-
-                    change_item = QTableWidgetItem(f"{change:+.2f}")
-                    change_item.setForeground(QColor("green" if change >= 0 else "red"))
-                    self.indices_table.setItem(row, 2, change_item)
-
-                    change_pct_item = QTableWidgetItem(f"{change_pct:+.2f}%")
-                    change_pct_item.setForeground(QColor("green" if change_pct >= 0 else "red"))
-                    self.indices_table.setItem(row, 3, change_pct_item)
+                    self.set_index_row(row, instrument.split(':')[1], indices_data[instrument])
 
             # Note: Top gainers/losers and most active would require additional API calls
             # or market data feeds that may not be available in basic Kite Connect
@@ -4330,6 +4375,20 @@ Validity: {validity}
         except Exception as e:
             self.logger.error(f"Failed to update market overview: {e}")
 
+    def set_index_row(self, row: int, index_name: str, quote: Dict[str, Any]):
+        """Write one index quote into the market indices table"""
+        ltp = quote.get('last_price', 0)
+        ohlc = quote.get('ohlc', {})
+        prev_close = ohlc.get('close', ltp)
+        change = ltp - prev_close
+        change_pct = (change / prev_close * 100) if prev_close > 0 else 0
+
+        table = self.indices_table
+        self.set_cell_text(table, row, 0, index_name)
+        self.set_cell_text(table, row, 1, f"{ltp:.2f}")
+        self.set_cell_text(table, row, 2, f"{change:+.2f}", "green" if change >= 0 else "red")
+        self.set_cell_text(table, row, 3, f"{change_pct:+.2f}%", "green" if change_pct >= 0 else "red")
+
     def on_symbol_search(self, text: str):
         """Handle symbol search input"""
         try:
@@ -4344,24 +4403,20 @@ Validity: {validity}
             if not self.api_client or not self.api_client.is_authenticated():
                 return
 
-            # This would require implementing instrument search in the API client
-            # For now, we'll show a basic implementation
-            instruments = self.api_client.get_instruments()
-            if instruments:
-                matching_instruments = [
-                    inst for inst in instruments
-                    if search_text.upper() in inst.get('tradingsymbol', '').upper()
-                ][:10]  # Limit to 10 results
-
-                if matching_instruments:
-                    self.symbol_suggestions.clear()
-                    for inst in matching_instruments:
-                        symbol = inst.get('tradingsymbol', '')
-                        exchange = inst.get('exchange', '')
-                        self.symbol_suggestions.addItem(f"{symbol} ({exchange})")
-                    self.symbol_suggestions.setVisible(True)
-                else:
-                    self.symbol_suggestions.setVisible(False)
+            # The instrument master downloads at most once a day; never wait for it on the UI thread
+            master = self.api_client.instrument_master
+            if not master.is_ready():
+                master.load_in_background()
+                return
+
+            matching_instruments = self.api_client.search_instruments(None, search_text, limit=10)
+            if matching_instruments:
+                self.symbol_suggestions.clear()
+                for inst in matching_instruments:
+                    self.symbol_suggestions.addItem(f"{inst.tradingsymbol} ({inst.exchange})")
+                self.symbol_suggestions.setVisible(True)
+            else:
+                self.symbol_suggestions.setVisible(False)
 
         except Exception as e:
             self.logger.error(f"Failed to search instruments: {e}")
@@ -5514,49 +5569,38 @@ Validity: {validity}
                 self.logger.warning("Cannot refresh data - API client not authenticated")
                 return
 
-            if self.is_refreshing:
+            if self.refresh_service.is_refreshing():
                 self.logger.debug("Refresh already in progress, skipping...")
                 return
 
-            self.is_refreshing = True
             current_time = datetime.now()
 
-            # Determine what needs refreshing based on intervals and priority
-            refresh_tasks = []
-
-            # High priority: Orders (most time-sensitive)
-            if self.should_refresh('orders', current_time):
-                refresh_tasks.append(('orders', self.refresh_orders_data))
-
-            # Medium priority: Market data (for active trading)
-            if self.should_refresh('market', current_time):
-                refresh_tasks.append(('market', self.refresh_market_data))
-
-            # Lower priority: Portfolio data (less frequent changes)
-            if self.should_refresh('portfolio', current_time):
-                refresh_tasks.append(('portfolio', self.refresh_portfolio_data))
-
-            # Lowest priority: Analytics (least time-sensitive)
-            if self.should_refresh('analytics', current_time):
-                refresh_tasks.append(('analytics', self.refresh_analytics_data))
-
-            # Execute refresh tasks
-            for task_name, task_func in refresh_tasks:
-                try:
-                    self.logger.debug(f"Refreshing {task_name} data...")
-                    task_func()
-                    self.last_refresh_time[task_name] = current_time
-                except Exception as e:
-                    self.logger.error(f"Failed to refresh {task_name} data: {e}")
+            # Determine what needs refreshing based on intervals; the profile
+            # is always fetched since it doubles as the connection check
+            sections = {'profile'}
+            component_sections = {
+                'orders': {'orders'},
+                'market': {'quotes', 'indices'},
+                'portfolio': {'margins', 'positions', 'holdings'},
+                'analytics': {'orders', 'trades', 'positions', 'holdings'},
+            }
+            for component, component_set in component_sections.items():
+                if self.should_refresh(component, current_time):
+                    sections |= component_set
+                    self.last_refresh_time[component] = current_time
+                    if component == 'analytics':
+                        self.analytics_refresh_pending = True
 
-            # Update connection status
-            self.update_connection_status(True)
+            # Streamed prices replace quote polling once the watchlist rows are mapped to instruments
+            if self.is_streaming() and self.stream_covers_watchlist():
+                sections -= {'quotes', 'indices'}
 
-            self.is_refreshing = False
+            # All due sections are fetched concurrently off the UI thread
+            self.logger.debug(f"Refreshing {sorted(sections)} in the background...")
+            self.refresh_service.request_refresh(sections, watchlist=self.load_watchlist())
 
         except Exception as e:
             self.logger.error(f"Error in intelligent refresh: {e}")
-            self.is_refreshing = False
 
     def should_refresh(self, component: str, current_time: datetime) -> bool:
         """Determine if a component should be refreshed"""
@@ -5649,6 +5693,12 @@ Validity: {validity}
             # Start connection monitoring (every 30 seconds)
             self.connection_monitor_timer.start(30000)
 
+            # Stream prices between polls when enabled
+            self.start_market_stream()
+
+            # Have symbol search and token lookup ready before they are needed
+            self.api_client.instrument_master.load_in_background()
+
             self.logger.info("Intelligent refresh system started")
 
         except Exception as e:
@@ -5662,8 +5712,8 @@ Validity: {validity}
             self.market_refresh_timer.stop()
             self.orders_refresh_timer.stop()
             self.connection_monitor_timer.stop()
+            self.stop_market_stream()
 
-            self.is_refreshing = False
             self.refresh_queue.clear()
 
             self.logger.info("Refresh system stopped")
@@ -5671,6 +5721,141 @@ Validity: {validity}
         except Exception as e:
             self.logger.error(f"Failed to stop refresh system: {e}")
 
+    def start_market_stream(self):
+        """Stream watchlist, index, position and holding prices over the ticker WebSocket"""
+        try:
+            if self.market_ticker is not None:
+                return
+            if not self.trading_config.websocket_enabled or not WEBSOCKETS_AVAILABLE:
+                return
+            if not self.api_client or not self.api_client.is_authenticated():
+                return
+
+            config = self.api_client.config
+            self.market_ticker = MarketTicker(config.api_key, config.access_token, parent=self)
+            self.market_ticker.ticks_ready.connect(self.on_market_ticks)
+            self.market_ticker.error_occurred.connect(
+                lambda message: self.logger.warning(f"Market stream: {message}"))
+            self.update_stream_subscriptions()
+            self.market_ticker.start()
+            self.logger.info("Market data streaming started")
+
+        except Exception as e:
+            self.logger.error(f"Failed to start market stream: {e}")
+            self.market_ticker = None
+
+    def stop_market_stream(self):
+        """Close the ticker connection; quotes fall back to polling"""
+        try:
+            if self.market_ticker is None:
+                return
+            ticker, self.market_ticker = self.market_ticker, None
+            ticker.ticks_ready.disconnect(self.on_market_ticks)
+            ticker.stop()
+            ticker.deleteLater()
+            self.stream_targets = {}
+            self.logger.info("Market data streaming stopped")
+
+        except Exception as e:
+            self.logger.error(f"Failed to stop market stream: {e}")
+
+    def is_streaming(self) -> bool:
+        """Check whether prices are arriving over the ticker connection"""
+        return self.market_ticker is not None and self.market_ticker.is_connected()
+
+    def stream_covers_watchlist(self) -> bool:
+        """Check that the shown watchlist quotes are for the current watchlist, so polling them can stop"""
+        quotes = self.refresh_service.snapshot.get('quotes')
+        return quotes is not None and quotes.keys == [f"NSE:{symbol}" for symbol in self.load_watchlist()]
+
+    def update_stream_subscriptions(self):
+        """Map instrument tokens to the table rows showing them and subscribe exactly those tokens"""
+        try:
+            if self.market_ticker is None:
+                return
+            snapshot = self.refresh_service.snapshot
+            targets: Dict[int, List[tuple]] = {}
+
+            def add(token, kind, row, context):
+                if token:
+                    targets.setdefault(int(token), []).append((kind, row, context))
+
+            master = self.api_client.instrument_master if self.api_client else None
+            quotes = snapshot.get('quotes')
+            if quotes is not None:
+                for row, (instrument, quote) in enumerate(zip(quotes.keys, quotes.items)):
+                    token = (quote or {}).get('instrument_token')
+                    if not token and master is not None and master.is_ready():
+                        token = master.get_token(instrument)
+                    add(token, 'watchlist', row, instrument.split(':', 1)[1])
+
+            indices = snapshot.get('indices')
+            if indices is not None:
+                for row, (instrument, quote) in enumerate(zip(indices.keys, indices.items)):
+                    if quote:
+                        token = quote.get('instrument_token') or INDEX_TOKENS.get(instrument)
+                        add(token, 'index', row, (instrument.split(':', 1)[1], quote))
+
+            positions = snapshot.get('positions')
+            if positions is not None:
+                for row, position in enumerate(positions.items):
+                    add(position.instrument_token, 'position', row, position)
+
+            # Regular holdings fill the first rows of the combined holdings table
+            for row, holding in enumerate(snapshot.get('all_holdings', {}).get('regular_holdings', [])):
+                add(holding.instrument_token, 'holding', row, holding)
+
+            self.stream_targets = targets
+            self.market_ticker.set_subscriptions(targets, MODE_QUOTE)
+            self.logger.debug(f"Streaming {len(targets)} instruments")
+
+        except Exception as e:
+            self.logger.error(f"Failed to update stream subscriptions: {e}")
+
+    def on_market_ticks(self, batch: Dict[int, Dict[str, Any]]):
+        """Apply one frame of conflated ticks, rewriting only the cells whose values changed"""
+        try:
+            for token, tick in batch.items():
+                ltp = tick.get('last_price')
+                if ltp is None:
+                    continue
+                for kind, row, context in self.stream_targets.get(token, ()):
+                    if kind == 'watchlist':
+                        quote = {'last_price': ltp, 'ohlc': tick.get('ohlc', {}),
+                                 'volume': tick.get('volume_traded', 0)}
+                        self.set_watchlist_row(row, context, quote)
+                    elif kind == 'index':
+                        index_name, quote = context
+                        self.set_index_row(row, index_name, dict(quote, last_price=ltp,
+                                                                 ohlc=tick.get('ohlc', quote.get('ohlc', {}))))
+                    elif kind == 'position':
+                        self.set_position_row(row, self.streamed_position(context, ltp))
+                    elif kind == 'holding':
+                        self.set_streamed_holding_row(row, context, ltp)
+
+        except Exception as e:
+            self.logger.error(f"Failed to apply market ticks: {e}")
+
+    def streamed_position(self, position: Position, ltp: float) -> Position:
+        """Reprice a position at a streamed last price"""
+        multiplier = position.multiplier or 1
+        pnl = position.sell_value - position.buy_value + position.quantity * ltp * multiplier
+        return replace(position, last_price=ltp, pnl=pnl)
+
+    def set_streamed_holding_row(self, row: int, holding: Holding, ltp: float):
+        """Reprice the price-dependent cells of a regular holding's row"""
+        table = self.holdings_table
+        pnl = (ltp - holding.average_price) * holding.quantity
+        invested_value = holding.quantity * holding.average_price
+        pnl_percentage = (pnl / invested_value * 100) if invested_value > 0 else 0
+        pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else None
+
+        self.set_cell_text(table, row, 5, f"₹{ltp:.2f}")
+        self.set_cell_text(table, row, 6, f"₹{pnl:.2f}", pnl_color)
+        self.set_cell_text(table, row, 7, f"{pnl_percentage:+.2f}%", pnl_color)
+        self.set_cell_text(table, row, 8, f"₹{ltp - holding.close_price:.2f}")
+        self.set_cell_text(table, row, 9, f"₹{holding.quantity * ltp:.2f}")
+
     def monitor_connection(self):
         """Monitor API connection status"""
         try:
@@ -11,8 +11,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QPalette
 
+from datetime import timedelta
+
 import pandas as pd
 
+from ..core.aggregate_store import AGGREGATE_SOURCES, AggregateStore, get_aggregate_store
 from ..core.config import AppConfig
 from ..core.data_manager import DataManager
 from ..modules.expenses.visualization import (
@@ -157,6 +160,11 @@ class DashboardWidget(QWidget):
         self.data_manager = data_manager
         self.config = config
 
+        # Materialized totals; refresh_data redraws only widgets whose views changed
+        self.aggregate_store = get_aggregate_store(data_manager)
+        self._dashboard_drawn = False
+        self._expense_data_valid = False
+
         # Get current theme from config
         self.current_theme = getattr(config, 'theme', 'dark')
 
@@ -711,20 +719,18 @@ class DashboardWidget(QWidget):
 
             parent_tab_widget.addTab(analytics_widget, "🔬 Advanced Analytics")
 
-            # Update with current data
-            self.update_advanced_analytics()
-
         except Exception as e:
             print(f"Error creating advanced analytics subtab: {e}")
             import traceback
             traceback.print_exc()
 
-    def update_advanced_analytics(self):
+    def update_advanced_analytics(self, expense_data=None):
         """Update advanced analytics with current expense data"""
         try:
             if hasattr(self, 'advanced_analytics'):
                 # Get expense data
-                expense_data = self.get_expense_data()
+                if expense_data is None:
+                    expense_data = self.get_expense_data()
 
                 # Sample budget data (in a real implementation, this would come from budget module)
                 sample_budget = {
@@ -1087,28 +1093,60 @@ class DashboardWidget(QWidget):
         layout.addWidget(activity_frame)
     
     def setup_refresh_timer(self):
-        """Setup automatic refresh timer"""
+        """Setup data change and automatic refresh timers"""
+        # Saves arrive in bursts (transactions, imports), so coalesce them into one refresh
+        self.change_timer = QTimer()
+        self.change_timer.setSingleShot(True)
+        self.change_timer.setInterval(250)
+        self.change_timer.timeout.connect(self.refresh_data)
+        self.data_manager.data_changed.connect(self.on_data_changed)
+
+        # Catches files written outside this DataManager; unchanged files cost a stat each
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_data)
         self.refresh_timer.start(60000)  # Refresh every minute
-    
-    def refresh_data(self):
-        """Refresh dashboard data with enhanced visualizations"""
+
+    def on_data_changed(self, module: str, operation: str):
+        """Schedule a refresh when a module the dashboard aggregates changes"""
+        if module in AGGREGATE_SOURCES:
+            self.change_timer.start()
+
+    def refresh_data(self, force: bool = False):
+        """Update aggregates and redraw the widgets whose inputs changed"""
         try:
-            # Get expense data for visualizations
-            expense_data = self.get_expense_data()
+            changes = self.aggregate_store.refresh()
+            if force or not self._dashboard_drawn:
+                changes = {module: set(AggregateStore.views) for module in AGGREGATE_SOURCES}
+            if not changes:
+                return
+
+            expense_changes = changes.get('expenses', set())
+
+            # Row-level widgets need the records themselves
+            if 'records' in expense_changes:
+                expense_data = self.get_expense_data()
+                was_valid = self._expense_data_valid
+                self._expense_data_valid = (not expense_data.empty and
+                                            self._has_valid_transaction_data(expense_data))
+                if self._expense_data_valid != was_valid:
+                    expense_changes = expense_changes | {'totals'}
+
+                self.update_interactive_charts(expense_data)
+                self.update_advanced_analytics(expense_data)
 
             # Update summary cards with enhanced metrics
-            self.update_summary_cards(expense_data)
+            if expense_changes & {'totals', 'by_day', 'by_category'}:
+                self.update_summary_cards()
 
             # Update expense tracker charts
-            self.update_expense_charts(expense_data)
+            self.update_expense_charts(expense_changes)
 
             # Update legacy stat cards if they exist
-            self.update_legacy_stat_cards()
+            if any('totals' in views or 'by_day' in views or 'by_category' in views
+                   for views in changes.values()):
+                self.update_legacy_stat_cards()
 
-            # Update advanced analytics
-            self.update_advanced_analytics()
+            self._dashboard_drawn = True
 
             # Update activity
             if hasattr(self, 'activity_label'):
@@ -1123,41 +1161,40 @@ class DashboardWidget(QWidget):
                 for card in self.summary_cards.values():
                     card.update_values("0", "No data")
 
-    def update_expense_charts(self, expense_data):
-        """Update expense tracker charts"""
+    def update_expense_charts(self, changed_views=None):
+        """Update expense tracker charts from the expense aggregates
+
+        Only charts reading one of ``changed_views`` are redrawn; all of them
+        when it is None.
+        """
         try:
-            # Use more lenient validation - just check if we have basic data
-            if expense_data.empty:
-                # Clear charts if no data
-                if hasattr(self, 'category_pie_chart'):
-                    self.category_pie_chart.clear_chart()
-                if hasattr(self, 'monthly_bar_chart'):
-                    self.monthly_bar_chart.clear_chart()
-                if hasattr(self, 'trends_line_chart'):
-                    self.trends_line_chart.clear_chart()
-                return
+            if changed_views is None:
+                changed_views = set(AggregateStore.views)
 
-            # Basic validation - just ensure we have required columns
-            required_columns = ['date', 'amount', 'category']
-            if not all(col in expense_data.columns for col in required_columns):
-                print(f"Missing required columns for charts: {required_columns}")
+            if self.aggregate_store.get_total('expenses')['count'] == 0:
+                # Clear charts if no data
+                if 'totals' in changed_views:
+                    if hasattr(self, 'category_pie_chart'):
+                        self.category_pie_chart.clear_chart()
+                    if hasattr(self, 'monthly_bar_chart'):
+                        self.monthly_bar_chart.clear_chart()
+                    if hasattr(self, 'trends_line_chart'):
+                        self.trends_line_chart.clear_chart()
                 return
 
             # Update category pie chart
-            if hasattr(self, 'category_pie_chart'):
+            if hasattr(self, 'category_pie_chart') and 'by_category' in changed_views:
+                category_data = self.aggregate_store.get_frame('expenses', 'by_category', 'category', 'amount')
                 self.category_pie_chart.update_chart(
-                    expense_data,
+                    category_data,
                     value_column='amount',
                     label_column='category',
                     title="Expense Distribution by Category"
                 )
 
             # Update monthly bar chart
-            if hasattr(self, 'monthly_bar_chart'):
-                # Group by month for monthly comparison
-                expense_data_copy = expense_data.copy()
-                expense_data_copy['month'] = expense_data_copy['date'].dt.strftime('%Y-%m')
-                monthly_data = expense_data_copy.groupby('month')['amount'].sum().reset_index()
+            if hasattr(self, 'monthly_bar_chart') and 'by_month' in changed_views:
+                monthly_data = self.aggregate_store.get_frame('expenses', 'by_month', 'month', 'amount')
 
                 self.monthly_bar_chart.update_chart(
                     monthly_data,
@@ -1169,18 +1206,16 @@ class DashboardWidget(QWidget):
                 )
 
             # Update trends line chart
-            if hasattr(self, 'trends_line_chart'):
+            if hasattr(self, 'trends_line_chart') and 'by_day' in changed_views:
+                daily_data = self.aggregate_store.get_frame('expenses', 'by_day', 'date', 'amount')
                 self.trends_line_chart.update_chart(
-                    expense_data,
+                    daily_data,
                     date_column='date',
                     value_column='amount',
                     title="Daily Expense Trends",
                     aggregation='daily'
                 )
 
-            # Update new interactive charts
-            self.update_interactive_charts(expense_data)
-
         except Exception as e:
             print(f"Error updating expense charts: {e}")
 
@@ -1276,47 +1311,50 @@ class DashboardWidget(QWidget):
             print(f"Error getting expense data: {e}")
             return pd.DataFrame()
 
-    def update_summary_cards(self, expense_data):
-        """Update summary cards with expense metrics and proper validation"""
+    def update_summary_cards(self):
+        """Update summary cards from the expense aggregates"""
         if not hasattr(self, 'summary_cards'):
             return
 
+        totals = self.aggregate_store.get_total('expenses')
+
         # Check if we have valid transaction data
-        if expense_data.empty or not self._has_valid_transaction_data(expense_data):
+        if totals['count'] == 0 or not self._expense_data_valid:
             # Set default values if no valid data
             for card in self.summary_cards.values():
                 card.update_values("0", "No data")
             return
 
         # Calculate summary metrics
-        metrics = ExpenseDataProcessor.calculate_summary_metrics(expense_data)
+        category_totals = self.aggregate_store.get_buckets('expenses', 'by_category')
+        top_category = max(category_totals, key=lambda category: category_totals[category]['total'],
+                           default='N/A')
 
         # Calculate spending trends
-        trends = ExpenseDataProcessor.get_spending_trends(expense_data)
+        trends = self._get_spending_trends()
 
         # Update cards with real data
         self.summary_cards['total_expenses'].update_values(
-            f"₹{metrics['total_amount']:.0f}",
+            f"₹{totals['total']:.0f}",
             "This Month"
         )
 
         # Average daily spending
-        if metrics['transaction_count'] > 0:
-            avg_daily = metrics['total_amount'] / 30  # Simplified for 30 days
-            self.summary_cards['avg_daily'].update_values(
-                f"₹{avg_daily:.0f}",
-                "Last 30 Days"
-            )
+        avg_daily = totals['total'] / 30  # Simplified for 30 days
+        self.summary_cards['avg_daily'].update_values(
+            f"₹{avg_daily:.0f}",
+            "Last 30 Days"
+        )
 
         # Top spending category
         self.summary_cards['top_category'].update_values(
-            f"{metrics['most_expensive_category']}",
+            f"{top_category}",
             "Highest Spending"
         )
 
         # Transaction count
         self.summary_cards['transaction_count'].update_values(
-            f"{metrics['transaction_count']}",
+            f"{totals['count']}",
             "This Month"
         )
 
@@ -1342,6 +1380,41 @@ class DashboardWidget(QWidget):
                 "Monthly Status"
             )
 
+    def _get_spending_trends(self, days: int = 30):
+        """Compare the last ``days`` of spending with the period before, from daily totals
+
+        Mirrors ExpenseDataProcessor.get_spending_trends without touching the records.
+        """
+        daily_totals = self.aggregate_store.get_buckets('expenses', 'by_day')
+        if not daily_totals:
+            return {'trend': 'neutral', 'change_percent': 0, 'current_period': 0, 'previous_period': 0}
+
+        end_date = pd.Timestamp(max(daily_totals)).date()
+        current_start = end_date - timedelta(days=days)
+        previous_start = current_start - timedelta(days=days)
+
+        current_total = self.aggregate_store.get_total_between('expenses', current_start, end_date)['total']
+        previous_total = self.aggregate_store.get_total_between(
+            'expenses', previous_start, current_start - timedelta(days=1))['total']
+
+        if previous_total > 0:
+            change_percent = ((current_total - previous_total) / previous_total) * 100
+        else:
+            change_percent = 0
+
+        if change_percent > 5:
+            trend = 'negative'  # Spending increased
+        elif change_percent < -5:
+            trend = 'positive'  # Spending decreased
+        else:
+            trend = 'neutral'
+
+        return {
+            'trend': trend,
+            'change_percent': change_percent,
+            'current_period': current_total,
+            'previous_period': previous_total
+        }
 
     def update_legacy_stat_cards(self):
         """Update legacy stat cards for backward compatibility"""
@@ -1349,34 +1422,21 @@ class DashboardWidget(QWidget):
             return
 
         try:
-            # Get expense summary
-            expense_summary = self.get_module_summary("expenses")
-
-            # Update stat cards with real data
-            if expense_summary:
-                self.stat_cards['expenses'].update_value(f"₹{expense_summary.get('total_amount', 0):.0f}")
-            else:
-                self.stat_cards['expenses'].update_value("₹0")
-
-            # Get income summary
-            income_summary = self.get_module_summary("income")
-
-            if income_summary:
-                self.stat_cards['income'].update_value(f"₹{income_summary.get('total_earned', 0):.0f}")
-                # Calculate savings (income - expenses)
-                total_income = income_summary.get('total_earned', 0)
-                total_expenses = expense_summary.get('total_amount', 0) if expense_summary else 0
-                savings = total_income - total_expenses
-                self.stat_cards['savings'].update_value(f"₹{savings:.0f}")
-            else:
-                self.stat_cards['income'].update_value("₹0")
-                self.stat_cards['savings'].update_value("₹0")
-
-            # Get habit summary
-            habit_summary = self.get_module_summary("habits")
-
-            if habit_summary:
-                self.stat_cards['habits'].update_value(f"{habit_summary.get('today_completion_rate', 0):.0f}%")
+            # Expense and income totals
+            total_expenses = self.aggregate_store.get_total('expenses')['total']
+            total_income = self.aggregate_store.get_total('income')['total']
+
+            self.stat_cards['expenses'].update_value(f"₹{total_expenses:.0f}")
+            self.stat_cards['income'].update_value(f"₹{total_income:.0f}")
+            # Calculate savings (income - expenses)
+            self.stat_cards['savings'].update_value(f"₹{total_income - total_expenses:.0f}")
+
+            # Habits completed today against today's records
+            today = pd.Timestamp.now().strftime('%Y-%m-%d')
+            habits_today = self.aggregate_store.get_buckets('habits', 'by_day').get(today)
+            if habits_today and habits_today['count']:
+                self.stat_cards['habits'].update_value(
+                    f"{habits_today['total'] / habits_today['count'] * 100:.0f}%")
             else:
                 self.stat_cards['habits'].update_value("0%")
 
@@ -1388,8 +1448,11 @@ class DashboardWidget(QWidget):
             else:
                 self.stat_cards['attendance'].update_value("0%")
 
-            # Placeholder data for other modules
-            self.stat_cards['tasks'].update_value("5")
+            # Tasks not yet completed
+            todo_statuses = self.aggregate_store.get_buckets('todos', 'by_category')
+            pending_tasks = sum(bucket['count'] for status, bucket in todo_statuses.items()
+                                if status != 'Completed')
+            self.stat_cards['tasks'].update_value(f"{pending_tasks}")
 
         except Exception as e:
             print(f"Error updating legacy stat cards: {e}")
@@ -1427,51 +1490,40 @@ class DashboardWidget(QWidget):
     def refresh_dashboard(self):
         """Refresh dashboard with latest data from all modules"""
         try:
+            # Redraw every widget, not just those whose aggregates moved
+            self.refresh_data(force=True)
+
             # Update financial overview with real data
             self.update_financial_overview()
 
             # Update recent activity
             self.update_recent_activity()
 
-            # Update module summaries
-            self.update_module_summaries()
-
         except Exception as e:
             print(f"Error refreshing dashboard: {e}")
 
     def update_financial_overview(self):
         """Update financial overview with real data"""
+        if not hasattr(self, 'stat_cards'):
+            return
+
         try:
-            total_income = 0.0
-            total_expenses = 0.0
             total_investments = 0.0
 
-            # Get expense data
-            try:
-                expense_df = self.data_manager.read_csv('expenses', 'expenses.csv',
-                                                      ['id', 'amount', 'category', 'description', 'date'])
-                if not expense_df.empty:
-                    total_expenses = expense_df['amount'].sum()
-            except:
-                pass
-
-            # Get income data
-            try:
-                income_df = self.data_manager.read_csv('income', 'income_records.csv',
-                                                     ['id', 'amount', 'source', 'description', 'date'])
-                if not income_df.empty:
-                    total_income = income_df['amount'].sum()
-            except:
-                pass
+            # Expense and income totals come from the aggregates
+            total_expenses = self.aggregate_store.get_total('expenses')['total']
+            total_income = self.aggregate_store.get_total('income')['total']
 
             # Get investment data
-            try:
-                investment_df = self.data_manager.read_csv('investments', 'investments.csv',
-                                                         ['id', 'current_value', 'total_investment'])
-                if not investment_df.empty:
-                    total_investments = investment_df['current_value'].sum()
-            except:
-                pass
+            if 'investments' in self.stat_cards:
+                try:
+                    investment_df = self.data_manager.read_csv('investments', 'investments.csv',
+                                                             ['id', 'current_value', 'total_investment'],
+                                                             columns=['current_value'])
+                    if not investment_df.empty:
+                        total_investments = investment_df['current_value'].sum()
+                except:
+                    pass
 
             # Calculate savings
             total_savings = total_income - total_expenses
@@ -1489,6 +1541,9 @@ class DashboardWidget(QWidget):
 
     def update_recent_activity(self):
         """Update recent activity section"""
+        if not hasattr(self, 'recent_activity_list'):
+            return
+
         try:
             recent_items = []
 
@@ -9,15 +9,21 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView, QLabel,
     QComboBox, QAbstractItemView, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal, QThread
+from PySide6.QtCore import Qt, Signal, QThread, QTimer
 from PySide6.QtGui import QFont, QIcon
 
-import pandas as pd
 from typing import Dict, List, Any, Optional
 
+from ..core.search_index import get_search_index
+
 
 class SearchWorker(QThread):
-    """Worker thread for performing search operations"""
+    """Worker thread for performing search operations
+
+    Queries the shared search index. The first search of a session may need
+    to (re)index modules whose files changed; later searches only touch the
+    in-memory postings.
+    """
     
     search_completed = Signal(list)  # Emits search results
     
@@ -26,121 +32,18 @@ class SearchWorker(QThread):
         self.data_manager = data_manager
         self.search_term = search_term.lower()
         self.search_modules = search_modules
+        self.search_index = get_search_index(data_manager)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
     def run(self):
         """Perform the search operation"""
         try:
-            results = []
-            
-            for module in self.search_modules:
-                module_results = self.search_in_module(module)
-                results.extend(module_results)
-            
+            results = self.search_index.search(self.search_term, self.search_modules)
             self.search_completed.emit(results)
             
         except Exception as e:
             self.logger.error(f"Error in search worker: {e}")
             self.search_completed.emit([])
-    
-    def search_in_module(self, module: str) -> List[Dict[str, Any]]:
-        """Search within a specific module"""
-        results = []
-        
-        try:
-            if module == "expenses":
-                df = self.data_manager.read_csv('expenses', 'expenses.csv', 
-                                              ['id', 'amount', 'category', 'description', 'date'])
-                for _, row in df.iterrows():
-                    if (self.search_term in str(row['description']).lower() or 
-                        self.search_term in str(row['category']).lower()):
-                        results.append({
-                            'module': 'Expenses',
-                            'type': 'Expense',
-                            'title': row['description'],
-                            'details': f"₹{row['amount']:.2f} - {row['category']}",
-                            'date': row['date'],
-                            'id': row['id']
-                        })
-            
-            elif module == "income":
-                df = self.data_manager.read_csv('income', 'income_records.csv',
-                                              ['id', 'amount', 'source', 'description', 'date'])
-                for _, row in df.iterrows():
-                    if (self.search_term in str(row['description']).lower() or 
-                        self.search_term in str(row['source']).lower()):
-                        results.append({
-                            'module': 'Income',
-                            'type': 'Income',
-                            'title': row['description'],
-                            'details': f"₹{row['amount']:.2f} - {row['source']}",
-                            'date': row['date'],
-                            'id': row['id']
-                        })
-            
-            elif module == "todos":
-                df = self.data_manager.read_csv('todos', 'todo_items.csv',
-                                              ['id', 'title', 'description', 'status', 'priority'])
-                for _, row in df.iterrows():
-                    if (self.search_term in str(row['title']).lower() or 
-                        self.search_term in str(row['description']).lower()):
-                        results.append({
-                            'module': 'To-Do',
-                            'type': 'Task',
-                            'title': row['title'],
-                            'details': f"{row['status']} - {row['priority']} Priority",
-                            'date': '',
-                            'id': row['id']
-                        })
-            
-            elif module == "investments":
-                df = self.data_manager.read_csv('investments', 'investments.csv',
-                                              ['id', 'symbol', 'name', 'current_value', 'profit_loss'])
-                for _, row in df.iterrows():
-                    if (self.search_term in str(row['symbol']).lower() or 
-                        self.search_term in str(row['name']).lower()):
-                        results.append({
-                            'module': 'Investments',
-                            'type': 'Investment',
-                            'title': f"{row['symbol']} - {row['name']}",
-                            'details': f"₹{row['current_value']:.2f} (P&L: ₹{row['profit_loss']:.2f})",
-                            'date': '',
-                            'id': row['id']
-                        })
-            
-            elif module == "habits":
-                df = self.data_manager.read_csv('habits', 'habit_records.csv',
-                                              ['id', 'habit_name', 'is_completed', 'date'])
-                for _, row in df.iterrows():
-                    if self.search_term in str(row['habit_name']).lower():
-                        status = "✅ Completed" if row['is_completed'] else "⏳ Pending"
-                        results.append({
-                            'module': 'Habits',
-                            'type': 'Habit',
-                            'title': row['habit_name'],
-                            'details': status,
-                            'date': row['date'],
-                            'id': row['id']
-                        })
-            
-            elif module == "budget":
-                df = self.data_manager.read_csv('budget', 'budget_plans.csv',
-                                              ['id', 'name', 'budget_type', 'budget_health_score'])
-                for _, row in df.iterrows():
-                    if self.search_term in str(row['name']).lower():
-                        results.append({
-                            'module': 'Budget',
-                            'type': 'Budget Plan',
-                            'title': row['name'],
-                            'details': f"{row['budget_type']} - Health: {row['budget_health_score']:.1f}%",
-                            'date': '',
-                            'id': row['id']
-                        })
-            
-        except Exception as e:
-            self.logger.error(f"Error searching in module {module}: {e}")
-        
-        return results
 
 
 class GlobalSearchDialog(QDialog):
@@ -151,6 +54,13 @@ class GlobalSearchDialog(QDialog):
         self.data_manager = data_manager
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.search_worker = None
+        self.pending_search = None  # (term, modules) queued while a search runs
+
+        # Search-as-you-type waits for a short pause in typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.search_as_you_type)
         
         self.setup_ui()
         self.setup_connections()
@@ -232,6 +142,8 @@ class GlobalSearchDialog(QDialog):
     def setup_connections(self):
         """Setup signal connections"""
         self.search_input.returnPressed.connect(self.perform_search)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+        self.module_filter.currentIndexChanged.connect(lambda _: self.search_timer.start())
         self.results_table.itemSelectionChanged.connect(self.on_selection_changed)
     
     def perform_search(self):
@@ -246,21 +158,37 @@ class GlobalSearchDialog(QDialog):
             QMessageBox.warning(self, "Search", "Search term must be at least 2 characters")
             return
         
-        # Determine which modules to search
+        self.start_search(search_term, self.get_search_modules())
+
+    def search_as_you_type(self):
+        """Search the current input without prompting about short terms"""
+        search_term = self.search_input.text().strip()
+        if len(search_term) < 2:
+            return
+        self.start_search(search_term, self.get_search_modules())
+
+    def get_search_modules(self) -> List[str]:
+        """Get the modules selected in the module filter"""
         module_filter = self.module_filter.currentText()
         if module_filter == "All Modules":
-            search_modules = ["expenses", "income", "todos", "investments", "habits", "budget"]
-        else:
-            module_map = {
-                "Expenses": "expenses",
-                "Income": "income", 
-                "To-Do": "todos",
-                "Investments": "investments",
-                "Habits": "habits",
-                "Budget": "budget"
-            }
-            search_modules = [module_map[module_filter]]
-        
+            return ["expenses", "income", "todos", "investments", "habits", "budget"]
+
+        module_map = {
+            "Expenses": "expenses",
+            "Income": "income", 
+            "To-Do": "todos",
+            "Investments": "investments",
+            "Habits": "habits",
+            "Budget": "budget"
+        }
+        return [module_map[module_filter]]
+
+    def start_search(self, search_term: str, search_modules: List[str]):
+        """Run a search, queueing it if one is already running"""
+        if self.search_worker is not None and self.search_worker.isRunning():
+            self.pending_search = (search_term, search_modules)
+            return
+
         # Update UI
         self.search_button.setEnabled(False)
         self.search_button.setText("🔍 Searching...")
@@ -273,6 +201,15 @@ class GlobalSearchDialog(QDialog):
     
     def on_search_completed(self, results: List[Dict[str, Any]]):
         """Handle search completion"""
+        # Only the newest query's results are worth showing
+        if self.pending_search is not None:
+            search_term, search_modules = self.pending_search
+            self.pending_search = None
+            if self.search_worker is not None:
+                self.search_worker.wait()
+            self.start_search(search_term, search_modules)
+            return
+
         # Update UI
         self.search_button.setEnabled(True)
         self.search_button.setText("🔍 Search")
@@ -288,6 +225,10 @@ class GlobalSearchDialog(QDialog):
     
     def update_results_table(self, results: List[Dict[str, Any]]):
         """Update the results table"""
+        # Sorting while rows are filled would move items between rows, and
+        # re-enabling it must not reorder the ranked results
+        self.results_table.setSortingEnabled(False)
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.results_table.setRowCount(len(results))
         
         for row_idx, result in enumerate(results):
@@ -308,6 +249,8 @@ class GlobalSearchDialog(QDialog):
             
             # Store full result data
             self.results_table.item(row_idx, 0).setData(Qt.UserRole, result)
+
+        self.results_table.setSortingEnabled(True)
     
     def on_selection_changed(self):
         """Handle selection change"""
@@ -4,6 +4,8 @@ The primary application window with collapsible sidebar navigation
 """
 
 import logging
+import json
+import importlib
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QStackedWidget,
     QSplitter, QFrame, QLabel, QPushButton, QToolButton, QStatusBar,
@@ -23,14 +25,21 @@ from .simple_optimized_styles import OptimizedStyleManager
 from .simple_theme_overlay import SimpleThemeSwitchManager
 from .plotly_theme import configure_plotly_theme
 from .update_dialog import UpdateNotificationDialog, UpdateProgressDialog, UpdateSettingsDialog, UpdateHistoryDialog
-from ..modules.expenses.widgets import ExpenseTrackerWidget
-from ..modules.income.widgets import IncomeTrackerWidget
-from ..modules.habits.widgets import HabitTrackerWidget
-from ..modules.attendance.widgets import AttendanceTrackerWidget
-from ..modules.todos.widgets import TodoTrackerWidget
-from ..modules.investments.widgets import InvestmentTrackerWidget
-from ..modules.budget.widgets import BudgetPlannerWidget
-from ..modules.trading.widgets import TradingWidget
+
+
+# Module pages besides the dashboard, in sidebar order.
+# module name -> (MainWindow attribute, widget module, widget class)
+# The widget modules are imported when the page is first built.
+MODULE_PAGES = {
+    'expenses': ('expense_tracker', '..modules.expenses.widgets', 'ExpenseTrackerWidget'),
+    'income': ('income_tracker', '..modules.income.widgets', 'IncomeTrackerWidget'),
+    'habits': ('habit_tracker', '..modules.habits.widgets', 'HabitTrackerWidget'),
+    'attendance': ('attendance_tracker', '..modules.attendance.simple_widgets', 'SimpleAttendanceTrackerWidget'),
+    'todos': ('todo_tracker', '..modules.todos.widgets', 'TodoTrackerWidget'),
+    'investments': ('investment_tracker', '..modules.investments.widgets', 'InvestmentTrackerWidget'),
+    'budget': ('budget_planner', '..modules.budget.widgets', 'BudgetPlannerWidget'),
+    'trading': ('trading_widget', '..modules.trading.widgets', 'TradingWidget'),
+}
 
 
 class MainWindow(QMainWindow):
@@ -130,10 +139,15 @@ class MainWindow(QMainWindow):
 
     def trigger_post_loading_dialogs(self):
         """Trigger any dialogs that should appear after loading screen completes"""
+        self._post_loading_done = True
+
         # Trigger trading startup dialog if it's pending
         if hasattr(self, 'trading_widget') and self.trading_widget:
             if hasattr(self.trading_widget, 'trigger_startup_dialog_if_pending'):
                 self.trading_widget.trigger_startup_dialog_if_pending()
+
+        # The window is on screen now - build the most-used pages in idle time
+        QTimer.singleShot(500, self.prefetch_module_pages)
     
     def setup_ui(self):
         """Setup the main UI layout"""
@@ -174,7 +188,12 @@ class MainWindow(QMainWindow):
         self.setup_content_pages()
     
     def setup_content_pages(self):
-        """Setup all content pages"""
+        """Setup the dashboard and register the other module pages
+
+        With lazy_module_pages enabled each module starts as a lightweight
+        placeholder and its widget is imported and built the first time
+        switch_module selects it (or when it is prefetched after startup).
+        """
         self.logger.info("Setting up content pages...")
 
         # Helper function to update progress during module creation
@@ -193,126 +212,144 @@ class MainWindow(QMainWindow):
             self.logger.debug("Dashboard widget created successfully")
             QApplication.processEvents()  # Allow UI updates after heavy widget creation
 
-            # Expense Tracker
-            self.logger.debug("Creating Expense Tracker widget...")
-            update_module_progress(60, "Creating expense tracker", "Setting up expense management and tracking")
-            QApplication.processEvents()  # Allow UI updates
-            self.expense_tracker = ExpenseTrackerWidget(self.data_manager, self.config)
-            self.content_widget.addWidget(self.expense_tracker)
-            self.logger.debug("Expense Tracker widget created successfully")
-            QApplication.processEvents()  # Allow UI updates after heavy widget creation
-
-            # Income Tracker
-            self.logger.debug("Creating Income Tracker widget...")
-            update_module_progress(63, "Creating income tracker", "Setting up income management and tracking")
-            self.income_tracker = IncomeTrackerWidget(self.data_manager, self.config)
-            self.content_widget.addWidget(self.income_tracker)
-            self.logger.debug("Income Tracker widget created successfully")
-
-            # Habit Tracker
-            self.logger.debug("Creating Habit Tracker widget...")
-            update_module_progress(66, "Creating habit tracker", "Setting up habit tracking and management")
-            self.habit_tracker = HabitTrackerWidget(self.data_manager, self.config)
-            self.content_widget.addWidget(self.habit_tracker)
-            self.logger.debug("Habit Tracker widget created successfully")
-
-            # Attendance Tracker - RE-ENABLED WITH SIMPLIFIED IMPLEMENTATION
-            self.logger.debug("Creating Simplified Attendance Tracker widget...")
-            update_module_progress(68, "Creating attendance tracker", "Setting up attendance tracking and management")
-            try:
-                from ..modules.attendance.simple_widgets import SimpleAttendanceTrackerWidget
-                self.attendance_tracker = SimpleAttendanceTrackerWidget(self.data_manager, self.config)
-                self.content_widget.addWidget(self.attendance_tracker)
-                self.logger.debug("Simplified Attendance Tracker widget created successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to create Simplified Attendance Tracker: {e}")
-                self.attendance_tracker = None
-
-            # To-Do List Module
-            self.logger.debug("Creating To-Do List widget...")
-            update_module_progress(70, "Creating todo tracker", "Setting up task management and organization")
-            try:
-                from ..modules.todos.widgets import TodoTrackerWidget
-                self.todo_tracker = TodoTrackerWidget(self.data_manager, self.config)
-                self.content_widget.addWidget(self.todo_tracker)
-                self.logger.debug("To-Do List widget created successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to create To-Do List widget: {e}")
-                self.todo_tracker = None
-
-            # Investment Tracker Module
-            self.logger.debug("Creating Investment Tracker widget...")
-            update_module_progress(72, "Creating investment tracker", "Setting up investment portfolio management")
-            try:
-                self.investment_tracker = InvestmentTrackerWidget(self.data_manager, self.config)
-                self.content_widget.addWidget(self.investment_tracker)
-                self.logger.debug("Investment Tracker widget created successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to create Investment Tracker widget: {e}")
-                import traceback
-                self.logger.error(f"Investment Tracker error traceback: {traceback.format_exc()}")
-                self.investment_tracker = None
-
-            # Budget Planner Module
-            self.logger.debug("Creating Budget Planner widget...")
-            update_module_progress(74, "Creating budget planner", "Setting up budget planning and analysis")
-            try:
-                self.budget_planner = BudgetPlannerWidget(self.data_manager, self.config)
-                self.content_widget.addWidget(self.budget_planner)
-                self.logger.debug("Budget Planner widget created successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to create Budget Planner widget: {e}")
-                self.budget_planner = None
-
-            # Trading Module
-            self.logger.debug("Creating Trading widget...")
-            update_module_progress(76, "Creating trading module", "Setting up trading interface and tools")
-            try:
-                self.trading_widget = TradingWidget(self.data_manager, self.config)
-                self.content_widget.addWidget(self.trading_widget)
-                self.logger.debug("Trading widget created successfully")
-
-                # Note: Trading widget will handle its own authentication flow
-                # including optional authentication and user education
-
-            except Exception as e:
-                self.logger.error(f"Failed to create Trading widget: {e}")
-                self.trading_widget = None
+            # Module widgets mapping - placeholders until a page is built
+            self.module_widgets = {'dashboard': self.dashboard}
+            self.module_placeholders = {}
+            self.module_usage_counts = self._load_module_usage_counts()
+            self._content_pages_ready = False
+            self._post_loading_done = False
+
+            for index, module_name in enumerate(MODULE_PAGES):
+                attribute = MODULE_PAGES[module_name][0]
+                setattr(self, attribute, None)
+
+                if self.config.lazy_module_pages:
+                    placeholder = self._create_module_placeholder(module_name)
+                    self.content_widget.addWidget(placeholder)
+                    self.module_placeholders[module_name] = placeholder
+                    self.module_widgets[module_name] = placeholder
+                else:
+                    progress = 60 + index * 2
+                    update_module_progress(progress, f"Creating {module_name} module",
+                                           f"Setting up the {module_name} page")
+                    self.load_module_page(module_name)
+                    QApplication.processEvents()  # Allow UI updates after heavy widget creation
 
-            # All modules created
-            update_module_progress(78, "Modules created", "All application modules and widgets loaded successfully")
+            # All modules registered
+            update_module_progress(78, "Modules registered", "Application modules ready to open")
 
         except Exception as e:
             self.logger.error(f"Critical error in setup_content_pages: {e}")
             raise
 
-        # Module widgets mapping
-        self.module_widgets = {
-            'dashboard': self.dashboard,
-            'expenses': self.expense_tracker,
-            'income': self.income_tracker,
-            'habits': self.habit_tracker,
-            'attendance': self.attendance_tracker,  # Will be None if failed to load
-            'todos': self.todo_tracker,  # Will be None if failed to load
-            'investments': self.investment_tracker,  # Will be None if failed to load
-            'budget': self.budget_planner,  # Will be None if failed to load
-            'trading': self.trading_widget  # Will be None if failed to load
-        }
-
         # Log module status
         for module_name, widget in self.module_widgets.items():
-            status = "✅ LOADED" if widget is not None else "❌ NOT LOADED"
+            if module_name in self.module_placeholders:
+                status = "⏳ DEFERRED"
+            else:
+                status = "✅ LOADED" if widget is not None else "❌ NOT LOADED"
             self.logger.info(f"Module '{module_name}': {status}")
 
         # Set dashboard as default
-        print(f"DEBUG: Setting dashboard as current widget. Dashboard widget: {self.dashboard}")
-        print(f"DEBUG: Content widget has {self.content_widget.count()} widgets")
-        print(f"DEBUG: Dashboard widget size: {self.dashboard.size()}")
         self.content_widget.setCurrentWidget(self.dashboard)
-        print(f"DEBUG: Current widget after setting: {self.content_widget.currentWidget()}")
-        print(f"DEBUG: Current widget index: {self.content_widget.currentIndex()}")
+        self._content_pages_ready = True
         self.logger.info("Content pages setup complete")
 
+    def _create_module_placeholder(self, module_name: str) -> QWidget:
+        """Create the stand-in page shown until a module is built"""
+        placeholder = QWidget()
+        placeholder.setObjectName(f"{module_name}Placeholder")
+        layout = QVBoxLayout(placeholder)
+        label = QLabel(f"Loading {module_name.title()}...")
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+        return placeholder
+
+    def load_module_page(self, module_name: str):
+        """Import and build a module page, replacing its placeholder
+
+        Returns the widget, or None if the module failed to load.
+        """
+        if module_name not in self.module_placeholders and module_name in self.module_widgets:
+            return self.module_widgets[module_name]
+
+        attribute, module_path, class_name = MODULE_PAGES[module_name]
+        self.logger.debug(f"Creating {class_name} for module '{module_name}'...")
+
+        try:
+            widget_module = importlib.import_module(module_path, __package__)
+            widget = getattr(widget_module, class_name)(self.data_manager, self.config)
+            self.logger.debug(f"{class_name} created successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to create {class_name}: {e}")
+            import traceback
+            self.logger.error(f"{class_name} error traceback: {traceback.format_exc()}")
+            widget = None
+
+        placeholder = self.module_placeholders.pop(module_name, None)
+        index = self.content_widget.indexOf(placeholder) if placeholder is not None else -1
+        if widget is not None:
+            if index >= 0:
+                self.content_widget.insertWidget(index, widget)
+            else:
+                self.content_widget.addWidget(widget)
+        if placeholder is not None:
+            self.content_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+
+        setattr(self, attribute, widget)
+        self.module_widgets[module_name] = widget
+
+        if widget is not None:
+            # Pages built after startup missed the initial theme propagation
+            if self._content_pages_ready and hasattr(widget, 'update_theme'):
+                try:
+                    widget.update_theme(self.config.theme)
+                except Exception as e:
+                    self.logger.warning(f"Failed to apply theme to {module_name} module: {e}")
+
+            # Trading widget connections
+            if module_name == 'trading' and hasattr(widget, 'token_manager'):
+                QTimer.singleShot(2000, self.setup_trading_connections)  # Delay to ensure token manager is initialized
+
+        return widget
+
+    def prefetch_module_pages(self):
+        """Build the most-used module pages one at a time while the UI is idle"""
+        count = self.config.prefetch_module_count
+        if count <= 0 or not self.module_placeholders:
+            return
+
+        order = list(MODULE_PAGES)
+        ranked = sorted(order, key=lambda name: (-self.module_usage_counts.get(name, 0), order.index(name)))
+        self._prefetch_queue = [name for name in ranked[:count] if name in self.module_placeholders]
+        self._prefetch_next_module()
+
+    def _prefetch_next_module(self):
+        """Build the next queued page and schedule the one after it"""
+        while self._prefetch_queue:
+            module_name = self._prefetch_queue.pop(0)
+            if module_name in self.module_placeholders:
+                self.logger.debug(f"Prefetching module '{module_name}'")
+                self.load_module_page(module_name)
+                break
+
+        if self._prefetch_queue:
+            QTimer.singleShot(0, self._prefetch_next_module)
+
+    def _load_module_usage_counts(self) -> dict:
+        """Load how often each module has been opened"""
+        try:
+            counts = json.loads(self.settings_manager.load_setting("modules/usage_counts", "{}") or "{}")
+            return {name: int(value) for name, value in counts.items()}
+        except (ValueError, TypeError, AttributeError):
+            return {}
+
+    def _record_module_usage(self, module_name: str):
+        """Count a module visit for prefetch ordering"""
+        self.module_usage_counts[module_name] = self.module_usage_counts.get(module_name, 0) + 1
+        self.settings_manager.save_setting("modules/usage_counts", json.dumps(self.module_usage_counts))
+
     def initialize_firebase_sync(self):
         """Initialize Firebase sync engine using secure backend system"""
         try:
@@ -476,11 +513,6 @@ class MainWindow(QMainWindow):
                 self.data_manager.data_changed.connect(self.on_data_changed)
                 self.logger.debug("Data manager data_changed signal connected")
 
-            # Trading widget connections
-            if self.trading_widget and hasattr(self.trading_widget, 'token_manager'):
-                # Connect to token manager signals if available
-                QTimer.singleShot(2000, self.setup_trading_connections)  # Delay to ensure token manager is initialized
-
             if hasattr(self.data_manager, 'error_occurred'):
                 self.data_manager.error_occurred.connect(self.show_error)
                 self.logger.debug("Data manager error_occurred signal connected")
@@ -572,11 +604,26 @@ class MainWindow(QMainWindow):
         #     return
 
         if module_name in self.module_widgets:
+            if module_name in self.module_placeholders:
+                # Show the loading page while the module is built
+                previous_widget = self.content_widget.currentWidget()
+                self.content_widget.setCurrentWidget(self.module_placeholders[module_name])
+                self.status_label.setText(f"Loading {module_name.title()}...")
+                QApplication.processEvents()
+                if self.load_module_page(module_name) is None:
+                    self.content_widget.setCurrentWidget(previous_widget)
+
+                # The trading login prompt waits until the page is first opened
+                if module_name == 'trading' and self.trading_widget and self._post_loading_done:
+                    if hasattr(self.trading_widget, 'trigger_startup_dialog_if_pending'):
+                        self.trading_widget.trigger_startup_dialog_if_pending()
+
             widget = self.module_widgets[module_name]
             self.logger.debug(f"Widget for {module_name}: {widget}")
 
             if widget is not None:
                 self.content_widget.setCurrentWidget(widget)
+                self._record_module_usage(module_name)
                 self.module_changed.emit(module_name)
                 self.status_label.setText(f"Switched to {module_name.title()}")
                 self.logger.debug(f"Successfully switched to {module_name}")
@@ -1019,6 +1066,9 @@ class MainWindow(QMainWindow):
         # Save configuration
         self.config.save_to_file()
 
+        # Fold journaled edits into the CSV files
+        self.data_manager.compact_storage()
+
         # Cleanup theme resources
         if hasattr(self, 'style_manager'):
             self.style_manager.cleanup()
@@ -0,0 +1,305 @@
+"""
+Plotly Host Module
+Long-lived, offline web views that render Plotly figures pushed over a QWebChannel
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal, Slot
+
+try:
+    import plotly
+    from plotly.utils import PlotlyJSONEncoder
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+try:
+    from PySide6.QtWebEngineWidgets import QWebEngineView
+    from PySide6.QtWebChannel import QWebChannel
+    WEBENGINE_AVAILABLE = True
+except ImportError:
+    WEBENGINE_AVAILABLE = False
+    QWebEngineView = QObject
+
+try:
+    import shiboken6
+    SHIBOKEN_AVAILABLE = True
+except ImportError:
+    SHIBOKEN_AVAILABLE = False
+
+PLOTLY_HOST_AVAILABLE = PLOTLY_AVAILABLE and WEBENGINE_AVAILABLE
+
+
+# Host page loaded once per view. plotly.js comes from the local plotly
+# package (the page's base URL) and qwebchannel.js from Qt's resources, so
+# rendering needs no network. Figures arrive as JSON through the bridge and
+# are drawn with Plotly.react, which diffs against what is already on screen.
+HOST_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+    html, body { margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden; background: #ffffff; }
+    #chart { width: 100%; height: 100%; }
+    #message { position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: 0; display: none; }
+</style>
+<script src="plotly.min.js"></script>
+<script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+</head>
+<body>
+<div id="chart"></div>
+<iframe id="message"></iframe>
+<script>
+    var chart = document.getElementById('chart');
+    var message = document.getElementById('message');
+    var layoutJson = '{}';
+    var config = { responsive: true, displaylogo: false };
+    var clicksBound = false;
+
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        var bridge = channel.objects.bridge;
+
+        bridge.figure_pushed.connect(function (dataJson, newLayoutJson, background) {
+            if (newLayoutJson) {
+                layoutJson = newLayoutJson;
+            }
+            document.body.style.background = background;
+            message.style.display = 'none';
+            message.srcdoc = '';
+            chart.style.display = 'block';
+            Plotly.react(chart, JSON.parse(dataJson), JSON.parse(layoutJson), config);
+            if (!clicksBound) {
+                clicksBound = true;
+                chart.on('plotly_click', function (event) {
+                    var point = event.points[0];
+                    bridge.point_clicked(JSON.stringify({
+                        curve: point.curveNumber, index: point.pointNumber,
+                        x: point.x, y: point.y, label: point.label, value: point.value
+                    }));
+                });
+            }
+        });
+
+        bridge.message_pushed.connect(function (html, background) {
+            document.body.style.background = background;
+            chart.style.display = 'none';
+            message.srcdoc = html;
+            message.style.display = 'block';
+        });
+
+        bridge.cleared.connect(function () {
+            Plotly.purge(chart);
+            clicksBound = false;
+            layoutJson = '{}';
+            message.style.display = 'none';
+            message.srcdoc = '';
+        });
+
+        bridge.page_ready();
+    });
+</script>
+</body>
+</html>
+"""
+
+
+def plotly_js_directory() -> Optional[Path]:
+    """Get the directory holding the bundled plotly.min.js, or None"""
+    if not PLOTLY_AVAILABLE:
+        return None
+    directory = Path(plotly.__file__).parent / "package_data"
+    if (directory / "plotly.min.js").exists():
+        return directory
+    return None
+
+
+class ChartBridge(QObject):
+    """QWebChannel object connecting a PlotlyChartView to its host page"""
+
+    figure_pushed = Signal(str, str, str)    # data JSON, layout JSON ('' = unchanged), background
+    message_pushed = Signal(str, str)        # HTML document, background
+    cleared = Signal()
+    ready = Signal()
+    clicked = Signal(dict)
+
+    @Slot()
+    def page_ready(self):
+        """Called by the host page once plotly.js and the channel are loaded"""
+        self.ready.emit()
+
+    @Slot(str)
+    def point_clicked(self, point_json: str):
+        """Called by the host page when a data point is clicked"""
+        try:
+            self.clicked.emit(json.loads(point_json))
+        except (TypeError, ValueError):
+            pass
+
+
+class PlotlyChartView(QWebEngineView):
+    """Web view that loads the host page once and then only receives figure data
+
+    show_figure() serializes the figure's traces and layout separately and
+    sends the layout only when it changed, so a refresh with new data is a
+    single Plotly.react call instead of a page reload. Anything sent before
+    the page finished loading is queued, keeping only the latest update.
+    """
+
+    point_clicked = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self.bridge = ChartBridge(self)
+        self.bridge.ready.connect(self._on_page_ready)
+        self.bridge.clicked.connect(self.point_clicked)
+        self.channel = QWebChannel(self.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.page().setWebChannel(self.channel)
+
+        self.is_ready = False
+        self._pending: Optional[tuple] = None
+        self._layout_json: Optional[str] = None
+
+        directory = plotly_js_directory()
+        if directory is None:
+            self.logger.warning("Bundled plotly.min.js not found; charts cannot be rendered")
+        base_url = QUrl.fromLocalFile(str(directory) + "/") if directory else QUrl()
+        self.setHtml(HOST_PAGE, base_url)
+
+    def show_figure(self, fig, background: str = "#ffffff"):
+        """Render a Plotly figure, sending the layout only if it changed"""
+        figure = fig.to_plotly_json()
+        data_json = json.dumps(figure.get("data", []), cls=PlotlyJSONEncoder)
+        layout_json = json.dumps(figure.get("layout", {}), cls=PlotlyJSONEncoder)
+
+        if not self.is_ready:
+            self._pending = ("figure", data_json, layout_json, background)
+            return
+
+        changed_layout = layout_json if layout_json != self._layout_json else ""
+        self._layout_json = layout_json
+        self.bridge.figure_pushed.emit(data_json, changed_layout, background)
+
+    def show_message(self, html: str, background: str = "#ffffff"):
+        """Show an HTML document (e.g. a no-data or error notice) over the chart"""
+        if not self.is_ready:
+            self._pending = ("message", html, background)
+            return
+        self.bridge.message_pushed.emit(html, background)
+
+    def clear(self):
+        """Remove the current chart, keeping the loaded page"""
+        self._pending = None
+        self._layout_json = None
+        if self.is_ready:
+            self.bridge.cleared.emit()
+
+    def _on_page_ready(self):
+        """Flush the update queued while the page was loading"""
+        self.is_ready = True
+        self._layout_json = None
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        if pending[0] == "figure":
+            _, data_json, layout_json, background = pending
+            self._layout_json = layout_json
+            self.bridge.figure_pushed.emit(data_json, layout_json, background)
+        else:
+            self.bridge.message_pushed.emit(pending[1], pending[2])
+
+
+class ChartViewPool:
+    """Shared pool of warm PlotlyChartViews
+
+    acquire() hands out a view whose host page (and plotly.js) is already
+    loaded when one is available, and tops the spares back up in the
+    background. When the widget that acquired a view is destroyed, the view
+    is detached before Qt deletes it and returned to the pool, so charts on
+    rebuilt tabs reuse pages instead of starting new ones.
+    """
+
+    def __init__(self, spare_count: int = 1, max_spares: int = 4):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.spare_count = spare_count
+        self.max_spares = max_spares
+        self.spares: List[PlotlyChartView] = []
+        self.owners: Dict[int, PlotlyChartView] = {}   # id(owner) -> view in use
+        self._top_up_scheduled = False
+
+    def acquire(self, owner) -> PlotlyChartView:
+        """Get a view for a chart widget; it returns to the pool when the owner is destroyed"""
+        view = None
+        while self.spares and view is None:
+            candidate = self.spares.pop()
+            if self._is_valid(candidate):
+                view = candidate
+        if view is None:
+            view = PlotlyChartView()
+
+        view.setParent(owner)
+        self.owners[id(owner)] = view
+        owner.destroyed.connect(lambda *args, key=id(owner): self._reclaim(key))
+        self._schedule_top_up()
+        return view
+
+    def release(self, view: PlotlyChartView):
+        """Return a view to the pool"""
+        if not self._is_valid(view):
+            return
+        view.clear()
+        view.setParent(None)
+        if len(self.spares) < self.max_spares:
+            self.spares.append(view)
+        else:
+            view.deleteLater()
+
+    def _reclaim(self, owner_key: int):
+        """Take a view back from an owner that is being destroyed"""
+        view = self.owners.pop(owner_key, None)
+        if view is not None:
+            self.release(view)
+
+    def _schedule_top_up(self):
+        """Create spare views after the current event, so their pages load off the critical path"""
+        if self._top_up_scheduled:
+            return
+        self._top_up_scheduled = True
+        QTimer.singleShot(0, self._top_up)
+
+    def _top_up(self):
+        """Keep spare_count warm views ready"""
+        self._top_up_scheduled = False
+        self.spares = [view for view in self.spares if self._is_valid(view)]
+        try:
+            while len(self.spares) < self.spare_count:
+                self.spares.append(PlotlyChartView())
+        except Exception as e:
+            self.logger.error(f"Error preparing chart views: {e}")
+
+    @staticmethod
+    def _is_valid(view: Any) -> bool:
+        """Check that Qt has not already deleted the view"""
+        return not SHIBOKEN_AVAILABLE or shiboken6.isValid(view)
+
+
+_chart_view_pool: Optional[ChartViewPool] = None
+
+
+def get_chart_view_pool() -> ChartViewPool:
+    """Get the application-wide chart view pool"""
+    global _chart_view_pool
+    if _chart_view_pool is None:
+        _chart_view_pool = ChartViewPool()
+    return _chart_view_pool
+
+
+def acquire_chart_view(owner) -> PlotlyChartView:
+    """Get a pooled PlotlyChartView for a chart widget"""
+    return get_chart_view_pool().acquire(owner)
@@ -0,0 +1,293 @@
+"""
+Table Models Module
+Virtualized Qt table models over pandas DataFrames for large record tables
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+
+def format_text(value: Any) -> str:
+    """Format a cell as plain text, showing missing values as empty"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and np.isnan(value):
+        return ""
+    if value is pd.NaT:
+        return ""
+    return str(value)
+
+
+def format_amount(value: Any) -> str:
+    """Format a cell as a rupee amount"""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return "₹0.00"
+    if np.isnan(amount):
+        return "₹0.00"
+    return f"₹{amount:.2f}"
+
+
+def format_date(value: Any, fmt: str = '%d/%m/%Y', invalid: str = 'Invalid Date') -> str:
+    """Format a date cell, accepting Timestamps, dates and parseable strings"""
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return invalid
+    if not hasattr(value, 'strftime'):
+        try:
+            value = pd.to_datetime(str(value))
+        except (TypeError, ValueError):
+            return invalid
+        if value is pd.NaT:
+            return invalid
+    try:
+        return value.strftime(fmt)
+    except (TypeError, ValueError):
+        return invalid
+
+
+def truncate(length: int) -> Callable[[Any], str]:
+    """Build a formatter that shortens long text with an ellipsis"""
+    def formatter(value: Any) -> str:
+        text = format_text(value)
+        return text if len(text) <= length else text[:length - 3] + "..."
+    return formatter
+
+
+@dataclass
+class TableColumn:
+    """Column of a DataFrameTableModel
+
+    ``key`` names the DataFrame column. ``formatter`` turns one raw value
+    into display text and is only called for cells that are shown.
+    ``sort_as`` picks the vectorized sort key: 'text' (case-insensitive),
+    'number', 'date', or None to sort the raw values. ``background`` and
+    ``foreground`` may map a raw value to a cell colour name.
+    """
+    key: str
+    header: str
+    formatter: Callable[[Any], str] = format_text
+    alignment: Optional[Qt.AlignmentFlag] = None
+    sort_as: Optional[str] = 'text'
+    tooltip: bool = False
+    background: Optional[Callable[[Any], Optional[str]]] = None
+    foreground: Optional[Callable[[Any], Optional[str]]] = None
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Read-only table model over a DataFrame's columns
+
+    Rows are kept as one NumPy array per column and shown through an array
+    of source row positions, so sorting and filtering are vectorized index
+    operations and a refresh is a single model reset. Display text is built
+    lazily in data() and cached per cell, so only rows the view actually
+    paints are formatted.
+    """
+
+    def __init__(self, columns: List[TableColumn], parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.columns = list(columns)
+
+        self._values: Dict[str, np.ndarray] = {}        # column key -> raw values by source row
+        self._display: List[Dict[int, str]] = [{} for _ in self.columns]  # column -> source row -> text
+        self._sort_keys: Dict[int, pd.Series] = {}       # column -> vectorized sort key
+        self._source_rows = 0
+        self._filter_mask: Optional[np.ndarray] = None
+        self._rows = np.arange(0)                        # view row -> source row
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    # Data loading
+
+    def set_dataframe(self, df: Optional[pd.DataFrame]):
+        """Replace the model data, keeping the current sort and dropping any filter"""
+        self.beginResetModel()
+        try:
+            self._load(df)
+            self._filter_mask = None
+            self._rows = self._ordered_rows(np.arange(self._source_rows))
+        finally:
+            self.endResetModel()
+
+    def clear(self):
+        """Remove all rows"""
+        self.set_dataframe(None)
+
+    def _load(self, df: Optional[pd.DataFrame]):
+        """Copy the model's columns out of the frame"""
+        self._values = {}
+        self._display = [{} for _ in self.columns]
+        self._sort_keys = {}
+        self._source_rows = 0 if df is None else len(df)
+
+        for column in self.columns:
+            if df is not None and column.key in df.columns:
+                self._values[column.key] = df[column.key].to_numpy(dtype=object)
+            else:
+                self._values[column.key] = np.full(self._source_rows, None, dtype=object)
+
+        # Extra frame columns stay reachable through row_value()
+        if df is not None:
+            for key in df.columns:
+                if key not in self._values:
+                    self._values[key] = df[key].to_numpy(dtype=object)
+
+    # Sorting and filtering
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        """Sort the visible rows by a column"""
+        self._sort_column = column
+        self._sort_order = order
+        if not (0 <= column < len(self.columns)):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self._rows
+        self._rows = self._ordered_rows(old_rows)
+        self._remap_persistent_indexes(old_rows)
+        self.layoutChanged.emit()
+
+    def set_filter_mask(self, mask: Optional[np.ndarray]):
+        """Show only source rows where ``mask`` is true; None shows every row"""
+        self.beginResetModel()
+        try:
+            if mask is not None:
+                mask = np.asarray(mask, dtype=bool)
+                if len(mask) != self._source_rows:
+                    raise ValueError(f"Filter mask has {len(mask)} rows, model has {self._source_rows}")
+            self._filter_mask = mask
+            rows = np.arange(self._source_rows) if mask is None else np.flatnonzero(mask)
+            self._rows = self._ordered_rows(rows)
+        finally:
+            self.endResetModel()
+
+    def set_text_filter(self, text: str, keys: Optional[List[str]] = None):
+        """Show rows where any of the given columns contains ``text`` (case-insensitive)"""
+        text = (text or "").strip()
+        if not text:
+            self.set_filter_mask(None)
+            return
+
+        mask = np.zeros(self._source_rows, dtype=bool)
+        for key in keys or [column.key for column in self.columns]:
+            values = pd.Series(self._values.get(key, []), dtype=object)
+            if len(values):
+                text_values = values.where(values.notna(), '').astype(str)
+                mask |= text_values.str.contains(text, case=False, regex=False).to_numpy()
+        self.set_filter_mask(mask)
+
+    def _ordered_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Order source rows by the current sort column"""
+        if not (0 <= self._sort_column < len(self.columns)) or len(rows) == 0:
+            return rows
+        keys = self._sort_key(self._sort_column).iloc[rows]
+        ordered = keys.sort_values(ascending=self._sort_order == Qt.AscendingOrder,
+                                   kind='stable', na_position='last')
+        return np.asarray(ordered.index, dtype=np.int64)
+
+    def _sort_key(self, column: int) -> pd.Series:
+        """Get the vectorized sort key of a column, indexed by source row"""
+        key = self._sort_keys.get(column)
+        if key is None:
+            spec = self.columns[column]
+            values = pd.Series(self._values[spec.key], dtype=object)
+            if spec.sort_as == 'number':
+                key = pd.to_numeric(values, errors='coerce')
+            elif spec.sort_as == 'date':
+                key = pd.to_datetime(values, errors='coerce')
+            elif spec.sort_as == 'text':
+                key = values.astype(str).str.lower().where(values.notna())
+            else:
+                key = values
+            self._sort_keys[column] = key
+        return key
+
+    def _remap_persistent_indexes(self, old_rows: np.ndarray):
+        """Move persistent indexes (selection, current cell) with their rows"""
+        persistent = self.persistentIndexList()
+        if not persistent:
+            return
+        position = np.empty(self._source_rows, dtype=np.int64)
+        position[self._rows] = np.arange(len(self._rows))
+        new_indexes = [self.index(int(position[old_rows[index.row()]]), index.column())
+                       for index in persistent]
+        self.changePersistentIndexList(persistent, new_indexes)
+
+    # Row access
+
+    def source_row(self, row: int) -> int:
+        """Map a view row to its position in the loaded DataFrame"""
+        return int(self._rows[row])
+
+    def row_value(self, row: int, key: str) -> Any:
+        """Get the raw value of a column for a view row"""
+        values = self._values.get(key)
+        if values is None or not (0 <= row < len(self._rows)):
+            return None
+        return values[self._rows[row]]
+
+    def row_record(self, row: int) -> Dict[str, Any]:
+        """Get all loaded values of a view row"""
+        source = self._rows[row]
+        return {key: values[source] for key, values in self._values.items()}
+
+    def column_index(self, key: str) -> int:
+        """Get the model column showing a DataFrame column, or -1"""
+        for column, spec in enumerate(self.columns):
+            if spec.key == key:
+                return column
+        return -1
+
+    # QAbstractTableModel interface
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        spec = self.columns[index.column()]
+
+        if role == Qt.DisplayRole or (role == Qt.ToolTipRole and spec.tooltip):
+            source = int(self._rows[index.row()])
+            if role == Qt.ToolTipRole:
+                return format_text(self._values[spec.key][source])
+            cache = self._display[index.column()]
+            text = cache.get(source)
+            if text is None:
+                try:
+                    text = spec.formatter(self._values[spec.key][source])
+                except Exception as e:
+                    self.logger.debug(f"Error formatting {spec.key}: {e}")
+                    text = ""
+                cache[source] = text
+            return text
+        if role == Qt.TextAlignmentRole and spec.alignment is not None:
+            return int(spec.alignment)
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            colors = spec.background if role == Qt.BackgroundRole else spec.foreground
+            if colors is not None:
+                color = colors(self._values[spec.key][int(self._rows[index.row()])])
+                return QColor(color) if color else None
+            return None
+        if role == Qt.UserRole:
+            return self._values[spec.key][int(self._rows[index.row()])]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal and 0 <= section < len(self.columns):
+                return self.columns[section].header
+            if orientation == Qt.Vertical:
+                return str(section + 1)
+        return None
@@ -0,0 +1,131 @@
+"""
+Tests for the dashboard aggregate store
+Runs AggregateStore over a DataManager in a temporary data directory
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+from src.core.aggregate_store import AggregateStore, AGGREGATE_SOURCES
+from src.modules.expenses.models import ExpenseDataModel
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestAggregateStore(unittest.TestCase):
+    """Test incremental totals and change reporting of AggregateStore"""
+
+    def setUp(self):
+        """Set up a data manager with a few expenses and a store over it"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+        self.expenses = pd.DataFrame([
+            {'id': 1, 'date': '2025-01-10', 'type': 'Expense', 'category': 'Food',
+             'sub_category': '', 'transaction_mode': 'UPI', 'amount': 100.0},
+            {'id': 2, 'date': '2025-01-10', 'type': 'Expense', 'category': 'Travel',
+             'sub_category': '', 'transaction_mode': 'UPI', 'amount': 250.0},
+            {'id': 3, 'date': '2025-02-01', 'type': 'Expense', 'category': 'Food',
+             'sub_category': '', 'transaction_mode': 'Cash', 'amount': 50.0},
+        ])
+        self.write_expenses()
+        self.store = AggregateStore(self.data_manager)
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_expenses(self):
+        self.data_manager.write_csv('expenses', AGGREGATE_SOURCES['expenses']['filename'], self.expenses)
+
+    def test_initial_refresh_builds_all_views(self):
+        """The first refresh totals every bucket view"""
+        changes = self.store.refresh(['expenses'])
+
+        self.assertEqual(changes['expenses'], set(AggregateStore.views))
+        self.assertEqual(self.store.get_total('expenses'), {'total': 400.0, 'count': 3})
+        self.assertEqual(self.store.get_buckets('expenses', 'by_category'),
+                         {'Food': {'total': 150.0, 'count': 2}, 'Travel': {'total': 250.0, 'count': 1}})
+        self.assertEqual(self.store.get_buckets('expenses', 'by_month'),
+                         {'2025-01': {'total': 350.0, 'count': 2}, '2025-02': {'total': 50.0, 'count': 1}})
+        self.assertEqual(self.store.get_total_between('expenses', date(2025, 1, 1), date(2025, 1, 31)),
+                         {'total': 350.0, 'count': 2})
+
+    def test_unchanged_source_reports_no_changes(self):
+        """Refreshing without a file change moves no view"""
+        self.store.refresh(['expenses'])
+        version = self.store.get_version('expenses', 'totals')
+
+        self.assertEqual(self.store.refresh(['expenses']), {})
+        self.assertEqual(self.store.get_version('expenses', 'totals'), version)
+
+    def test_edit_updates_only_affected_views(self):
+        """Recategorizing a row moves the category buckets but not the totals"""
+        self.store.refresh(['expenses'])
+        self.expenses.loc[self.expenses['id'] == 2, 'category'] = 'Food'
+        self.write_expenses()
+
+        changes = self.store.refresh(['expenses'])
+
+        self.assertEqual(changes['expenses'], {'records', 'by_category'})
+        self.assertEqual(self.store.get_buckets('expenses', 'by_category'),
+                         {'Food': {'total': 400.0, 'count': 3}})
+        self.assertEqual(self.store.get_total('expenses'), {'total': 400.0, 'count': 3})
+
+    def test_removed_row_is_subtracted(self):
+        """Deleting a row drops its contribution and empties its buckets"""
+        self.store.refresh(['expenses'])
+        self.expenses = self.expenses[self.expenses['id'] != 3]
+        self.write_expenses()
+
+        self.store.refresh(['expenses'])
+
+        self.assertEqual(self.store.get_total('expenses'), {'total': 350.0, 'count': 2})
+        self.assertNotIn('2025-02', self.store.get_buckets('expenses', 'by_month'))
+
+    def test_incremental_matches_rebuild(self):
+        """Totals reached by increments equal a rebuild from scratch"""
+        self.store.refresh(['expenses'])
+        self.expenses.loc[len(self.expenses)] = [4, '2025-02-03', 'Expense', 'Bills', '', 'Card', 75.5]
+        self.expenses.loc[self.expenses['id'] == 1, 'amount'] = 120.0
+        self.write_expenses()
+        self.store.refresh(['expenses'])
+
+        rebuilt = AggregateStore(self.data_manager)
+        rebuilt.refresh(['expenses'])
+
+        for view in AggregateStore.bucket_views:
+            self.assertEqual(self.store.get_buckets('expenses', view), rebuilt.get_buckets('expenses', view))
+        self.assertEqual(self.store.get_total('expenses'), rebuilt.get_total('expenses'))
+
+    def test_count_matches_loaded_expenses(self):
+        """Undated and non-positive rows are left out of the count, as ExpenseDataModel drops them"""
+        self.expenses.loc[len(self.expenses)] = [4, '2025-02-03', 'Income', 'Salary', '', 'Bank', 900.0]
+        self.expenses.loc[len(self.expenses)] = [5, '2025-02-04', 'Expense', 'Food', '', 'Cash', 0.0]
+        self.expenses.loc[len(self.expenses)] = [6, '', 'Expense', 'Food', '', 'Cash', 30.0]
+        self.write_expenses()
+
+        self.store.refresh(['expenses'])
+
+        loaded = ExpenseDataModel(self.data_manager).get_all_expenses()
+        self.assertEqual(self.store.get_total('expenses'), {'total': loaded['amount'].sum(), 'count': len(loaded)})
+        self.assertEqual(len(loaded), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
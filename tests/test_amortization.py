@@ -0,0 +1,145 @@
+"""
+Tests for the integer-paise amortization engine
+Compares engine schedules with the earlier Decimal implementation of LoanDetails
+"""
+
+import unittest
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+from dateutil.relativedelta import relativedelta
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.investments.amortization import AmortizationEngine, amortization_engine
+from src.modules.investments.models import LoanDetails
+
+
+START = date(2025, 1, 31)
+# The engine rounds interest to the paisa every month, so it may drift from the
+# unrounded schedule by up to half a paisa per payment made so far
+DRIFT_PER_PAYMENT = 0.005
+
+
+def reference_schedule(principal, annual_rate, tenure, emi, start, prepayments=None):
+    """The schedule as LoanDetails computed it before the engine, plus kept-EMI prepayments"""
+    prepayments = prepayments or {}
+    remaining_balance = Decimal(str(principal))
+    emi_decimal = Decimal(str(emi))
+    monthly_rate = Decimal(str(annual_rate)) / Decimal('100') / Decimal('12')
+    schedule = []
+
+    for payment_num in range(1, tenure + 1):
+        interest_amount = remaining_balance * monthly_rate
+        if payment_num == tenure:
+            principal_amount = remaining_balance
+        else:
+            principal_amount = emi_decimal - interest_amount
+            if principal_amount < 0:
+                principal_amount = Decimal('0')
+                interest_amount = emi_decimal
+            principal_amount += Decimal(str(prepayments.get(payment_num, 0)))
+            principal_amount = min(principal_amount, remaining_balance)
+        remaining_balance -= principal_amount
+
+        schedule.append({
+            'payment_number': payment_num,
+            'payment_date': start + relativedelta(months=payment_num - 1),
+            'principal_amount': float(principal_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'interest_amount': float(interest_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'remaining_balance': float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+        })
+        if remaining_balance <= 0:
+            break
+
+    return schedule
+
+
+class TestAmortizationEngine(unittest.TestCase):
+    """Test AmortizationEngine schedules against the Decimal reference"""
+
+    def setUp(self):
+        """Start every test with an empty memo"""
+        amortization_engine.clear()
+
+    def make_loan(self, principal, annual_rate, tenure, emi=0.0):
+        return LoanDetails(loan_name="Test loan", outstanding_amount=principal, interest_rate=annual_rate,
+                           net_tenure=tenure, emi_amount=emi, emi_start_date=datetime.combine(START, datetime.min.time()))
+
+    def assertMatchesReference(self, records, reference):
+        self.assertEqual(len(records), len(reference))
+        for row, expected in zip(records, reference):
+            self.assertEqual(row['payment_number'], expected['payment_number'])
+            self.assertEqual(row['payment_date'], expected['payment_date'])
+            for column in ('principal_amount', 'interest_amount', 'remaining_balance'):
+                self.assertAlmostEqual(row[column], expected[column],
+                                       delta=0.01 + DRIFT_PER_PAYMENT * row['payment_number'],
+                                       msg=f"{column} of payment {row['payment_number']}")
+
+    def test_schedules_match_decimal_implementation(self):
+        """Home, car and zero-interest loans agree with the old schedule to the paisa range"""
+        for principal, rate, tenure in [(2500000.0, 8.5, 240), (650000.0, 9.25, 60), (120000.0, 0.0, 12)]:
+            with self.subTest(principal=principal, rate=rate, tenure=tenure):
+                loan = self.make_loan(principal, rate, tenure)
+                records = loan.generate_amortization_schedule()
+
+                self.assertMatchesReference(records, reference_schedule(
+                    principal, rate, tenure, loan.calculate_emi(), START))
+                self.assertEqual(round(sum(row['principal_amount'] for row in records), 2), principal)
+                self.assertEqual(records[-1]['remaining_balance'], 0.0)
+
+    def test_final_installment_clears_remainder(self):
+        """An EMI rounded down leaves a remainder that the last payment clears"""
+        principal, rate, tenure, emi = 100000.0, 10.0, 12, 8791.0
+        loan = self.make_loan(principal, rate, tenure, emi)
+        records = loan.generate_amortization_schedule()
+
+        self.assertMatchesReference(records, reference_schedule(principal, rate, tenure, emi, START))
+        self.assertGreater(records[-1]['principal_amount'] + records[-1]['interest_amount'], emi)
+        self.assertTrue(all(row['principal_amount'] + row['interest_amount'] == emi for row in records[:-1]))
+        self.assertEqual(round(sum(row['principal_amount'] for row in records), 2), principal)
+
+    def test_prepayment_keeps_emi_and_shortens_loan(self):
+        """Extra principal with the same EMI matches the reference and ends the loan early"""
+        principal, rate, tenure = 1500000.0, 9.0, 120
+        prepayments = {12: 100000.0, 36: 250000.0}
+        loan = self.make_loan(principal, rate, tenure)
+        scenario = loan.get_prepayment_scenario(prepayments)
+
+        self.assertMatchesReference(scenario['schedule'], reference_schedule(
+            principal, rate, tenure, loan.calculate_emi(), START, prepayments))
+        self.assertGreater(scenario['payments_saved'], 0)
+        self.assertGreater(scenario['interest_saved'], 0)
+        self.assertEqual(round(sum(row['principal_amount'] for row in scenario['schedule']), 2), principal)
+
+    def test_prepayment_with_reduced_emi_keeps_tenure(self):
+        """Reducing the EMI keeps the payment count and lowers later payments"""
+        loan = self.make_loan(800000.0, 8.0, 84)
+        scenario = loan.get_prepayment_scenario({24: 200000.0}, reduce_emi=True)
+        schedule = scenario['schedule']
+        base = loan.generate_amortization_schedule()
+
+        self.assertEqual(len(schedule), 84)
+        self.assertEqual(schedule[:23], base[:23])
+        self.assertLess(schedule[30]['principal_amount'] + schedule[30]['interest_amount'], loan.calculate_emi())
+        self.assertEqual(schedule[-1]['remaining_balance'], 0.0)
+        self.assertGreater(scenario['interest_saved'], 0)
+
+    def test_batched_schedules_match_single_and_are_memoized(self):
+        """Many loans computed in one pass equal their one-at-a-time schedules"""
+        engine = AmortizationEngine()
+        keys = [engine.make_key(principal, rate, tenure, 0.0, START)
+                for principal, rate, tenure in [(500000.0, 7.5, 36), (2500000.0, 8.5, 240), (90000.0, 12.0, 6)]]
+        batched = engine.schedules(keys)
+
+        for key, schedule in zip(keys, batched):
+            single = AmortizationEngine().schedules([key])[0]
+            self.assertEqual(schedule.to_records(), single.to_records())
+        self.assertIs(engine.schedules(keys[:1])[0], batched[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for the attendance record store
+Checks that logged saves reach direct CSV readers and that bad rows do not break summaries
+"""
+
+import unittest
+import csv
+import os
+import tempfile
+import shutil
+from pathlib import Path
+
+import pytest
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+@pytest.fixture(scope="class")
+def attendance(request, import_without_init):
+    request.cls.models = import_without_init('src.modules.attendance.models')
+    request.cls.simple_models = import_without_init('src.modules.attendance.simple_models')
+
+
+@pytest.mark.usefixtures("attendance")
+class TestAttendanceRecordStore(unittest.TestCase):
+    """Test AttendanceRecordStore against readers of the CSV file"""
+
+    def setUp(self):
+        """Set up a data directory shared by the simple manager and the pandas model"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_dir = Path(self.temp_dir) / "data"
+        self.data_manager = DataManager(str(self.data_dir))
+        self.manager = self.simple_models.SimpleAttendanceDataManager(str(self.data_dir))
+
+    def tearDown(self):
+        """Drop the shared store and clean up the temporary data directory"""
+        self.simple_models._record_stores.pop(os.path.abspath(self.manager.records_file), None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def save(self, date_str: str, present: int = 8, **fields):
+        periods = {f"period_{i}": "Present" if i <= present else "Absent" for i in range(1, 9)}
+        self.assertTrue(self.manager.save_record(self.simple_models.SimpleAttendanceRecord(date=date_str, **periods, **fields)))
+
+    def test_logged_saves_reach_pandas_model(self):
+        """AttendanceDataModel sees saves that are still in the append log"""
+        self.save("2025-01-13")
+        self.save("2025-01-14", present=4)
+        self.assertTrue(Path(self.manager.store.log_file).exists())
+
+        df = self.models.AttendanceDataModel(self.data_manager).get_all_records()
+
+        self.assertEqual(sorted(df['date'].astype(str)), ["2025-01-13", "2025-01-14"])
+        self.assertFalse(Path(self.manager.store.log_file).exists())
+
+    def test_compact_pending_records_without_store(self):
+        """A log left behind by an earlier run is folded in without a loaded store"""
+        self.save("2025-01-13")
+        log_file = Path(self.manager.store.log_file)
+        records_file = Path(self.manager.records_file)
+        log_contents = log_file.read_text(encoding='utf-8')
+
+        # Reset the CSV and log to the state an interrupted run leaves on disk
+        self.manager.compact()
+        with open(records_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerow(self.simple_models.ATTENDANCE_HEADERS)
+        log_file.write_text(log_contents, encoding='utf-8')
+
+        self.assertTrue(self.simple_models.compact_pending_records(str(records_file)))
+        self.assertIn("2025-01-13", records_file.read_text(encoding='utf-8'))
+        self.assertFalse(log_file.exists())
+
+    def test_compact_storage_folds_logged_saves(self):
+        """DataManager.compact_storage runs the hook the attendance model registers"""
+        self.save("2025-01-13")
+        log_file = Path(self.manager.store.log_file)
+
+        self.data_manager.compact_storage('attendance')
+        self.assertTrue(log_file.exists())
+
+        self.models.AttendanceDataModel(self.data_manager)
+        self.save("2025-01-14")
+        self.data_manager.compact_storage('attendance')
+
+        records = Path(self.manager.records_file).read_text(encoding='utf-8')
+        self.assertIn("2025-01-13", records)
+        self.assertIn("2025-01-14", records)
+        self.assertFalse(log_file.exists())
+
+    def test_summary_tolerates_malformed_dates(self):
+        """A record with an unparseable date still counts in the summary"""
+        self.save("2025-01-13")
+        self.save("2025-01-14 09:30:00", present=4)
+        self.save("not a date", is_holiday=True)
+
+        summary = self.manager.get_summary()
+
+        self.assertEqual(summary['total_days'], 3)
+        self.assertEqual(summary['holiday_days'], 1)
+        self.assertEqual(summary['present_periods'], 12)
+        self.assertEqual(summary['overall_percentage'], 75.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
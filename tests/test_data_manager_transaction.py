@@ -0,0 +1,89 @@
+"""
+Tests for DataManager transactions
+Checks that batched writes land once and notify the UI and sync once on commit
+"""
+
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestDataManagerTransaction(unittest.TestCase):
+    """Test write buffering and change notification of DataManager.transaction"""
+
+    columns = ['id', 'date', 'amount']
+
+    def setUp(self):
+        """Set up a data manager over a temporary data directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+
+        self.signals = []
+        self.data_manager.data_changed.connect(lambda module, operation: self.signals.append((module, operation)))
+
+        sync_patcher = patch.object(self.data_manager, 'trigger_sync_for_module')
+        self.trigger_sync = sync_patcher.start()
+        self.addCleanup(sync_patcher.stop)
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_frame(self, rows: int) -> pd.DataFrame:
+        return pd.DataFrame({'id': range(1, rows + 1), 'date': ['2025-01-15'] * rows,
+                             'amount': [100.0 * (i + 1) for i in range(rows)]})
+
+    def test_write_csv_only_transaction_notifies_once(self):
+        """A transaction holding only write_csv calls still signals and syncs once"""
+        with self.data_manager.transaction('expenses'):
+            self.data_manager.write_csv('expenses', 'expenses.csv', self.make_frame(2))
+            self.data_manager.write_csv('expenses', 'expenses.csv', self.make_frame(3))
+            self.assertEqual(self.signals, [])
+
+        self.assertEqual(self.signals, [('expenses', 'transaction')])
+        self.trigger_sync.assert_called_once_with('expenses')
+        self.assertEqual(len(self.data_manager.read_csv('expenses', 'expenses.csv')), 3)
+
+    def test_row_operations_coalesce_into_one_write(self):
+        """Appends inside a transaction are visible to reads and notify once on commit"""
+        with self.data_manager.transaction('expenses'):
+            for amount in (10.0, 20.0, 30.0):
+                self.data_manager.append_row('expenses', 'expenses.csv',
+                                             {'date': '2025-01-15', 'amount': amount}, self.columns)
+            self.assertEqual(len(self.data_manager.read_csv('expenses', 'expenses.csv', self.columns)), 3)
+
+        self.assertEqual(self.signals, [('expenses', 'transaction')])
+        self.trigger_sync.assert_called_once_with('expenses')
+
+    def test_failed_transaction_discards_writes(self):
+        """A block that raises writes nothing and sends no signal"""
+        with self.assertRaises(RuntimeError):
+            with self.data_manager.transaction('expenses'):
+                self.data_manager.write_csv('expenses', 'expenses.csv', self.make_frame(2))
+                raise RuntimeError("abort")
+
+        self.assertEqual(self.signals, [])
+        self.trigger_sync.assert_not_called()
+        self.assertFalse(self.data_manager.file_exists('expenses', 'expenses.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the expense chart data
+Checks that the column-subset chart load keeps the rows the full model load keeps
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+from src.modules.expenses.models import ExpenseDataModel
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestExpenseChartData(unittest.TestCase):
+    """Test ExpenseDataModel.get_chart_data against the full record load"""
+
+    def setUp(self):
+        """Set up expenses with an income, an unknown type, a zero amount and a missing date"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+        self.data_manager.write_csv('expenses', 'expenses.csv', pd.DataFrame([
+            {'id': 1, 'date': '2025-01-10', 'type': 'Expense', 'category': 'Food', 'amount': 100.0},
+            {'id': 2, 'date': '2025-01-11', 'type': 'Income', 'category': 'Salary', 'amount': 900.0},
+            {'id': 3, 'date': '2025-01-12', 'type': '', 'category': 'Travel', 'amount': 40.0},
+            {'id': 4, 'date': '2025-01-13', 'type': 'Expense', 'category': 'Food', 'amount': 0.0},
+            {'id': 5, 'date': '', 'type': 'Expense', 'category': 'Food', 'amount': 25.0},
+            {'id': 6, 'date': '2025-02-01', 'type': 'Expense', 'category': 'Bills', 'amount': 60.0},
+        ]))
+        self.model = ExpenseDataModel(self.data_manager)
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_chart_data_matches_expense_records(self):
+        """All-time chart rows are the Expense rows of get_all_expenses"""
+        chart_ids = self.model.get_chart_data()['id'].astype(int).tolist()
+        expense_ids = self.model.get_expense_records_only()['id'].astype(int).tolist()
+
+        self.assertEqual(chart_ids, expense_ids)
+        self.assertEqual(chart_ids, [1, 3, 6])
+
+    def test_chart_data_matches_date_range_query(self):
+        """Date-bounded chart rows are the rows get_expenses_by_date_range returns"""
+        start, end = date(2025, 1, 1), date(2025, 1, 31)
+        chart_ids = self.model.get_chart_data(start, end)['id'].astype(int).tolist()
+        range_ids = self.model.get_expenses_by_date_range(start, end)['id'].astype(int).tolist()
+
+        self.assertEqual(chart_ids, range_ids)
+        self.assertEqual(chart_ids, [1, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+"""
+Tests for the concurrent Firebase sync scheduler
+Runs FirebaseSyncEngine against a local stand-in for the Realtime Database REST API
+"""
+
+import unittest
+import json
+import os
+import time
+import tempfile
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from unittest.mock import patch
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+import src.core.direct_firebase_client as direct_firebase_client
+from src.core.direct_firebase_client import DirectFirebaseClient
+from src.core.data_manager import DataManager
+from src.core.firebase_sync import FirebaseSyncEngine
+
+
+class RealtimeDatabaseStub(ThreadingHTTPServer):
+    """In-memory Realtime Database answering GET/PUT/PATCH on /<path>.json"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), RealtimeDatabaseHandler)
+        self.tree = {}
+        self.lock = threading.Lock()
+        self.requests = []         # (method, path) in arrival order
+        self.connections = 0       # TCP connections accepted
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latency = 0.02        # keeps requests overlapping when workers run in parallel
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_node(self, parts):
+        node = self.tree
+        for part in parts:
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def set_node(self, parts, value):
+        node = self.tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        if value is None:
+            node.pop(parts[-1], None)
+        else:
+            node[parts[-1]] = value
+
+
+class RealtimeDatabaseHandler(BaseHTTPRequestHandler):
+    """Request handler for RealtimeDatabaseStub"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def _handle(self, method: str):
+        server = self.server
+        path = urlparse(self.path).path
+        parts = [part for part in path[:-len('.json')].split('/') if part]
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        with server.lock:
+            server.requests.append((method, '/'.join(parts)))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+
+        time.sleep(server.latency)
+
+        with server.lock:
+            if method == 'PUT':
+                server.set_node(parts, body)
+                result = body
+            elif method == 'PATCH':
+                for key, value in body.items():
+                    server.set_node(parts + key.split('/'), value)
+                result = body
+            else:
+                result = server.get_node(parts)
+            server.in_flight -= 1
+
+        payload = json.dumps(result).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestFirebaseSyncScheduler(unittest.TestCase):
+    """Test concurrent module sync over a pooled HTTP session"""
+
+    modules = ["expenses", "income", "habits", "todos"]
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+        self.server = RealtimeDatabaseStub()
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+        # Signed-in client pointing at the stand-in
+        with patch.object(DirectFirebaseClient, '_load_session', return_value=False):
+            self.client = DirectFirebaseClient()
+        self.client.database_url = self.server.url
+        self.client.database_client = None
+        self.client.current_user = {'localId': 'test-user', 'email': 'test@example.com'}
+        self.client.id_token = 'test-token'
+
+        self.client_patch = patch.object(direct_firebase_client, '_direct_firebase_client', self.client)
+        self.client_patch.start()
+
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+        for module in self.modules:
+            for filename in ["a.csv", "b.csv", "c.csv"]:
+                self.data_manager.write_csv(module, filename, pd.DataFrame({
+                    'id': [1, 2, 3],
+                    'name': [f"{module}-{filename}-{i}" for i in range(3)],
+                    'amount': [10.0, 20.0, 30.0]
+                }))
+
+        self.engine = FirebaseSyncEngine(self.data_manager)
+        self.engine.config.enabled = True
+        self.engine.syncable_modules = list(self.modules)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.client_patch.stop()
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sync_all_data_uploads_every_file(self):
+        """Every module file ends up in the database"""
+        self.engine.sync_all_data()
+
+        for module in self.modules:
+            for name in ["a", "b", "c"]:
+                node = self.server.get_node(['users', 'test-user', 'data', module, name])
+                self.assertIsNotNone(node, f"{module}/{name} was not uploaded")
+                self.assertEqual(len(node['records']), 3)
+                self.assertEqual(node['metadata']['version'], 1)
+
+        versions = self.server.get_node(['users', 'test-user', 'sync_versions'])
+        self.assertEqual(len(versions), len(self.modules) * 3)
+        self.assertEqual(set(versions.values()), {1})
+
+    def test_modules_sync_concurrently_on_bounded_pool(self):
+        """Modules overlap but never exceed the worker limit"""
+        self.engine.max_sync_workers = 3
+        self.engine.sync_all_data()
+
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+
+    def test_files_within_module_keep_order(self):
+        """Files of one module are uploaded one after another in name order"""
+        self.engine.sync_all_data()
+
+        for module in self.modules:
+            uploads = [path.rsplit('/', 1)[-1] for method, path in self.server.requests
+                       if method == 'PUT' and f"/data/{module}/" in path]
+            self.assertEqual(uploads, ["a", "b", "c"])
+
+    def test_requests_reuse_pooled_connections(self):
+        """Keep-alive connections are reused instead of one per request"""
+        self.engine.sync_all_data()
+
+        request_count = len(self.server.requests)
+        self.assertGreater(request_count, len(self.modules) * 3)
+        self.assertLessEqual(self.server.connections, self.engine.max_sync_workers)
+
+    def test_progress_reported_per_module(self):
+        """sync_progress counts up to the number of modules"""
+        progress = []
+        self.engine.sync_progress.connect(lambda operation, current, total: progress.append((current, total)))
+
+        self.engine.sync_all_data()
+
+        module_progress = [entry for entry in progress if entry[1] == len(self.modules)]
+        self.assertEqual(module_progress[-1], (len(self.modules), len(self.modules)))
+        self.assertEqual([current for current, _ in module_progress[1:]],
+                         list(range(1, len(self.modules) + 1)))
+
+    def test_idle_sync_is_one_shallow_read(self):
+        """A sync without changes reads the version index once and nothing else"""
+        self.engine.sync_all_data()
+        self.server.requests.clear()
+
+        with patch.object(self.engine, '_hash_file', wraps=self.engine._hash_file) as hash_file:
+            self.engine.sync_all_data()
+
+        self.assertEqual(self.server.requests, [('GET', 'users/test-user/sync_versions')])
+        hash_file.assert_not_called()
+
+    def test_changed_file_pushes_only_changed_rows(self):
+        """Editing one row patches that row and its version in one request"""
+        self.engine.sync_all_data()
+        self.server.requests.clear()
+
+        df = self.data_manager.read_csv("income", "b.csv")
+        df.loc[df['id'] == 2, 'amount'] = 99.0
+        self.data_manager.write_csv("income", "b.csv", df)
+
+        self.engine.sync_all_data()
+
+        writes = [entry for entry in self.server.requests if entry[0] != 'GET']
+        self.assertEqual(writes, [('PATCH', 'users/test-user')])
+        node = self.server.get_node(['users', 'test-user', 'data', 'income', 'b'])
+        self.assertEqual(node['records']['2']['amount'], 99.0)
+        self.assertEqual(node['metadata']['version'], 2)
+        self.assertEqual(self.server.get_node(['users', 'test-user', 'sync_versions', 'income:b']), 2)
+
+    def test_file_without_ids_is_uploaded_only_when_changed(self):
+        """Rows that cannot be keyed are uploaded in full, but only after a change"""
+        self.data_manager.write_csv("todos", "d.csv", pd.DataFrame({'name': ["a", "b"], 'amount': [1.0, 2.0]}))
+        self.engine.sync_all_data()
+        self.server.requests.clear()
+
+        self.engine.sync_all_data()
+        self.assertEqual(self.server.requests, [('GET', 'users/test-user/sync_versions')])
+
+        self.data_manager.write_csv("todos", "d.csv", pd.DataFrame({'name': ["a", "c"], 'amount': [1.0, 3.0]}))
+        self.engine.sync_all_data()
+
+        writes = [entry for entry in self.server.requests if entry[0] != 'GET']
+        self.assertEqual(writes, [('PUT', 'users/test-user/data/todos/d'),
+                                  ('PUT', 'users/test-user/sync_versions/todos:d')])
+        node = self.server.get_node(['users', 'test-user', 'data', 'todos', 'd'])
+        self.assertEqual([record['name'] for record in node['records']], ["a", "c"])
+        self.assertEqual(node['metadata']['version'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the habit streak engine
+Runs HabitStreakEngine over habit records in a temporary data directory
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+from src.modules.habits.streak_engine import HabitStreakEngine
+
+
+TODAY = date(2025, 3, 10)
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestHabitStreakEngine(unittest.TestCase):
+    """Test streaks, rates and incremental updates of HabitStreakEngine"""
+
+    def setUp(self):
+        """Set up two habits with known completion histories"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+
+        records = []
+        # Habit 1: done the last 3 days, a gap, then a 5-day run before it
+        for offset in range(3):
+            records.append((1, TODAY - timedelta(days=offset), True))
+        records.append((1, TODAY - timedelta(days=3), False))
+        for offset in range(4, 9):
+            records.append((1, TODAY - timedelta(days=offset), True))
+        # Habit 2: done yesterday and the day before, not yet today
+        records.append((2, TODAY - timedelta(days=1), True))
+        records.append((2, TODAY - timedelta(days=2), True))
+        self.write_records(records)
+
+        self.engine = HabitStreakEngine(self.data_manager)
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_records(self, records):
+        self.records = pd.DataFrame([
+            {'id': i + 1, 'habit_id': habit_id, 'date': day.strftime('%Y-%m-%d'),
+             'is_completed': completed}
+            for i, (habit_id, day, completed) in enumerate(records)])
+        self.data_manager.write_csv('habits', 'habit_records.csv', self.records)
+
+    def test_current_and_longest_streaks(self):
+        """Current streaks end today; longest covers the whole history"""
+        streaks = self.engine.get_streaks(TODAY)
+
+        self.assertEqual(streaks[1], {'current': 3, 'longest': 5})
+        self.assertEqual(streaks[2], {'current': 0, 'longest': 2})
+
+    def test_completion_rates_over_window(self):
+        """Rates divide completed by recorded days inside the window"""
+        rates = self.engine.get_completion_rates(days=4, today=TODAY)
+
+        self.assertAlmostEqual(rates[1], 75.0)
+        self.assertAlmostEqual(rates[2], 100.0)
+
+    def test_daily_completions_and_totals(self):
+        """Per-day completions are summed across habits"""
+        daily = self.engine.get_daily_completions(TODAY - timedelta(days=3), TODAY)
+
+        self.assertEqual(daily, {TODAY - timedelta(days=3): 0, TODAY - timedelta(days=2): 2,
+                                 TODAY - timedelta(days=1): 2, TODAY: 1})
+        self.assertEqual(self.engine.get_totals(), (11, 10))
+
+    def test_record_saved_updates_in_place(self):
+        """A saved record extends the streak without a rebuild"""
+        self.engine.get_streaks(TODAY)
+        self.engine.record_saved(2, TODAY, True, replaced=False)
+
+        self.assertTrue(self.engine.built)
+        self.assertEqual(self.engine.get_streaks(TODAY)[2], {'current': 3, 'longest': 3})
+
+    def test_file_change_triggers_rebuild(self):
+        """Rewriting the records file is picked up on the next query"""
+        self.engine.get_streaks(TODAY)
+        self.write_records([(3, TODAY, True)])
+
+        self.assertEqual(self.engine.get_streaks(TODAY), {3: {'current': 1, 'longest': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
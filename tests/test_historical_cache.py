@@ -0,0 +1,132 @@
+"""
+Tests for the incremental historical price cache
+Runs HistoricalPriceCache over temporary storage with a scripted price source
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.investments import historical_cache
+from src.modules.investments.data_storage import InvestmentDataStorage
+from src.modules.investments.historical_cache import HistoricalPriceCache
+
+
+START = date(2025, 1, 1)
+
+
+class FixedDateTime(datetime):
+    """datetime whose now() is set by the test"""
+
+    current = datetime(2025, 1, 15, 11, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+class ScriptedSource:
+    """Price source answering from a {date: close} mapping the test edits"""
+
+    def __init__(self):
+        self.closes = {day.date(): 100.0 + i for i, day in enumerate(pd.bdate_range('2024-12-01', '2025-02-28'))}
+        self.today = None
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        days = [day for day in sorted(self.closes) if start <= day < end and day <= self.today]
+        closes = [self.closes[day] for day in days]
+        return pd.DataFrame({'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+                             'Volume': [1000] * len(days)}, index=pd.DatetimeIndex(days))
+
+
+class TestHistoricalPriceCache(unittest.TestCase):
+    """Test incremental downloads and readjustment detection of HistoricalPriceCache"""
+
+    def setUp(self):
+        """Set up a cache over temporary storage and a fixed clock"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = ScriptedSource()
+        self.cache = HistoricalPriceCache(InvestmentDataStorage(str(Path(self.temp_dir) / "investments")),
+                                          self.source)
+
+        clock = mock.patch.object(historical_cache, 'datetime', FixedDateTime)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def update_at(self, when: datetime) -> pd.DataFrame:
+        FixedDateTime.current = when
+        self.source.today = when.date()
+        bars, error = self.cache.update("INFY", START)
+        self.assertIsNone(error)
+        return bars
+
+    def close_on(self, bars: pd.DataFrame, day: date) -> float:
+        return float(bars.loc[bars['date'] == day.isoformat(), 'close'].iloc[0])
+
+    def test_intraday_bar_is_overwritten_without_full_download(self):
+        """A bar stored during the session is replaced by the tail, not compared"""
+        session = date(2025, 1, 15)
+        self.update_at(datetime(2025, 1, 15, 11, 0))
+
+        self.source.closes[session] *= 1.03
+        bars = self.update_at(datetime(2025, 1, 15, 15, 0))
+
+        self.assertEqual(self.source.calls[-1][0], date(2025, 1, 14))
+        self.assertEqual(len(self.source.calls), 2)
+        self.assertAlmostEqual(self.close_on(bars, session), self.source.closes[session])
+
+    def test_provisional_bar_is_settled_next_day(self):
+        """The next day's tail starts at the last settled bar and finalizes yesterday"""
+        session = date(2025, 1, 15)
+        self.update_at(datetime(2025, 1, 15, 11, 0))
+
+        self.source.closes[session] *= 0.98
+        bars = self.update_at(datetime(2025, 1, 16, 10, 0))
+
+        self.assertEqual(self.source.calls[-1][0], date(2025, 1, 14))
+        self.assertEqual(len(self.source.calls), 2)
+        self.assertAlmostEqual(self.close_on(bars, session), self.source.closes[session])
+        self.assertEqual(bars['date'].iloc[-1], '2025-01-16')
+
+    def test_friday_bar_is_settled_over_the_weekend(self):
+        """A bar fetched during Friday's session is refreshed on Saturday and then left alone"""
+        friday = date(2025, 1, 17)
+        self.update_at(datetime(2025, 1, 17, 11, 0))
+        self.source.closes[friday] += 5.0
+
+        bars = self.update_at(datetime(2025, 1, 18, 10, 0))
+        self.assertAlmostEqual(self.close_on(bars, friday), self.source.closes[friday])
+
+        calls = len(self.source.calls)
+        self.update_at(datetime(2025, 1, 19, 10, 0))
+        self.assertEqual(len(self.source.calls), calls)
+
+    def test_readjusted_history_is_downloaded_again(self):
+        """A changed close on a settled bar triggers a download of the covered range"""
+        self.update_at(datetime(2025, 1, 15, 18, 0))
+
+        for day in self.source.closes:
+            self.source.closes[day] /= 2
+        bars = self.update_at(datetime(2025, 1, 16, 18, 0))
+
+        self.assertEqual(self.source.calls[-1][0], START)
+        self.assertAlmostEqual(self.close_on(bars, date(2025, 1, 2)), self.source.closes[date(2025, 1, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
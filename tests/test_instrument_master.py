@@ -0,0 +1,184 @@
+"""
+Tests for the instrument master
+Covers daily caching of the instrument dump, prefix search and token lookup
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+
+def make_instrument(token, symbol, name, exchange="NSE", expiry="", instrument_type="EQ"):
+    return {
+        'instrument_token': token, 'exchange_token': token >> 8, 'tradingsymbol': symbol, 'name': name,
+        'last_price': 0.0, 'expiry': expiry, 'strike': 0.0, 'tick_size': 0.05, 'lot_size': 1,
+        'instrument_type': instrument_type, 'segment': exchange, 'exchange': exchange,
+    }
+
+
+INSTRUMENTS = [
+    make_instrument(408065, "INFY", "INFOSYS"),
+    make_instrument(1281, "INFY", "INFOSYS", exchange="BSE"),
+    make_instrument(2953217, "TCS", "TATA CONSULTANCY SERV LT"),
+    make_instrument(895745, "TATASTEEL", "TATA STEEL"),
+    make_instrument(884737, "TATAMOTORS", "TATA MOTORS"),
+    make_instrument(3001089, "INFIBEAM", "INFIBEAM AVENUES"),
+    make_instrument(12345602, "INFY25JAN1900CE", "INFY", exchange="NFO",
+                    expiry=date(2025, 1, 30), instrument_type="CE"),
+    make_instrument(12345603, "INFY25JANFUT", "INFY", exchange="NFO",
+                    expiry="2025-01-30", instrument_type="FUT"),
+    make_instrument(256265, "NIFTY 50", "NIFTY 50", instrument_type="EQ"),
+]
+
+
+@pytest.fixture(scope="class")
+def trading(request, import_without_init):
+    request.cls.instrument_master = import_without_init('src.modules.trading.instrument_master')
+    request.cls.api_client = import_without_init('src.modules.trading.api_client')
+    request.cls.models = import_without_init('src.modules.trading.models')
+
+
+@pytest.mark.usefixtures("trading")
+class TestInstrumentMaster(unittest.TestCase):
+    """Test searching and caching the instrument dump"""
+
+    def setUp(self):
+        """Set up a master over a small dump"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.downloads = 0
+        self.master = self.instrument_master.InstrumentMaster(Path(self.temp_dir), self.load)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def require_pyarrow(self):
+        if not self.instrument_master.PYARROW_AVAILABLE:
+            self.skipTest("pyarrow not installed")
+
+    def load(self):
+        self.downloads += 1
+        return [dict(instrument) for instrument in INSTRUMENTS]
+
+    def test_prefix_search_ranks_exact_symbol_first(self):
+        """An exact symbol leads, then longer symbols in order, then name matches"""
+        results = self.master.search("infy")
+
+        self.assertEqual([(i.exchange, i.tradingsymbol) for i in results[:2]], [("NSE", "INFY"), ("BSE", "INFY")])
+        self.assertEqual([i.tradingsymbol for i in results[2:]], ["INFY25JAN1900CE", "INFY25JANFUT"])
+
+    def test_search_matches_name_words(self):
+        """Any word of the name matches, after the symbol matches"""
+        results = self.master.search("TATA")
+
+        self.assertEqual([i.tradingsymbol for i in results], ["TATAMOTORS", "TATASTEEL", "TCS"])
+        self.assertEqual([i.tradingsymbol for i in self.master.search("avenue")], ["INFIBEAM"])
+
+    def test_search_filters_exchange_and_limits(self):
+        """Results can be limited to one exchange and a count"""
+        self.assertEqual([i.tradingsymbol for i in self.master.search("INF", exchange="NFO")],
+                         ["INFY25JAN1900CE", "INFY25JANFUT"])
+        self.assertEqual(len(self.master.search("INF", limit=2)), 2)
+        self.assertEqual(self.master.search("INF", exchange="MCX"), [])
+        self.assertEqual(self.master.search("   "), [])
+
+    def test_results_are_instruments_with_parsed_expiry(self):
+        """Expiries given as dates or strings both become datetimes"""
+        option = self.master.get_instrument("NFO", "INFY25JAN1900CE")
+        future = self.master.get_instrument("NFO", "INFY25JANFUT")
+
+        self.assertEqual(option.expiry, datetime(2025, 1, 30))
+        self.assertEqual(future.expiry, datetime(2025, 1, 30))
+        self.assertEqual(option.instrument_type, "CE")
+        self.assertIsNone(self.master.get_instrument("NSE", "INFY").expiry)
+        self.assertIsNone(self.master.get_instrument("NSE", "MISSING"))
+
+    def test_token_resolution(self):
+        """EXCHANGE:SYMBOL strings resolve to instrument tokens"""
+        tokens = self.master.resolve_tokens(["NSE:INFY", "BSE:INFY", "NSE:NIFTY 50", "NSE:UNKNOWN"])
+
+        self.assertEqual(tokens, {"NSE:INFY": 408065, "BSE:INFY": 1281, "NSE:NIFTY 50": 256265})
+
+    def test_dump_is_downloaded_once_per_day(self):
+        """A second master on the same day reads the cache file instead of downloading"""
+        self.require_pyarrow()
+        self.master.ensure_loaded()
+        self.assertTrue(self.master.cache_path.exists())
+
+        second = self.instrument_master.InstrumentMaster(Path(self.temp_dir), self.load)
+        self.assertEqual(second.get_token("NSE:TCS"), 2953217)
+        self.assertEqual(self.downloads, 1)
+
+    def test_previous_days_dump_is_replaced(self):
+        """A cache file from an earlier dump triggers a new download"""
+        self.require_pyarrow()
+        yesterday = self.instrument_master.dump_date() - timedelta(days=1)
+        with mock.patch.object(self.instrument_master, 'dump_date', return_value=yesterday):
+            self.master.ensure_loaded()
+
+        second = self.instrument_master.InstrumentMaster(Path(self.temp_dir), self.load)
+        second.ensure_loaded()
+
+        self.assertEqual(self.downloads, 2)
+        self.assertEqual(second.loaded_date, self.instrument_master.dump_date())
+
+    def test_failed_download_keeps_previous_instruments(self):
+        """When the broker is unreachable the last loaded dump stays usable"""
+        yesterday = self.instrument_master.dump_date() - timedelta(days=1)
+        with mock.patch.object(self.instrument_master, 'dump_date', return_value=yesterday):
+            self.master.ensure_loaded()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.master.loader = lambda: []
+
+        self.assertEqual(self.master.get_token("NSE:INFY"), 408065)
+
+
+class FakeKite:
+    """Stand-in for KiteConnect serving the instrument dump"""
+
+    def __init__(self):
+        self.instrument_calls = 0
+
+    def instruments(self, exchange=None):
+        self.instrument_calls += 1
+        return [dict(instrument) for instrument in INSTRUMENTS]
+
+
+@pytest.mark.usefixtures("trading")
+class TestClientInstrumentSearch(unittest.TestCase):
+    """Test that the API client answers searches from the instrument master"""
+
+    def setUp(self):
+        """Set up an authenticated client backed by the fake kite"""
+        self.temp_dir = tempfile.mkdtemp()
+        config = self.models.TradingConfig(api_key="key", api_secret="secret")
+        self.client = self.api_client.ZerodhaAPIClient(config, Path(self.temp_dir))
+        self.client.kite = FakeKite()
+        self.client.is_connected = True
+        self.client.config.access_token = "token"
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_searches_share_one_download(self):
+        """Repeated searches and lookups download the dump once"""
+        self.assertEqual([i.tradingsymbol for i in self.client.search_instruments("NSE", "TATA")],
+                         ["TATAMOTORS", "TATASTEEL", "TCS"])
+        self.assertEqual(len(self.client.get_instruments("NFO")), 2)
+        self.assertEqual(self.client.get_instrument_tokens(["NSE:INFY"]), {"NSE:INFY": 408065})
+
+        self.assertEqual(self.client.kite.instrument_calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the partitioned investment data storage
+Covers the pinned partition format and migration of legacy category files
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.investments import data_storage
+from src.modules.investments.data_storage import InvestmentDataStorage
+
+
+class TestInvestmentDataStorage(unittest.TestCase):
+    """Test partition format pinning and legacy migration of InvestmentDataStorage"""
+
+    def setUp(self):
+        """Set up an empty investments directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_dir = Path(self.temp_dir) / "investments"
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def store_price(self, storage: InvestmentDataStorage, symbol: str, price: float):
+        self.assertTrue(storage.store_real_time_data(symbol, {'current_price': price, 'data_source': 'test'}))
+
+    def write_legacy_file(self):
+        pd.DataFrame([
+            {'symbol': 'INFY', 'current_price': 1500.0, 'timestamp': '2025-01-15T10:00:00'},
+            {'symbol': 'TCS', 'current_price': 3400.0, 'timestamp': '2025-01-15T10:00:00'},
+        ]).to_csv(self.base_dir / 'real_time_data.csv', index=False)
+
+    def test_csv_partitions_stay_visible_after_installing_pyarrow(self):
+        """A store pinned to CSV keeps reading CSV once pyarrow is available"""
+        with mock.patch.object(data_storage, 'PYARROW_AVAILABLE', False):
+            storage = InvestmentDataStorage(str(self.base_dir))
+            self.store_price(storage, "INFY", 1500.0)
+        self.assertEqual(storage.partition_format, 'csv')
+
+        with mock.patch.object(data_storage, 'PYARROW_AVAILABLE', True):
+            reopened = InvestmentDataStorage(str(self.base_dir))
+        self.assertEqual(reopened.partition_format, 'csv')
+        self.assertEqual(reopened.load_real_time_data("INFY")['current_price'], 1500.0)
+        self.assertEqual(reopened.get_all_stored_symbols(), ["INFY"])
+
+    def test_format_detected_for_stores_without_manifest(self):
+        """Partitions written before the manifest existed keep their format"""
+        with mock.patch.object(data_storage, 'PYARROW_AVAILABLE', False):
+            storage = InvestmentDataStorage(str(self.base_dir))
+            self.store_price(storage, "INFY", 1500.0)
+        (self.base_dir / 'partitions' / 'manifest.json').unlink()
+
+        with mock.patch.object(data_storage, 'PYARROW_AVAILABLE', True):
+            reopened = InvestmentDataStorage(str(self.base_dir))
+            self.assertEqual(reopened.partition_format, 'csv')
+            self.assertFalse((self.base_dir / 'partitions' / 'manifest.json').exists())
+            self.store_price(reopened, "TCS", 3400.0)
+        self.assertTrue((self.base_dir / 'partitions' / 'manifest.json').exists())
+        self.assertEqual(sorted(reopened.get_partition_symbols('real_time')), ["INFY", "TCS"])
+
+    def test_opening_a_store_writes_no_manifest(self):
+        """The format is pinned by the first partition write, not by construction or reads"""
+        storage = InvestmentDataStorage(str(self.base_dir))
+        self.assertIsNone(storage.load_real_time_data("INFY"))
+        self.assertFalse((self.base_dir / 'partitions' / 'manifest.json').exists())
+
+        self.store_price(storage, "INFY", 1500.0)
+        self.assertTrue((self.base_dir / 'partitions' / 'manifest.json').exists())
+
+    def test_missing_pyarrow_fails_loudly_for_feather_store(self):
+        """A Feather store without pyarrow reports errors instead of looking empty"""
+        (self.base_dir / 'partitions').mkdir(parents=True)
+        (self.base_dir / 'partitions' / 'manifest.json').write_text('{"format": "feather"}')
+
+        with mock.patch.object(data_storage, 'PYARROW_AVAILABLE', False):
+            storage = InvestmentDataStorage(str(self.base_dir))
+            with self.assertRaises(RuntimeError):
+                storage.write_partition('real_time', 'INFY', pd.DataFrame([{'symbol': 'INFY'}]))
+
+    def test_legacy_file_is_split_into_partitions(self):
+        """A category file from earlier versions is split per symbol and moved aside"""
+        self.base_dir.mkdir(parents=True)
+        self.write_legacy_file()
+
+        storage = InvestmentDataStorage(str(self.base_dir))
+
+        self.assertEqual(sorted(storage.get_partition_symbols('real_time')), ["INFY", "TCS"])
+        self.assertEqual(storage.load_real_time_data("TCS")['current_price'], 3400.0)
+        self.assertFalse((self.base_dir / 'real_time_data.csv').exists())
+        self.assertTrue((self.base_dir / 'backups' / 'real_time_data_pre_partition.csv').exists())
+
+    def test_failed_migration_is_retried(self):
+        """A migration that fails part-way is not marked done and keeps the legacy file"""
+        self.base_dir.mkdir(parents=True)
+        self.write_legacy_file()
+        storage = InvestmentDataStorage(str(self.base_dir))
+
+        with mock.patch.object(storage, '_write_partition_file', side_effect=OSError("disk full")):
+            storage.migrate_legacy_file('real_time')
+
+        self.assertNotIn('real_time', storage._migrated_categories)
+        self.assertTrue((self.base_dir / 'real_time_data.csv').exists())
+
+        self.assertEqual(sorted(storage.get_partition_symbols('real_time')), ["INFY", "TCS"])
+        self.assertIn('real_time', storage._migrated_categories)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for batched investment price updates
+Checks InvestmentDataModel.update_current_prices against the per-investment calculations
+"""
+
+import unittest
+import tempfile
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+from src.modules.investments.models import Investment, InvestmentDataModel
+
+
+DERIVED_COLUMNS = ['total_investment', 'current_value', 'profit_loss',
+                   'profit_loss_percentage', 'days_held', 'annualized_return']
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestInvestmentPriceUpdate(unittest.TestCase):
+    """Test update_current_prices over a small portfolio"""
+
+    def setUp(self):
+        """Set up a portfolio of three investments"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+        self.model = InvestmentDataModel(self.data_manager)
+
+        bought = (date.today() - timedelta(days=400)).strftime('%Y-%m-%d')
+        self.investments = [
+            Investment(symbol="INFY", name="Infosys", quantity=10, purchase_price=1400.0,
+                       current_price=1400.0, purchase_date=bought),
+            Investment(symbol="TCS", name="Tata Consultancy", quantity=2.5, purchase_price=3300.0,
+                       current_price=3300.0, purchase_date=date.today().strftime('%Y-%m-%d')),
+            Investment(symbol="GOLDBEES", name="Gold ETF", investment_type="ETF", quantity=100,
+                       purchase_price=45.0, current_price=45.0, purchase_date=bought),
+        ]
+        for investment in self.investments:
+            self.assertTrue(self.model.add_investment(investment))
+
+        self.signals = []
+        self.data_manager.data_changed.connect(lambda module, operation: self.signals.append((module, operation)))
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def row(self, df: pd.DataFrame, symbol: str) -> pd.Series:
+        return df[df['symbol'] == symbol].iloc[0]
+
+    def test_matches_per_investment_calculation(self):
+        """Derived columns equal those of Investment.to_dict for the new prices"""
+        prices = {"INFY": 1610.5, "TCS": 3150.0}
+        self.assertEqual(self.model.update_current_prices(prices), 2)
+
+        df = self.data_manager.read_csv('investments', 'investments.csv')
+        for investment in self.investments[:2]:
+            investment.current_price = prices[investment.symbol]
+            expected = investment.to_dict()
+            row = self.row(df, investment.symbol)
+            self.assertAlmostEqual(float(row['current_price']), prices[investment.symbol])
+            for column in DERIVED_COLUMNS:
+                self.assertAlmostEqual(float(row[column]), float(expected[column]), places=6, msg=column)
+
+    def test_unmatched_rows_are_untouched(self):
+        """Investments without a new price keep their stored values"""
+        before = self.row(self.model.get_all_investments(), "GOLDBEES")
+        self.model.update_current_prices({"INFY": 1500.0})
+
+        after = self.row(self.data_manager.read_csv('investments', 'investments.csv'), "GOLDBEES")
+        self.assertEqual(float(after['current_price']), 45.0)
+        self.assertEqual(str(after['last_updated']), str(before['last_updated']))
+
+    def test_invalid_prices_are_skipped(self):
+        """Negative, non-numeric and unknown-symbol prices update nothing"""
+        self.assertEqual(self.model.update_current_prices({"INFY": -5, "TCS": "n/a", "WIPRO": 500.0}), 0)
+        self.assertEqual(self.signals, [])
+
+    def test_single_write_and_signal(self):
+        """All prices land in one write with one change notification"""
+        self.model.update_current_prices({"INFY": 1500.0, "TCS": 3400.0, "GOLDBEES": 50.0})
+
+        self.assertEqual(self.signals, [('investments', 'write')])
+        summary = self.model.get_portfolio_summary()
+        self.assertAlmostEqual(summary['total_current_value'], 10 * 1500.0 + 2.5 * 3400.0 + 100 * 50.0)
+        self.assertEqual(summary['by_type']['ETF']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Tests for the streaming market ticker
+Decodes the ticker's binary packets and streams from the local replay server through MarketTicker
+"""
+
+import unittest
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+
+INFY = 408065        # NSE equity
+NIFTY = 256265       # NSE index (segment 9)
+
+
+def make_tick(token=INFY, last_price=1520.35):
+    return {
+        'instrument_token': token, 'last_price': last_price, 'last_traded_quantity': 12,
+        'average_traded_price': 1518.4, 'volume_traded': 250000, 'total_buy_quantity': 900,
+        'total_sell_quantity': 1100,
+        'ohlc': {'open': 1510.0, 'high': 1525.5, 'low': 1505.05, 'close': 1500.0},
+    }
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+def process_until(condition, timeout=5.0):
+    """Run the event loop until condition() holds or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture(scope="class")
+def trading(request, import_without_init):
+    request.cls.ticker = import_without_init('src.modules.trading.ticker')
+    request.cls.tick_replay = import_without_init('src.modules.trading.tick_replay')
+
+
+@pytest.mark.usefixtures("trading")
+class TestTickCodec(unittest.TestCase):
+    """Test encoding and decoding of ticker packets"""
+
+    def round_trip(self, tick, mode):
+        return self.ticker.parse_binary_message(self.ticker.pack_binary_message([self.ticker.pack_packet(tick, mode)]))
+
+    def test_quote_packet_round_trip(self):
+        """A quote packet carries price, volume and OHLC"""
+        tick, = self.round_trip(make_tick(), self.ticker.MODE_QUOTE)
+
+        self.assertEqual(tick['mode'], self.ticker.MODE_QUOTE)
+        self.assertTrue(tick['tradable'])
+        self.assertEqual(tick['instrument_token'], INFY)
+        self.assertAlmostEqual(tick['last_price'], 1520.35)
+        self.assertEqual(tick['volume_traded'], 250000)
+        self.assertEqual(tick['ohlc'], {'open': 1510.0, 'high': 1525.5, 'low': 1505.05, 'close': 1500.0})
+        self.assertAlmostEqual(tick['change'], 1.3567, places=3)
+
+    def test_ltp_packet_round_trip(self):
+        """An LTP packet carries only the last price"""
+        tick, = self.round_trip(make_tick(), self.ticker.MODE_LTP)
+
+        self.assertEqual(tick, {'tradable': True, 'mode': self.ticker.MODE_LTP, 'instrument_token': INFY,
+                                'last_price': 1520.35})
+
+    def test_full_packet_round_trip(self):
+        """A full packet adds timestamps, open interest and market depth"""
+        tick = make_tick()
+        tick['exchange_timestamp'] = datetime(2025, 1, 15, 10, 0, 5)
+        tick['depth'] = {'buy': [{'quantity': 10, 'price': 1520.3, 'orders': 2}],
+                         'sell': [{'quantity': 7, 'price': 1520.4, 'orders': 1}]}
+
+        decoded, = self.round_trip(tick, self.ticker.MODE_FULL)
+
+        self.assertEqual(decoded['mode'], self.ticker.MODE_FULL)
+        self.assertEqual(decoded['exchange_timestamp'], datetime(2025, 1, 15, 10, 0, 5))
+        self.assertEqual(len(decoded['depth']['buy']), 5)
+        self.assertEqual(decoded['depth']['buy'][0], {'quantity': 10, 'price': 1520.3, 'orders': 2})
+        self.assertEqual(decoded['depth']['sell'][0], {'quantity': 7, 'price': 1520.4, 'orders': 1})
+
+    def test_index_packet_round_trip(self):
+        """Index packets are not tradable and report the net change"""
+        tick = make_tick(NIFTY, 23510.5)
+        tick['ohlc'] = {'open': 23400.0, 'high': 23550.0, 'low': 23380.0, 'close': 23450.0}
+
+        decoded, = self.round_trip(tick, self.ticker.MODE_QUOTE)
+
+        self.assertFalse(decoded['tradable'])
+        self.assertAlmostEqual(decoded['last_price'], 23510.5)
+        self.assertAlmostEqual(decoded['net_change'], 60.5)
+
+    def test_heartbeat_has_no_ticks(self):
+        """One-byte messages are heartbeats"""
+        self.assertEqual(self.ticker.parse_binary_message(b"\x00"), [])
+
+    def test_conflator_keeps_one_merged_tick_per_instrument(self):
+        """Later ticks overwrite earlier fields but keep the ones they lack"""
+        conflator = self.ticker.TickConflator()
+        conflator.add([make_tick(INFY, 1520.0), make_tick(NIFTY, 23500.0),
+                       {'instrument_token': INFY, 'last_price': 1521.0}])
+
+        batch = conflator.drain()
+
+        self.assertEqual(set(batch), {INFY, NIFTY})
+        self.assertEqual(batch[INFY]['last_price'], 1521.0)
+        self.assertIn('ohlc', batch[INFY])
+        self.assertEqual((conflator.received, conflator.conflated), (3, 1))
+        self.assertEqual(conflator.drain(), {})
+
+
+@pytest.mark.usefixtures("trading")
+class TestMarketTicker(unittest.TestCase):
+    """Test streaming from the replay server"""
+
+    instruments = {INFY: 1520.0, 2953217: 3500.0, 738561: 1250.0, NIFTY: 23450.0}
+
+    def setUp(self):
+        """Start a replay server well above the frame rate"""
+        if not self.ticker.WEBSOCKETS_AVAILABLE:
+            self.skipTest("QtWebSockets not available")
+        self.server = self.tick_replay.ReplayTickServer(self.instruments, updates_per_second=2000, seed=7)
+        url = self.server.start()
+        self.market_ticker = self.ticker.MarketTicker(url=url, frame_rate=20)
+        self.batches = []
+        self.market_ticker.ticks_ready.connect(self.batches.append)
+
+    def tearDown(self):
+        """Close both ends"""
+        self.market_ticker.stop()
+        self.server.stop()
+        QCoreApplication.processEvents()
+
+    def test_streams_only_subscribed_instruments_conflated_per_frame(self):
+        """Each frame delivers at most one tick per subscribed instrument"""
+        self.market_ticker.subscribe([INFY, NIFTY])
+        self.market_ticker.start()
+
+        self.assertTrue(process_until(lambda: len(self.batches) >= 5))
+
+        delivered = set().union(*self.batches)
+        self.assertEqual(delivered, {INFY, NIFTY})
+        self.assertEqual(set(self.server.subscribed_tokens()), {INFY, NIFTY})
+        stats = self.market_ticker.stats
+        self.assertGreater(stats.ticks, stats.delivered)
+        self.assertEqual(stats.delivered, sum(len(batch) for batch in self.batches))
+        self.assertEqual(self.batches[-1][INFY]['mode'], self.ticker.MODE_QUOTE)
+
+    def test_unsubscribe_stops_instrument(self):
+        """Unsubscribed instruments stop arriving"""
+        self.market_ticker.subscribe([INFY, NIFTY])
+        self.market_ticker.start()
+        self.assertTrue(process_until(lambda: len(self.batches) >= 2))
+
+        self.market_ticker.set_subscriptions([NIFTY])
+        self.assertTrue(process_until(lambda: set(self.server.subscribed_tokens()) == {NIFTY}))
+        self.market_ticker.flush()
+        self.batches.clear()
+        self.assertTrue(process_until(lambda: len(self.batches) >= 3))
+
+        self.assertEqual(set().union(*self.batches), {NIFTY})
+
+    def test_reconnects_and_resubscribes(self):
+        """After a dropped connection the ticker reconnects and restores its subscriptions"""
+        self.market_ticker.subscribe([738561], self.ticker.MODE_LTP)
+        self.market_ticker.start()
+        self.assertTrue(process_until(self.market_ticker.is_connected))
+
+        self.market_ticker._reconnect_delay = 0
+        self.server.disconnect_clients()
+        self.assertTrue(process_until(lambda: not self.market_ticker.is_connected()))
+        self.assertTrue(process_until(self.market_ticker.is_connected))
+        self.batches.clear()
+
+        self.assertTrue(process_until(lambda: len(self.batches) >= 2))
+        self.assertEqual(self.market_ticker.stats.reconnects, 1)
+        self.assertEqual(self.server.subscribed_tokens(), {738561: self.ticker.MODE_LTP})
+        self.assertEqual(self.batches[-1][738561]['mode'], self.ticker.MODE_LTP)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for the global search index
+Checks term matching, updates after data changes and reloading the persisted shards
+"""
+
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+from src.core.search_index import SearchIndex, SEARCH_SOURCES
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test lookup, incremental updates and persistence of SearchIndex"""
+
+    expense_columns = SEARCH_SOURCES['expenses']['columns']
+
+    def setUp(self):
+        """Set up a data manager holding a few expenses and tasks"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(str(Path(self.temp_dir) / "data"))
+
+        sync_patcher = patch.object(self.data_manager, 'trigger_sync_for_module')
+        sync_patcher.start()
+        self.addCleanup(sync_patcher.stop)
+
+        self.data_manager.write_csv('expenses', 'expenses.csv', pd.DataFrame({
+            'id': [1, 2],
+            'date': ['2025-01-02', '2025-01-03'],
+            'type': ['Expense', 'Expense'],
+            'category': ['Food', 'Transport'],
+            'sub_category': ['Groceries', 'Taxi'],
+            'transaction_mode': ['UPI', 'Cash'],
+            'amount': [250.0, 120.0],
+            'notes': ['Weekly vegetables', 'Airport ride'],
+        }))
+        self.data_manager.write_csv('todos', 'todo_items.csv', pd.DataFrame({
+            'id': [1],
+            'title': ['Renew passport'],
+            'description': ['Book appointment'],
+            'category': ['Personal'],
+            'priority': ['High'],
+            'status': ['Pending'],
+            'due_date': ['2025-02-01'],
+            'tags': ['travel'],
+        }))
+
+        self.index = SearchIndex(self.data_manager)
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def titles(self, query: str, index: SearchIndex = None, **kwargs):
+        return [result['title'] for result in (index or self.index).search(query, **kwargs)]
+
+    def test_token_prefix_and_fuzzy_lookup(self):
+        """Queries match whole words, prefixes, substrings and misspellings"""
+        self.assertEqual(self.titles("vegetables"), ["Weekly vegetables"])
+        self.assertEqual(self.titles("VEG"), ["Weekly vegetables"])
+        self.assertEqual(self.titles("port"), ["Renew passport", "Airport ride"])
+        self.assertEqual(self.titles("pasport"), ["Renew passport"])
+        self.assertEqual(self.titles("airport taxi"), ["Airport ride"])
+        self.assertEqual(self.titles("airport food"), [])
+        self.assertEqual(self.titles("port", modules=['todos']), ["Renew passport"])
+
+    def test_exact_match_ranks_first(self):
+        """An exact word match scores above a prefix match"""
+        self.data_manager.append_row('expenses', 'expenses.csv', {
+            'date': '2025-01-04', 'type': 'Expense', 'category': 'Food', 'amount': 40.0,
+            'notes': 'Veg'}, self.expense_columns)
+
+        self.assertEqual(self.titles("veg"), ["Veg", "Weekly vegetables"])
+
+    def test_data_changed_updates_the_index(self):
+        """Appends, updates and deletes show up in the next search"""
+        self.assertEqual(self.titles("lunch"), [])
+
+        self.data_manager.append_row('expenses', 'expenses.csv', {
+            'date': '2025-01-04', 'type': 'Expense', 'category': 'Food', 'amount': 40.0,
+            'notes': 'Office lunch'}, self.expense_columns)
+        self.assertEqual(self.titles("lunch"), ["Office lunch"])
+
+        self.data_manager.update_row('expenses', 'expenses.csv', 2, {'notes': 'Station ride'})
+        self.assertEqual(self.titles("airport"), [])
+        self.assertEqual(self.titles("station"), ["Station ride"])
+
+        self.data_manager.delete_row('expenses', 'expenses.csv', 1)
+        self.assertEqual(self.titles("vegetables"), [])
+        self.assertEqual(self.index.get_statistics()['modules']['expenses'], 2)
+
+    def test_refresh_rewrites_only_changed_module_shards(self):
+        """A change to one module saves that module's shard only"""
+        self.index.refresh()
+        self.assertTrue((self.index.index_dir / "expenses.json").exists())
+        self.assertTrue((self.index.index_dir / "todos.json").exists())
+
+        self.data_manager.append_row('expenses', 'expenses.csv', {
+            'date': '2025-01-04', 'type': 'Expense', 'category': 'Food', 'amount': 40.0,
+            'notes': 'Office lunch'}, self.expense_columns)
+
+        with patch.object(self.index, '_save_module', wraps=self.index._save_module) as save_module:
+            self.index.refresh()
+            self.index.refresh()
+
+        save_module.assert_called_once_with('expenses')
+
+    def test_reload_from_disk_without_reading_sources(self):
+        """A new index answers from the saved shards while the sources are unchanged"""
+        expected = self.index.search("port")
+
+        reloaded = SearchIndex(self.data_manager)
+        with patch.object(self.data_manager, 'read_csv', wraps=self.data_manager.read_csv) as read_csv:
+            self.assertEqual(reloaded.search("port"), expected)
+        read_csv.assert_not_called()
+        self.assertEqual(reloaded.get_statistics(), self.index.get_statistics())
+
+    def test_reload_picks_up_changes_made_while_closed(self):
+        """A stale shard is re-read and an unreadable shard is rebuilt"""
+        self.index.refresh()
+        self.data_manager.update_row('todos', 'todo_items.csv', 1, {'title': 'Renew licence'})
+        (self.index.index_dir / "expenses.json").write_text("{not json", encoding='utf-8')
+
+        reloaded = SearchIndex(self.data_manager)
+        self.assertEqual(self.titles("licence", reloaded), ["Renew licence"])
+        self.assertEqual(self.titles("passport", reloaded), [])
+        self.assertEqual(self.titles("vegetables", reloaded), ["Weekly vegetables"])
+
+
+if __name__ == '__main__':
+    unittest.main()
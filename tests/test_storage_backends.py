@@ -0,0 +1,157 @@
+"""
+Tests for the DataManager storage backends
+Runs the same row operations through the CSV, journal and SQLite backends
+"""
+
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from pathlib import Path
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import QCoreApplication
+
+from src.core.data_manager import DataManager
+
+
+COLUMNS = ['id', 'date', 'type', 'category', 'amount', 'notes']
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestStorageBackends(unittest.TestCase):
+    """Test row operations, journal replay, compaction and switching between backends"""
+
+    def setUp(self):
+        """Set up an empty data directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_dir = Path(self.temp_dir) / "data"
+        self.csv_path = self.data_dir / "expenses" / "expenses.csv"
+
+    def tearDown(self):
+        """Clean up the temporary data directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def open(self, backend: str) -> DataManager:
+        data_manager = DataManager(str(self.data_dir), storage_backend=backend)
+        sync_patcher = patch.object(data_manager, 'trigger_sync_for_module')
+        sync_patcher.start()
+        self.addCleanup(sync_patcher.stop)
+        return data_manager
+
+    def append(self, data_manager: DataManager, day: str, row_type: str, amount: float):
+        self.assertTrue(data_manager.append_row('expenses', 'expenses.csv', {
+            'date': day, 'type': row_type, 'category': 'Food', 'amount': amount, 'notes': 'lunch'}, COLUMNS))
+
+    def apply_changes(self, data_manager: DataManager):
+        """Three appends, one update and one delete"""
+        self.append(data_manager, '2025-01-02', 'Expense', 10.0)
+        self.append(data_manager, '2025-01-03', 'Expense', 20.0)
+        self.append(data_manager, '2025-01-03', 'Income', 30.0)
+        self.assertTrue(data_manager.update_row('expenses', 'expenses.csv', 1, {'amount': 15.0}))
+        self.assertTrue(data_manager.delete_row('expenses', 'expenses.csv', 3))
+
+    def read(self, data_manager: DataManager) -> pd.DataFrame:
+        return data_manager.read_csv('expenses', 'expenses.csv', COLUMNS)
+
+    def csv_backend_output(self) -> str:
+        reference_dir = Path(self.temp_dir) / "reference"
+        data_manager = DataManager(str(reference_dir), storage_backend='csv')
+        with patch.object(data_manager, 'trigger_sync_for_module'):
+            self.apply_changes(data_manager)
+        return (reference_dir / "expenses" / "expenses.csv").read_text(encoding='utf-8')
+
+    def assertRows(self, df: pd.DataFrame, expected):
+        rows = [(int(row.id), row.date.strftime('%Y-%m-%d'), row.type, float(row.amount))
+                for row in df.itertuples()]
+        self.assertEqual(rows, expected)
+
+    def test_row_operations_on_every_backend(self):
+        """Appends, updates and deletes read back the same on every backend"""
+        for backend in ('csv', 'journal', 'sqlite'):
+            with self.subTest(backend=backend):
+                shutil.rmtree(self.data_dir, ignore_errors=True)
+                data_manager = self.open(backend)
+                self.apply_changes(data_manager)
+
+                self.assertRows(self.read(data_manager), [(1, '2025-01-02', 'Expense', 15.0),
+                                                          (2, '2025-01-03', 'Expense', 20.0)])
+
+    def test_date_range_query_on_every_backend(self):
+        """query_csv includes rows dated on the end day, before and after compaction"""
+        for backend in ('csv', 'journal', 'sqlite'):
+            with self.subTest(backend=backend):
+                shutil.rmtree(self.data_dir, ignore_errors=True)
+                data_manager = self.open(backend)
+                self.apply_changes(data_manager)
+
+                for _ in range(2):
+                    df = data_manager.query_csv('expenses', 'expenses.csv', filters={'type': 'Expense'},
+                                                date_range=('2025-01-02', '2025-01-03'))
+                    self.assertRows(df, [(1, '2025-01-02', 'Expense', 15.0), (2, '2025-01-03', 'Expense', 20.0)])
+                    self.assertEqual(len(data_manager.query_csv('expenses', 'expenses.csv',
+                                                                date_range=('2025-01-03', None))), 1)
+                    data_manager.compact_storage()
+
+    def test_journal_replays_after_restart(self):
+        """A new DataManager rebuilds the rows from the CSV snapshot and the journal"""
+        self.apply_changes(self.open('journal'))
+        journal_path = self.csv_path.with_name("expenses.csv.journal")
+        self.assertEqual(len(journal_path.read_text(encoding='utf-8').splitlines()), 5)
+
+        # A crash mid-write can leave a torn last line behind
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "append", "row": {"id"')
+
+        self.assertRows(self.read(self.open('journal')), [(1, '2025-01-02', 'Expense', 15.0),
+                                                          (2, '2025-01-03', 'Expense', 20.0)])
+
+    def test_compaction_writes_what_the_csv_backend_writes(self):
+        """Compacted journal and SQLite files match the plain CSV file byte for byte"""
+        expected = self.csv_backend_output()
+        self.assertIn("2025-01-02,", expected)
+
+        for backend in ('journal', 'sqlite'):
+            with self.subTest(backend=backend):
+                shutil.rmtree(self.data_dir, ignore_errors=True)
+                data_manager = self.open(backend)
+                self.apply_changes(data_manager)
+
+                self.assertEqual(data_manager.compact_storage('expenses'), 1)
+                self.assertEqual(self.csv_path.read_text(encoding='utf-8'), expected)
+                self.assertFalse(self.csv_path.with_name("expenses.csv.journal").exists())
+                self.assertEqual(data_manager.compact_storage('expenses'), 0)
+
+    def test_switching_backends_keeps_the_data(self):
+        """Data moves csv -> journal -> sqlite -> csv without loss or format drift"""
+        self.apply_changes(self.open('csv'))
+        expected = self.csv_path.read_text(encoding='utf-8')
+
+        journal = self.open('journal')
+        self.append(journal, '2025-01-04', 'Expense', 40.0)
+        journal.compact_storage()
+
+        sqlite = self.open('sqlite')
+        self.assertRows(self.read(sqlite), [(1, '2025-01-02', 'Expense', 15.0),
+                                            (2, '2025-01-03', 'Expense', 20.0),
+                                            (3, '2025-01-04', 'Expense', 40.0)])
+        self.assertTrue(sqlite.delete_row('expenses', 'expenses.csv', 3))
+        sqlite.compact_storage()
+
+        self.assertEqual(self.csv_path.read_text(encoding='utf-8'), expected)
+        self.assertRows(self.read(self.open('csv')), [(1, '2025-01-02', 'Expense', 15.0),
+                                                      (2, '2025-01-03', 'Expense', 20.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests for the virtualized DataFrame table model
+Checks loading, lazy formatting, sorting and filtering of DataFrameTableModel
+"""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PySide6.QtCore import Qt, QCoreApplication
+
+from src.ui.table_models import DataFrameTableModel, TableColumn, format_amount, format_date, truncate
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+class TestDataFrameTableModel(unittest.TestCase):
+    """Test DataFrameTableModel over a small expense frame"""
+
+    def setUp(self):
+        """Set up a model over three records"""
+        self.model = DataFrameTableModel([
+            TableColumn('date', 'Date', formatter=format_date, sort_as='date'),
+            TableColumn('category', 'Category'),
+            TableColumn('amount', 'Amount', formatter=format_amount, sort_as='number'),
+            TableColumn('notes', 'Notes', formatter=truncate(8), tooltip=True),
+        ])
+        self.model.set_dataframe(pd.DataFrame({
+            'id': [1, 2, 3],
+            'date': ['2025-01-15', '2024-12-31', '2025-03-01'],
+            'category': ['food', 'Travel', 'bills'],
+            'amount': [120.5, 9.0, np.nan],
+            'notes': ['lunch with team', None, 'power'],
+        }))
+
+    def cell(self, row: int, column: int, role=Qt.DisplayRole):
+        return self.model.data(self.model.index(row, column), role)
+
+    def column_text(self, column: int):
+        return [self.cell(row, column) for row in range(self.model.rowCount())]
+
+    def test_loads_rows_and_headers(self):
+        """The model exposes one row per record and the column headers"""
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.columnCount(), 4)
+        self.assertEqual(self.model.headerData(2, Qt.Horizontal), 'Amount')
+
+    def test_cells_are_formatted(self):
+        """Display text goes through each column's formatter"""
+        self.assertEqual(self.cell(0, 0), '15/01/2025')
+        self.assertEqual(self.cell(0, 2), '₹120.50')
+        self.assertEqual(self.cell(2, 2), '₹0.00')
+        self.assertEqual(self.cell(0, 3), 'lunch...')
+        self.assertEqual(self.cell(1, 3), '')
+        self.assertEqual(self.cell(0, 3, Qt.ToolTipRole), 'lunch with team')
+        self.assertEqual(self.cell(0, 2, Qt.UserRole), 120.5)
+
+    def test_sort_by_number_and_date(self):
+        """Numeric and date columns sort by value, with missing values last"""
+        self.model.sort(2, Qt.AscendingOrder)
+        self.assertEqual(self.column_text(2), ['₹9.00', '₹120.50', '₹0.00'])
+
+        self.model.sort(0, Qt.DescendingOrder)
+        self.assertEqual(self.column_text(0), ['01/03/2025', '15/01/2025', '31/12/2024'])
+
+    def test_text_sort_ignores_case(self):
+        """Text columns sort case-insensitively"""
+        self.model.sort(1, Qt.AscendingOrder)
+        self.assertEqual(self.column_text(1), ['bills', 'food', 'Travel'])
+
+    def test_text_filter_keeps_sort(self):
+        """Filtering shows matching rows in the current sort order"""
+        self.model.sort(2, Qt.DescendingOrder)
+        self.model.set_text_filter('E', ['notes'])
+
+        self.assertEqual(self.model.rowCount(), 2)
+        self.assertEqual([self.model.row_value(row, 'id') for row in range(2)], [1, 3])
+
+        self.model.set_text_filter('')
+        self.assertEqual(self.model.rowCount(), 3)
+
+    def test_row_access_reaches_extra_columns(self):
+        """Frame columns without a model column stay reachable by row"""
+        self.model.sort(0, Qt.AscendingOrder)
+        self.assertEqual(self.model.source_row(0), 1)
+        self.assertEqual(self.model.row_record(0)['id'], 2)
+        self.assertEqual(self.model.column_index('amount'), 2)
+        self.assertEqual(self.model.column_index('id'), -1)
+
+    def test_filter_mask_length_is_checked(self):
+        """A mask that does not match the row count is rejected"""
+        with self.assertRaises(ValueError):
+            self.model.set_filter_mask(np.array([True]))
+
+
+if __name__ == '__main__':
+    unittest.main()
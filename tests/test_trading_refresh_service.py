@@ -0,0 +1,264 @@
+"""
+Tests for the background trading refresh service
+Runs TradingRefreshService over ZerodhaAPIClient with a fake kite object standing in for the broker
+"""
+
+import unittest
+import copy
+import time
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+
+# Import the modules to test
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+
+def make_position(symbol, last_price=100.0, quantity=10, product="MIS"):
+    position = {name: 0 for name in (
+        'overnight_quantity', 'multiplier', 'value', 'm2m', 'unrealised', 'realised',
+        'buy_quantity', 'buy_price', 'buy_value', 'sell_quantity', 'sell_price', 'sell_value',
+        'day_buy_quantity', 'day_buy_price', 'day_buy_value', 'day_sell_quantity',
+        'day_sell_price', 'day_sell_value')}
+    position.update(tradingsymbol=symbol, exchange="NSE", instrument_token=hash(symbol) % 100000,
+                    product=product, quantity=quantity, average_price=95.0, close_price=98.0,
+                    last_price=last_price, pnl=(last_price - 95.0) * quantity)
+    return position
+
+
+def make_order(order_id, status="COMPLETE", symbol="INFY"):
+    return {
+        'order_id': order_id, 'parent_order_id': None, 'exchange_order_id': None, 'placed_by': 'AB1234',
+        'variety': 'regular', 'status': status, 'tradingsymbol': symbol, 'exchange': 'NSE',
+        'instrument_token': 408065, 'transaction_type': 'BUY', 'order_type': 'LIMIT', 'product': 'CNC',
+        'quantity': 1, 'disclosed_quantity': 0, 'price': 1500.0, 'trigger_price': 0.0,
+        'average_price': 1500.0, 'filled_quantity': 1, 'pending_quantity': 0, 'cancelled_quantity': 0,
+        'market_protection': 0, 'order_timestamp': '2025-01-15 10:00:00', 'exchange_timestamp': None,
+        'status_message': None, 'status_message_raw': None, 'guid': f"guid-{order_id}", 'tag': None,
+    }
+
+
+def make_holding(symbol, last_price=200.0):
+    holding = {name: 0 for name in (
+        'used_quantity', 't1_quantity', 'realised_quantity', 'authorised_quantity',
+        'opening_quantity', 'collateral_quantity', 'day_change', 'day_change_percentage')}
+    holding.update(tradingsymbol=symbol, exchange="NSE", instrument_token=hash(symbol) % 100000,
+                   isin=f"INE{symbol}", product="CNC", quantity=5, average_price=180.0,
+                   last_price=last_price, close_price=199.0, pnl=(last_price - 180.0) * 5)
+    return holding
+
+
+class FakeKite:
+    """Stand-in for KiteConnect answering from in-memory data after a fixed latency"""
+
+    def __init__(self, indices, latency: float = 0.05):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = []            # method names in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self.profile_data = {'user_id': 'AB1234', 'user_name': 'Test User', 'broker': 'ZERODHA'}
+        self.margins_data = {'equity': {'net': 10000.0}, 'commodity': {'net': 0.0}}
+        self.positions_data = {'day': [], 'net': [make_position("INFY"), make_position("TCS", 3500.0)]}
+        self.holdings_data = [make_holding("HDFCBANK"), make_holding("ITC", 450.0)]
+        self.mf_holdings_data = [{'tradingsymbol': 'INF000K01', 'fund': 'Index Fund', 'quantity': 10,
+                                  'average_price': 50.0, 'last_price': 55.0, 'pnl': 50.0, 'folio': '123'}]
+        self.orders_data = [make_order("1001"), make_order("1002", status="OPEN")]
+        self.trades_data = [{'trade_id': 't1', 'order_id': '1001'}]
+        self.quotes_data = {instrument: {'last_price': 100.0 + i, 'ohlc': {'close': 99.0}}
+                            for i, instrument in enumerate(["NSE:INFY", "NSE:TCS"] + indices)}
+
+    def _call(self, name, result):
+        with self.lock:
+            self.calls.append(name)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        # The client rewrites some fields in place, so hand out copies like a real response
+        return copy.deepcopy(result)
+
+    def profile(self):
+        return self._call('profile', self.profile_data)
+
+    def margins(self):
+        return self._call('margins', self.margins_data)
+
+    def positions(self):
+        return self._call('positions', self.positions_data)
+
+    def holdings(self):
+        return self._call('holdings', self.holdings_data)
+
+    def mf_holdings(self):
+        return self._call('mf_holdings', self.mf_holdings_data)
+
+    def orders(self):
+        return self._call('orders', self.orders_data)
+
+    def trades(self):
+        return self._call('trades', self.trades_data)
+
+    def quote(self, instruments):
+        return self._call('quote', {i: self.quotes_data[i] for i in instruments if i in self.quotes_data})
+
+
+def setUpModule():
+    if QCoreApplication.instance() is None:
+        global _app
+        _app = QCoreApplication([])
+
+
+@pytest.fixture(scope="class")
+def trading(request, import_without_init):
+    request.cls.api_client = import_without_init('src.modules.trading.api_client')
+    request.cls.models = import_without_init('src.modules.trading.models')
+    request.cls.refresh_service = import_without_init('src.modules.trading.refresh_service')
+
+
+@pytest.mark.usefixtures("trading")
+class TestTradingRefreshService(unittest.TestCase):
+    """Test concurrent fetching and change detection of the trading refresh"""
+
+    watchlist = ["INFY", "TCS"]
+
+    def setUp(self):
+        """Set up an authenticated client backed by the fake kite"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.kite = FakeKite(self.refresh_service.MARKET_INDICES)
+
+        config = self.models.TradingConfig(api_key="key", api_secret="secret")
+        self.client = self.api_client.ZerodhaAPIClient(config, Path(self.temp_dir))
+        self.client.kite = self.kite
+        self.client.is_connected = True
+        self.client.config.access_token = "token"
+
+        self.service = self.refresh_service.TradingRefreshService(lambda: self.client)
+        self.emitted = {}
+        for name in ('profile_changed', 'margins_changed', 'positions_changed', 'orders_changed',
+                     'trades_changed', 'quotes_changed', 'indices_changed'):
+            getattr(self.service, name).connect(lambda payload, name=name: self.emitted.setdefault(name, []).append(payload))
+        self.service.holdings_changed.connect(
+            lambda data, changes: self.emitted.setdefault('holdings_changed', []).append((data, changes)))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.service.wait(5)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_first_refresh_reports_every_section(self):
+        """Without a previous snapshot everything counts as changed"""
+        changed = self.service.refresh_now(watchlist=self.watchlist)
+
+        self.assertEqual(changed, {'profile', 'margins', 'positions', 'holdings', 'orders',
+                                   'trades', 'quotes', 'indices'})
+        positions = self.emitted['positions_changed'][0]
+        self.assertEqual([p.tradingsymbol for p in positions.items], ["INFY", "TCS"])
+        self.assertTrue(positions.layout_changed)
+        data, holdings = self.emitted['holdings_changed'][0]
+        self.assertEqual(data['summary']['total_count'], 3)
+        self.assertEqual(len(holdings.changed), 3)
+
+    def test_api_calls_run_concurrently(self):
+        """Independent calls overlap, so a refresh costs about one round trip per wave"""
+        start = time.monotonic()
+        self.service.refresh_now(watchlist=self.watchlist)
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(self.kite.max_in_flight, 1)
+        self.assertLess(elapsed, self.kite.latency * len(self.kite.calls) * 0.6)
+
+    def test_unchanged_data_emits_nothing(self):
+        """A second refresh over identical data emits no section signals"""
+        self.service.refresh_now(watchlist=self.watchlist)
+        self.emitted.clear()
+        finished = []
+        self.service.refresh_finished.connect(finished.append)
+
+        changed = self.service.refresh_now(watchlist=self.watchlist)
+
+        self.assertEqual(changed, set())
+        self.assertEqual(self.emitted, {})
+        self.assertEqual(finished, [set()])
+
+    def test_only_changed_items_are_emitted(self):
+        """Changed rows are reported individually; new or removed rows change the layout"""
+        self.service.refresh_now(watchlist=self.watchlist)
+        self.emitted.clear()
+
+        self.kite.positions_data['net'][1] = make_position("TCS", 3550.0)
+        self.kite.orders_data.append(make_order("1003", status="OPEN"))
+        self.kite.holdings_data.pop()
+        self.kite.quotes_data["NSE:INFY"] = {'last_price': 101.5, 'ohlc': {'close': 99.0}}
+
+        changed = self.service.refresh_now(watchlist=self.watchlist)
+
+        self.assertEqual(changed, {'positions', 'orders', 'holdings', 'quotes'})
+
+        positions = self.emitted['positions_changed'][0]
+        self.assertFalse(positions.layout_changed)
+        self.assertEqual(list(positions.changed), ["NSE:TCS:MIS"])
+        self.assertEqual([(row, p.last_price) for row, p in positions.changed_rows()], [(1, 3550.0)])
+
+        orders = self.emitted['orders_changed'][0]
+        self.assertTrue(orders.layout_changed)
+        self.assertEqual(list(orders.changed), ["1003"])
+
+        _, holdings = self.emitted['holdings_changed'][0]
+        self.assertEqual(holdings.changed, {})
+        self.assertEqual(holdings.removed, ["NSE:ITC:CNC"])
+
+        quotes = self.emitted['quotes_changed'][0]
+        self.assertEqual(list(quotes.changed), ["NSE:INFY"])
+
+    def test_watchlist_and_indices_share_one_quote_request(self):
+        """Quotes for the watchlist and the market overview go out as one batched call"""
+        self.service.refresh_now({'quotes', 'indices'}, watchlist=self.watchlist)
+
+        self.assertEqual(self.kite.calls, ['quote'])
+        self.assertEqual(self.emitted['quotes_changed'][0].keys, ["NSE:INFY", "NSE:TCS"])
+        self.assertEqual(self.emitted['indices_changed'][0].keys, self.refresh_service.MARKET_INDICES)
+
+    def test_request_refresh_runs_in_background(self):
+        """request_refresh returns at once and changes arrive through the event loop"""
+        finished = []
+        self.service.refresh_finished.connect(finished.append)
+
+        start = time.monotonic()
+        self.assertTrue(self.service.request_refresh(['positions', 'orders']))
+        self.assertLess(time.monotonic() - start, self.kite.latency)
+        self.assertFalse(self.service.request_refresh(['margins']))   # merged into the running refresh
+
+        self.assertTrue(self.service.wait(5))
+        self.assertEqual(finished, [])
+        QCoreApplication.processEvents()
+
+        self.assertEqual(set().union(*finished), {'positions', 'orders', 'margins'})
+        self.assertEqual(self.kite.calls.count('margins'), 1)
+        self.assertIn('positions_changed', self.emitted)
+        self.assertFalse(self.service.is_refreshing())
+
+    def test_results_for_replaced_client_are_dropped(self):
+        """Data fetched for a client that was disconnected meanwhile never reaches the UI"""
+        original_positions = self.kite.positions
+
+        def disconnect_during_call():
+            self.client = None
+            return original_positions()
+
+        self.kite.positions = disconnect_during_call
+        changed = self.service.refresh_now(['positions'])
+
+        self.assertEqual(changed, set())
+        self.assertEqual(self.emitted, {})
+
+
+if __name__ == '__main__':
+    unittest.main()